@@ -25,6 +25,8 @@ Project-URL: https://github.com/ChrisGrattoni/partitionoptimizer
 
 import random # used in the set_letter method of the Student class
 import csv # used in students_from_csv method of IndividualPartition class
+import sys # used to intern repeated strings when reading the student .csv
+import gc # used to pause garbage collection while reading the student .csv
 import time # use when benchmarking and setting an evaluation time limit:
             # start = time.perf_counter()
             # (do something)
@@ -44,13 +46,54 @@ from tkinter import filedialog # used for the GUI file browser
 from tkinter import font # used to set the width of the "Start" button
 import threading, queue # used to run the GUI and the parallel GA in separate threads
 import yaml # used to import settings from 'settings.yaml'
-import numpy as np # used to perform mathematical operations for graphs
+import numpy as np # used to perform mathematical operations for graphs and to evaluate partitions
 import matplotlib # used to create graphs
 import matplotlib.pyplot as plt # used to create graphs of the data
 from matplotlib import colors # used to style graphs/charts
 from PIL import Image, ImageTk # used to resize images
 from datetime import datetime #just used to test that the pie chart is updating
 import shutil # delete directory of output images on a new run
+import hashlib # used to key the compiled schedule cache by the contents of the input .csv files
+import collections # used for the least-recently-used order of the fitness cache
+
+# used to read and write Parquet files (optional, only needed if the 
+# student data or the reports use the Parquet format)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# used to hash genomes for the fitness cache (optional, a slower
+# hash from hashlib is used if the xxhash module is not installed)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# used to compile the fused fitness kernel of JitFitnessEngine (optional,
+# the NumPy FitnessEngine is used if the numba module is not installed)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# used to share the compiled schedule with the island processes 
+# (only available in Python 3.8+, otherwise each island reads the 
+# compiled schedule cache instead)
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+# used to solve the sub-problems of LargeNeighborhoodSearch exactly with 
+# the CP-SAT solver (optional, smaller sub-problems are solved by scoring
+# every partition if the ortools module is not installed)
+try:
+    from ortools.sat.python import cp_model
+except ImportError:
+    cp_model = None
 
 # number of processes to launch (must be >= 4)
 NUMBER_OF_PROCESSES = multiprocessing.cpu_count()
@@ -266,7 +309,7 @@ class StartPage(tk.Frame):
 
     # a method to launch the file dialog 
     def fileDialog(self, label):
-        filename = tk.filedialog.askopenfilename(initialdir =  "IO_DIRECTORY", title = "Select A File", filetypes = (("csv","*.csv"),("all files","*.*")) )
+        filename = tk.filedialog.askopenfilename(initialdir =  "IO_DIRECTORY", title = "Select A File", filetypes = (("csv","*.csv"),("parquet","*.parquet"),("all files","*.*")) )
         label.configure(text = filename)
 
     # a method to clear a label
@@ -307,11 +350,11 @@ class PageOne(tk.Frame):
             pass
            
     def create_queue(self, controller):
-        # creates threadsafe message queue and sends thread to run_parallel()
+        # creates threadsafe message queue and sends thread to run_optimizer()
         
         message_queue = queue.Queue()
 
-        new_thread = threading.Thread(target = ParallelGeneticAlgorithm.run_parallel, args = (message_queue,))
+        new_thread = threading.Thread(target = run_optimizer, args = (message_queue,))
         new_thread.start()
 
         self.start_message_queue(message_queue, controller)
@@ -367,7 +410,9 @@ class EndPage(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent)
 
-        results_text = "Final results have been written to course_analysis.csv and student_assignments.csv in the following directory: " + str(IO_DIRECTORY)
+        # the file extension of the reports (.csv or .parquet)
+        extension = "." + settings_dict["report_format"]
+        results_text = "Final results have been written to course_analysis" + extension + " and student_assignments" + extension + " in the following directory: " + str(IO_DIRECTORY)
         results_label = tk.Label(self, text = results_text, font = ('bold', 10), padx = 10, pady = 10)
         results_label.grid(row = 1, column = 0)
 
@@ -490,6 +535,711 @@ class Course:
         self.course_id_list = [] # course IDs will be appended here
         self.roster = [] # students on the course's roster will be appended here
 
+class CompiledSchedule:
+    """
+    A class used to store an array-backed copy of a Schedule object, where
+    students, required subgroups and courses are replaced by integer indices
+
+    Students are indexed in the order of Schedule.student_list, subgroups in
+    the order of Schedule.required_subgroups_list (the same order used by a
+    partition/genome) and courses in the order of Schedule.course_dict.
+
+    Course rosters are stored in CSR (compressed sparse row) form: the
+    enrollments of course c are the entries
+
+    course_offsets[c] : course_offsets[c + 1]
+
+    of the enrollment_* arrays. For example, if course 0 has 3 students and
+    course 1 has 2 students, then course_offsets = [0, 3, 5].
+
+    Attributes
+    ----------
+    number_of_students : int
+        the number of students at the school
+    number_of_subgroups : int
+        the number of required subgroups (the length of a partition)
+    number_of_courses : int
+        the number of courses at the school
+    student_subgroup : numpy array
+        the index of the required subgroup of each student
+    course_offsets : numpy array
+        CSR offsets into the enrollment_* arrays, one entry per course plus one
+    enrollment_student : numpy array
+        the index of the student for each enrollment (grouped by course)
+    enrollment_subgroup : numpy array
+        the index of the required subgroup for each enrollment (grouped by course)
+    enrollment_course : numpy array
+        the index of the course for each enrollment
+        (ex: [0, 0, 0, 1, 1] for the example above)
+    course_totals : numpy array
+        the number of students on the roster of each course
+    number_of_preferred_subgroups : int
+        the number of preferred subgroups (0 if there are none)
+    preferred_offsets : numpy array
+        CSR offsets into preferred_member_subgroup, one entry per
+        preferred subgroup plus one
+    preferred_member_subgroup : numpy array
+        for each member of each preferred subgroup, the index of the
+        required subgroup that the member belongs to
+    subgroup_offsets : numpy array
+        CSR offsets into subgroup_course, one entry per subgroup plus one
+    subgroup_course : numpy array
+        the course index of each enrollment, grouped by subgroup (a course
+        appears once for each member of the subgroup on its roster)
+    subgroup_preferred_offsets : numpy array
+        CSR offsets into subgroup_preferred, one entry per subgroup plus one
+    subgroup_preferred : numpy array
+        the preferred subgroups that each subgroup has a member in (only
+        those with members in two or more subgroups, the others are never split)
+    subgroup_member_offsets : numpy array
+        CSR offsets into subgroup_member_student, one entry per subgroup plus one
+    subgroup_member_student : numpy array
+        the index of each member of each required subgroup (in the order
+        of Schedule.required_subgroups_list)
+    preferred_member_student : numpy array
+        the index of each member of each preferred subgroup (uses the 
+        same preferred_offsets as preferred_member_subgroup)
+    student_ids : numpy array
+        the ID number of each student (as strings)
+    student_last_names, student_first_names, student_middle_names : numpy array
+        the names of each student (as strings)
+    course_rooms, course_periods : numpy array
+        the room number and period of each course (as strings)
+    course_numbers, course_names, course_ids : numpy array
+        Course.course_number_list, Course.course_name_list and 
+        Course.course_id_list for each course, with the items of each list
+        joined by list_separator (as strings)
+
+    Methods
+    -------
+    from_schedule(schedule_obj)
+        compile a Schedule object whose students, courses and required
+        subgroups have already been loaded
+    index_subgroups()
+        build the subgroup -> courses and subgroup -> preferred subgroups tables
+    gather_ranges(offsets, indices)
+        the positions of every entry of a set of CSR rows
+    encode_partition(letter_list)
+        convert a list of letters ["A", "C", ...] into an array of
+        letter indices [0, 2, ...]
+    decode_partition(genome)
+        convert an array of letter indices [0, 2, ...] back into a list
+        of letters ["A", "C", ...]
+    course_letter_counts(genome, number_of_partitions)
+        count the students of each letter in each course
+    preferred_split_flags(genome)
+        flag the preferred subgroups whose members have different letters
+    save(file_location)
+        write the compiled schedule to a .npz file
+    load(file_location)
+        read a compiled schedule from a .npz file written by save()
+    publish()
+        copy the arrays used for evaluation into a block of shared memory
+    attach(descriptor)
+        read-only view of a compiled schedule published by another process
+    """
+
+    # bump this whenever the attributes written by save() change, so that 
+    # cache files written by older versions of SPOTS are ignored
+    cache_version = 1
+
+    # joins the items of Course.course_number_list etc. into a single string
+    list_separator = "\x1f"
+
+    # the attributes written to (and read from) a .npz file by save()/load()
+    array_names = ["student_subgroup", "course_offsets", "enrollment_student", 
+                   "enrollment_subgroup", "enrollment_course", "course_totals",
+                   "preferred_offsets", "preferred_member_subgroup", 
+                   "subgroup_member_offsets", "subgroup_member_student", 
+                   "preferred_member_student", "student_ids", "student_last_names", 
+                   "student_first_names", "student_middle_names", "course_rooms", 
+                   "course_periods", "course_numbers", "course_names", "course_ids"]
+
+    # the attributes published to shared memory by publish(), which are 
+    # everything needed to evaluate partitions (but not to write reports),
+    # including the room of each course for the room capacities
+    shared_array_names = ["student_subgroup", "course_offsets", "enrollment_student", 
+                          "enrollment_subgroup", "enrollment_course", "course_totals",
+                          "preferred_offsets", "preferred_member_subgroup", 
+                          "subgroup_offsets", "subgroup_course", 
+                          "subgroup_preferred_offsets", "subgroup_preferred", 
+                          "course_rooms"]
+
+    def __init__(self):
+        """
+        The constructor for the CompiledSchedule class (use
+        CompiledSchedule.from_schedule() to populate the attributes)
+        """
+        self.number_of_students = 0
+        self.number_of_subgroups = 0
+        self.number_of_courses = 0
+        self.student_subgroup = None
+        self.course_offsets = None
+        self.enrollment_student = None
+        self.enrollment_subgroup = None
+        self.enrollment_course = None
+        self.course_totals = None
+        self.number_of_preferred_subgroups = 0
+        self.preferred_offsets = None
+        self.preferred_member_subgroup = None
+        self.subgroup_offsets = None
+        self.subgroup_course = None
+        self.subgroup_preferred_offsets = None
+        self.subgroup_preferred = None
+        self.subgroup_member_offsets = None
+        self.subgroup_member_student = None
+        self.preferred_member_student = None
+        self.student_ids = None
+        self.student_last_names = None
+        self.student_first_names = None
+        self.student_middle_names = None
+        self.course_rooms = None
+        self.course_periods = None
+        self.course_numbers = None
+        self.course_names = None
+        self.course_ids = None
+        
+        # the shared memory block that the arrays are views of (see attach())
+        self.shared_memory_block = None
+
+    @classmethod
+    def from_schedule(cls, schedule_obj):
+        """
+        Compile a Schedule object into integer index arrays
+
+        Note: schedule_obj.students_from_csv() and
+        schedule_obj.subgroups_from_csv(..., "required") must be called first
+
+        Parameters
+        ----------
+        schedule_obj : Schedule object
+            a schedule with students, courses and required subgroups loaded
+        """
+        compiled = cls()
+
+        # key: student ID number
+        # value: the index of the student in schedule_obj.student_list
+        student_index_dict = {student.id: i for i, student in enumerate(schedule_obj.student_list)}
+
+        compiled.number_of_students = len(schedule_obj.student_list)
+        compiled.number_of_subgroups = len(schedule_obj.required_subgroups_list)
+        compiled.number_of_courses = len(schedule_obj.course_dict)
+
+        # the index of the required subgroup for each student:
+        compiled.student_subgroup = np.zeros(compiled.number_of_students, dtype=np.int32)
+
+        for subgroup_index, subgroup in enumerate(schedule_obj.required_subgroups_list):
+            for student in subgroup:
+                compiled.student_subgroup[student_index_dict[student.id]] = subgroup_index
+
+        # the members of each required subgroup in CSR form (only used to
+        # rebuild required_subgroups_list from a cache file):
+        member_sizes = np.fromiter((len(subgroup) for subgroup in schedule_obj.required_subgroups_list),
+                                   dtype=np.int64, count=compiled.number_of_subgroups)
+        
+        compiled.subgroup_member_offsets = np.zeros(compiled.number_of_subgroups + 1, dtype=np.int64)
+        np.cumsum(member_sizes, out=compiled.subgroup_member_offsets[1:])
+
+        compiled.subgroup_member_student = np.fromiter((student_index_dict[student.id]
+                                                        for subgroup in schedule_obj.required_subgroups_list
+                                                        for student in subgroup),
+                                                       dtype=np.int32, count=int(compiled.subgroup_member_offsets[-1]))
+
+        # the number of students in each course, in course_dict order:
+        compiled.course_totals = np.fromiter((len(roster) for roster in schedule_obj.course_dict.values()),
+                                             dtype=np.int32, count=compiled.number_of_courses)
+
+        # CSR offsets, ex: totals [3, 2] -> offsets [0, 3, 5]
+        compiled.course_offsets = np.zeros(compiled.number_of_courses + 1, dtype=np.int64)
+        np.cumsum(compiled.course_totals, out=compiled.course_offsets[1:])
+
+        number_of_enrollments = int(compiled.course_offsets[-1])
+
+        # flatten the rosters into a single array of student indices:
+        compiled.enrollment_student = np.fromiter((student_index_dict[student.id]
+                                                   for roster in schedule_obj.course_dict.values()
+                                                   for student in roster),
+                                                  dtype=np.int32, count=number_of_enrollments)
+
+        compiled.enrollment_subgroup = compiled.student_subgroup[compiled.enrollment_student]
+
+        compiled.enrollment_course = np.repeat(np.arange(compiled.number_of_courses, dtype=np.int32),
+                                               compiled.course_totals)
+
+        # preferred subgroups are stored by the required subgroup of each
+        # member, since members of the same required subgroup always
+        # share a letter:
+        preferred_subgroups_list = schedule_obj.preferred_subgroups_list
+
+        if preferred_subgroups_list is not None:
+            compiled.number_of_preferred_subgroups = len(preferred_subgroups_list)
+
+            preferred_sizes = np.fromiter((len(subgroup) for subgroup in preferred_subgroups_list),
+                                          dtype=np.int64, count=compiled.number_of_preferred_subgroups)
+
+            compiled.preferred_offsets = np.zeros(compiled.number_of_preferred_subgroups + 1, dtype=np.int64)
+            np.cumsum(preferred_sizes, out=compiled.preferred_offsets[1:])
+
+            compiled.preferred_member_student = np.fromiter((student_index_dict[student.id]
+                                                             for subgroup in preferred_subgroups_list
+                                                             for student in subgroup),
+                                                            dtype=np.int32, count=int(compiled.preferred_offsets[-1]))
+
+            compiled.preferred_member_subgroup = compiled.student_subgroup[compiled.preferred_member_student]
+
+        # the names and course details needed to write the reports:
+        student_list = schedule_obj.student_list
+        
+        compiled.student_ids = np.array([student.id for student in student_list], dtype=str)
+        compiled.student_last_names = np.array([student.last_name for student in student_list], dtype=str)
+        compiled.student_first_names = np.array([student.first_name for student in student_list], dtype=str)
+        compiled.student_middle_names = np.array([student.middle_name for student in student_list], dtype=str)
+
+        separator = cls.list_separator
+        
+        compiled.course_rooms = np.array([course.room_number for course in schedule_obj.course_dict], dtype=str)
+        compiled.course_periods = np.array([course.period for course in schedule_obj.course_dict], dtype=str)
+        compiled.course_numbers = np.array([separator.join(course.course_number_list) for course in schedule_obj.course_dict], dtype=str)
+        compiled.course_names = np.array([separator.join(course.course_name_list) for course in schedule_obj.course_dict], dtype=str)
+        compiled.course_ids = np.array([separator.join(course.course_id_list) for course in schedule_obj.course_dict], dtype=str)
+
+        compiled.index_subgroups()
+
+        return compiled
+
+    def index_subgroups(self):
+        """
+        Build the reverse (subgroup -> courses) and (subgroup -> preferred 
+        subgroups) CSR tables from the course rosters, so that the courses 
+        affected by changing the letter of a subgroup can be found without
+        scanning every course
+
+        Parameters
+        ----------
+        None
+        """
+        # group the enrollments by subgroup instead of by course:
+        subgroup_order = np.argsort(self.enrollment_subgroup, kind='stable')
+        self.subgroup_course = self.enrollment_course[subgroup_order]
+
+        subgroup_sizes = np.bincount(self.enrollment_subgroup, minlength=self.number_of_subgroups)
+        self.subgroup_offsets = np.zeros(self.number_of_subgroups + 1, dtype=np.int64)
+        np.cumsum(subgroup_sizes, out=self.subgroup_offsets[1:])
+
+        # the preferred subgroups that each subgroup has a member in (only 
+        # the preferred subgroups with members in two or more subgroups, 
+        # since the others are never split):
+        if self.number_of_preferred_subgroups > 0:
+            preferred_sizes = np.diff(self.preferred_offsets)
+            member_group = np.repeat(np.arange(self.number_of_preferred_subgroups, dtype=np.int64), preferred_sizes)
+
+            group_starts = self.preferred_offsets[:-1]
+            is_shared = (np.minimum.reduceat(self.preferred_member_subgroup, group_starts) 
+                         != np.maximum.reduceat(self.preferred_member_subgroup, group_starts))
+            is_shared_member = np.repeat(is_shared, preferred_sizes)
+
+            # unique (subgroup, preferred subgroup) pairs, sorted by subgroup:
+            pairs = np.unique(self.preferred_member_subgroup[is_shared_member].astype(np.int64) * self.number_of_preferred_subgroups 
+                              + member_group[is_shared_member])
+            pair_subgroup = pairs // self.number_of_preferred_subgroups
+
+            self.subgroup_preferred = pairs % self.number_of_preferred_subgroups
+        else:
+            pair_subgroup = np.zeros(0, dtype=np.int64)
+            self.subgroup_preferred = np.zeros(0, dtype=np.int64)
+
+        self.subgroup_preferred_offsets = np.zeros(self.number_of_subgroups + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pair_subgroup, minlength=self.number_of_subgroups), 
+                  out=self.subgroup_preferred_offsets[1:])
+
+    @classmethod
+    def gather_ranges(cls, offsets, indices):
+        """
+        Return the positions of every entry of the CSR rows listed in indices,
+        along with the length of each row
+        
+        For example, with offsets = [0, 3, 5, 9] and indices = [0, 2], this
+        returns positions [0, 1, 2, 5, 6, 7, 8] and lengths [3, 4]
+        
+        Parameters
+        ----------
+        offsets : numpy array
+            CSR offsets, one entry per row plus one
+        indices : numpy array
+            the rows to gather
+        """
+        starts = offsets[indices]
+        lengths = offsets[indices + 1] - starts
+
+        # each position is the start of its row plus its place in the row:
+        row_start = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+
+        return row_start + np.arange(int(lengths.sum()), dtype=np.int64), lengths
+
+    def encode_partition(self, letter_list):
+        """
+        Convert a list of letters into an array of letter indices,
+        ex: ["A", "C", "B", "D"] -> [0, 2, 1, 3]
+
+        A list of partitions (a population) is converted into a 2-D array
+        with one row per partition
+
+        A partition that is already an array of letter indices (a genome, 
+        see IndividualPartition) is returned unchanged, and a list of 
+        genomes is stacked into a 2-D array
+
+        Parameters
+        ----------
+        letter_list : list
+            a list of letter assignments for each required subgroup
+            (or a list of such lists)
+        """
+        # genomes are already letter indices:
+        if isinstance(letter_list, np.ndarray) and letter_list.dtype == np.uint8:
+            return letter_list
+        
+        if len(letter_list) > 0 and isinstance(letter_list[0], np.ndarray):
+            return np.stack(letter_list).astype(np.uint8, copy=False)
+        
+        # each single-character string is stored as its unicode code point,
+        # so "A" -> 65, "B" -> 66, ...
+        code_points = np.asarray(letter_list, dtype='U1').view(np.uint32)
+
+        return (code_points - 65).astype(np.uint8)
+
+    @classmethod
+    def decode_partition(cls, genome):
+        """
+        Convert an array of letter indices into a list of letters,
+        ex: [0, 2, 1, 3] -> ["A", "C", "B", "D"]
+        
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup
+        """
+        # "A" is unicode code point 65, "B" is 66, ...
+        return (np.asarray(genome, dtype=np.uint32) + 65).view('U1').tolist()
+
+    def course_letter_counts(self, genome, number_of_partitions):
+        """
+        Count the students of each letter in each course, returned as an
+        array of shape (number_of_courses, number_of_partitions), where
+        row c is [A count, B count, ...] for course c
+
+        If genome is a 2-D array with one partition per row, the counts for
+        every partition are computed in a single pass and returned as an
+        array of shape (number_of_genomes, number_of_courses, number_of_partitions)
+
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup (see encode_partition)
+        number_of_partitions : int
+            the number of letters students are divided into
+        """
+        # the size of the counts array for a single partition:
+        block_size = self.number_of_courses * number_of_partitions
+
+        # the letter of each enrollment, grouped by course:
+        enrollment_letter = genome[..., self.enrollment_subgroup].astype(np.int64)
+
+        # the position of each (course, letter) pair in the counts array:
+        flat_index = self.enrollment_course * number_of_partitions + enrollment_letter
+
+        if genome.ndim == 1:
+            # count (course, letter) pairs in a single pass:
+            flat_counts = np.bincount(flat_index, minlength=block_size)
+
+            return flat_counts.reshape(self.number_of_courses, number_of_partitions)
+
+        # for a population, offset each row into its own block so that a 
+        # single bincount covers every (genome, course, letter) triple:
+        number_of_genomes = genome.shape[0]
+        flat_index += (np.arange(number_of_genomes, dtype=np.int64) * block_size)[:, None]
+
+        flat_counts = np.bincount(flat_index.ravel(), minlength=number_of_genomes * block_size)
+
+        return flat_counts.reshape(number_of_genomes, self.number_of_courses, number_of_partitions)
+
+    def preferred_split_flags(self, genome):
+        """
+        Return a boolean array with one entry per preferred subgroup, which
+        is True if the members of the subgroup were assigned different letters
+
+        (for a 2-D array of genomes, one row of flags is returned per genome)
+
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup (see encode_partition)
+        """
+        if self.number_of_preferred_subgroups == 0:
+            return np.zeros(genome.shape[:-1] + (0,), dtype=bool)
+
+        # the letter of each member of each preferred subgroup:
+        member_letter = genome[..., self.preferred_member_subgroup]
+
+        # a subgroup is split if its smallest and largest letters differ:
+        group_starts = self.preferred_offsets[:-1]
+
+        smallest_letter = np.minimum.reduceat(member_letter, group_starts, axis=-1)
+        largest_letter = np.maximum.reduceat(member_letter, group_starts, axis=-1)
+
+        return smallest_letter != largest_letter
+
+    def save(self, file_location):
+        """
+        Write the compiled schedule to a .npz file, so that it can be read
+        back with CompiledSchedule.load() without parsing the .csv files again
+        
+        The file is written to a temporary file first and then renamed, so 
+        a run that is interrupted never leaves behind a partial cache file
+        
+        Parameters
+        ----------
+        file_location : str
+            the file path of the .npz file, ex: C:\\Users\\jsmith\\schedule_cache\\1a2b3c.npz
+        """
+        arrays = {name: getattr(self, name) for name in self.array_names if getattr(self, name) is not None}
+        arrays["cache_version"] = np.array(self.cache_version)
+
+        temp_location = str(file_location) + "." + str(os.getpid()) + ".tmp"
+
+        # passing a file object stops numpy from appending ".npz" to the name:
+        with open(temp_location, 'wb') as outfile:
+            np.savez(outfile, **arrays)
+
+        os.replace(temp_location, file_location)
+
+    @classmethod
+    def load(cls, file_location):
+        """
+        Read a compiled schedule from a .npz file written by save(), 
+        returning None if the file was written by a different version
+        of the cache format
+        
+        Parameters
+        ----------
+        file_location : str
+            the file path of the .npz file
+        """
+        compiled = cls()
+
+        with np.load(file_location, allow_pickle=False) as arrays:
+            if "cache_version" not in arrays or int(arrays["cache_version"]) != cls.cache_version:
+                return None
+
+            for name in cls.array_names:
+                if name in arrays:
+                    setattr(compiled, name, arrays[name])
+
+        compiled.number_of_students = len(compiled.student_subgroup)
+        compiled.number_of_subgroups = len(compiled.subgroup_member_offsets) - 1
+        compiled.number_of_courses = len(compiled.course_totals)
+
+        if compiled.preferred_offsets is not None:
+            compiled.number_of_preferred_subgroups = len(compiled.preferred_offsets) - 1
+
+        compiled.index_subgroups()
+
+        return compiled
+
+    def publish(self):
+        """
+        Copy the arrays used for evaluation into a single block of shared 
+        memory, so that island processes can attach to them with attach()
+        instead of each building their own copy of the schedule
+        
+        Returns (shared_memory_block, descriptor), where descriptor is a small
+        dictionary (safe to pass to multiprocessing.Process) describing where 
+        each array is stored in the block
+        
+        Note: the process that calls publish() owns the block, so it must 
+        keep shared_memory_block alive while the islands are running, and 
+        call shared_memory_block.close() and shared_memory_block.unlink()
+        once they have finished
+        
+        Parameters
+        ----------
+        None
+        """
+        if shared_memory is None:
+            raise NotImplementedError("Sharing the compiled schedule requires Python 3.8+ (multiprocessing.shared_memory)")
+        
+        # key: attribute name
+        # value: (offset into the block, dtype, shape)
+        array_layout = {}
+        block_size = 0
+
+        for name in self.shared_array_names:
+            array = getattr(self, name)
+            
+            if array is None:
+                continue
+
+            # start each array on a 64-byte boundary:
+            block_size = -(-block_size // 64) * 64
+            array_layout[name] = (block_size, array.dtype.str, array.shape)
+            block_size += array.nbytes
+
+        # a block of size 0 is not allowed
+        shared_memory_block = shared_memory.SharedMemory(create=True, size=max(block_size, 1))
+
+        for name, (offset, dtype, shape) in array_layout.items():
+            view = np.ndarray(shape, dtype=dtype, buffer=shared_memory_block.buf, offset=offset)
+            view[...] = getattr(self, name)
+
+        descriptor = {"block_name": shared_memory_block.name,
+                      "array_layout": array_layout,
+                      "number_of_students": self.number_of_students,
+                      "number_of_subgroups": self.number_of_subgroups,
+                      "number_of_courses": self.number_of_courses,
+                      "number_of_preferred_subgroups": self.number_of_preferred_subgroups}
+
+        return shared_memory_block, descriptor
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Return a compiled schedule whose arrays are read-only views of a 
+        block of shared memory created by publish() (no data is copied, 
+        so every island shares a single copy of the schedule)
+        
+        Only the attributes needed to evaluate partitions are available 
+        (the student names and course details are not published)
+        
+        Parameters
+        ----------
+        descriptor : dict
+            the descriptor returned by publish()
+        """
+        compiled = cls()
+        
+        compiled.shared_memory_block = shared_memory.SharedMemory(name=descriptor["block_name"])
+
+        for name, (offset, dtype, shape) in descriptor["array_layout"].items():
+            view = np.ndarray(shape, dtype=dtype, buffer=compiled.shared_memory_block.buf, offset=offset)
+            view.flags.writeable = False
+            setattr(compiled, name, view)
+
+        compiled.number_of_students = descriptor["number_of_students"]
+        compiled.number_of_subgroups = descriptor["number_of_subgroups"]
+        compiled.number_of_courses = descriptor["number_of_courses"]
+        compiled.number_of_preferred_subgroups = descriptor["number_of_preferred_subgroups"]
+
+        return compiled
+
+class DisjointSet:
+    """
+    A class used to merge student pairings into subgroups with a disjoint-set
+    (union-find) forest, using union by size and path halving so that each
+    union() and find() runs in nearly constant time
+    
+    Source: https://en.wikipedia.org/wiki/Disjoint-set_data_structure
+    
+    Attributes
+    ----------
+    parent_dict : dict
+        key: an item (ex: a student ID number)
+        value: the parent of the item in the forest (a root is its own parent)
+    size_dict : dict
+        key: the root of a tree
+        value: the number of items in the tree
+        
+    Methods
+    -------
+    find(item)
+        return the root of the tree containing item
+    union(item1, item2)
+        merge the trees containing item1 and item2
+    subgroups()
+        return a list of lists, one for each tree
+    """
+    
+    def __init__(self):
+        """
+        The constructor for the DisjointSet class
+        """
+        # items are stored in the order they are first seen (Python 3.7+)
+        self.parent_dict = {}
+        self.size_dict = {}
+        
+    def __contains__(self, item):
+        return item in self.parent_dict
+        
+    def find(self, item):
+        """
+        Return the root of the tree containing item (adding item as a new 
+        tree of size 1 if it has not been seen before)
+        
+        Parameters
+        ----------
+        item : hashable
+            ex: a student ID number
+        """
+        parent_dict = self.parent_dict
+        
+        if item not in parent_dict:
+            parent_dict[item] = item
+            self.size_dict[item] = 1
+            return item
+        
+        # path halving: point every other item on the path at its grandparent
+        while parent_dict[item] != item:
+            parent_dict[item] = parent_dict[parent_dict[item]]
+            item = parent_dict[item]
+            
+        return item
+    
+    def union(self, item1, item2):
+        """
+        Merge the trees containing item1 and item2 
+        
+        Parameters
+        ----------
+        item1 : hashable
+        item2 : hashable
+        """
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        
+        if root1 == root2:
+            return root1
+        
+        # attach the smaller tree to the larger one:
+        if self.size_dict[root1] < self.size_dict[root2]:
+            root1, root2 = root2, root1
+        
+        self.parent_dict[root2] = root1
+        self.size_dict[root1] += self.size_dict.pop(root2)
+        
+        return root1
+    
+    def subgroups(self):
+        """
+        Return a list of lists, one for each tree, where the trees are listed 
+        in the order their first item was seen and the items of each tree 
+        are listed in the order they were seen
+        
+        Parameters
+        ----------
+        None
+        """
+        # key: the root of a tree
+        # value: the items in the tree
+        subgroup_dict = {}
+        
+        for item in self.parent_dict:
+            root = self.find(item)
+            
+            if root not in subgroup_dict:
+                subgroup_dict[root] = []
+                
+            subgroup_dict[root].append(item)
+            
+        return list(subgroup_dict.values())
+
 class Schedule:
     """
     A class used to store detailed attributes about a school's schedule
@@ -533,22 +1283,95 @@ class Schedule:
         a list in the same form as required_subgroups_list, but subgroups
         are not required by the algorithm 
         (instead, this will be encouraged by the fitness function)
+    compiled : CompiledSchedule object
+        an array-backed copy of the schedule built by compile_schedule()
+        (None until compile_schedule() is called)
+    compiled_partition : numpy array
+        the most recently loaded partition as an array of letter indices
+        (only populated once the schedule has been compiled)
+    fitness_engine : FitnessEngine object
+        the vectorized equivalent of fitness_score() and get_max_deviation()
+        for the compiled schedule (None until compile_schedule() is called)
+    fitness_kernel : str
+        "numba" to evaluate partitions with the compiled JitFitnessEngine 
+        (if Numba is installed), "bitset" for the BitsetFitnessEngine or 
+        "numpy" for the FitnessEngine
+    cohort_groupings : dict
+        the cohort constraints declared in settings.yaml (see CohortRules),
+        or an empty dict to use the built-in A/B or A/B/C/D rules
+    cohort_rules : CohortRules object
+        the compiled cohort constraints (built from cohort_groupings, or 
+        from the built-in groupings if cohort_groupings is empty)
+    room_capacity_dict : dict
+        key: a room number
+        value: a dict of the capacities of the room, ex: 
+        {"HALF_CLASS_MAXIMUM" : 12, "QUARTER_CLASS_MAXIMUM" : 6}
+        (None if no room capacity .csv was loaded)
+    course_thresholds : CourseThresholds object
+        the class maxima and penalty tolerances of each course (built by
+        course_threshold_table())
+    use_presolve : bool
+        True to evaluate partitions on a presolved copy of the compiled 
+        schedule (see Presolve)
+    presolve : Presolve object
+        the presolve of the compiled schedule (None if use_presolve is False),
+        whose genome is shorter than a full partition (see Presolve.expand_genome())
+    use_student_classes : bool
+        True to optimize the letter counts of classes of students with 
+        identical schedules instead of their letters (see StudentClasses)
+    student_classes : StudentClasses object
+        the classes of the (presolved) compiled schedule (None if 
+        use_student_classes is False or no students have identical schedules)
             
     Methods
     -------
-    students_from_csv(file_location)
+    students_from_csv(file_location, column_map)
         populates student_list and course_dict from a .csv file
+    column_indices(headers, column_map)
+        find the column of each field of the student .csv from its headers
+    students_from_parquet(file_location, column_map)
+        populates student_list and course_dict from a Parquet file
     subgroups_from_csv(file_location, required_or_preferred)
         populates required_subgroups_list and/or preferred_subgroups from
         a .csv file        
+    room_capacities_from_csv(file_location)
+        populates room_capacity_dict from a .csv file
+    course_threshold_table()
+        the class maxima and penalty tolerances of each course
+    compile_schedule()
+        build the array-backed CompiledSchedule and FitnessEngine used to 
+        evaluate partitions
+    build_fitness_engine()
+        build the FitnessEngine (or JitFitnessEngine) selected by fitness_kernel
+    load_compiled(compiled)
+        rebuild student_list, course_dict and the subgroup lists from a 
+        CompiledSchedule object (ex: one read from a cache file)
+    load_shared(descriptor)
+        attach to a compiled schedule published to shared memory by 
+        another process (without any Student or Course objects)
+    cache_key(student_csv_path, required_subgroups_csv_path, preferred_subgroups_csv_path, column_map)
+        a hash of the input .csv files and settings that identifies a 
+        compiled schedule
+    load_csv_files(student_csv_path, required_subgroups_csv_path, preferred_subgroups_csv_path, cache_directory, column_map)
+        load and compile the schedule, reading it from the compiled 
+        schedule cache when the input files have not changed
     load_partition(letter_list)
         load a list of letter assignments into the letter attribute
         for each cohort of student objects in Schedule.required_subgroups_list
+    partition_from_assignments(file_location)
+        read a student assignment report back into a genome
+    course_letter_counts()
+        count the students of each letter in each course for the most
+        recently loaded partition
     write_student_assignments()
         write a report of final student assignments in .csv format
     write_course_analysis()
         write an report of the letter breakdown in each classroom 
         as a .csv file
+    write_student_assignments_parquet()
+        write the report of write_student_assignments() as a Parquet file
+    write_course_analysis_parquet()
+        write the report of write_course_analysis() as a Parquet file
     fitness_score()
         evaluates the fitness of the schedule, where the specific 
         fitness function is based on the number of partitions 
@@ -561,7 +1384,26 @@ class Schedule:
         is taking place
     """
     
-    def __init__(self, number_of_partitions, half_class_maximum, quarter_class_maximum):
+    # the default header of each column of the student .csv (these are the
+    # headers of example_student_data.csv), in the order used by older 
+    # versions of SPOTS:
+    # key: field name
+    # value: column header
+    default_column_map = {"last_name" : "LAST NAME",
+                          "first_name" : "FIRST NAME",
+                          "middle_name" : "MIDDLE NAME",
+                          "student_id" : "STUDENT ID",
+                          "course_number" : "COURSE NUMBER",
+                          "course_name" : "COURSE NAME",
+                          "course_id" : "COURSE ID",
+                          "room_number" : "ROOM NUMBER",
+                          "period" : "PERIOD"}
+    
+    # the fields that every student .csv must have
+    required_columns = ["student_id", "room_number", "period"]
+    
+    def __init__(self, number_of_partitions, half_class_maximum, quarter_class_maximum, fitness_kernel = "numpy", cohort_groupings = None, 
+                 use_presolve = False, use_student_classes = False):
         """
         The constructor for the Schedule class
         
@@ -578,6 +1420,20 @@ class Schedule:
             the target maximum size of a partition when dividing students
             into four cohorts of roughly equal size
             (default value is 9)
+        fitness_kernel : str
+            "numba", "bitset" or "numpy", see build_fitness_engine()
+            (default value is "numpy")
+        cohort_groupings : dict
+            the cohort constraints, ex: {"A" : 10, "B" : 10, "C" : 10}
+            (default value is None, which uses the built-in A/B or 
+            A/B/C/D rules, see CohortRules)
+        use_presolve : bool
+            True to remove the courses and subgroups that cannot change 
+            the score before evaluating partitions, see Presolve
+            (default value is False)
+        use_student_classes : bool
+            True to group students with identical schedules into classes, 
+            see StudentClasses (default value is False)
         """
         self.number_of_partitions = number_of_partitions
         self.half_class_maximum = half_class_maximum
@@ -598,6 +1454,131 @@ class Schedule:
         self.required_subgroups_list = None
         self.preferred_subgroups_list = None        
 
+        self.compiled = None
+        self.compiled_partition = None
+        self.fitness_engine = None
+        self.fitness_kernel = fitness_kernel
+        
+        # the cohort constraints: declared groupings replace the built-in
+        # rules of fitness_score(), otherwise the built-in groupings are 
+        # only used to decide which courses are "In Compliance"
+        self.cohort_groupings = dict(cohort_groupings or {})
+        
+        if self.cohort_groupings:
+            self.cohort_rules = CohortRules(number_of_partitions, self.cohort_groupings)
+        else:
+            default_groupings = CohortRules.default_groupings(number_of_partitions, half_class_maximum, quarter_class_maximum)
+            self.cohort_rules = CohortRules(number_of_partitions, default_groupings, 
+                                            CohortRules.default_capacity_fields(number_of_partitions)) if default_groupings is not None else None
+        
+        # the per-room capacities (see room_capacities_from_csv()) and the
+        # thresholds of each course (see course_threshold_table()):
+        self.room_capacity_dict = None
+        self.course_thresholds = None
+        
+        self.use_presolve = use_presolve
+        self.presolve = None
+        
+        self.use_student_classes = use_student_classes
+        self.student_classes = None
+
+    def room_capacities_from_csv(self, file_location):
+        """
+        A method to populate room_capacity_dict from a .csv file of the 
+        safe capacity of each room (ex: science labs and gyms), so that 
+        courses in these rooms are checked against their own maxima 
+        instead of half_class_maximum and quarter_class_maximum
+        
+        The .csv file should have a ROOM NUMBER column and a column for 
+        each maximum to override:
+
+        ROOM NUMBER, HALF CLASS MAXIMUM, QUARTER CLASS MAXIMUM
+        LAB1, 12, 6
+        GYM, 25, 13
+        
+        For declared cohort groupings (see CohortRules), use a column for
+        each grouping instead, ex: a column "AB" for the grouping "AB"
+        
+        Headers are not case sensitive, and spaces may be replaced with 
+        underscores (ex: half_class_maximum). A blank value, or a room 
+        that is not listed, uses the value from settings.yaml
+        
+        Parameters
+        ----------
+        file_location : str
+            the file path of a .csv file with room capacities, for 
+            example C:\\Users\\jsmith\\room_capacities.csv
+            (or None to use the same maxima in every room)
+        """
+        if file_location is None:
+            self.room_capacity_dict = None
+        else:
+            room_capacity_dict = {}
+            
+            with open(file_location, mode='r') as infile:
+                reader = csv.reader(infile)
+                
+                # normalize the headers, ex: "Room Number" -> "ROOM_NUMBER"
+                headers = [header.strip().upper().replace(" ", "_") for header in next(reader)]
+                
+                if "ROOM_NUMBER" not in headers:
+                    raise ValueError("The room capacity .csv must have a ROOM NUMBER column: " + str(file_location))
+                
+                room_column = headers.index("ROOM_NUMBER")
+                
+                for row in reader:
+                    if len(row) <= room_column or row[room_column].strip() == "":
+                        continue
+                    
+                    # the non-blank capacities of the room:
+                    capacity_dict = {}
+                    
+                    for header, value in zip(headers, row):
+                        if header != "ROOM_NUMBER" and value.strip() != "":
+                            capacity_dict[header] = int(value)
+                    
+                    room_capacity_dict[row[room_column].strip()] = capacity_dict
+            
+            self.room_capacity_dict = room_capacity_dict
+        
+        # rebuild the thresholds (and the fitness function, if the schedule
+        # has been compiled) with the new capacities:
+        self.course_thresholds = None
+        
+        if self.compiled is not None:
+            self.build_fitness_engine()
+        
+        return self.room_capacity_dict
+    
+    def course_threshold_table(self):
+        """
+        A method to return the class maxima and penalty tolerances of each
+        course as a CourseThresholds object (built from the room of each
+        course and room_capacity_dict the first time this is called, and 
+        stored in self.course_thresholds)
+        
+        Parameters
+        ----------
+        None
+        """
+        if self.course_thresholds is None:
+            if self.course_dict:
+                course_totals = [len(roster) for roster in self.course_dict.values()]
+                course_rooms = [course.room_number for course in self.course_dict]
+            else:
+                # a schedule attached to shared memory has no Course objects:
+                course_totals = self.compiled.course_totals
+                course_rooms = self.compiled.course_rooms
+            
+            self.course_thresholds = CourseThresholds(course_totals, 
+                                                      course_rooms, 
+                                                      self.half_class_maximum, 
+                                                      self.quarter_class_maximum, 
+                                                      self.cohort_rules, 
+                                                      self.room_capacity_dict)
+        
+        return self.course_thresholds
+    
     def subgroups_from_csv(self, file_location, required_or_preferred):
         """
         A method to populate required_subgroups_list and preferred_subgroups_list
@@ -611,6 +1592,7 @@ class Schedule:
         09281381, 63471199
         87172918, 42074738
         87172918, 59283715
+        63471199, 42074738
         
         Suppose most ID numbers correspond to a Student object:
         
@@ -623,48 +1605,53 @@ class Schedule:
         For this example, suppose that '59283715' is an invalid ID number, and has
         no student associated to it. 
         
-        Here is how this method will parse this list of pairings: 
-        
-        Look at the first row "09281381, 20383882". This row indicates that 
-        student1 and student2 are part of a subgroup. Append these:
+        Each row is a link between two students, and a subgroup is every student
+        that can be reached from one another by following links (so links are 
+        transitive: if student1 is linked to student5 and student5 is linked to 
+        student3, then student1 and student3 are in the same subgroup). The 
+        links are merged with a disjoint-set (union-find) structure, see the 
+        DisjointSet class. Here is how this method will parse this list of 
+        pairings: 
         
-        temp_subgroups_list = [[student1, student2]]
+        The first row merges student1 and student2: {student1, student2}
         
-        The second row indicates that student3 and student 4 are in a 
-        subgroup, so update the list as follows:
+        The second row merges student3 and student4: {student1, student2}, {student3, student4}
         
-        temp_subgroups_list = [[student1, student2], [student3, student4]]
+        The third row adds student5 to the subgroup containing student1: 
+        {student1, student2, student5}, {student3, student4}
         
-        The third row indicates that student5 should be added to the subgroup
-        containing student1: 
-        
-        temp_subgroups_list = [[student1, student2, student5], [student3, student4]]
-
         The fourth row is superfluous since student3 and student4 are already in
         a subgroup, so no action is taken.
         
         The fifth row pairs student4 with a non-existent student, so no action
         is taken. 
         
-        Next, convert our nested list into a list of tuples:
+        The sixth row links student5 and student3, which bridges the two 
+        existing subgroups, so they are merged: 
+        {student1, student2, student5, student3, student4}
         
-        temp_subgroups_list = [(student1, student2, student5), (student3, student4)]
+        Next, we list the subgroups as tuples (in the order their first member
+        appeared in the .csv file, with members in the order they appeared):
+        
+        temp_subgroups_list = [(student1, student2, student3, student4, student5)]
    
-        Finally, we check student_list against temp_subgroups_list. Each student
-        in student_list that is not in temp_subgroups_list represents a subgroup
-        of size 1. We append these to temp_subgroups_list. For example, suppose 
-        we have the following: 
+        Finally, each student in student_list that does not appear in the .csv 
+        represents a subgroup of size 1. We append these to temp_subgroups_list. 
+        For example, suppose we have the following: 
         
         student_list = [student1, student2, student3, student4, student5, student6]
         
         Then we write the following: 
         
-        temp_subgroups_list = [(student1, student2, student5), (student3, student4), (student5), (student6)]
+        temp_subgroups_list = [(student1, student2, student3, student4, student5), (student6,)]
         
         If required_or_preferred = "required", we assign self.required_subgroups_list = temp_subgroups_list
         
         If required_or_preferred = "preferred", we assign self.preferred_subgroups_list = temp_subgroups_list
         
+        Each row is processed in (nearly) constant time, so the whole file is
+        processed in time that is (nearly) linear in the number of rows
+        
         Parameters
         ----------
         csv_file_location : str
@@ -689,8 +1676,9 @@ class Schedule:
             # import the .csv:
             with open(file_location, mode='r') as infile:
                 
-                # a place to store subgroups
-                temp_subgroups_list = []
+                # a disjoint-set forest of student ID numbers, where each 
+                # tree is a subgroup
+                disjoint_set = DisjointSet()
                 
                 # read the .csv file            
                 reader = csv.reader(infile)
@@ -700,6 +1688,10 @@ class Schedule:
                 
                 # description of the columns in the .csv file:
                 for row in reader:
+                    # skip blank lines
+                    if len(row) < 2:
+                        continue
+                    
                     # row[0] : First student ID number
                     first_id = row[0]
                     
@@ -709,124 +1701,35 @@ class Schedule:
                     # check if both student ID numbers are valid by checking
                     # if the ID numbers are keys in self.student_dict:
                     if first_id in self.student_dict and second_id in self.student_dict:
-                        # if they are, then store the Student objects:
-                        student_obj1 = self.student_dict[first_id]
-                        student_obj2 = self.student_dict[second_id]
-                        
-                        # if temp_subgroups_list is empty, then we have our first subgroup,
-                        # which we store as [[student_obj1, student_obj2]]
-                        if len(temp_subgroups_list) == 0:
-                            temp_subgroups_list.append([student_obj1, student_obj2])
-                        # otherwise, we need to check whether we have to append to 
-                        # an existing subgroup or create a new one:
-                        else: 
-                            
-                            # use found_flag to track if we have found a subgroup 
-                            # containing student_obj1 or student_obj2:
-                            found_flag = False
-                            
-                            # for each existing subgroup
-                            for subgroup in temp_subgroups_list:
-                                # if both student objects are in the subgroup, then we 
-                                # are done with these two student objects 
-                                if student_obj1 in subgroup and student_obj2 in subgroup:
-                                    # set found_flag to True to indicate that we have managed
-                                    # to verify that our students are already in a subgroup
-                                    found_flag = True
-                                    
-                                    # at this point, there is no reason to continue with the current
-                                    # loop so we break:
-                                    break                                    
-                                    
-                                # if student_obj1 is in the subgroup, but student_obj2 is not, 
-                                # then add student_obj2 to the subgroup:                                    
-                                elif student_obj1 in subgroup and student_obj2 not in subgroup:
-                                    subgroup.append(student_obj2)
-                                    
-                                    # set found_flag to True to indicate that we have managed
-                                    # to fit our students into a subgroup
-                                    found_flag = True
-                                    
-                                    # at this point, there is no reason to continue with the current
-                                    # loop so we break:
-                                    break
-                                    
-                                # similarly, if student_obj1 is NOT in the subgroup but 
-                                # student_obj2 is, then add student_obj1 to the subgroup:                            
-                                elif student_obj1 not in subgroup and student_obj2 in subgroup:
-                                    subgroup.append(student_obj1)
-                                    
-                                    # set found_flag to True to indicate that we have managed
-                                    # to fit our students into a subgroup
-                                    found_flag = True
-                                    
-                                    # at this point, there is no reason to continue with the current
-                                    # loop so we break:
-                                    break                                
-                            
-                            # if the above for loop completes without finding a subgroup, then
-                            # found_flag will remain False and we also know the following: 
-                            #
-                            # 1. student_obj1 and student_obj2 are valid students
-                            # 2. these students are not a part of any existing subgroup
-                            #
-                            # in this case we create a new subgroup with the student objects
-                            if found_flag is not True:
-                                temp_subgroups_list.append([student_obj1, student_obj2])
-                
-                # once we have completed this for every row of the .csv, we have successfully
-                # populated temp_subgroups_list with every student subgroup of size > 1
-                
-                # since we are done appending to subgroups, convert to a list of tuples:            
-                temp_subgroups_list = [tuple(subgroup) for subgroup in temp_subgroups_list]
-               
-                # finally, each Student object that is in student_list but does not 
-                # currently appear in a subgroup is actually a subgroup of length 1
-                #
-                # we need to add these to temp_subgroups_list:
+                        # if they are, then merge the subgroups containing 
+                        # the two students (this also merges two existing 
+                        # subgroups if the pair bridges them)
+                        disjoint_set.union(first_id, second_id)
                 
-                # for each Student_object in self.student_list
-                for student_obj in self.student_list:
-                    
-                    # a flag to indicate that we have not found 
-                    # the student in a subgroup yet
-                    found_flag = False                   
-                    
-                    # for each existing subgroup:
-                    for subgroup in temp_subgroups_list:                       
-                        
-                        # if the student object is found in the subgroup
-                        if student_obj in subgroup:
-                            
-                            # then the student has been found
-                            found_flag = True
-                            
-                            # and we can break out of the loop
-                            break
-                        # if we reach subgroups of length 1
-                        elif len(subgroup) == 1:
-                            # then we can stop our search because we 
-                            # know that student_obj needs to be added
-                            # to temp_subgroups_list as a subgroup of 
-                            # length 1
-                            break
-                            
-                    # if we have not found the flag ("not found_flag" evaluates to True)
-                    if found_flag is not True:
-                        # then append the student to temp_subgroups_list as a subgroup
-                        # of length 1:
-                        temp_subgroups_list.append((student_obj,)) # singleton tuple needs a trailing comma
-                
-                # now temp_subbroups_list is fully populated, 
-                # so we assign it to the appropriate attribute:
-                if required_or_preferred == "required":
-                    self.required_subgroups_list = temp_subgroups_list
-                elif required_or_preferred == "preferred":
-                    self.preferred_subgroups_list = temp_subgroups_list
-                else: 
-                    raise NameError('Subgroups must either be "required" or "preferred"')
+            # once we have completed this for every row of the .csv, we have successfully
+            # found every student subgroup of size > 1, which we convert to a list of tuples
+            # of Student objects:
+            temp_subgroups_list = [tuple(self.student_dict[student_id] for student_id in subgroup) 
+                                   for subgroup in disjoint_set.subgroups()]
+               
+            # finally, each Student object that is in student_list but does not 
+            # appear in the .csv is actually a subgroup of length 1
+            #
+            # we need to add these to temp_subgroups_list:
+            for student_obj in self.student_list:
+                if student_obj.id not in disjoint_set:
+                    temp_subgroups_list.append((student_obj,)) # singleton tuple needs a trailing comma
+            
+            # now temp_subbroups_list is fully populated, 
+            # so we assign it to the appropriate attribute:
+            if required_or_preferred == "required":
+                self.required_subgroups_list = temp_subgroups_list
+            elif required_or_preferred == "preferred":
+                self.preferred_subgroups_list = temp_subgroups_list
+            else: 
+                raise NameError('Subgroups must either be "required" or "preferred"')
                     
-    def students_from_csv(self, file_location):
+    def students_from_csv(self, file_location, column_map = None):
         """
         A method to populate student_list and course_dict from a .csv file
         
@@ -834,7 +1737,7 @@ class Schedule:
         For example, if John Smith is taking 7 classes, then John Smith should
         have 7 rows in the .csv file:
         
-        LAST,FIRST,MIDDLE,STUDENT_ID,COURSE_NUMBER,COURSE_NAME,COURSE_ID,ROOM_NUMBER,PERIOD
+        LAST NAME,FIRST NAME,MIDDLE NAME,STUDENT ID,COURSE NUMBER,COURSE NAME,COURSE ID,ROOM NUMBER,PERIOD
         John,Smith,William,000281871,Math435-01,ALGEBRA 2/TRIG,299381878,ROOM 255, PERIOD 1
         John,Smith,William,000281871,Eng402-01,ADV BRITISH LIT,345342243,ROOM 211, PERIOD 2
         John,Smith,William,000281871,Hist424-01,AP WORLD HIST,5011222439,ROOM 166, PERIOD 3
@@ -843,12 +1746,29 @@ class Schedule:
         John,Smith,William,000281871,Germ461-01,AP GERMAN LANG,198243981,ROOM 214, PERIOD 7
         John,Smith,William,000281871,Gym400-01,ADVENTURE EDUCATION,23423,ROOM GYM, PERIOD 8
         
-        This algorithm can be modified to accommodate additional attributes about students or
-        courses that can be added to the .csv file. For example, it is possible to add a row
-        for the teacher of each course. It is also possible to modify the algorithm to run with
-        fewer rows. The only rows that cannot be deleted are STUDENT_ID, ROOM_NUMBER, and PERIOD. 
-        This is because STUDENT_ID is the unique identifier for each student and the tuple
-        (ROOM_NUMBER, PERIOD) is the unique identifier for each course. 
+        Columns are found by their header (the first row of the .csv), so the 
+        columns can be in any order and the file can have extra columns 
+        (ex: a TEACHER column), which are ignored. column_map says which
+        header to use for each field (see Schedule.default_column_map):
+        
+        column_map = {"student_id" : "STUDENT ID", "room_number" : "ROOM NUMBER", ...}
+        
+        Headers are matched without regard to case or surrounding spaces, and
+        a column can also be given by its position (ex: "period" : 8). The 
+        only columns that cannot be left out are student_id, room_number and 
+        period. This is because student_id is the unique identifier for each 
+        student and the tuple (room_number, period) is the unique identifier 
+        for each course. Any other column that is missing is left blank. 
+        
+        If none of the headers in column_map are found, the columns are read
+        in the order shown above (the layout used by older versions of SPOTS).
+        
+        The file is streamed one row at a time, and only the values that are
+        kept (the first row of each student and course) are stored, with 
+        repeated strings (periods, course names, ...) interned so that each 
+        distinct value is only stored once. This keeps memory use proportional
+        to the number of students and courses rather than the number of rows,
+        even for district-wide exports with millions of rows.
         
         A .csv file in the above form is easy to generate in Infinite Campus.
         
@@ -857,132 +1777,170 @@ class Schedule:
         csv_file_location : str
             the file path of a .csv file with student enrollment data, for 
             example C:\\Users\\jsmith\\student_data.csv
+        column_map : dict
+            key: a field name (ex: "student_id")
+            value: the header of the column with this field (ex: "STUDENT ID")
+            or its position (ex: 3)
+            (default = None, which uses Schedule.default_column_map)
         """
         
         # import the .csv:
-        with open(file_location, mode='r') as infile:
+        with open(file_location, mode='r', newline='') as infile:
             # each course is uniquely identified by the tuple (room, period)
             # temp_course_dict is a dictionary with the following:
             # key: (room, period)
             # value: associated Course object
             temp_course_dict = {}
             
+            # the course numbers/names/ids already recorded for each course,
+            # so that checking for a new value does not scan a list:
+            # key: (room, period)
+            # value: (set of course numbers, set of course names, set of course IDs)
+            seen_dict = {}
+            
             # each student is uniquely identified by their ID number
             # self.student_dict is a dictionary with the following:
             # key: ID number
             # value: associated Student object
             self.student_dict = {}
+            student_dict = self.student_dict
             
             # read the .csv file            
             # note: reader method ended up being faster than csv.DictReader objects
             # https://courses.cs.washington.edu/courses/cse140/13wi/csv-parsing.html
             reader = csv.reader(infile)
             
-            # skip the first row since the first row contains headers
-            next(reader) 
+            # use the first row (the headers) to find the column of each field:
+            headers = next(reader) 
+            column_index_dict = self.column_indices(headers, column_map)
             
-            # description of the columns in the .csv file:
-            for row in reader:
-                # row[0] : LAST NAME (ex: Smith)
-                last_name = row[0]
-                
-                # row[1] : FIRST NAME (ex: John)
-                first_name = row[1]
-                
-                # row[2] : MIDDLE NAME (ex: Jacob)
-                middle_name = row[2]
-
-                # row[3] : STUDENT ID (ex: 123456)
-                student_id = row[3]
-
-                # row[4] : COURSE NUMBER (ex: M11701)
-                course_number = row[4]
-
-                # IMPORTANT: If you are only considering first semester courses,
-                # check if the course number ends in a '1'. If it does not, then
-                # continue to the next iteration of the loop
-                
-                #if course_number[-1] != '1':
-                #    continue
-                
-                # row[5] : COURSE NAME (ex: Algebra 1)
-                course_name = row[5]
+            # the column of each field (None if the column is missing):
+            last_name_index = column_index_dict["last_name"]
+            first_name_index = column_index_dict["first_name"]
+            middle_name_index = column_index_dict["middle_name"]
+            student_id_index = column_index_dict["student_id"]
+            course_number_index = column_index_dict["course_number"]
+            course_name_index = column_index_dict["course_name"]
+            course_id_index = column_index_dict["course_id"]
+            room_number_index = column_index_dict["room_number"]
+            period_index = column_index_dict["period"]
+            
+            # every row must be long enough to include each column we read:
+            minimum_row_length = max(index for index in column_index_dict.values() if index is not None) + 1
 
-                # row[6] : COURSE ID (ex: 801900)
-                course_id = row[6]
+            # intern repeated strings, so that (for example) the period of 
+            # every course in 5th period is the same str object
+            intern = sys.intern
+            
+            # every Student/Course object created below lives until the end of
+            # the run, so the garbage collector would only rescan them over and 
+            # over (which can more than double the time to read a large .csv)
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            
+            try:
+                # description of the columns in the .csv file:
+                for row in reader:
+                    # skip blank or short lines
+                    if len(row) < minimum_row_length:
+                        continue
+                    
+                    # STUDENT ID (ex: 123456)
+                    student_id = row[student_id_index]
+                    
+                    # ROOM NUMBER (ex: Room 254) and PERIOD (ex: 5)
+                    course_key = (row[room_number_index], row[period_index])
+                    
+                    # COURSE NUMBER (ex: M11701)
+                    course_number = row[course_number_index] if course_number_index is not None else ""
 
-                # row[7] : ROOM NUMBER (ex: Room 254)
-                room_number = row[7]
-                
-                # row[8] : PERIOD (ex: 5)
-                period = row[8]
+                    # IMPORTANT: If you are only considering first semester courses,
+                    # check if the course number ends in a '1'. If it does not, then
+                    # continue to the next iteration of the loop
+                    
+                    #if course_number[-1] != '1':
+                    #    continue
+                    
+                    # COURSE NAME (ex: Algebra 1)
+                    course_name = row[course_name_index] if course_name_index is not None else ""
 
-                # first, set current_student to an appropriate Student object:
-                
-                # check if student_id is NOT in our self.student_dict
-                if student_id not in self.student_dict:
-                    # if the student is not in self.student_dict,
-                    # then instantiate a Student object and assign 
-                    # it to current_student:
-                    current_student = Student(student_id)
-                    current_student.last_name = last_name
-                    current_student.middle_name = middle_name
-                    current_student.first_name = first_name
+                    # COURSE ID (ex: 801900)
+                    course_id = row[course_id_index] if course_id_index is not None else ""
 
-                    # next, add to self.student_dict using:
-                    # key: student_id 
-                    # value: Student object
-                    self.student_dict[student_id] = current_student                    
+                    # first, set current_student to an appropriate Student object:
+                    current_student = student_dict.get(student_id)
                     
-                # otherwise, student_id **is** in our self.student_dict:
-                else:
-                    # access this Student object and assign it to current_student:
-                    current_student = self.student_dict[student_id]
-
-                # now current_student is assigned, but the Student object
-                # does not yet have its associated Course object appended
-                # to Student.schedule
-                
-                # next, set current_course to an appropriate Course object
-                
-                # check if the course the student is taking is NOT in our temp_course_dict:
-                if (room_number, period) not in temp_course_dict:
-                    # if the course is not in temp_course_dict,
-                    # then instantiate a course object:
-                    current_course = Course(room_number, period)
-                    current_course.course_number_list.append(course_number)
-                    current_course.course_name_list.append(course_name)
-                    current_course.course_id_list.append(course_id)
+                    # check if student_id is NOT in our self.student_dict
+                    if current_student is None:
+                        # if the student is not in self.student_dict,
+                        # then instantiate a Student object and assign 
+                        # it to current_student:
+                        current_student = Student(student_id)
                         
-                    # next, add to temp_course_dict using:
-                    # key: (room_number, period) 
-                    # value: Course object
-                    temp_course_dict[(room_number, period)] = current_course
-                
-                # if (room_number, period) **is** in our temp_course_dict, then 
-                # the Course object already exists, so we just need the following: 
-                else:
-                    # access this Course object and assign it to current_course:
-                    current_course = temp_course_dict[(room_number, period)]
-                                        
-                    # append any newly encountered course numbers/names/ids to the
-                    # appropriate lists:
-                    if course_number not in current_course.course_number_list:
-                        current_course.course_number_list.append(course_number)
-                    if course_name not in current_course.course_name_list:
-                        current_course.course_name_list.append(course_name)
-                    if course_id not in current_course.course_id_list:
-                        current_course.course_id_list.append(course_id)
+                        # LAST NAME (ex: Smith), FIRST NAME (ex: John), MIDDLE NAME (ex: Jacob)
+                        current_student.last_name = intern(row[last_name_index]) if last_name_index is not None else ""
+                        current_student.first_name = intern(row[first_name_index]) if first_name_index is not None else ""
+                        current_student.middle_name = intern(row[middle_name_index]) if middle_name_index is not None else ""
+
+                        # next, add to self.student_dict using:
+                        # key: student_id 
+                        # value: Student object
+                        student_dict[student_id] = current_student                    
+                        
+                    # now current_student is assigned, but the Student object
+                    # does not yet have its associated Course object appended
+                    # to Student.schedule
                     
-                # now current_course is assigned, but the Course object
-                # does not yet have its associated Student object appended
-                # to Course.roster
-                current_course.roster.append(current_student)
-                
-                # similarly, current_student is assigned, but the Student object
-                # does not yet have its associated Course object appended
-                # to Student.schedule:
-                current_student.schedule.append(current_course)
+                    # next, set current_course to an appropriate Course object
+                    current_course = temp_course_dict.get(course_key)
+                    
+                    # check if the course the student is taking is NOT in our temp_course_dict:
+                    if current_course is None:
+                        # if the course is not in temp_course_dict,
+                        # then instantiate a course object:
+                        course_key = (intern(course_key[0]), intern(course_key[1]))
+                        
+                        current_course = Course(course_key[0], course_key[1])
+                        current_course.course_number_list.append(intern(course_number))
+                        current_course.course_name_list.append(intern(course_name))
+                        current_course.course_id_list.append(intern(course_id))
+                            
+                        # next, add to temp_course_dict using:
+                        # key: (room_number, period) 
+                        # value: Course object
+                        temp_course_dict[course_key] = current_course
+                        seen_dict[course_key] = ({course_number}, {course_name}, {course_id})
+                    
+                    # if (room_number, period) **is** in our temp_course_dict, then 
+                    # the Course object already exists, so we just need the following: 
+                    else:
+                        seen_numbers, seen_names, seen_ids = seen_dict[course_key]
+                                            
+                        # append any newly encountered course numbers/names/ids to the
+                        # appropriate lists:
+                        if course_number not in seen_numbers:
+                            seen_numbers.add(course_number)
+                            current_course.course_number_list.append(intern(course_number))
+                        if course_name not in seen_names:
+                            seen_names.add(course_name)
+                            current_course.course_name_list.append(intern(course_name))
+                        if course_id not in seen_ids:
+                            seen_ids.add(course_id)
+                            current_course.course_id_list.append(intern(course_id))
+                        
+                    # now current_course is assigned, but the Course object
+                    # does not yet have its associated Student object appended
+                    # to Course.roster
+                    current_course.roster.append(current_student)
+                    
+                    # similarly, current_student is assigned, but the Student object
+                    # does not yet have its associated Course object appended
+                    # to Student.schedule:
+                    current_student.schedule.append(current_course)
+                    
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
  
             # now that temp_course_dict has a unique key for each 
             # course, we can iterate over the dictionary to populate
@@ -1009,6 +1967,586 @@ class Schedule:
                 schedule = student_obj.schedule
                 self.student_list.append(student_obj)
 
+    @classmethod
+    def column_indices(cls, headers, column_map = None):
+        """
+        Return a dictionary with the position of each field of 
+        students_from_csv() in a row of the .csv file, where 
+        
+        key: a field name (ex: "student_id")
+        value: the position of its column (or None if the column is missing)
+        
+        For example, with the headers of example_student_data.csv:
+        
+        ["LAST NAME", "FIRST NAME", ..., "ROOM NUMBER", "PERIOD"] -> {"last_name" : 0, ..., "period" : 8}
+        
+        Parameters
+        ----------
+        headers : list
+            the first row of the .csv file
+        column_map : dict
+            key: a field name (ex: "student_id")
+            value: the header of the column (ex: "STUDENT ID") or its position (ex: 3)
+            (default = None, which uses Schedule.default_column_map; fields 
+            missing from column_map also use Schedule.default_column_map)
+        """
+        # headers are compared in upper case without surrounding spaces 
+        # (or the byte order mark some programs add to the start of a .csv):
+        normalized_headers = [header.replace("\ufeff", "").strip().upper() for header in headers]
+
+        header_index_dict = {}
+        
+        for index, header in enumerate(normalized_headers):
+            # if a header is repeated, use the first column with that header
+            if header not in header_index_dict:
+                header_index_dict[header] = index
+
+        full_column_map = dict(cls.default_column_map)
+        
+        if column_map is not None:
+            full_column_map.update(column_map)
+            
+        column_index_dict = {}
+        
+        for field, column in full_column_map.items():
+            # a column given by its position:
+            if isinstance(column, int):
+                column_index_dict[field] = column if column < len(headers) else None
+            # a column given by its header:
+            else:
+                column_index_dict[field] = header_index_dict.get(str(column).strip().upper())
+
+        # if none of the headers were found, this .csv uses the column 
+        # order of older versions of SPOTS (which did not check headers)
+        if all(index is None for index in column_index_dict.values()):
+            warnings.warn("None of the column headers in column_map were found in the student .csv, "
+                          + "so the columns are read in the default order: " + ", ".join(cls.default_column_map))
+            
+            column_index_dict = {field: position for position, field in enumerate(cls.default_column_map)}
+
+        missing_fields = [field for field in cls.required_columns if column_index_dict.get(field) is None]
+
+        if len(missing_fields) > 0:
+            raise ValueError("The student .csv is missing the column(s) for " + ", ".join(missing_fields)
+                             + " (add the header of each column to column_map in settings.yaml)")
+
+        return column_index_dict
+
+    def students_from_parquet(self, file_location, column_map = None):
+        """
+        A method to populate student_list and course_dict from a Parquet file
+        (or any other columnar file that pyarrow can read as a table)
+        
+        The file should have the same columns as the .csv file described in
+        students_from_csv(), with one row per student course enrollment, and
+        columns are found by name in the same way (see column_indices()).
+        Columns that are not strings (ex: an integer STUDENT ID) are 
+        converted to strings.
+        
+        Unlike students_from_csv(), the rows are never looped over in Python: 
+        student IDs and (room, period) pairs are converted to integer codes
+        with pyarrow and grouped with numpy, so Student and Course objects are 
+        only created once per student and once per course. The result is the 
+        same as reading the same data from a .csv file with students_from_csv() 
+        (students and courses in the order they first appear, and so on).
+        
+        Note: this requires the optional pyarrow module (pip install pyarrow)
+        
+        Parameters
+        ----------
+        file_location : str
+            the file path of a .parquet file with student enrollment data, for 
+            example C:\\Users\\jsmith\\student_data.parquet
+        column_map : dict
+            key: a field name (ex: "student_id")
+            value: the header of the column with this field (ex: "STUDENT ID")
+            or its position (ex: 3)
+            (default = None, which uses Schedule.default_column_map)
+        """
+        if pa is None:
+            raise ImportError("Reading Parquet files requires the pyarrow module (pip install pyarrow)")
+        
+        table = pq.read_table(file_location)
+        
+        # find the column of each field (None if the column is missing):
+        column_index_dict = self.column_indices(table.column_names, column_map)
+
+        # read each column that we need as a single (unchunked) array of strings:
+        column_dict = {}
+        
+        for field, index in column_index_dict.items():
+            if index is None:
+                column_dict[field] = None
+            else:
+                column_dict[field] = pc.cast(table.column(index), pa.string()).combine_chunks()
+
+        # skip rows that are missing a student ID, room or period 
+        # (the equivalent of a blank line in a .csv):
+        keep_rows = None
+        
+        for field in self.required_columns:
+            is_valid = pc.is_valid(column_dict[field])
+            keep_rows = is_valid if keep_rows is None else pc.and_(keep_rows, is_valid)
+        
+        if pc.all(keep_rows).as_py() is False:
+            column_dict = {field: (column if column is None else pc.filter(column, keep_rows)) 
+                           for field, column in column_dict.items()}
+
+        number_of_rows = len(column_dict["student_id"])
+        
+        def column_values(field, rows):
+            # the values of a column in the given rows as Python strings 
+            # (a missing column or a missing value is left blank)
+            column = column_dict[field]
+            
+            if column is None:
+                return [""] * len(rows)
+            
+            return pc.fill_null(pc.take(column, pa.array(rows, type=pa.int64())), "").to_pylist()
+
+        def encode(values):
+            # integer codes for each distinct value, numbered in the order the 
+            # values first appear, ex: ["9", "7", "9", "5"] -> [0, 1, 0, 2]
+            # (returns the codes and the row where each code first appears)
+            encoded = pc.dictionary_encode(values)
+            codes = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+            
+            # since codes are numbered in order, code c first appears in the 
+            # row where the largest code so far goes up from c - 1 to c: 
+            largest_code = np.maximum.accumulate(codes) if len(codes) > 0 else codes
+            first_rows = np.flatnonzero(np.diff(largest_code, prepend=-1) > 0)
+            
+            return codes, first_rows
+
+        def encode_column(field):
+            # encode() for a column (a missing column is a single blank value)
+            column = column_dict[field]
+            
+            if column is None:
+                return np.zeros(number_of_rows, dtype=np.int64), np.zeros(min(number_of_rows, 1), dtype=np.int64)
+            
+            return encode(pc.fill_null(column, ""))
+        
+        # each student is uniquely identified by their ID number:
+        student_codes, student_first_rows = encode_column("student_id")
+        
+        # each course is uniquely identified by the tuple (room, period):
+        room_codes, room_first_rows = encode_column("room_number")
+        period_codes, period_first_rows = encode_column("period")
+        course_codes, course_first_rows = encode(pa.array(room_codes * len(period_first_rows) + period_codes))
+
+        number_of_students = len(student_first_rows)
+        number_of_courses = len(course_first_rows)
+
+        # intern repeated strings (see students_from_csv())
+        intern = sys.intern
+        
+        # pause the garbage collector while the Student/Course objects are 
+        # created (see students_from_csv())
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        
+        try:
+            # instantiate a Student object for each student:
+            self.student_dict = {}
+            student_list = []
+        
+            for student_id, last_name, first_name, middle_name in zip(column_values("student_id", student_first_rows),
+                                                                      column_values("last_name", student_first_rows),
+                                                                      column_values("first_name", student_first_rows),
+                                                                      column_values("middle_name", student_first_rows)):
+                student_obj = Student(student_id)
+                student_obj.last_name = intern(last_name)
+                student_obj.first_name = intern(first_name)
+                student_obj.middle_name = intern(middle_name)
+            
+                self.student_dict[student_id] = student_obj
+                student_list.append(student_obj)
+
+            # instantiate a Course object for each course:
+            course_list = [Course(intern(room_number), intern(period)) 
+                           for room_number, period in zip(column_values("room_number", course_first_rows),
+                                                          column_values("period", course_first_rows))]
+
+            # add the distinct course numbers/names/IDs of each course, in the 
+            # order they first appear:
+            for field, list_name in [("course_number", "course_number_list"), 
+                                     ("course_name", "course_name_list"), 
+                                     ("course_id", "course_id_list")]:
+                value_codes, value_first_rows = encode_column(field)
+            
+                # the distinct (course, value) pairs, in the order they first appear:
+                pair_codes, pair_first_rows = encode(pa.array(course_codes * len(value_first_rows) + value_codes))
+            
+                # group the pairs by course (keeping the order they first appear):
+                pair_order = np.argsort(course_codes[pair_first_rows], kind='stable')
+                pair_rows = pair_first_rows[pair_order]
+            
+                for course_index, value in zip(course_codes[pair_rows].tolist(), column_values(field, pair_rows)):
+                    getattr(course_list[course_index], list_name).append(intern(value))
+
+            # populate the roster of each course (in row order):
+            roster_order = np.argsort(course_codes, kind='stable')
+            roster_offsets = np.zeros(number_of_courses + 1, dtype=np.int64)
+            np.cumsum(np.bincount(course_codes, minlength=number_of_courses), out=roster_offsets[1:])
+
+            roster_students = student_codes[roster_order].tolist()
+            roster_offsets = roster_offsets.tolist()
+
+            for course_index, course_obj in enumerate(course_list):
+                course_obj.roster = [student_list[i] for i in roster_students[roster_offsets[course_index]:roster_offsets[course_index + 1]]]
+                self.course_dict[course_obj] = course_obj.roster
+
+            # populate the schedule of each student (in row order):
+            schedule_order = np.argsort(student_codes, kind='stable')
+            schedule_offsets = np.zeros(number_of_students + 1, dtype=np.int64)
+            np.cumsum(np.bincount(student_codes, minlength=number_of_students), out=schedule_offsets[1:])
+
+            schedule_courses = course_codes[schedule_order].tolist()
+            schedule_offsets = schedule_offsets.tolist()
+
+            for student_index, student_obj in enumerate(student_list):
+                student_obj.schedule = [course_list[c] for c in schedule_courses[schedule_offsets[student_index]:schedule_offsets[student_index + 1]]]
+
+            self.student_list.extend(student_list)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def compile_schedule(self):
+        """
+        A method to build the array-backed CompiledSchedule for this schedule
+
+        Walking course_dict roster by roster (reading student.letter for each
+        Student object) is the most expensive part of evaluating a partition,
+        so this is done once after the .csv files have been loaded, and the
+        resulting integer arrays are used by every evaluation afterwards.
+
+        Note: call this after students_from_csv() and subgroups_from_csv()
+        
+        Parameters
+        ----------
+        None
+        """
+        if self.required_subgroups_list is None:
+            raise ValueError("Load required subgroups with subgroups_from_csv() before compiling the schedule")
+
+        self.compiled = CompiledSchedule.from_schedule(self)
+
+        # the vectorized fitness function for the compiled arrays:
+        self.build_fitness_engine()
+
+        return self.compiled
+
+    def build_fitness_engine(self):
+        """
+        A method to build the fitness function for the compiled schedule, 
+        stored in self.fitness_engine
+        
+        If self.fitness_kernel is "numba", partitions are evaluated by the
+        fused kernel of JitFitnessEngine. If Numba is not installed, this 
+        falls back to the NumPy FitnessEngine (with a warning)
+        
+        If self.fitness_kernel is "bitset", the letters of each course are
+        counted with the packed bitsets of BitsetFitnessEngine
+        
+        If cohort groupings were declared (or number_of_partitions is not 
+        2 or 4), partitions are evaluated by the CohortFitnessEngine 
+        instead (the numba and bitset kernels implement the built-in rules)
+        
+        The class maxima and penalty tolerances of each course are taken 
+        from course_threshold_table() (rebuilt here, since the schedule 
+        may have changed)
+        
+        If use_presolve is True, the engine evaluates the presolved schedule
+        (see Presolve), so its genomes only have the subgroups kept by 
+        presolve (load_partition() expands them back to full partitions)
+        
+        If use_student_classes is True, the genomes of the engine hold the 
+        letter counts of each class of subgroups with identical schedules 
+        (see StudentClasses), which are expanded before they are scored
+        
+        Parameters
+        ----------
+        None
+        """
+        self.course_thresholds = None
+        course_thresholds = self.course_threshold_table()
+        compiled = self.compiled
+        
+        # remove the courses and subgroups that cannot change the score:
+        if self.use_presolve and self.cohort_rules is not None:
+            self.presolve = Presolve(self.compiled, self.number_of_partitions, course_thresholds, self.cohort_rules)
+            
+            compiled = self.presolve.compiled
+            course_thresholds = self.presolve.course_thresholds
+        else:
+            self.presolve = None
+        
+        # group the subgroups with identical schedules into classes:
+        if self.use_student_classes:
+            self.student_classes = StudentClasses(compiled, self.number_of_partitions)
+            
+            if self.student_classes.number_of_classes == 0:
+                self.student_classes = None
+        else:
+            self.student_classes = None
+        
+        if self.cohort_groupings or not FitnessEngine.supports(self.number_of_partitions):
+            if self.cohort_rules is None:
+                print("In order to choose something other than an AB or ABCD partition, you must declare cohort_groupings in settings.yaml")    
+                raise NotImplementedError
+            
+            self.fitness_engine = CohortFitnessEngine(compiled, 
+                                                      self.number_of_partitions, 
+                                                      self.half_class_maximum, 
+                                                      self.quarter_class_maximum, 
+                                                      self.cohort_rules, 
+                                                      course_thresholds, 
+                                                      self.presolve, 
+                                                      self.student_classes)
+            
+            return self.fitness_engine
+        
+        if self.fitness_kernel == "numba" and njit is None:
+            warnings.warn("The numba module is not installed, so the NumPy fitness function is used instead")
+        
+        if self.fitness_kernel == "numba" and njit is not None:
+            engine_class = JitFitnessEngine
+        elif self.fitness_kernel == "bitset":
+            engine_class = BitsetFitnessEngine
+        else:
+            engine_class = FitnessEngine
+        
+        self.fitness_engine = engine_class(compiled, 
+                                           self.number_of_partitions, 
+                                           self.half_class_maximum, 
+                                           self.quarter_class_maximum, 
+                                           course_thresholds, 
+                                           self.presolve, 
+                                           self.student_classes)
+        
+        return self.fitness_engine
+
+    def load_compiled(self, compiled):
+        """
+        A method to populate student_list, student_dict, course_dict, 
+        required_subgroups_list and preferred_subgroups_list from a 
+        CompiledSchedule object (ex: one read from the compiled schedule 
+        cache), so that the schedule can be used exactly as if 
+        students_from_csv(), subgroups_from_csv() and compile_schedule() 
+        had been called
+        
+        Parameters
+        ----------
+        compiled : CompiledSchedule object
+            a compiled schedule that includes the student names and course
+            details (see CompiledSchedule.save())
+        """
+        separator = CompiledSchedule.list_separator
+        
+        # rebuild the Student objects in the order of student_list:
+        self.student_list = []
+        self.student_dict = {}
+
+        for i in range(compiled.number_of_students):
+            student_obj = Student(str(compiled.student_ids[i]))
+            student_obj.last_name = str(compiled.student_last_names[i])
+            student_obj.first_name = str(compiled.student_first_names[i])
+            student_obj.middle_name = str(compiled.student_middle_names[i])
+
+            self.student_list.append(student_obj)
+            self.student_dict[student_obj.id] = student_obj
+
+        # rebuild the Course objects and their rosters in the order of course_dict:
+        self.course_dict = {}
+        
+        student_list = self.student_list
+        enrollment_student = compiled.enrollment_student.tolist()
+        course_offsets = compiled.course_offsets.tolist()
+        
+        for c in range(compiled.number_of_courses):
+            course_obj = Course(str(compiled.course_rooms[c]), str(compiled.course_periods[c]))
+            course_obj.course_number_list = str(compiled.course_numbers[c]).split(separator)
+            course_obj.course_name_list = str(compiled.course_names[c]).split(separator)
+            course_obj.course_id_list = str(compiled.course_ids[c]).split(separator)
+
+            for student_index in enrollment_student[course_offsets[c]:course_offsets[c + 1]]:
+                student_obj = student_list[student_index]
+                course_obj.roster.append(student_obj)
+                student_obj.schedule.append(course_obj)
+
+            self.course_dict[course_obj] = course_obj.roster
+
+        # rebuild the subgroups as lists of tuples of Student objects:
+        member_offsets = compiled.subgroup_member_offsets.tolist()
+        member_student = compiled.subgroup_member_student.tolist()
+        
+        self.required_subgroups_list = [tuple(student_list[i] for i in member_student[member_offsets[g]:member_offsets[g + 1]])
+                                        for g in range(compiled.number_of_subgroups)]
+
+        if compiled.preferred_member_student is not None:
+            preferred_offsets = compiled.preferred_offsets.tolist()
+            preferred_student = compiled.preferred_member_student.tolist()
+
+            self.preferred_subgroups_list = [tuple(student_list[i] for i in preferred_student[preferred_offsets[g]:preferred_offsets[g + 1]])
+                                             for g in range(compiled.number_of_preferred_subgroups)]
+        else:
+            self.preferred_subgroups_list = None
+
+        self.compiled = compiled
+        self.compiled_partition = None
+        
+        self.build_fitness_engine()
+
+        return self.compiled
+
+    def load_shared(self, descriptor):
+        """
+        A method to attach the schedule to a CompiledSchedule published to 
+        shared memory by CompiledSchedule.publish()
+        
+        This is used by the island processes, which only evaluate partitions,
+        so student_list, course_dict and the subgroup lists are left empty 
+        (use load_csv_files() for a schedule that writes reports)
+        
+        Parameters
+        ----------
+        descriptor : dict
+            the descriptor returned by CompiledSchedule.publish()
+        """
+        self.compiled = CompiledSchedule.attach(descriptor)
+        self.compiled_partition = None
+        
+        self.build_fitness_engine()
+
+        return self.compiled
+
+    def cache_key(self, student_csv_path, required_subgroups_csv_path, preferred_subgroups_csv_path, column_map = None):
+        """
+        A method to return a hash (as a hexadecimal string) of the contents 
+        of the input .csv files along with the settings that the compiled 
+        schedule depends on, so that a cached schedule is only reused when 
+        none of these have changed
+        
+        Note: this hashes the contents of the files rather than their 
+        names or modification times, so copying or touching a .csv file 
+        does not invalidate the cache, but editing it does
+        
+        Parameters
+        ----------
+        student_csv_path : str
+            the location of the .csv with student schedule data
+        required_subgroups_csv_path : str
+            the location of the .csv with required subgrouping data (or None)
+        preferred_subgroups_csv_path : str
+            the location of the .csv with preferred subgrouping data (or None)
+        column_map : dict
+            the headers of the columns of the student .csv (see students_from_csv())
+        """
+        key = hashlib.sha256()
+        
+        key.update(("version:" + str(CompiledSchedule.cache_version) + "\n").encode())
+        key.update(("number_of_partitions:" + str(self.number_of_partitions) + "\n").encode())
+        key.update(("half_class_maximum:" + str(self.half_class_maximum) + "\n").encode())
+        key.update(("quarter_class_maximum:" + str(self.quarter_class_maximum) + "\n").encode())
+        key.update(("column_map:" + repr(sorted((column_map or {}).items())) + "\n").encode())
+
+        for label, file_location in [("students", student_csv_path), 
+                                     ("required", required_subgroups_csv_path), 
+                                     ("preferred", preferred_subgroups_csv_path)]:
+            key.update((label + ":").encode())
+            
+            if file_location is None:
+                key.update(b"None\n")
+                continue
+
+            # hash the file in 1 MB blocks, so large files are not read into memory at once:
+            file_hash = hashlib.sha256()
+            
+            with open(file_location, mode='rb') as infile:
+                for block in iter(lambda: infile.read(1 << 20), b""):
+                    file_hash.update(block)
+            
+            key.update((file_hash.hexdigest() + "\n").encode())
+
+        return key.hexdigest()
+
+    def load_csv_files(self, student_csv_path, required_subgroups_csv_path, preferred_subgroups_csv_path, cache_directory = None, column_map = None):
+        """
+        A method to load the school's data and compile the schedule, which 
+        is equivalent to the following: 
+        
+        students_from_csv(student_csv_path, column_map)
+        subgroups_from_csv(required_subgroups_csv_path, "required")
+        subgroups_from_csv(preferred_subgroups_csv_path, "preferred")
+        compile_schedule()
+        
+        (if student_csv_path ends in .parquet, students_from_parquet() is 
+        used instead of students_from_csv())
+        
+        If cache_directory is given, the compiled schedule is saved there as
+        <cache_key>.npz the first time the .csv files are parsed, and every 
+        later call with unchanged .csv files and settings reads this file 
+        instead of parsing the .csv files again (see cache_key())
+        
+        Returns True if the schedule was read from the cache
+        
+        Parameters
+        ----------
+        student_csv_path : str
+            the location of the .csv with student schedule data
+        required_subgroups_csv_path : str
+            the location of the .csv with required subgrouping data (or None)
+        preferred_subgroups_csv_path : str
+            the location of the .csv with preferred subgrouping data (or None)
+        cache_directory : str
+            the folder where compiled schedules are cached 
+            (default = None, which turns off the cache)
+        column_map : dict
+            the headers of the columns of the student .csv 
+            (default = None, see students_from_csv())
+        """
+        cache_file = None
+        
+        if cache_directory is not None:
+            cache_directory = Path(cache_directory)
+            cache_file = cache_directory / (self.cache_key(student_csv_path, 
+                                                           required_subgroups_csv_path, 
+                                                           preferred_subgroups_csv_path,
+                                                           column_map) + ".npz")
+            
+            if cache_file.exists():
+                try:
+                    compiled = CompiledSchedule.load(cache_file)
+                # a damaged or unreadable cache file is ignored and rewritten below
+                except (OSError, ValueError, KeyError):
+                    compiled = None
+                    
+                if compiled is not None:
+                    self.load_compiled(compiled)
+                    return True
+
+        # student data can also be read from a Parquet file:
+        if Path(student_csv_path).suffix.lower() in (".parquet", ".pq"):
+            self.students_from_parquet(student_csv_path, column_map)
+        else:
+            self.students_from_csv(student_csv_path, column_map)
+            
+        self.subgroups_from_csv(required_subgroups_csv_path, "required")
+        self.subgroups_from_csv(preferred_subgroups_csv_path, "preferred")
+        self.compile_schedule()
+
+        if cache_file is not None:
+            # the cache only saves time, so a read-only folder is not an error:
+            try:
+                cache_directory.mkdir(parents=True, exist_ok=True)
+                self.compiled.save(cache_file)
+            except OSError as error:
+                warnings.warn("Unable to write the compiled schedule cache: " + str(error))
+
+        return False
+
     def load_partition(self, letter_list):
         """
         A method to load a list of letters into the letter attribute for 
@@ -1025,15 +2563,33 @@ class Schedule:
         
         This method is used when we need to evaluate the fitness of a newly-generated partition.
         
+        letter_list can also be a genome (an array of letter indices, see IndividualPartition),
+        which is converted to letters first.
+        
         Parameters
         ----------
         letter_list : list
             a list of letter assignments for each subgroup at the school, for example a school with
-            four subgroups could have ["A", "B", "A", "D"]
+            four subgroups could have ["A", "B", "A", "D"] (or the genome [0, 1, 0, 3])
         """
 
         number_of_partitions = self.number_of_partitions
         
+        # the letter counts of each class of students with identical 
+        # schedules are expanded to one letter per student first (see 
+        # StudentClasses.expand_genome()):
+        if isinstance(letter_list, np.ndarray) and self.student_classes is not None:
+            letter_list = self.student_classes.expand_genome(letter_list)
+        
+        # a genome of the presolved schedule is expanded to a full partition 
+        # first (see Presolve.expand_genome()):
+        if isinstance(letter_list, np.ndarray) and self.presolve is not None:
+            letter_list = self.presolve.expand_genome(letter_list)
+        
+        # convert a genome into letters:
+        if isinstance(letter_list, np.ndarray):
+            letter_list = CompiledSchedule.decode_partition(letter_list)
+        
         for i in range(len(letter_list)):
             letter = letter_list[i]
             
@@ -1044,32 +2600,141 @@ class Schedule:
             for student in student_subgroup:
                 student.letter = letter
 
-    # possibly move to Reports class
-    def write_student_assignments(self):
+        # keep an array copy of the partition for the compiled schedule:
+        if self.compiled is not None:
+            self.compiled_partition = self.compiled.encode_partition(letter_list)
+
+    def partition_from_assignments(self, file_location):
         """
-        A method to write a report of final student assignments in .csv format
+        A method to read a student assignment report written by an earlier 
+        run (see write_student_assignments(), or the .parquet report of 
+        write_student_assignments_parquet()) back into a genome of the 
+        fitness engine (ex: to warm start from the best partition so far)
         
-        For example:
-        id number,last name,first name,middle name,letter
-        091834273,Smithfield,Jonathan,Christopher,A
-        023421760,Thomasville,Abigail,Heather May,B        
+        Each required subgroup gets the letter of its first member listed
+        in the report. A subgroup with no member in the report (ex: a new
+        student), or whose letter is not one of the first 
+        number_of_partitions letters, gets a random letter
+        
+        Returns a tuple (genome, number_of_missing_subgroups)
         
         Parameters
         ----------
-        None
+        file_location : str or Path
+            the location of the student assignment report
         """
-        # the file name and location for the student assignment report:
-        output_file = IO_DIRECTORY / 'student_assignments.csv' 
-        
-        with open(output_file, 'w') as file:
-            # write the headers of the .csv
-            headers = "id,last name,first name,middle name,letter"
-            file.write(headers)
-            file.write("\n")   
+        if Path(file_location).suffix.lower() == ".parquet":
+            if pa is None:
+                raise ImportError("Reading Parquet files requires the pyarrow module (pip install pyarrow)")
             
-            # write a line in the .csv for each student in student_list:
-            for student_obj in self.student_list:
-                current_id = student_obj.id
+            table = pq.read_table(file_location, columns = ["id", "letter"])
+            letter_dict = dict(zip(table.column("id").to_pylist(), table.column("letter").to_pylist()))
+        else:
+            with open(file_location, newline = '') as infile:
+                reader = csv.reader(infile)
+                
+                # skip the headers
+                next(reader)
+                
+                # key: student ID
+                # value: letter
+                letter_dict = {row[0] : row[-1] for row in reader if row}
+        
+        # a list in the form ["A", "B", "C", "D", ...] 
+        possible_letter_list = [chr(i + 65) for i in range(0, self.number_of_partitions)]
+        
+        letter_list = []
+        number_of_missing_subgroups = 0
+        
+        for student_subgroup in self.required_subgroups_list:
+            letter = None
+            
+            for student in student_subgroup:
+                if letter_dict.get(student.id) in possible_letter_list:
+                    letter = letter_dict[student.id]
+                    break
+            
+            if letter is None:
+                letter = random.choice(possible_letter_list)
+                number_of_missing_subgroups += 1
+            
+            letter_list.append(letter)
+        
+        genome = self.compiled.encode_partition(letter_list)
+        
+        # the genome of the fitness engine (see load_partition()):
+        if self.presolve is not None:
+            genome = self.presolve.reduce_genome(genome)
+        
+        if self.student_classes is not None:
+            genome = self.student_classes.compress_genome(genome)
+        
+        return genome, number_of_missing_subgroups
+
+    def course_letter_counts(self):
+        """
+        A method to count the students of each letter in each course for the
+        most recently loaded partition, returned as a list of the form
+        [[A count, B count, ...], ...] with one row per course (in the order 
+        of course_dict)
+        
+        If the schedule has been compiled, the counts are computed from the
+        compiled arrays, otherwise each roster in course_dict is walked
+        
+        Parameters
+        ----------
+        None
+        """
+        if self.compiled is not None and self.compiled_partition is not None:
+            counts = self.compiled.course_letter_counts(self.compiled_partition, self.number_of_partitions)
+            return counts.tolist()
+
+        # a list in the form ["A", "B", "C", "D", ...] 
+        possible_letter_list = [chr(i + 65) for i in range(0, self.number_of_partitions)]
+        letter_index_dict = {letter: index for index, letter in enumerate(possible_letter_list)}
+
+        counts_list = []
+
+        for roster in self.course_dict.values():
+            counts = [0 for i in range(0, self.number_of_partitions)]
+
+            for student in roster:
+                counts[letter_index_dict[student.letter]] += 1
+
+            counts_list.append(counts)
+
+        return counts_list
+
+    # possibly move to Reports class
+    def write_student_assignments(self):
+        """
+        A method to write a report of final student assignments in .csv format
+        
+        For example:
+        id number,last name,first name,middle name,letter
+        091834273,Smithfield,Jonathan,Christopher,A
+        023421760,Thomasville,Abigail,Heather May,B        
+        
+        The letters are those of the most recently loaded partition (a 
+        genome of StudentClasses or Presolve is expanded to one letter per
+        student by load_partition())
+        
+        Parameters
+        ----------
+        None
+        """
+        # the file name and location for the student assignment report:
+        output_file = IO_DIRECTORY / 'student_assignments.csv' 
+        
+        with open(output_file, 'w') as file:
+            # write the headers of the .csv
+            headers = "id,last name,first name,middle name,letter"
+            file.write(headers)
+            file.write("\n")   
+            
+            # write a line in the .csv for each student in student_list:
+            for student_obj in self.student_list:
+                current_id = student_obj.id
                 current_last = student_obj.last_name
                 current_first = student_obj.first_name
                 current_middle = student_obj.middle_name
@@ -1099,7 +2764,8 @@ class Schedule:
     def write_course_analysis(self):
         """
         A method to write an report of the letter breakdown in each classroom
-        as a .csv file (only implemented for A/B and A/B/C/D partitions)
+        as a .csv file (for A/B and A/B/C/D partitions, or for the cohort
+        groupings declared in settings.yaml, see CohortRules)
         
         Summary of .csv headers: 
         room,period,course_number_list,total_students,A_count,B_count,C_count,D_count,A_ratio,B_ratio,C_ratio,D_ration,max_deviation,in compliance?
@@ -1132,18 +2798,16 @@ class Schedule:
         output_file = IO_DIRECTORY / 'course_analysis.csv' 
         
         # if number_of_partitions is not 2 or 4, you will have to 
-        # implement your own analysis
-        if self.number_of_partitions != 2 and self.number_of_partitions != 4:
-            print("In order to choose something other than an AB or ABCD partition, you must write your own final analysis")    
+        # declare the cohort groupings in settings.yaml
+        if self.cohort_rules is None:
+            print("In order to choose something other than an AB or ABCD partition, you must declare cohort_groupings in settings.yaml")    
             raise NotImplementedError        
         
         else:
             with open(output_file, 'w') as file:
                 # a list in the form ["A", "B", "C", "D", ...], 
                 # where the length of the list is based on the
-                # size of the partition, this will either be
-                # ["A", "B"] or ["A", "B", "C", "D"] with the
-                # current implementation 
+                # size of the partition
                 possible_letter_list = [chr(i + 65) for i in range(0, self.number_of_partitions)]
             
                 # concatenate the header row for the .csv file:
@@ -1160,9 +2824,21 @@ class Schedule:
                 # write the headers to the .csv file:
                 file.write(headers)
                 file.write("\n")  
+
+                # the letter counts of every course, ex: [[6, 6, 6, 6], ...]
+                counts_list = self.course_letter_counts()
+                
+                # a course is "In Compliance" with physical distancing rules
+                # if no cohort grouping is above its maximum, ex: for an A/B/C/D
+                # partition, no more than self.quarter_class_maximum (9) students
+                # of any letter, and no more than self.half_class_maximum (15) 
+                # students in the (A+B) and (C+D) combined groups (or the 
+                # capacities of the course's room, see room_capacities_from_csv())
+                compliance_list = self.cohort_rules.compliance(np.array(counts_list, dtype=np.int64).reshape(-1, self.number_of_partitions), 
+                                                               self.course_threshold_table().grouping_maxima).tolist()
                 
                 # for each course at the school:
-                for course in self.course_dict:
+                for course_index, course in enumerate(self.course_dict):
                     # concatenate a row of data about the course, as a
                     # string where each value is delimited by a comma:
                     line = course.room_number # room number for the course
@@ -1178,18 +2854,9 @@ class Schedule:
                     line += str(total_students)
                     line += ","
                     
-                    # prepare to count each letter, where counts = [0,0] for A/B 
-                    # and counts = [0,0,0,0] for A/B/C/D:
-                    counts = [0 for i in range(0, self.number_of_partitions)] 
-            
-                    # for each student on the roster:
-                    for student in roster:
-                        # use the student's assigned letter to find the correct
-                        # index in [0,0,0,0] to increment
-                        index = possible_letter_list.index(student.letter) 
-                    
-                        # and then increment it:
-                        counts[index] += 1 # 
+                    # the letter counts for this course, where counts = [A, B] 
+                    # for A/B and counts = [A, B, C, D] for A/B/C/D:
+                    counts = counts_list[course_index]
                     
                     # concatenate these values onto the row, delimited by commas:
                     for count in counts:
@@ -1215,50 +2882,101 @@ class Schedule:
                     
                     # next, we determine if the course is "In Compliance" with 
                     # physical distancing rules
-                    if self.number_of_partitions == 2:
-                        # for an A/B partition, we say that a course is
-                        # "In Compliance" if there are no more than 15 
-                        # students in either group
-                        if counts[0] <= self.half_class_maximum and counts[1] <= self.half_class_maximum:
-                            line += "Yes" 
-                        else:
-                            line += "No"
-                        
-                    elif self.number_of_partitions == 4:
-                        a_count = counts[0]
-                        b_count = counts[1]
-                        c_count = counts[2]
-                        d_count = counts[3]
-                        
-                        # for an A/B/C/D partition, we say that a course is
-                        # "In Compliance" if there are no more than 
-                        # self.quarter_class_maximum (9) students in any
-                        # of the four groups:
-                        
-                        qcm = self.quarter_class_maximum 
-                        check_individually = (a_count <= qcm 
-                                            and b_count <= qcm 
-                                            and c_count <= qcm 
-                                            and d_count <= qcm)
-                        
-                        # we also require that the (A+B) and (C+D) combined 
-                        # groups are no more than self.half_class_maximum students
-                        # (default value 15):                        
-                        check_pairs = (a_count + b_count <= self.half_class_maximum 
-                                    and c_count + d_count <= self.half_class_maximum)
-                        
-                        # if the course passes both tests, it is "In Compliance"
-                        if check_individually and check_pairs:
-                            line += "Yes"
-                        # if it fails either test, it is "Out of Compliance"
-                        else:
-                            line += "No"
+                    if compliance_list[course_index]:
+                        line += "Yes"
+                    # if it fails any grouping, it is "Out of Compliance"
+                    else:
+                        line += "No"
                     
                     # write the concatenated string to the .csv file
                     file.write(line)
                     # write a line break
                     file.write("\n")
 
+    def write_student_assignments_parquet(self):
+        """
+        A method to write the report of write_student_assignments() as a 
+        Parquet file, 'student_assignments.parquet', with the same columns
+        
+        Note: this requires the optional pyarrow module (pip install pyarrow)
+        
+        Parameters
+        ----------
+        None
+        """
+        if pa is None:
+            raise ImportError("Writing Parquet files requires the pyarrow module (pip install pyarrow)")
+        
+        # the file name and location for the student assignment report:
+        output_file = IO_DIRECTORY / 'student_assignments.parquet' 
+        
+        table = pa.table({"id": [student_obj.id for student_obj in self.student_list],
+                          "last name": [student_obj.last_name for student_obj in self.student_list],
+                          "first name": [student_obj.first_name for student_obj in self.student_list],
+                          "middle name": [student_obj.middle_name for student_obj in self.student_list],
+                          "letter": [student_obj.letter for student_obj in self.student_list]})
+        
+        pq.write_table(table, output_file)
+
+    def write_course_analysis_parquet(self):
+        """
+        A method to write the report of write_course_analysis() as a Parquet 
+        file, 'course_analysis.parquet', with the same columns 
+        
+        The section list is stored as a list of strings (rather than as a 
+        quoted string, as in the .csv) and "in compliance?" is stored as 
+        True/False (rather than Yes/No)
+        
+        Note: this requires the optional pyarrow module (pip install pyarrow)
+        
+        Parameters
+        ----------
+        None
+        """
+        if pa is None:
+            raise ImportError("Writing Parquet files requires the pyarrow module (pip install pyarrow)")
+        
+        # if number_of_partitions is not 2 or 4, you will have to 
+        # declare the cohort groupings in settings.yaml
+        if self.cohort_rules is None:
+            print("In order to choose something other than an AB or ABCD partition, you must declare cohort_groupings in settings.yaml")    
+            raise NotImplementedError        
+        
+        # the file name and location for the course analysis report:
+        output_file = IO_DIRECTORY / 'course_analysis.parquet' 
+        
+        # a list in the form ["A", "B", "C", "D", ...]
+        possible_letter_list = [chr(i + 65) for i in range(0, self.number_of_partitions)]
+
+        # the letter counts of every course, with one row per course:
+        counts = np.array(self.course_letter_counts(), dtype=np.int64).reshape(-1, self.number_of_partitions)
+        total_students = counts.sum(axis=1)
+        
+        ratios = counts / total_students[:, None]
+        
+        # the largest ratio minus the ratio for an even distribution:
+        max_deviation = ratios.max(axis=1) - 1/self.number_of_partitions
+        
+        # the same test for "In Compliance" used by write_course_analysis():
+        in_compliance = self.cohort_rules.compliance(counts, self.course_threshold_table().grouping_maxima)
+
+        columns = {"room": [course.room_number for course in self.course_dict],
+                   "period": [course.period for course in self.course_dict],
+                   "section list": pa.array([course.course_number_list for course in self.course_dict], 
+                                            type=pa.list_(pa.string())),
+                   "total students": total_students}
+        
+        for i, letter in enumerate(possible_letter_list):
+            columns[letter + " count"] = counts[:, i]
+            
+        for i, letter in enumerate(possible_letter_list):
+            columns[letter + " ratio"] = ratios[:, i]
+        
+        columns["max deviation"] = max_deviation
+        columns["in compliance?"] = in_compliance
+        
+        pq.write_table(pa.table(columns), output_file)
+
     def fitness_score(self):
         """
         A method to evaluate the fitness of a particular partition of 
@@ -1275,8 +2993,10 @@ class Schedule:
         to have a negative fitness score because of accumulating too
         many penalties
         
-        Note: this function is only implemented for 
-        number_of_partitions = 2 and = 4
+        Note: the rules below are built in for number_of_partitions = 2 
+        and = 4. For any other number of partitions (or to replace the 
+        built-in rules), declare cohort_groupings in settings.yaml and the
+        rules of CohortRules are used instead
         
         Note: this function should be modified if a school has a different
         set of requirements to classify a course as "In Compliance."  
@@ -1316,26 +3036,43 @@ class Schedule:
         # the number of courses at the school
         number_of_courses = len(self.course_dict)
 
+        # the letter counts of every course, ex: [[6, 6, 6, 6], ...]
+        # (computed from the compiled arrays if compile_schedule() was called)
+        counts_list = self.course_letter_counts()
+        
+        # the class maxima and penalty tolerances of each course, which 
+        # depend on the course's room and size (see CourseThresholds):
+        thresholds = self.course_threshold_table()
+
+        # fitness function for declared cohort groupings (see CohortRules):
+        if self.cohort_groupings or (self.number_of_partitions != 2 and self.number_of_partitions != 4):
+            if self.cohort_rules is None:
+                print("In order to choose something other than an AB or ABCD partition, you must declare cohort_groupings in settings.yaml")    
+                raise NotImplementedError
+            
+            counts = np.array(counts_list, dtype=np.int64).reshape(-1, self.number_of_partitions)
+            
+            weighted_terms, penalties, good, other = self.cohort_rules.course_terms(counts, counts.sum(axis=1), 100/number_of_courses, 
+                                                                                    thresholds.grouping_maxima, 
+                                                                                    thresholds.grouping_tolerance)
+            
+            # add every term from left to right, in the same order as FitnessEngine.score():
+            for term in weighted_terms.ravel().tolist():
+                weighted_fitness_score += term
+            
+            penalty_count = int(penalties.sum())
+            good_score = int(np.count_nonzero(good))
+            other_score = int(np.count_nonzero(other))
+            
         # fitness function for an A/B partition:
-        if self.number_of_partitions == 2:
+        elif self.number_of_partitions == 2:
             # for each course:
-            for course in self.course_dict:
-                # get the course's roster:
-                roster = self.course_dict[course]
-                
-                a_count = 0
-                b_count = 0
-            
-                # count the A's and B's on the course roster:
-                for student in roster:
-                    letter = student.letter
-                    if letter == "A":
-                        a_count += 1
-                    elif letter == "B":
-                        b_count += 1
+            for course_index, counts in enumerate(counts_list):
+                # the A's and B's on the course roster:
+                a_count, b_count = counts
                 
                 # the total number of students in the course
-                total = len(roster)
+                total = a_count + b_count
                 
                 # relative percentage of A's and B's:
                 a_percent = a_count/total
@@ -1348,16 +3085,17 @@ class Schedule:
                 # we are classifying a course as "In Compliance"
                 # if it has no more than self.half_class_maximum
                 # A's and self.half_class_maximum B's (default 
-                # value is 15):
-                hcm = self.half_class_maximum
+                # value is 15, or the capacity of the course's room):
+                hcm = thresholds.half_class_maximum[course_index]
                 
                 # our tolerance for applying a penalty based on the 
                 # the ratio of A to B groups (usually set to 55%) 
                 # 
                 # for a small class, 55% might not be feasible, so we set
-                # it to (total/2 + 1)/total instead
+                # it to (total/2 + 1)/total instead (precomputed for 
+                # each course, see CourseThresholds)
                 #                
-                pairwise_tolerance = max([0.55, (total/2+1)/total])
+                pairwise_tolerance = thresholds.pairwise_tolerance[course_index]
                 
                 if a_count <= hcm and b_count <= hcm:
                     # increment the raw "In Compliance" score:
@@ -1401,33 +3139,16 @@ class Schedule:
         # fitness function for an A/B/C/D partition:
         elif self.number_of_partitions == 4:
             # for each course:
-            for course in self.course_dict:
-                # get the course's roster:
-                roster = self.course_dict[course]
-                
-                a_count = 0
-                b_count = 0
-                c_count = 0
-                d_count = 0
-                
-                # count the A's/B's/C's/D's on the roster:
-                for student in roster:
-                    letter = student.letter
-                    if letter == "A":
-                        a_count += 1
-                    elif letter == "B":
-                        b_count += 1
-                    elif letter == "C":
-                        c_count += 1
-                    elif letter == "D":
-                        d_count += 1
+            for course_index, counts in enumerate(counts_list):
+                # the A's/B's/C's/D's on the roster:
+                a_count, b_count, c_count, d_count = counts
                 
                 # the total number of students on the roster:
-                total = len(roster)
+                total = a_count + b_count + c_count + d_count
                                 
                 # check if there are no more than self.quarter_class_maximum
-                # (9) students of any letter:
-                qcm = self.quarter_class_maximum
+                # (9) students of any letter (or the capacity of the course's room):
+                qcm = thresholds.quarter_class_maximum[course_index]
                 check_individually = (a_count <= qcm 
                                     and b_count <= qcm 
                                     and c_count <= qcm 
@@ -1435,7 +3156,7 @@ class Schedule:
                 
                 # check if the (A+B) count and (C+D) count are each less
                 # than self.half_class_maximum students (default value is 15):
-                hcm = self.half_class_maximum
+                hcm = thresholds.half_class_maximum[course_index]
                 check_pairs = (a_count + b_count <= hcm and c_count + d_count <= hcm)
                 
                 # we classify a course as "In Compliance" if there
@@ -1490,9 +3211,10 @@ class Schedule:
                     # which is usually going to be set to 55%
                     # 
                     # for a small class, 55% might not be feasible, so we set
-                    # it to (total/2 + 1)/total instead
+                    # it to (total/2 + 1)/total instead (precomputed for 
+                    # each course, see CourseThresholds)
                     #
-                    pairwise_tolerance = max([0.55, (total/2+1)/total])
+                    pairwise_tolerance = thresholds.pairwise_tolerance[course_index]
 
                     if a_percent + b_percent > pairwise_tolerance:
                         # see note above about pairwise_multiplier
@@ -1510,9 +3232,10 @@ class Schedule:
                     # which is usually going to be set to 30%
                     # 
                     # for a small class, 30% might not be feasible, so we set
-                    # it to (total/4 + 1)/total instead
+                    # it to (total/4 + 1)/total instead (precomputed for 
+                    # each course, see CourseThresholds)
                     #
-                    individual_tolerance = max([0.3, (total/4+1)/total])
+                    individual_tolerance = thresholds.individual_tolerance[course_index]
 
                     # subtract from weighted_fitness_score if a_percent exceeds the value of individual_tolerance:
                     if a_percent > individual_tolerance:
@@ -1560,21 +3283,20 @@ class Schedule:
                         else:
                             # this should catch any cases that have been missed above 
                             other_score += 1
-                            
-        else:
-            print("In order to choose something other than an AB or ABCD partition, you must add your own fitness function")    
-            raise NotImplementedError
         
         if self.preferred_subgroups_list is not None:
             number_of_subgroups = len(self.preferred_subgroups_list)
+
+            # a list with one entry per preferred subgroup: True if the
+            # subgroup has been split across more than one letter
+            if self.compiled is not None and self.compiled_partition is not None:
+                split_list = self.compiled.preferred_split_flags(self.compiled_partition).tolist()
+            else:
+                split_list = [len(set(student.letter for student in subgroup)) > 1 
+                              for subgroup in self.preferred_subgroups_list]
             
-            for subgroup in self.preferred_subgroups_list:
-                subgroup_letter_set = set()
-                
-                for student in subgroup:
-                    subgroup_letter_set.add(student.letter)
-                    
-                if len(subgroup_letter_set) > 1:
+            for is_split in split_list:
+                if is_split:
                     # TO DO: DISCUSS THE BEST APPROACH FOR PENALIZING
                     # VIOLATIONS OF PREFERRED_SUBGROUPS AND HOW TO APPLY
                     # THE PENALTY
@@ -1598,74 +3320,37 @@ class Schedule:
         A method to get the max deviation of each course that is not in compliance
         from a 25-25-25-25% split (if number_of_partitions = 4) 
         or a 50-50% split (if number_of_partitions = 2)
+        (or an even split between any number of letters)
 
         Parameters
         ----------
         """
+        # use the vectorized equivalent if the schedule has been compiled:
+        if self.fitness_engine is not None and self.compiled_partition is not None:
+            if self.presolve is not None:
+                return self.fitness_engine.max_deviation(self.presolve.reduce_genome(self.compiled_partition))
+            
+            return self.fitness_engine.max_deviation(self.compiled_partition)
+
+        if self.cohort_rules is None:
+            print("In order to choose something other than an AB or ABCD partition, you must declare cohort_groupings in settings.yaml")    
+            raise NotImplementedError
+
         max_deviation = [] # max deviation of courses that are not in compliance
 
-        # max deviation for an A/B partition:
-        if self.number_of_partitions == 2:
-            for course in self.course_dict:
-                roster = self.course_dict[course]
-                
-                a_count = 0
-                b_count = 0
-
-                for student in roster:
-                    letter = student.letter
-                    if letter == "A":
-                        a_count += 1
-                    elif letter == "B":
-                        b_count += 1
-                
-                max_count = max(a_count, b_count)
-                total_count = len(roster)
-                hcm = self.half_class_maximum
-
-                if (a_count > hcm or b_count > hcm): # not in compliance
-                    cur_imbalance = (max_count/total_count - 0.5)
-                    max_deviation.append(cur_imbalance)
-        elif self.number_of_partitions == 4:
-            for course in self.course_dict:
-                roster = self.course_dict[course]
-                
-                a_count = 0
-                b_count = 0
-                c_count = 0
-                d_count = 0
-                
-                # count the A's/B's/C's/D's on the roster:
-                for student in roster:
-                    letter = student.letter
-                    if letter == "A":
-                        a_count += 1
-                    elif letter == "B":
-                        b_count += 1
-                    elif letter == "C":
-                        c_count += 1
-                    elif letter == "D":
-                        d_count += 1
-                
-                max_count = max([a_count, b_count, c_count, d_count])
-                total_count = len(roster)
-                qcm = self.quarter_class_maximum
-                hcm = self.half_class_maximum
+        # the letter counts of every course, ex: [[6, 6, 6, 6], ...]
+        counts_list = self.course_letter_counts()
         
-                check_individually = (a_count <= qcm 
-                                    and b_count <= qcm 
-                                    and c_count <= qcm 
-                                    and d_count <= qcm)
-            
-                check_pairs = (a_count + b_count <= hcm and c_count + d_count <= hcm)
-                
-                if not (check_individually and check_pairs): # not in compliance
-                    cur_imbalance = (max_count/total_count - 0.25)
-                    max_deviation.append(cur_imbalance)
-                                           
-        else:
-            print("In order to choose something other than an AB or ABCD partition, you must add your own fitness function")    
-            raise NotImplementedError
+        # True for each course that is "In Compliance" (see CohortRules):
+        compliance_list = self.cohort_rules.compliance(np.array(counts_list, dtype=np.int64).reshape(-1, self.number_of_partitions), 
+                                                       self.course_threshold_table().grouping_maxima).tolist()
+
+        for counts, in_compliance in zip(counts_list, compliance_list):
+            if not in_compliance:
+                # the largest share of a letter minus the share of an even split, 
+                # ex: 0.25 for an A/B/C/D partition
+                cur_imbalance = (max(counts)/sum(counts) - 1/self.number_of_partitions)
+                max_deviation.append(cur_imbalance)
     
         return max_deviation
 
@@ -1717,1641 +3402,7140 @@ class Schedule:
         
         return [(room, period), [("Group: " + student.letter + ", Name: " + student.last_name + ", " + student.first_name) for student in current_roster]]
 
-class IndividualPartition(Schedule):
+class CohortRules:
     """
-    A class used to store an individual partition of student
-    subgroups as an ordered list of letter assignments
+    A class used to store the cohort constraints of a school: the cohorts 
+    (letters) that students are divided into, the groupings of cohorts 
+    that are in the building at the same time (ex: A+B and C+D) and the 
+    maximum number of students of each grouping in a classroom
     
-    Ex: ["A", "A", "C", "B", "D", "A", ...]
+    The groupings are declared as a dictionary, where each key is a string
+    of letters and each value is the maximum, ex: for an A/B/C/D partition
     
-    Attributes
-    ----------
-    schedule_obj: Schedule object
-        inherited from the schedule class
+    {"A" : 9, "B" : 9, "C" : 9, "D" : 9, "AB" : 15, "CD" : 15}
     
-    number_of_partitions: int
-        inherited from the schedule class
-        
-    partition : list
-        an individual partition of student subgroups stored as a 
-        list of letters, ex: ["A", "A", "C", "B", "D", "A", ...]
-        
-    fitness: tuple
-        a tuple representing the fitness of the partition in the form:
-        (weighted_fitness_score, penalty_count, good_score, other_score, number_of_courses)
+    and for a 3-day rotation {"A" : 10, "B" : 10, "C" : 10}. The groupings 
+    are compiled into a (letters x groupings) membership matrix, so the 
+    counts of every grouping of every course are found with one matrix
+    product, for any number of letters
     
-    student_letter_list : list
-        either ["A", "B"] or ["A", "B", "C", "D"]    
+    A course is "In Compliance" if no grouping is above its maximum. For
+    a course that is not, a penalty is applied for each grouping whose 
+    share of the roster is above its tolerance:
+    
+    tolerance = max(even share + 0.05, (total*even share + 1)/total)
+    penalty = multiplier*(share - even share)
+    
+    where even share = (letters in the grouping)/(number of letters), and 
+    the multiplier is FitnessEngine.individual_multiplier for a single 
+    letter or FitnessEngine.pairwise_multiplier for a grouping of several
+    letters (ex: for A/B/C/D the tolerances are 30% and 55%, the same as 
+    in Schedule.fitness_score()). A course with no penalties is counted
+    as good if it is too big to ever be "In Compliance" (an even split 
+    is above the maximum of some grouping), and as other otherwise
     
+    Attributes
+    ----------
+    number_of_partitions : int
+        the number of cohorts (letters) students are divided into
+    cohort_groupings : dict
+        key: a string of letters, ex: "AB"
+        value: the maximum number of students of these letters in a course
+    grouping_names : list
+        the keys of cohort_groupings, in order
+    membership : numpy array
+        1 if the letter (row) belongs to the grouping (column), 
+        shape (number_of_partitions, number_of_groupings)
+    maxima : numpy array
+        the maximum of each grouping
+    even_shares : numpy array
+        the share of a course each grouping would have with an even split
+    multipliers : numpy array
+        the penalty multiplier of each grouping
+    tolerance_margin : float
+        how far above its even share a grouping can be before a penalty 
+        is applied (default = 0.05)
+    capacity_fields : list
+        the column of the room capacity .csv that sets the maximum of each
+        grouping in a room (ex: "AB", or "HALF_CLASS_MAXIMUM" for the 
+        built-in groupings)
+        
     Methods
     -------
-    return_fitness(number_of_partitions)
-        applies the partition to the Schedule object, and then 
-        uses the Schedule.evaluate_fitness() method to get
-        the fitness of partition_list
-
-    generate_partition()
-        generate a random partition, ex: ["A", "A", "C", "B", "D", "A", ...]
+    default_groupings(number_of_partitions, half_class_maximum, quarter_class_maximum)
+        the built-in groupings for an A/B or A/B/C/D partition
+    default_capacity_fields(number_of_partitions)
+        the room capacity columns of the built-in groupings
+    group_counts(counts)
+        the number of students of each grouping in each course
+    compliance(counts, maxima)
+        flag the courses that are "In Compliance"
+    course_maxima(course_rooms, room_capacity_dict, course_half_maximum, course_quarter_maximum)
+        the maximum of each grouping in each course
+    course_tolerances(totals)
+        the penalty tolerance of each grouping in each course
+    course_capacity(maxima)
+        the most students a course can have and still be "In Compliance"
+    course_terms(counts, totals, course_weight, maxima, tolerances)
+        apply the rules to an array of course counts
     """
     
-    def __init__(self, schedule_obj):
+    tolerance_margin = 0.05
+    
+    def __init__(self, number_of_partitions, cohort_groupings, capacity_fields = None):
         """
-        The constructor for the IndividualPartition class
+        The constructor for the CohortRules class, which compiles the 
+        groupings into index arrays
         
         Parameters
         ----------
-        schedule_obj: Schedule object
-            inherited from the schedule class
+        number_of_partitions : int
+            the number of cohorts (letters) students are divided into
+        cohort_groupings : dict
+            key: a string of letters, ex: "AB"
+            value: the maximum number of students of these letters in a course
+        capacity_fields : list
+            (optional) the column of the room capacity .csv for each grouping
+            (default = None, which uses the name of each grouping, ex: "AB")
         """
-        self.schedule_obj = schedule_obj
-        self.number_of_partitions = schedule_obj.number_of_partitions
+        if number_of_partitions < 2 or number_of_partitions > 26:
+            raise ValueError("number_of_partitions must be between 2 and 26")
         
-        if self.number_of_partitions == 2:
-            self.student_letter_list = ["A", "B"]
-        elif self.number_of_partitions == 4:
-            self.student_letter_list = ["A", "B", "C", "D"]
+        if not cohort_groupings:
+            raise ValueError("Declare at least one grouping in cohort_groupings (ex: A : 10)")
+        
+        self.number_of_partitions = number_of_partitions
+        self.cohort_groupings = dict(cohort_groupings)
+        self.grouping_names = [str(name).upper() for name in cohort_groupings]
+        
+        number_of_groupings = len(self.grouping_names)
+        
+        self.membership = np.zeros((number_of_partitions, number_of_groupings), dtype=np.int64)
+        
+        for g, name in enumerate(self.grouping_names):
+            for letter in name:
+                letter_index = ord(letter) - 65
                 
-        self.partition = None
-        self.fitness = None
-        self.max_deviation = None
-
-    def generate_partition(self):
+                if letter_index < 0 or letter_index >= number_of_partitions:
+                    raise ValueError("The grouping " + name + " in cohort_groupings uses a letter that is not one of the first " 
+                                     + str(number_of_partitions) + " letters")
+                
+                self.membership[letter_index, g] = 1
+        
+        self.maxima = np.array(list(cohort_groupings.values()), dtype=np.int64)
+        
+        grouping_sizes = self.membership.sum(axis=0)
+        self.even_shares = grouping_sizes/number_of_partitions
+        self.multipliers = np.where(grouping_sizes == 1, FitnessEngine.individual_multiplier, FitnessEngine.pairwise_multiplier)
+        
+        if capacity_fields is None:
+            self.capacity_fields = list(self.grouping_names)
+        else:
+            self.capacity_fields = list(capacity_fields)
+        
+    @classmethod
+    def default_groupings(cls, number_of_partitions, half_class_maximum, quarter_class_maximum):
         """
-        A method to generate a random partition, ex: ["A", "A", "C", "B", "D", "A", ...]
+        Return the groupings of the built-in rules of Schedule.fitness_score():
+        {"A" : hcm, "B" : hcm} for an A/B partition and 
+        {"A" : qcm, "B" : qcm, "C" : qcm, "D" : qcm, "AB" : hcm, "CD" : hcm}
+        for an A/B/C/D partition (None for any other number of partitions)
         
         Parameters
         ----------
-        None
-        
-        """        
+        number_of_partitions : int
+            the number of cohorts (letters) students are divided into
+        half_class_maximum : int
+            the target maximum size of a partition when dividing students 
+            into two cohorts
+        quarter_class_maximum : int
+            the target maximum size of a partition when dividing students
+            into four cohorts
+        """
+        if number_of_partitions == 2:
+            return {"A" : half_class_maximum, "B" : half_class_maximum}
         
-        student_partition_list = []
-    
-        # use number_of_subgroups to determine how many letters are needed
-        number_of_subgroups = len(self.schedule_obj.required_subgroups_list)
-
-        # populate the list, ex: ["A", "A", "C", "B", "D", "A", ...] 
-        for _ in range(number_of_subgroups):
-            letter = random.choice(self.student_letter_list)
-            student_partition_list.append(letter)        
+        if number_of_partitions == 4:
+            return {"A" : quarter_class_maximum, 
+                    "B" : quarter_class_maximum, 
+                    "C" : quarter_class_maximum, 
+                    "D" : quarter_class_maximum, 
+                    "AB" : half_class_maximum, 
+                    "CD" : half_class_maximum}
         
-        # store the list in the self.partition attribute
-        self.partition = student_partition_list
+        return None
         
-        return self.partition
-
-    
-    def load_partition(self, partition):
+    @classmethod
+    def default_capacity_fields(cls, number_of_partitions):
         """
-        A method to load a partition into memory given a string representation
+        Return the column of the room capacity .csv that sets the maximum
+        of each of the built-in groupings (see default_groupings()), ex:
+        ["HALF_CLASS_MAXIMUM", "HALF_CLASS_MAXIMUM"] for an A/B partition
         
         Parameters
         ----------
-        partition:
-            a list of the form ["A", "C", "D", ...]
+        number_of_partitions : int
+            the number of cohorts (letters) students are divided into
+        """
+        if number_of_partitions == 2:
+            return ["HALF_CLASS_MAXIMUM"]*2
         
-        """     
-        student_partition_list = []
-
-        for student_partition_assignment in partition:
-            student_partition_list.append(student_partition_assignment)
-
-        self.partition = student_partition_list
-        return self.partition
-
-
-    def return_fitness(self):
+        if number_of_partitions == 4:
+            return ["QUARTER_CLASS_MAXIMUM"]*4 + ["HALF_CLASS_MAXIMUM"]*2
+        
+        return None
+        
+    def group_counts(self, counts):
         """
-        A method that loads the current partition into the Schedule object
-        and returns the fitness score of that partition
+        Return the number of students of each grouping in each course, 
+        with shape (..., number_of_courses, number_of_groupings)
         
         Parameters
         ----------
-        None
+        counts : numpy array
+            letter counts with shape (..., number_of_courses, number_of_partitions)
+        """
+        return counts @ self.membership
         
+    def compliance(self, counts, maxima = None):
         """
-        self.schedule_obj.load_partition(self.partition)        
-        self.fitness = self.schedule_obj.fitness_score()
-        return self.schedule_obj.fitness_score()
-    
-    def return_max_deviation(self):
+        Return a boolean array that is True for each course that is "In
+        Compliance" (no grouping is above its maximum)
+        
+        Parameters
+        ----------
+        counts : numpy array
+            letter counts with shape (..., number_of_courses, number_of_partitions)
+        maxima : numpy array
+            (optional) the maximum of each grouping in each course, shape 
+            (number_of_courses, number_of_groupings), see course_maxima() 
+            (default = None, which uses the same maxima for every course)
         """
-        A method that loads the current partitions into the Schedule object
-        and returns a list of the maximum deviation of each Course from
-        25-25-25-25% (if number_of_partitions = 4) or 50-50% (if number_of_partitions = 2)
-        of the total class size
-
+        if maxima is None:
+            maxima = self.maxima
+            
+        return np.all(self.group_counts(counts) <= maxima, axis=-1)
+        
+    def course_maxima(self, course_rooms, room_capacity_dict, course_half_maximum, course_quarter_maximum):
+        """
+        Return the maximum of each grouping in each course, with shape 
+        (number_of_courses, number_of_groupings), where the maximum of a 
+        grouping comes from the row of the course's room in the room 
+        capacity .csv (or from cohort_groupings if the room is not listed)
+        
         Parameters
         ----------
-        None
-
+        course_rooms : list
+            the room number of each course (or None)
+        room_capacity_dict : dict
+            the room capacities, see Schedule.room_capacities_from_csv() (or None)
+        course_half_maximum : numpy array
+            the half_class_maximum of each course (used by the built-in groupings)
+        course_quarter_maximum : numpy array
+            the quarter_class_maximum of each course (used by the built-in groupings)
         """
-
-        self.schedule_obj.load_partition(self.partition)        
-        self.max_deviation = self.schedule_obj.get_max_deviation()
-        return self.max_deviation
+        number_of_courses = len(course_half_maximum)
         
-class Population(IndividualPartition):
-    """
-    A class used to store a population of partitions (numerous IndividualPartition objects)
-    
-    Attributes
-    ----------
-    individual_partition_obj : IndividualPartition object
-        inherited from the IndividualPartition class
-    
-    population_size : int
-        the number of individuals in the population
+        maxima = np.empty((number_of_courses, len(self.grouping_names)), dtype=np.int64)
         
-    population : list
-        a list of IndividualPartition objects that represent the population 
-        (ex: [partition1, partition2, ...]
-    
-    sorted_scored_population : list
-        a list of tuples in the form [(score1, partition1), (score2, partition2), ...] 
-        that is sorted by fitness score in descending order (so score1 is highest)
+        for g, field in enumerate(self.capacity_fields):
+            if field == "HALF_CLASS_MAXIMUM":
+                maxima[:, g] = course_half_maximum
+            elif field == "QUARTER_CLASS_MAXIMUM":
+                maxima[:, g] = course_quarter_maximum
+            else:
+                maxima[:, g] = CourseThresholds.room_values(course_rooms, room_capacity_dict, field, 
+                                                            self.maxima[g], number_of_courses)
         
-    number_of_partitions: int
-        inherited from the IndividualSchedule class
-    
-    student_letter_list : list
-            either ["A", "B"] or ["A", "B", "C", "D"]
-    
-    Methods
-    -------
-    generate_individual()
-        generate a random partition, ex: ["A", "A", "C", "B", "D", "A", ...]
-    populate():
-        generate a population of N individuals (random partitions), where N is 
-        self.number_of_partitions and each individual is appended to the list 
-        at self.population
-    population_fitness()
-        assess the fitness of each individual in the population, stored in 
-        the attribute self.sorted_scored_population as a list in the form
-        [(score1, population1), (score2, population2), ...] where the 
-        scores are listed in descending order 
-    """
-    
-    def __init__(self, individual_partition_obj, population_size):
+        return maxima
+        
+    def course_capacity(self, maxima = None):
         """
+        Return an upper bound on the number of students that a course can 
+        have and still be "In Compliance", for each course
+        
+        For any set of groupings that covers every letter, the students of
+        a compliant course number at most the sum of their maxima (ex: 
+        2*half_class_maximum for the (A+B) and (C+D) groupings), so the 
+        smallest such sum is a bound (this is exact for the built-in 
+        groupings). A course with more students than this bound can never 
+        be "In Compliance"
+        
         Parameters
         ----------
-        individual_partition_obj : IndividualPartition object
-            inherited from the IndividualPartition class
-    
-        population_size : int
-            the number of individuals in the population            
-        
+        maxima : numpy array
+            (optional) the maximum of each grouping in each course, see 
+            course_maxima() (default = None, the same maxima for every course)
         """
-        self.individual_partition_obj = individual_partition_obj
-        self.population_size = population_size
-        self.population = []
-        self.sorted_scored_population = []
-        self.number_of_partitions = individual_partition_obj.number_of_partitions
-        self.student_letter_list = individual_partition_obj.student_letter_list
-
-    def generate_individual(self):
+        if maxima is None:
+            maxima = self.maxima[None, :]
+        
+        number_of_groupings = len(self.grouping_names)
+        
+        if np.any(self.membership.sum(axis=1) == 0):
+            # a letter without a grouping has no maximum:
+            return np.full(len(maxima), np.iinfo(np.int64).max, dtype=np.int64)
+        
+        # one grouping per letter (the grouping with the smallest maximum
+        # that contains the letter) always covers every letter:
+        letter_maxima = np.where(self.membership[None, :, :] > 0, maxima[:, None, :], np.iinfo(np.int64).max)
+        
+        capacity = letter_maxima.min(axis=-1).sum(axis=-1)
+        
+        # every other cover (for a small number of groupings):
+        if number_of_groupings <= 12:
+            subsets = (np.arange(1, 2**number_of_groupings)[:, None] >> np.arange(number_of_groupings)) & 1
+            covers = subsets[np.all(subsets @ self.membership.T > 0, axis=1)]
+            
+            capacity = np.minimum(capacity, (maxima @ covers.T).min(axis=-1))
+        
+        return capacity
+        
+    def course_tolerances(self, totals):
         """
-        A method to generate a random partition, ex: ["A", "A", "C", "B", "D", "A", ...]
+        Return the tolerance for applying a penalty to each grouping in each
+        course, with shape (number_of_courses, number_of_groupings) (for a 
+        small class, even share + 0.05 might not be feasible, so we use 
+        (total*even share + 1)/total instead)
         
         Parameters
         ----------
-        None
+        totals : numpy array
+            the number of students in each course, shape (number_of_courses,)
         """
+        return np.maximum(self.even_shares + self.tolerance_margin, 
+                          (totals[..., None]*self.even_shares + 1)/totals[..., None])
         
-        return self.individual_partition_obj.generate_partition()
-
-
-    def load_population(self, population):
+    def course_terms(self, counts, totals, course_weight, maxima = None, tolerances = None):
         """
-        A method to load a population into memory given a string representation
+        Apply the rules to every course at once, returning a tuple 
+        (weighted_terms, penalties, good, other) in the same form as 
+        FitnessEngine.course_terms()
         
         Parameters
         ----------
-        population:
-            a list of partitions, where each partition is represented as a list ["A", "C", "D", ...]
-            Example: [ ["A", "C", "D"], ["B", "B", "A"], ["C", "A", "A"] ]
+        counts : numpy array
+            letter counts with shape (..., number_of_courses, number_of_partitions)
+        totals : numpy array
+            the number of students in each course, shape (number_of_courses,)
+        course_weight : float
+            the amount a course that is "In Compliance" adds to the score
+        maxima : numpy array
+            (optional) the maximum of each grouping in each course, see 
+            course_maxima() (default = None, the same maxima for every course)
+        tolerances : numpy array
+            (optional) the precomputed course_tolerances(totals)
+        """
+        if maxima is None:
+            maxima = self.maxima
         
-        """        
+        if tolerances is None:
+            tolerances = self.course_tolerances(totals)
         
-        self.population = []
-        for partition in population:
-            individual = self.individual_partition_obj.load_partition(partition)
-            self.population.append(individual)
-
+        not_compliant = ~self.compliance(counts, maxima)
+        
+        # the share of each grouping is the sum of the shares of its letters:
+        percents = counts/totals[..., None]
+        group_percents = percents @ self.membership
+        
+        penalized = not_compliant[..., None] & (group_percents > tolerances)
+        
+        penalty_terms = np.where(penalized, -(self.multipliers*(group_percents - self.even_shares)), 0.0)
+        
+        # an "Out of Compliance" course for which no penalty was applied:
+        balanced = not_compliant & ~np.any(penalized, axis=-1)
+        
+        # courses too big to ever be "In Compliance" (even an even split is 
+        # above the maximum of some grouping) are counted as good when they 
+        # are evenly partitioned:
+        too_big = np.any(totals[..., None]*self.even_shares > maxima, axis=-1)
+        
+        good = ~not_compliant | (balanced & too_big)
+        other = balanced & ~too_big
+        
+        good_term = np.where(good, course_weight, 0.0)
+        
+        weighted_terms = np.concatenate((penalty_terms, good_term[..., None]), axis=-1)
+        
+        return weighted_terms, np.count_nonzero(penalized, axis=-1), good, other
 
-    def populate(self):
+class CourseThresholds:
+    """
+    A class used to store the thresholds of the fitness rules for every 
+    course as arrays: the class maxima of each course (which can depend on
+    the room, see Schedule.room_capacities_from_csv()) and the tolerances 
+    for applying penalties, which only depend on the size of the course, 
+    so they are computed once instead of on every evaluation
+    
+    Attributes
+    ----------
+    course_totals : numpy array
+        the number of students on the roster of each course
+    half_class_maximum : numpy array
+        the max size of a partition when dividing the students of each 
+        course into two cohorts
+    quarter_class_maximum : numpy array
+        the max size of a partition when dividing the students of each 
+        course into four cohorts
+    pairwise_tolerance : numpy array
+        max(0.55, (total/2 + 1)/total) for each course, see Schedule.fitness_score()
+    individual_tolerance : numpy array
+        max(0.3, (total/4 + 1)/total) for each course, see Schedule.fitness_score()
+    grouping_maxima : numpy array
+        the maximum of each cohort grouping in each course, shape 
+        (number_of_courses, number_of_groupings), see CohortRules 
+        (None if there are no cohort rules)
+    grouping_tolerance : numpy array
+        the penalty tolerance of each cohort grouping in each course 
+        (None if there are no cohort rules)
+    course_multiplicity : numpy array
+        the number of identical sections that each course stands for 
+        (None if every course is a single section, see Presolve)
+        
+    Methods
+    -------
+    room_values(course_rooms, room_capacity_dict, field, default, number_of_courses)
+        the value of one column of the room capacity .csv for each course
+    take(course_index)
+        the thresholds of some of the courses
+    """
+    
+    def __init__(self, course_totals, course_rooms, half_class_maximum, quarter_class_maximum, 
+                 cohort_rules = None, room_capacity_dict = None):
         """
-        A method to generate a population of N individuals (random partitions),
-        where N is self.number_of_partitions and each individual is appended
-        to the list at self.population
+        The constructor for the CourseThresholds class
         
         Parameters
         ----------
-        None
+        course_totals : numpy array
+            the number of students on the roster of each course
+        course_rooms : list
+            the room number of each course (or None)
+        half_class_maximum : int
+            the max size of a partition when dividing students into two 
+            cohorts, for courses in rooms without a capacity
+        quarter_class_maximum : int
+            the max size of a partition when dividing students into four 
+            cohorts, for courses in rooms without a capacity
+        cohort_rules : CohortRules object
+            (optional) the cohort constraints (default = None)
+        room_capacity_dict : dict
+            (optional) the room capacities, see Schedule.room_capacities_from_csv()
+            (default = None)
         """
+        totals = np.asarray(course_totals, dtype=np.int64)
+        number_of_courses = len(totals)
+        
+        self.course_totals = totals
+        self.half_class_maximum = self.room_values(course_rooms, room_capacity_dict, "HALF_CLASS_MAXIMUM", 
+                                                   half_class_maximum, number_of_courses)
+        self.quarter_class_maximum = self.room_values(course_rooms, room_capacity_dict, "QUARTER_CLASS_MAXIMUM", 
+                                                      quarter_class_maximum, number_of_courses)
+        
+        # the same tolerances as Schedule.fitness_score():
+        self.pairwise_tolerance = np.maximum(0.55, (totals/2+1)/totals)
+        self.individual_tolerance = np.maximum(0.3, (totals/4+1)/totals)
+        
+        if cohort_rules is not None:
+            self.grouping_maxima = cohort_rules.course_maxima(course_rooms, room_capacity_dict, 
+                                                              self.half_class_maximum, self.quarter_class_maximum)
+            self.grouping_tolerance = cohort_rules.course_tolerances(totals)
+        else:
+            self.grouping_maxima = None
+            self.grouping_tolerance = None
         
-        for _ in range(self.population_size):
-            individual = self.individual_partition_obj.generate_partition()
-            self.population.append(individual)
-
-    def population_fitness(self):
+        self.course_multiplicity = None
+    
+    @classmethod
+    def room_values(cls, course_rooms, room_capacity_dict, field, default, number_of_courses):
         """
-        A method to assess the fitness of each individual in the population, 
-        stored in the attribute self.sorted_scored_population as a list in the form
-        [(score1, population1), (score2, population2), ...] where the 
-        scores are listed in descending order 
+        Return an array with the value of one column of the room capacity 
+        .csv for the room of each course (default for rooms that are not 
+        listed, or whose value is blank)
         
         Parameters
         ----------
-        None
+        course_rooms : list
+            the room number of each course (or None)
+        room_capacity_dict : dict
+            the room capacities, see Schedule.room_capacities_from_csv() (or None)
+        field : str
+            the (normalized) column header, ex: "HALF_CLASS_MAXIMUM"
+        default : int
+            the value for rooms without a capacity
+        number_of_courses : int
+            the number of courses
         """
-        self.sorted_scored_population = []
-
-        for individual in self.population:
-            self.individual_partition_obj.partition = individual
-            fitness = self.individual_partition_obj.return_fitness()
-            tuple = (fitness, list(individual))
-            self.sorted_scored_population.append(tuple)
+        values = np.full(number_of_courses, default, dtype=np.int64)
         
-        self.sorted_scored_population.sort(reverse = True)
+        if course_rooms is None or not room_capacity_dict:
+            return values
         
-        return self.sorted_scored_population
+        for course_index, room_number in enumerate(course_rooms):
+            capacity_dict = room_capacity_dict.get(str(room_number).strip())
+            
+            if capacity_dict is not None and field in capacity_dict:
+                values[course_index] = capacity_dict[field]
+        
+        return values
+    
+    def take(self, course_index):
+        """
+        Return the thresholds of some of the courses (ex: the courses 
+        affected by a change, see DeltaEvaluator) as a new CourseThresholds
+        
+        Parameters
+        ----------
+        course_index : numpy array
+            the indices of the courses
+        """
+        subset = CourseThresholds.__new__(CourseThresholds)
+        
+        for name, array in vars(self).items():
+            setattr(subset, name, None if array is None else array[course_index])
+        
+        return subset
 
-class GeneticAlgorithm(Population):
+class Presolve:
     """
-    A class that implements the methods of a genetic algorithm 
+    A class used to shrink a compiled schedule before it is optimized, by
+    removing the parts of the problem whose score cannot change:
+    
+    1. courses that are "In Compliance" under any partition (no more 
+       students than the smallest maximum, ex: quarter_class_maximum) are
+       removed, and their score is added as a constant offset
+    2. sections with identical rosters (and the same thresholds) always 
+       have the same letter counts, so each set of them is scored once 
+       and weighted by the number of sections
+    3. subgroups whose every course was removed (and that do not share a
+       preferred subgroup with another subgroup) do not affect the score, 
+       so they are dropped from the genome
+    
+    Courses that can never be "In Compliance" (more students than 
+    CohortRules.course_capacity()) are counted, but they are not removed,
+    since their penalties still depend on how evenly they are partitioned
+    
+    The fitness of a presolved genome is the same tuple as the fitness of
+    the full genome (up to floating point rounding of weighted_fitness_score,
+    since the terms are added in a different order)
     
     Attributes
     ----------
-    population_obj : Population object
-        inherited from the Population class
-    generation_number : int
-        the current generation the algorithm is on
-    mutation_rate : float
-        the rate of mutation for each child, with
-        a default value of 0.01 (1%)
-    current_generation: 
-        a deep copy of the sorted_scored_population attribute from population_obj,
-        this is a list in the form [(score1, population1), (score2, population2), ...]
-    next_generation:
-        the next generation of individuals as determined by the algorithm, 
-        this is a list in the form [(score1, population1), (score2, population2), ...]
-    number_of_partitions: int
-        inherited from the Population class
-    student_letter_list : list
-        either ["A", "B"] or ["A", "B", "C", "D"]   
+    original : CompiledSchedule object
+        the compiled schedule before presolving
+    compiled : CompiledSchedule object
+        the presolved schedule (fewer courses and subgroups), which only 
+        has the arrays needed to evaluate partitions
+    course_thresholds : CourseThresholds object
+        the thresholds of the presolved courses, with course_multiplicity
+    number_of_partitions : int
+        the number of partitions students are to be separated into 
+    number_of_courses : int
+        the number of courses before presolving
+    always_compliant : numpy array
+        True for each course that is "In Compliance" under any partition
+    never_compliant : numpy array
+        True for each course that can never be "In Compliance"
+    kept_courses : numpy array
+        the original index of each presolved course (the first of each set 
+        of identical sections)
+    kept_subgroups : numpy array
+        the original index of each subgroup of the presolved genome
+    dropped_subgroups : numpy array
+        the original index of each subgroup dropped from the genome
+    score_offset : tuple
+        the part of the fitness tuple from the removed courses:
+        (weighted_fitness_score, penalty_count, good_score, other_score)
         
     Methods
     -------
-    mutate(individual_partition)
-        a method to mutate children based on a specified mutation rate
-    children(parent1, parent2)
-        produce two children (new partitions) by performing random
-        crossover and mutation on the parents (original partitions)
-    run_tournament(scored_population)
-        select two parents from the population using Tournament Selection
-    generate_next_generation()
-        use self.current_generation to generate self.next_generation
+    reduce_compiled()
+        build the presolved CompiledSchedule
+    reduce_genome(genome)
+        the presolved genome of a full genome
+    expand_genome(genome)
+        the full genome of a presolved genome
+    summary()
+        a report of how much of the problem was removed
     """
     
-    def __init__(self, population_obj, generation_number, mutation_rate = 0.01):
+    def __init__(self, compiled, number_of_partitions, course_thresholds, cohort_rules):
         """
+        The constructor for the Presolve class
+        
         Parameters
         ----------
-        population_obj : Population object
-            inherited from the Population class
-        generation_number : int
-            the current generation the algorithm is on
-        mutation_rate : float
-            the rate of mutation for each child, with
-            a default value of 0.01 (1%)
-        current_generation: 
-            a deep copy of the sorted_scored_population attribute from population_obj,
-            this is a list in the form [(score1, population1), (score2, population2), ...]
-        next generation:
-            the next generation of individuals as determined by the algorithm, 
-            this is a list in the form [(score1, population1), (score2, population2), ...]
-        number_of_partitions: int
-            inherited from the Population class
+        compiled : CompiledSchedule object
+            the compiled schedule to presolve
+        number_of_partitions : int
+            the number of partitions students are to be separated into 
+        course_thresholds : CourseThresholds object
+            the thresholds of every course (see Schedule.course_threshold_table())
+        cohort_rules : CohortRules object
+            the cohort constraints (used to decide which courses are 
+            "In Compliance" under any partition)
         """
-        self.population_obj = population_obj
-        self.generation_number = generation_number
-        self.mutation_rate = mutation_rate
-        self.current_generation = [(population[0],population[1][:]) for population in population_obj.sorted_scored_population]
-        self.next_generation = None
-        self.number_of_partitions = population_obj.number_of_partitions
-        self.student_letter_list = population_obj.student_letter_list
+        self.original = compiled
+        self.number_of_partitions = number_of_partitions
+        self.number_of_courses = compiled.number_of_courses
         
-    def mutate(self, individual_partition):
-        """
-        A method to mutate children based on a specified mutation rate
+        totals = course_thresholds.course_totals
+        maxima = course_thresholds.grouping_maxima
         
-        Source: https://en.wikipedia.org/wiki/Mutation_(genetic_algorithm)
+        # no grouping can have more students than the whole course:
+        self.always_compliant = totals <= maxima.min(axis=1)
+        self.never_compliant = totals > cohort_rules.course_capacity(maxima)
         
-        Parameters
-        ----------
-        individual_partition : list
-            a list in the form ["A", "A", "B", "D", "A", "C", "B", "C", ...]
-        """        
-                
-        # the mutated partition
-        new_partition = []
+        # merge the remaining sections whose rosters (as sorted lists of 
+        # subgroups) and thresholds are identical:
+        # key: (roster, thresholds)
+        # value: the index of the first section with this key in kept_courses
+        section_dict = {}
+        kept_courses = []
+        course_multiplicity = []
         
-        # for each letter in your ["A", "A", "B", "D", "A", "C", "B", "C", ...]:
-        for letter in individual_partition: 
-            
-            # generate a random number between 0 and 1 
-            # (rolling the dice to see if we are a winner)
-            check_mutate = random.random() 
+        course_offsets = compiled.course_offsets
+        enrollment_subgroup = compiled.enrollment_subgroup
+        
+        for course_index in np.flatnonzero(~self.always_compliant).tolist():
+            roster = np.sort(enrollment_subgroup[course_offsets[course_index]:course_offsets[course_index + 1]])
             
-            # if we win our "dice roll", then mutate:
-            if check_mutate < self.mutation_rate:
-                # subtract the letter from STUDENT_LETTER_LIST
-                # for example, if letter = "A" and 
-                # STUDENT_LETTER_LIST = ["A","B","C","D"], then
-                # intersected_list = ["B","C","D"]
-                intersected_list = [element for element in self.student_letter_list if element is not letter]
-                
-                # mutated letter is a random selection from
-                # intersected_list:
-                new_letter = random.choice(intersected_list)
-                
-                # append this new_letter to new_partition
-                new_partition.append(new_letter)
+            key = (roster.tobytes(), 
+                   int(course_thresholds.half_class_maximum[course_index]), 
+                   int(course_thresholds.quarter_class_maximum[course_index]), 
+                   maxima[course_index].tobytes())
             
-            # if we do not win our dice roll, do not
-            # mutate, just append the original letter
-            # onto new_partition
+            if key in section_dict:
+                course_multiplicity[section_dict[key]] += 1
             else:
-                new_partition.append(letter)
+                section_dict[key] = len(kept_courses)
+                kept_courses.append(course_index)
+                course_multiplicity.append(1)
         
-        # return the mutated partition
-        return new_partition
-
-    @classmethod
-    def get_children_pair(cls, parent1, parent2):
+        self.kept_courses = np.array(kept_courses, dtype=np.int64)
+        
+        # keep the subgroups enrolled in a kept course, and every subgroup 
+        # that shares a preferred subgroup with another subgroup (a 
+        # preferred subgroup of a single subgroup is never split):
+        is_kept = np.zeros(compiled.number_of_subgroups, dtype=bool)
+        
+        positions, _ = compiled.gather_ranges(course_offsets, self.kept_courses)
+        is_kept[enrollment_subgroup[positions]] = True
+        
+        if compiled.number_of_preferred_subgroups > 0:
+            group_starts = compiled.preferred_offsets[:-1]
+            member_subgroup = compiled.preferred_member_subgroup
+            
+            is_shared = (np.minimum.reduceat(member_subgroup, group_starts) 
+                         != np.maximum.reduceat(member_subgroup, group_starts))
+            
+            is_kept[member_subgroup[np.repeat(is_shared, np.diff(compiled.preferred_offsets))]] = True
+        
+        self.kept_subgroups = np.flatnonzero(is_kept)
+        self.dropped_subgroups = np.flatnonzero(~is_kept)
+        
+        self.compiled = self.reduce_compiled()
+        
+        self.course_thresholds = course_thresholds.take(self.kept_courses)
+        self.course_thresholds.course_multiplicity = np.array(course_multiplicity, dtype=np.int64)
+        
+        # every removed course is "In Compliance":
+        number_removed = int(np.count_nonzero(self.always_compliant))
+        
+        self.score_offset = (number_removed*(100/self.number_of_courses), 0, number_removed, 0)
+        
+    def reduce_compiled(self):
         """
-        a given pair of parents create 2 new children:
-            1. child1 starts off as a clone of parent1, just as child2 starts off as a clone of parent2.
-            2. these 2 clones then have an opportunity to swap some genes (individual student letter assignments).
-               this happens by selecting a random [relatively small] subset of itself (i.e. a set of indices), and 
-               having child1 and child2 swap their letters at these indices.
-
-               the idea is that each parent might have found a successful schedule of a small "chunk" of students
-               that the other parent did not find yet (or was not successful in that overall environment), and this
-               is a way to inject those small "local" changes (local in the sense that it is an improvement that can
-               be made to a small subset of students that doesn't really affect those outside of this subset).
-            3. so whenever we take a parent from island1 to cross it with a parent from island2, the original population
-               [of island1] gets 2 children: one that is a near-clone of parent1 (and island1 native), and another one
-               that is a near-clone of parent2 (a foreigner from island2)
-
-        ****
+        Return a CompiledSchedule with only the kept courses (one per set 
+        of identical sections) and the kept subgroups, where subgroup 
+        kept_subgroups[i] of the original schedule is subgroup i
         
         Parameters
         ----------
-        parent1:
-            list of letters representing parent1 (the partition)
-
-        parent2:
-            list of letters representing parent1 (the partition)
-
-        """    
-
-        genome_length = min(len(parent1), len(parent2))
-
-        # child1 and child2 start off as clones of their respective parents
-        child1 = parent1[:]
-        child2 = parent2[:]
-
-        # size of cohort to inject, i.e. number of letters to replace in the partition
-        # this is purely based on [what seems right to me] based on some limited experimentation
-        # far from finalized, please feel free to play around with the parameters
-        # some small number (such as between 10 and 40) seems to work best
-        injection_size = random.randint(10,30)
-
-        # choose injection_size random indexes which will get the other parent's genes
-        for _ in range(injection_size):
-            # choose 
-            rand_index = random.randint(0, genome_length-1)
-            temp = child1[rand_index]
-            child1[rand_index] = child2[rand_index]
-            child2[rand_index] = temp
-
-        return child1, child2
+        None
+        """
+        original = self.original
+        
+        # the new index of each original subgroup (-1 if dropped):
+        new_index = np.full(original.number_of_subgroups, -1, dtype=np.int32)
+        new_index[self.kept_subgroups] = np.arange(len(self.kept_subgroups), dtype=np.int32)
+        
+        compiled = CompiledSchedule()
+        
+        compiled.number_of_students = original.number_of_students
+        compiled.number_of_subgroups = len(self.kept_subgroups)
+        compiled.number_of_courses = len(self.kept_courses)
+        compiled.student_subgroup = new_index[original.student_subgroup]
+        
+        compiled.course_totals = original.course_totals[self.kept_courses]
+        compiled.course_offsets = np.zeros(compiled.number_of_courses + 1, dtype=np.int64)
+        np.cumsum(compiled.course_totals, out=compiled.course_offsets[1:])
+        
+        positions, _ = original.gather_ranges(original.course_offsets, self.kept_courses)
+        
+        compiled.enrollment_student = original.enrollment_student[positions]
+        compiled.enrollment_subgroup = new_index[original.enrollment_subgroup[positions]]
+        compiled.enrollment_course = np.repeat(np.arange(compiled.number_of_courses, dtype=np.int32),
+                                               compiled.course_totals)
+        
+        # every preferred subgroup is kept (so each split still costs 100 
+        # divided by the number of preferred subgroups), but the members of 
+        # a preferred subgroup whose only subgroup was dropped point at 
+        # subgroup 0 instead, since such a subgroup is never split:
+        if original.number_of_preferred_subgroups > 0 and compiled.number_of_subgroups > 0:
+            compiled.number_of_preferred_subgroups = original.number_of_preferred_subgroups
+            compiled.preferred_offsets = original.preferred_offsets
+            compiled.preferred_member_subgroup = np.maximum(new_index[original.preferred_member_subgroup], 0)
+        
+        if original.course_rooms is not None:
+            compiled.course_rooms = original.course_rooms[self.kept_courses]
+        
+        compiled.index_subgroups()
+        
+        return compiled
     
-    def children(self, parent1, parent2):
+    def reduce_genome(self, genome):
         """
-        A method to produce two children (new partitions) by performing random
-        crossover and mutation on the parents (original partitions).
+        Return the presolved genome of a full genome (or of a 2-D array 
+        with one genome per row)
         
-        Note: this function does not select the parents, it only performs the
-        crossover/mutation steps once the parents have been selected
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup of the original schedule
+        """
+        return genome[..., self.kept_subgroups]
+    
+    def expand_genome(self, genome):
+        """
+        Return the full genome of a presolved genome, where the dropped 
+        subgroups (whose letters do not affect the score) are assigned 
+        the letters A, B, C, ... in turn, so that the letters stay balanced
         
-        Source (mutation): https://en.wikipedia.org/wiki/Mutation_(genetic_algorithm)
-        Source (crossover): https://en.wikipedia.org/wiki/Crossover_(genetic_algorithm)
+        A genome that is already full length is returned unchanged
         
         Parameters
         ----------
-        parent1 : list
-            a list in the form ["A", "A", "B", "D", "A", "C", "B", "C", ...]
-        parent2 : list
-            a list in the form ["A", "A", "B", "D", "A", "C", "B", "C", ...]
-        """    
+        genome : numpy array
+            the letter index of each subgroup of the presolved schedule
+        """
+        if genome.shape[-1] == self.original.number_of_subgroups:
+            return genome
         
-        # the length of the parent lists
-        genome_length = len(parent1)
-
-
-        # one pair of parents produce one pair of children
-        child1, child2 = self.get_children_pair(parent1, parent2)
-
-
-        # mutate:
-        mutated_child1 = self.mutate(child1)
-        mutated_child2 = self.mutate(child2)
+        full_genome = np.empty(genome.shape[:-1] + (self.original.number_of_subgroups,), dtype=np.uint8)
+        full_genome[..., self.kept_subgroups] = genome
+        full_genome[..., self.dropped_subgroups] = np.arange(len(self.dropped_subgroups)) % self.number_of_partitions
         
-        # return the children as a tuple:
-        return mutated_child1, mutated_child2
-
-    @classmethod
-    def tournament_winner_index(cls, array_length, num_reps):
+        return full_genome
+    
+    def summary(self):
         """
-        Helper function. Uses tournament selection with num_reps representatives to 
-        select an index for an array of length array_length.
-
-        Source (tournament selection): https://en.wikipedia.org/wiki/Tournament_selection
-
+        Return a report of how much of the problem was removed, ex:
+        
+        Presolve: 412 of 602 courses scored (150 always in compliance, 40 identical sections merged, 
+        25 can never be in compliance), 1830 of 2010 subgroups in the genome
+        
         Parameters
         ----------
-        array_length: int
-            the length of the array for which we are using tournament selection
-
-        num_reps: int
-            number of representatives to use for tournament selection
-
-        """    
+        None
+        """
+        number_always = int(np.count_nonzero(self.always_compliant))
+        number_merged = self.number_of_courses - number_always - len(self.kept_courses)
         
-        # our population is stored in descending order, so start off by assuming
-        # we have the worst possible index, then we get num_reps tries
-        # to improve upon (i.e. to minimize) this value
-        cur_winner = array_length
-
-        for _ in range(num_reps):
-            cur_winner = min(cur_winner, random.randint(0, array_length-1))
+        return ("Presolve: " + str(len(self.kept_courses)) + " of " + str(self.number_of_courses) + " courses scored (" 
+                + str(number_always) + " always in compliance, " 
+                + str(number_merged) + " identical sections merged, " 
+                + str(int(np.count_nonzero(self.never_compliant))) + " can never be in compliance), " 
+                + str(len(self.kept_subgroups)) + " of " + str(self.original.number_of_subgroups) + " subgroups in the genome")
 
-        return cur_winner
-
-    def run_tournament(self, scored_population):
+class StudentClasses:
+    """
+    A class used to shrink the genome by grouping interchangeable subgroups
+    into classes: subgroups that are enrolled in exactly the same courses 
+    (most of them are single students with identical schedules) always 
+    give the same course counts, no matter which of them gets which letter, 
+    so only the number of members of each class assigned to each letter 
+    needs to be optimized
+    
+    A genome of this class has two parts (both stored as uint8):
+    
+    1. the letter of each free subgroup (subgroups that are not in a class,
+       in the order of the schedule), ex: [0, 2, 1, ...]
+    2. the letter counts of each class, number_of_partitions genes per 
+       class, ex: [3, 4, 2, 5, ...] for a class of 14 members
+    
+    Subgroups that share a preferred subgroup with other subgroups are 
+    never put in a class (their letters matter to the preferred subgroup),
+    and a set of identical subgroups only becomes a class if it has more 
+    members than number_of_partitions (otherwise the counts would take 
+    more genes than the letters). Classes with more than 255 members are split into 
+    chunks, so that every count fits in a uint8
+    
+    expand_genome() turns the counts back into one letter per subgroup 
+    (the first members of a class get "A", the next ones get "B", ...), 
+    which is how partitions are scored and written to student_assignments.csv
+    
+    Attributes
+    ----------
+    number_of_partitions : int
+        the number of partitions students are to be separated into 
+    number_of_subgroups : int
+        the number of subgroups of the compiled schedule (the length of an
+        expanded genome)
+    free_subgroups : numpy array
+        the index of each subgroup that is not in a class
+    class_sizes : numpy array
+        the number of members of each class
+    class_offsets : numpy array
+        CSR offsets of the members of each class in class_members
+    class_members : numpy array
+        the subgroup index of the members of every class, class by class
+    member_class : numpy array
+        the class of each entry of class_members
+    member_rank : numpy array
+        the position of each entry of class_members within its class
+    number_of_classes : int
+        the number of classes
+    genome_length : int
+        the number of genes of a genome of this class
+    gene_blocks : numpy array
+        the first gene of the block that each gene belongs to (the genes
+        of the counts of a class form one block, every letter of a free 
+        subgroup is a block of its own), used by crossover to swap the 
+        counts of a class as a whole
+        
+    Methods
+    -------
+    expand_genome(genome)
+        the letter of each subgroup of a genome
+    compress_genome(genome)
+        the genome of a partition with one letter per subgroup
+    random_genome(rng)
+        a random genome
+    mutate_counts(genome, mutation_rate, rng)
+        move members of classes from one letter to another
+    summary()
+        a report of how much the genome was shrunk
+    """
+    
+    # the largest number of members of a class (the largest uint8)
+    maximum_class_size = 255
+    
+    def __init__(self, compiled, number_of_partitions):
         """
-        A method to select two parents from the population. This algorithm
-        uses Tournament Selection, though there may be performance gains 
-        from trying other selection methods or modifying the size of the 
-        tournament. 
+        The constructor for the StudentClasses class
         
-        Source (selection): https://en.wikipedia.org/wiki/Genetic_algorithm#Selection
-        Source (tournament selection): https://en.wikipedia.org/wiki/Tournament_selection
+        Parameters
+        ----------
+        compiled : CompiledSchedule object
+            the compiled schedule (or presolved schedule) whose subgroups
+            are grouped into classes
+        number_of_partitions : int
+            the number of partitions students are to be separated into 
+        """
+        self.number_of_partitions = number_of_partitions
+        self.number_of_subgroups = compiled.number_of_subgroups
+        
+        # subgroups that share a preferred subgroup with another subgroup 
+        # stay free (a preferred subgroup of a single subgroup is never split):
+        in_preferred = np.zeros(self.number_of_subgroups, dtype=bool)
+        
+        if compiled.number_of_preferred_subgroups > 0:
+            group_starts = compiled.preferred_offsets[:-1]
+            member_subgroup = compiled.preferred_member_subgroup
+            
+            is_shared = (np.minimum.reduceat(member_subgroup, group_starts) 
+                         != np.maximum.reduceat(member_subgroup, group_starts))
+            
+            in_preferred[member_subgroup[np.repeat(is_shared, np.diff(compiled.preferred_offsets))]] = True
+        
+        # key: the sorted courses of a subgroup
+        # value: the subgroups with these courses
+        class_dict = {}
+        
+        subgroup_offsets = compiled.subgroup_offsets
+        subgroup_course = compiled.subgroup_course
+        
+        for subgroup in np.flatnonzero(~in_preferred).tolist():
+            key = np.sort(subgroup_course[subgroup_offsets[subgroup]:subgroup_offsets[subgroup + 1]]).tobytes()
+            
+            if key in class_dict:
+                class_dict[key].append(subgroup)
+            else:
+                class_dict[key] = [subgroup]
+        
+        is_free = np.ones(self.number_of_subgroups, dtype=bool)
+        class_list = []
+        
+        for members in class_dict.values():
+            if len(members) <= number_of_partitions:
+                continue
+            
+            is_free[members] = False
+            
+            # split large classes into (nearly) equal chunks of at most 255:
+            number_of_chunks = -(-len(members)//self.maximum_class_size)
+            class_list.extend(np.array_split(np.array(members, dtype=np.int64), number_of_chunks))
+        
+        self.free_subgroups = np.flatnonzero(is_free)
+        self.number_of_classes = len(class_list)
+        
+        self.class_sizes = np.array([len(members) for members in class_list], dtype=np.int64)
+        self.class_offsets = np.zeros(self.number_of_classes + 1, dtype=np.int64)
+        np.cumsum(self.class_sizes, out=self.class_offsets[1:])
+        
+        if self.number_of_classes > 0:
+            self.class_members = np.concatenate(class_list)
+        else:
+            self.class_members = np.zeros(0, dtype=np.int64)
+        
+        self.member_class = np.repeat(np.arange(self.number_of_classes, dtype=np.int64), self.class_sizes)
+        self.member_rank = np.arange(len(self.class_members), dtype=np.int64) - self.class_offsets[self.member_class]
+        
+        number_of_free = len(self.free_subgroups)
+        self.genome_length = number_of_free + self.number_of_classes*number_of_partitions
+        
+        # every gene of the counts of a class points to the first count:
+        self.gene_blocks = np.arange(self.genome_length, dtype=np.int64)
+        self.gene_blocks[number_of_free:] -= (self.gene_blocks[number_of_free:] - number_of_free) % number_of_partitions
+        
+    def class_counts(self, genome):
+        """
+        Return the letter counts of a genome as an array of shape 
+        (number_of_classes, number_of_partitions) (or with one more 
+        leading axis for a 2-D array of genomes)
         
         Parameters
         ----------
-        scored_population : list
-            a list of individuals in the form [partition1, partition2, partition3,...], 
-            where the list is sorted in descending fitness order 
-            (that is, fitness(partitionX) > fitness(partitionY) for X < Y)
+        genome : numpy array
+            a genome of this class (or a 2-D array with one genome per row)
         """
-        scored_population_length = len(scored_population)
-
-
-        # for the tournament selection when crossing two partitions within an island,
-        # the number of representatives to use. the below seems to work well in practice.
-        number_of_tournament_reps_per_population = scored_population_length //10
-
-
-        # select the two parents using tournament selection
-        # the number 4 is somewhat arbitrary, but seems to work well in practice
-        parent1_index = self.tournament_winner_index(scored_population_length, number_of_tournament_reps_per_population)
-        parent1 = list(scored_population[parent1_index])
+        number_of_free = len(self.free_subgroups)
+        
+        return genome[..., number_of_free:].reshape(genome.shape[:-1] + (self.number_of_classes, self.number_of_partitions))
+    
+    def expand_genome(self, genome):
+        """
+        Return the letter of each subgroup of a genome (or of a 2-D array 
+        with one genome per row), where the first members of each class 
+        get letter 0 ("A"), the next ones get letter 1 ("B"), ... 
         
-        parent2_index = self.tournament_winner_index(scored_population_length, number_of_tournament_reps_per_population)
-        parent2 = list(scored_population[parent2_index])
+        A genome with one letter per subgroup is returned unchanged
         
-        # return the parents as a tuple:
-        return parent1, parent2
-           
-    def generate_next_generation(self):
+        Parameters
+        ----------
+        genome : numpy array
+            a genome of this class
         """
-        The main method of the GeneticAlgorithm class: use self.current_generation
-        to generate self.next_generation
+        if genome.shape[-1] == self.number_of_subgroups:
+            return genome
         
-        Source: https://en.wikipedia.org/wiki/Genetic_algorithm
+        expanded_genome = np.empty(genome.shape[:-1] + (self.number_of_subgroups,), dtype=np.uint8)
+        expanded_genome[..., self.free_subgroups] = genome[..., :len(self.free_subgroups)]
+        
+        # the rank at which each letter ends in each class, ex: counts of 
+        # [3, 4, 2, 5] end at ranks [3, 7, 9, 14], so the members of rank 
+        # 0-2 get "A", 3-6 get "B", 7-8 get "C" and 9-13 get "D"
+        letter_ends = np.cumsum(self.class_counts(genome), axis=-1, dtype=np.int64)
+        
+        # the letter of a member is the number of letters that end at or before its rank:
+        member_letter = (letter_ends[..., self.member_class, :] <= self.member_rank[:, None]).sum(axis=-1)
+        
+        expanded_genome[..., self.class_members] = np.minimum(member_letter, self.number_of_partitions - 1)
+        
+        return expanded_genome
+    
+    def compress_genome(self, genome):
+        """
+        Return the genome of this class for a partition with one letter per
+        subgroup (or for a 2-D array with one partition per row)
         
         Parameters
         ----------
-        None
-        """ 
-        # the next_generation should be the same length as the current_generation
-        next_generation_length = len(self.current_generation)
+        genome : numpy array
+            the letter index of each subgroup
+        """
+        number_of_partitions = self.number_of_partitions
+        leading_shape = genome.shape[:-1]
+        number_of_rows = int(np.prod(leading_shape, dtype=np.int64))
         
-        # Use elitist selection for 20% of self.next_generation
-        # Source: https://en.wikipedia.org/wiki/Selection_(genetic_algorithm)#e._Elitism_Selection
-        elites_length = 2*next_generation_length//10
+        compressed_genome = np.empty(leading_shape + (self.genome_length,), dtype=np.uint8)
+        compressed_genome[..., :len(self.free_subgroups)] = genome[..., self.free_subgroups]
         
-        # Introduce completely new individuals for 10% of self.next_generation
-        new_blood_length = next_generation_length//10
+        # count the letters of every (row, class) pair with a single bincount:
+        member_letter = genome[..., self.class_members].reshape(number_of_rows, -1).astype(np.int64)
+        bins = (np.arange(number_of_rows, dtype=np.int64)[:, None]*self.number_of_classes 
+                + self.member_class)*number_of_partitions + member_letter
         
-        # Use crossover for the remaining 70% of self_next_generation
-        # Source: https://en.wikipedia.org/wiki/Crossover_(genetic_algorithm)
-        children_length = next_generation_length - elites_length - new_blood_length
+        counts = np.bincount(bins.ravel(), minlength = number_of_rows*self.number_of_classes*number_of_partitions)
         
-        # A container for the list of individuals that will be added to self.next_generation
-        # This initial list starts out unscored: [partition1, partition2, partition3,...]
-        next_generation_individuals = []
+        compressed_genome[..., len(self.free_subgroups):] = counts.reshape(leading_shape + (-1,))
         
-        # A list of elites (the fittest 20% of the self.current_generation)
-        # This list is in the form [partition1, partition2, partition3,...]
-        elites = [item[1] for item in self.current_generation[0:elites_length]]
+        return compressed_genome
+    
+    def random_genome(self, rng):
+        """
+        Return a random genome: a random letter for each free subgroup and 
+        random (multinomial) letter counts for each class
+        
+        Parameters
+        ----------
+        rng : numpy.random.Generator
+            the random number generator to use
+        """
+        number_of_partitions = self.number_of_partitions
         
-        # Add these to the next_generation_individuals
-        next_generation_individuals.extend(elites)
+        free_letters = rng.integers(0, number_of_partitions, size = len(self.free_subgroups), dtype = np.uint8)
         
-        # Generate the "new blood" (the 10% completely random individuals)
-        # Note: these individuals are currently unscored
-        for i in range(new_blood_length):
-            ith_partition = self.population_obj.generate_individual()
-            next_generation_individuals.append(ith_partition)
-
-        # A list of all individuals from self.current_generation, 
-        # these are the potential parents for self.next_generation
-        # Note: this list is in the form [partition1, partition2, partition3,...]
-        ordered_individuals = [element[1][:] for element in self.current_generation]
-
-        # For the remaining 70% of individuals in self.next_generation, 
-        # do the following:
-        # 1) Select two parents using tournament selection
-        # 2) Generate two children using crossover & mutation
-        for i in range(children_length//2):
-            
-            parent1, parent2 = self.run_tournament(ordered_individuals)
-            
-            child1, child2 = self.children(parent1, parent2)
-            
-            next_generation_individuals.extend([child1, child2])
-            
-            # We are generating children in pairs, if we accidentally
-            # add one child too many to self.next_generation, take off 
-            # the extra child 
-            if len(next_generation_individuals) > next_generation_length: 
-                next_generation_individuals = next_generation_individuals[0:-1]
+        counts = rng.multinomial(self.class_sizes, np.full(number_of_partitions, 1/number_of_partitions))
         
-        # next_generation_individuals has not yet been scored, so we
-        # use the Population class to assess the fitness of the next_generation:
-        self.population_obj.population = next_generation_individuals
-        scored_next_generation = self.population_obj.population_fitness()
+        return np.concatenate((free_letters, counts.ravel().astype(np.uint8)))
+    
+    def mutate_counts(self, genome, mutation_rate, rng):
+        """
+        Mutate the counts of a genome (or of a 2-D array with one genome per
+        row) in place: each class is mutated with the probability that at 
+        least one of its members would be mutated at mutation_rate, and a 
+        mutation moves one random member of the class to a random other letter
         
-        # after scoring, assign this to self.next_generation
-        # self.next_generation is in the form [(score1, partition1), (score2, partition2), ...]
-        self.next_generation = scored_next_generation
+        Parameters
+        ----------
+        genome : numpy array
+            a genome of this class (or a 2-D array of genomes)
+        mutation_rate : float
+            the rate of mutation of each member
+        rng : numpy.random.Generator
+            the random number generator to use
+        """
+        number_of_partitions = self.number_of_partitions
         
-        return self.population_obj.sorted_scored_population
+        if self.number_of_classes == 0:
+            return genome
+        
+        counts = self.class_counts(genome).astype(np.int64)
+        
+        class_rate = 1 - (1 - mutation_rate)**self.class_sizes
+        mutation_mask = rng.random(counts.shape[:-1]) < class_rate
+        
+        mutated_counts = counts[mutation_mask]
+        number_of_mutations = len(mutated_counts)
+        
+        # pick a random member of each class, and move it from its letter
+        # to one of the other letters (as in GeneticAlgorithm.mutate()):
+        mutated_class = np.nonzero(mutation_mask)[-1]
+        member_rank = rng.integers(0, self.class_sizes[mutated_class])
+        
+        old_letter = (np.cumsum(mutated_counts, axis=-1) <= member_rank[:, None]).sum(axis=-1)
+        new_letter = (old_letter + rng.integers(1, number_of_partitions, size = number_of_mutations)) % number_of_partitions
+        
+        mutation_index = np.arange(number_of_mutations)
+        mutated_counts[mutation_index, old_letter] -= 1
+        mutated_counts[mutation_index, new_letter] += 1
+        
+        counts[mutation_mask] = mutated_counts
+        
+        genome[..., len(self.free_subgroups):] = counts.reshape(genome.shape[:-1] + (-1,))
+        
+        return genome
+    
+    def summary(self):
+        """
+        Return a report of how much the genome was shrunk, ex:
+        
+        Student classes: 1650 subgroups with identical schedules in 120 classes, 
+        genome of 660 genes instead of 1830
+        
+        Parameters
+        ----------
+        None
+        """
+        return ("Student classes: " + str(len(self.class_members)) + " subgroups with identical schedules in " 
+                + str(self.number_of_classes) + " classes, genome of " + str(self.genome_length) 
+                + " genes instead of " + str(self.number_of_subgroups))
 
-class Reports:
+class FitnessEngine:
     """
-    A class for generating reports/visualizations of the algorithm's progress
+    A class that evaluates partitions using NumPy array operations over a 
+    CompiledSchedule, as a fast equivalent of Schedule.fitness_score() and 
+    Schedule.get_max_deviation()
+    
+    Per-course A/B/C/D counts are computed with np.bincount over the
+    compiled enrollment arrays, and the "In Compliance" rules and penalty
+    tolerances from Schedule.fitness_score() are applied to every course
+    at once with array operations instead of per-course if/elif branches.
+    
+    The penalty terms of each course are accumulated in the same order as
+    in Schedule.fitness_score() (using np.cumsum, which adds from left to
+    right), so score() returns the same tuple as Schedule.fitness_score().
+    
+    Note: the rules below are only implemented for number_of_partitions = 2
+    and = 4 (the same as Schedule.fitness_score())
     
     Attributes
     ----------
-    None
+    compiled : CompiledSchedule object
+        the compiled schedule to evaluate partitions against
+    number_of_partitions : int
+        the number of partitions students are to be separated into 
+    half_class_maximum : int
+        the target maximum size of a partition when dividing students 
+        into two cohorts (default value is 15)
+    quarter_class_maximum : int
+        the target maximum size of a partition when dividing students
+        into four cohorts (default value is 9)
+    number_of_courses : int
+        the number of courses at the school (before presolving)
+    course_weight : float
+        the amount a course that is "In Compliance" adds to the score
+    course_totals : numpy array
+        the number of students on the roster of each course
+    course_thresholds : CourseThresholds object
+        the class maxima and penalty tolerances of each course
+    presolve : Presolve object
+        the presolve that compiled was reduced by (or None)
+    score_offset : tuple
+        the part of the fitness tuple from the courses removed by presolve
+        (weighted_fitness_score, penalty_count, good_score, other_score)
+    student_classes : StudentClasses object
+        the classes of interchangeable subgroups (or None), in which case
+        score(), score_population() and max_deviation() take genomes of
+        StudentClasses and expand them first
         
     Methods
     -------
-    return_progress(cls, pid_string, generation_number, population, time)
-        concatenate a string with genetic algorithm progress
-    write_progress(cls, path, progress_string, write_or_append)
-        write a progress_string to the output log
-    return_era_progress(cls, era_number, start_timer, end_timer, total_time)
-        concatenate a string with parallel genetic algorithm progress
-    create_pie_chart(cls, era_number, fitness_score, in_compliance, total_courses)
-        generates a pie chart visualizing the number of classrooms in/out of compliance
-        with social distancing
-    create_histogram(cls, era_number, num_partitions, best_partition_score, max_deviation, time_elapsed, time_limit)
-        generates a histogram of the max deviation from 25/25/25/25% split (if 4 partitions) or
-        50/50% split (if 2 partitions) for each "bad" course that is not in compliance
+    supports(number_of_partitions)
+        True if the rules are implemented for number_of_partitions
+    decode_genome(genome)
+        the letter of each subgroup of a genome of the optimizer
+    course_counts(genome)
+        count the students of each letter in each course
+    compliance(counts, thresholds)
+        flag the courses that are "In Compliance"
+    course_terms(counts, thresholds)
+        apply the fitness rules to an array of course counts
+    weigh_sections(course_terms, thresholds)
+        weight the terms of each course by its number of identical sections
+    update_courses(evaluator, changed_subgroups, new_letters)
+        move subgroups of a DeltaEvaluator and re-score their courses
+    preferred_terms(genome)
+        the penalty terms for preferred subgroups that have been split
+    score(genome)
+        evaluate a partition, returning the same tuple as Schedule.fitness_score()
+    score_population(genomes)
+        evaluate every partition in a population at once
+    max_deviation(genome)
+        the same list as Schedule.get_max_deviation() for a partition
     """
-
+    
+    # see the notes on pairwise_multiplier and individual_multiplier
+    # in Schedule.fitness_score()
+    pairwise_multiplier = 0.3
+    individual_multiplier = 0.25
+    
+    def __init__(self, compiled, number_of_partitions, half_class_maximum, quarter_class_maximum, course_thresholds = None, 
+                 presolve = None, student_classes = None):
+        """
+        The constructor for the FitnessEngine class
+        
+        Parameters
+        ----------
+        compiled : CompiledSchedule object
+            the compiled schedule to evaluate partitions against
+        number_of_partitions : int
+            the number of partitions students are to be separated into 
+        half_class_maximum : int
+            the target maximum size of a partition when dividing students 
+            into two cohorts
+        quarter_class_maximum : int
+            the target maximum size of a partition when dividing students
+            into four cohorts
+        course_thresholds : CourseThresholds object
+            (optional) the class maxima and penalty tolerances of each 
+            course (default = None, which uses half_class_maximum and 
+            quarter_class_maximum for every course)
+        presolve : Presolve object
+            (optional) if compiled is a presolved schedule, the Presolve 
+            that built it, so that the removed courses are added back to
+            the score (default = None)
+        student_classes : StudentClasses object
+            (optional) the classes of interchangeable subgroups of compiled,
+            if the optimizer uses their genomes (default = None)
+        """
+        if not self.supports(number_of_partitions):
+            print("In order to choose something other than an AB or ABCD partition, you must declare cohort_groupings in settings.yaml")    
+            raise NotImplementedError
+        
+        self.compiled = compiled
+        self.number_of_partitions = number_of_partitions
+        self.half_class_maximum = half_class_maximum
+        self.quarter_class_maximum = quarter_class_maximum
+        self.course_totals = compiled.course_totals.astype(np.int64)
+        self.presolve = presolve
+        self.student_classes = student_classes
+        
+        # the removed courses still count towards number_of_courses:
+        if presolve is not None:
+            self.number_of_courses = presolve.number_of_courses
+            self.score_offset = presolve.score_offset
+        else:
+            self.number_of_courses = compiled.number_of_courses
+            self.score_offset = (0.0, 0, 0, 0)
+        
+        self.course_weight = 100/self.number_of_courses
+        
+        if course_thresholds is None:
+            course_thresholds = CourseThresholds(self.course_totals, compiled.course_rooms, 
+                                                 half_class_maximum, quarter_class_maximum)
+        
+        self.course_thresholds = course_thresholds
+        
     @classmethod
-    def return_progress(cls, pid_string, generation_number, population, time):
+    def supports(cls, number_of_partitions):
         """
-        Concatenate a string to report progress of the algorithm
+        Return True if partitions with number_of_partitions letters can be
+        scored (the built-in rules are only implemented for 2 and 4)
         
         Parameters
         ----------
-        pid_string: string
-            process ID string
-
-        generation_number: int
-            the current generation number
-            
-        population : nested list
-            a sorted, scored population, from which we will be extracting
-            a fitness score
-            
-        time : time object
-            the time elapsed
-
-        """    
-        # Concatenate a string to report progress:
-        progress_string = "PID(" + pid_string + "):"
-        progress_string += "Generation = "
-        progress_string += str(generation_number)
-        progress_string += ", Fitness = "
-        progress_string += str(population[0][0][0])
-        progress_string += ", In Compliance = "
-        progress_string += str(population[0][0][2])
-        progress_string += " out of "
-        progress_string += str(population[0][0][-1])   
-        progress_string += ", elapsed time so far this era (sec) = " + str(time)
-
-        return progress_string
+        number_of_partitions : int
+            the number of partitions students are to be separated into 
+        """
+        return number_of_partitions == 2 or number_of_partitions == 4
     
-    @classmethod
-    def write_progress(cls, path, progress_string, write_or_append):
+    def decode_genome(self, genome):
         """
-        Write to the progress log
+        Return the letter index of each subgroup of compiled for a genome of
+        the optimizer (or a 2-D array with one genome per row), which is the
+        genome itself unless student_classes is set (see StudentClasses)
         
         Parameters
         ----------
-        path: path object
-            the directory to write to
-
-        progress_string: string
-            the string to write
-            
-        write_or_append : string
-            use 'w' or 'a' to write over current file contents or append 
-        """  
-
-        progress_file = path / 'progress_log.txt'    
-        with open(progress_file, write_or_append) as file:
-            file.write(progress_string)
-            file.write("\n")  
-
-    @classmethod
-    def return_era_progress(cls, era_number, start_timer, end_timer, total_time):
+        genome : numpy array
+            a genome of the optimizer, or the letter index of each subgroup
         """
-        Concatenate a string to report progress of the algorithm
+        if self.student_classes is None:
+            return genome
+        
+        return self.student_classes.expand_genome(genome)
+        
+    def course_counts(self, genome):
+        """
+        Count the students of each letter in each course, returned as an 
+        array of shape (number_of_courses, number_of_partitions)
         
         Parameters
         ----------
-        pid_string: string
-            process ID string
+        genome : numpy array
+            the letter index of each required subgroup 
+            (see CompiledSchedule.encode_partition)
+        """
+        return self.compiled.course_letter_counts(genome, self.number_of_partitions)
 
-        era_number: int
-            the current era number
-        
-        start_timer : float
-            the start time of the era
-            
-        end_timer : float
-            the end time of the era
+    def compliance(self, counts, thresholds = None):
+        """
+        Return a boolean array that is True for each course that is "In
+        Compliance" (the same test used by Schedule.write_course_analysis()
+        and Schedule.get_max_deviation())
         
-        total_time : float
-            the total time elapsed
-        """    
-
-        progress_string = "Just completed era #" + str(era_number) + " in " + str(round(end_timer - start_timer, 3)) + "sec"
-        progress_string += "\n"
-        progress_string += "Total elapsed time: " + str(round(total_time/60, 2)) + " min"
+        Parameters
+        ----------
+        counts : numpy array
+            letter counts with shape (..., number_of_courses, number_of_partitions)
+        thresholds : CourseThresholds object
+            (optional) the thresholds of the courses in counts 
+            (default = None, which uses self.course_thresholds)
+        """
+        if thresholds is None:
+            thresholds = self.course_thresholds
         
-        return progress_string
+        # the maximum of each course, compared with every letter at once:
+        hcm = thresholds.half_class_maximum
+        
+        if self.number_of_partitions == 2:
+            # no more than hcm students in either group:
+            return np.all(counts <= hcm[:, None], axis=-1)
+        
+        qcm = thresholds.quarter_class_maximum
+        
+        # no more than qcm students of any letter:
+        check_individually = np.all(counts <= qcm[:, None], axis=-1)
+        
+        # (A+B) and (C+D) each have no more than hcm students:
+        check_pairs = ((counts[..., 0] + counts[..., 1] <= hcm) 
+                       & (counts[..., 2] + counts[..., 3] <= hcm))
+        
+        return check_individually & check_pairs
 
-    @classmethod
-    def create_pie_chart(cls, era_number, fitness_score, in_compliance, total_courses):
+    def course_terms(self, counts, thresholds = None):
         """
-        Creates a pie chart visualizing the portion of classrooms in compliance (green) vs. out of compliance (red)
+        Apply the rules of Schedule.fitness_score() to every course at once
+        
+        Returns a tuple (weighted_terms, penalties, good, other) where:
+        
+        weighted_terms : array of shape (..., number_of_courses, m) holding 
+            the amounts added to weighted_fitness_score by each course, in 
+            the order Schedule.fitness_score() adds them
+        penalties : array of shape (..., number_of_courses), the number of
+            penalties applied to each course
+        good : boolean array of shape (..., number_of_courses), True for the
+            courses counted in good_score
+        other : boolean array of shape (..., number_of_courses), True for the
+            courses counted in other_score
+        
         Parameters
         ----------
-        era_number: int
-            the current era number
+        counts : numpy array
+            letter counts with shape (..., number_of_courses, number_of_partitions)
+        thresholds : CourseThresholds object
+            (optional) the thresholds of the courses in counts, ex: 
+            course_thresholds.take(course_index) for some of the courses 
+            (default = None, which uses self.course_thresholds)
+        """
+        if thresholds is None:
+            thresholds = self.course_thresholds
         
-        fitness_score: int
-            fitness score of best partition
-
-        in_compliance: int
-            the number of classrooms that satisfy social distancing guidelines as defined
+        totals = thresholds.course_totals
+        hcm = thresholds.half_class_maximum
+        course_weight = self.course_weight
         
-        total_courses: int
-            the total number of classrooms present
-        """
-
-        labels = ["In Compliance", "Out of Compliance"]
-        sizes = [in_compliance, total_courses - in_compliance]
-        colorslist = ["#b0ff85", "#ff5757"]
-
-        # generates a string as the label for each slice
-        def pie_label_string(pct):
-            num = int(np.round(pct/100 * sum(sizes)))
-            return str(np.round(pct)) + "% \n" + "(" + str(num) + " out of " + str(total_courses) + ")"
-
-        fig = plt.figure(linewidth = 2)
-        ax = fig.add_subplot(111)
-
-        title_string = "Era " + str(era_number) + ": Classrooms In/Out of Compliance with Social Distancing\n"
-        subtitle_string = "Fitness Score: " + str(round(fitness_score,3))
-
-        ax.set_title(title_string + subtitle_string)
-        ax.pie(sizes, labels = labels, autopct = pie_label_string,
-                colors = colorslist, startangle = 90, wedgeprops={"edgecolor":"k",'linewidth': 1, 'antialiased': True})
-        ax.axis('equal')
-
-        if (USE_GUI):
-            pie_output_file = IO_DIRECTORY / 'current_pie.png'
-            fig.savefig(pie_output_file, bbox_inches='tight')
-        else:
-            # the directory where we will put the pie charts
-            pie_path = IO_DIRECTORY / "piecharts"
+        # the relative percentage of each letter, ex: [a_percent, b_percent, ...]
+        percents = counts/totals[..., None]
+        
+        # our tolerance for applying a penalty based on the relative size of 
+        # the (A + B) or (C + D) groups (see Schedule.fitness_score()):
+        pairwise_tolerance = thresholds.pairwise_tolerance
+        
+        if self.number_of_partitions == 2:
+            a_count = counts[..., 0]
+            b_count = counts[..., 1]
+            a_percent = percents[..., 0]
+            b_percent = percents[..., 1]
             
-            # try to create the directory 
-            try:
-                os.mkdir(pie_path)
-            # unless it already exists
-            except FileExistsError:
-                # if the directory already exists, check if this is the 
-                # beginning of a new run (Era # is 1)
-                if era_number == 1:
-                    # if so, remove the directory and all its contents
-                    shutil.rmtree(pie_path)
-                    # wait for this os operation to finish
-                    while os.path.exists(pie_path): # check if it exists
-                        pass
-                    # then create a new (empty) folder to put pie charts in 
-                    os.mkdir(pie_path)
+            # deviation from a 50/50 split between A's and B's:
+            percent_difference = np.abs(a_percent - b_percent)
             
-            # the filename for the pie chart
-            pie_filename = "pie_era" + str(era_number) + ".png"
+            good = (a_count <= hcm) & (b_count <= hcm)
             
-            # the path for the pie chart
-            pie_output_file = pie_path / pie_filename
+            # exactly one of the two groups is above hcm:
+            one_over = ~good & ((a_count <= hcm) | (b_count <= hcm))
             
-            # save the pie chart
-            fig.savefig(pie_output_file, bbox_inches='tight')
+            # both groups are above hcm, so only the A/B ratio is checked:
+            both_over = (a_count > hcm) & (b_count > hcm)
+            unbalanced = both_over & ((a_percent > pairwise_tolerance) | (b_percent > pairwise_tolerance))
+            
+            penalized = one_over | unbalanced
+            other = both_over & ~unbalanced
+            
+            weighted_terms = np.where(good, course_weight, np.where(penalized, -percent_difference, 0.0))
+            
+            return self.weigh_sections((weighted_terms[..., None], penalized.astype(np.int64), good, other), thresholds)
         
-        # close the plot so it doesn't continue to sit in memory
-        plt.close()
+        # fitness function for an A/B/C/D partition:
+        not_compliant = ~self.compliance(counts, thresholds)
         
-    @classmethod
-    def create_histogram(cls, era_number, num_partitions, best_partition_score, max_deviation, time_elapsed, time_limit):
+        ab_percent = percents[..., 0] + percents[..., 1]
+        cd_percent = percents[..., 2] + percents[..., 3]
+        
+        # penalize (A + B) if it exceeds pairwise_tolerance, otherwise (C + D):
+        ab_penalized = not_compliant & (ab_percent > pairwise_tolerance)
+        cd_penalized = not_compliant & ~ab_penalized & (cd_percent > pairwise_tolerance)
+        
+        pairwise_term = np.where(ab_penalized, -(self.pairwise_multiplier*(ab_percent - 0.5)), 
+                                 np.where(cd_penalized, -(self.pairwise_multiplier*(cd_percent - 0.5)), 0.0))
+        
+        # our tolerance for applying a penalty based on the relative size 
+        # of any individual A/B/C/D group:
+        individual_tolerance = thresholds.individual_tolerance
+        
+        individual_penalized = not_compliant[..., None] & (percents > individual_tolerance[..., None])
+        
+        individual_terms = np.where(individual_penalized, -(self.individual_multiplier*(percents - 0.25)), 0.0)
+        
+        # an "Out of Compliance" course for which no penalty was applied:
+        all_individually = np.all(percents <= individual_tolerance[..., None], axis=-1)
+        all_pairwise = (ab_percent <= pairwise_tolerance) & (cd_percent <= pairwise_tolerance)
+        balanced = not_compliant & all_individually & all_pairwise
+        
+        # courses too big to ever be "In Compliance" are counted as good
+        # when they are evenly partitioned:
+        too_big = totals > 2*hcm
+        
+        good = ~not_compliant | (balanced & too_big)
+        other = balanced & ~too_big
+        
+        good_term = np.where(good, course_weight, 0.0)
+        
+        weighted_terms = np.concatenate((pairwise_term[..., None], individual_terms, good_term[..., None]), axis=-1)
+        
+        penalties = (ab_penalized.astype(np.int64) + cd_penalized 
+                     + np.count_nonzero(individual_penalized, axis=-1))
+        
+        return self.weigh_sections((weighted_terms, penalties, good, other), thresholds)
+    
+    def weigh_sections(self, course_terms, thresholds):
         """
-        Creates an histogram visualizing the max deviation from 25/25/25/25% or 50/50% split of the courses
-        that are not in compliance
-
+        Multiply the terms of each course returned by course_terms() by the
+        number of identical sections it stands for (see Presolve), so that 
+        good and other become the number of sections counted in good_score
+        and other_score (the terms are returned unchanged if every course 
+        is a single section)
+        
         Parameters
         ----------
-        era_number: int
-            the current era number
+        course_terms : tuple
+            (weighted_terms, penalties, good, other), see course_terms()
+        thresholds : CourseThresholds object
+            the thresholds of the courses in course_terms
+        """
+        multiplicity = thresholds.course_multiplicity
         
-        num_partitions: int
-            number of partitions (2 or 4)
-
-        best_partition_score: tuple
-            fitness score and other data (i.e. number in compliance, etc)
-            of best partition found
+        if multiplicity is None:
+            return course_terms
         
-        max_deviation: list
-            list of the maximum deviation of each bad course
+        weighted_terms, penalties, good, other = course_terms
         
-        time_elapsed: int
-            the time the program has run for so far
+        return (weighted_terms*multiplicity[:, None], 
+                penalties*multiplicity, 
+                good*multiplicity, 
+                other*multiplicity)
         
-        time_limit: int
-            the total time limit allotted for the program to run
+    def update_courses(self, evaluator, changed_subgroups, new_letters):
         """
-
-        n_bins = 10
-        total_courses = best_partition_score[-1]
-        in_compliance = best_partition_score[2]
-        not_in_compliance = total_courses - in_compliance
-
-        x = max_deviation
-
-        fig = plt.figure(linewidth = 2)
-        ax = fig.add_subplot(111)
-
-        n, bins, patches = ax.hist(x, bins=n_bins, edgecolor = 'black')
-        ax.set_title("Era " + str(era_number) + ": Max Deviation of the " + str(not_in_compliance) + " Courses Not in Compliance")
-        if (num_partitions == 4):
-            ax.set_xlabel("Max Deviation Per Course from 25%/25%/25%/25% Of Class Size")
-        elif (num_partitions == 2):
-            ax.set_xlabel("Max Deviation Per Coursefrom 50%/50% Of Class Size")
-        ax.set_ylabel("Number of Courses")
-
-        for thispatch in patches:
-            if (time_elapsed/time_limit < 0.5): # early; red plot
-                thispatch.set_facecolor("#ff5757")
-            elif (time_elapsed/time_limit < 0.8): # middle; yellow plot
-                thispatch.set_facecolor("#ffe485")
-            else: # late; green plot
-                thispatch.set_facecolor("#b0ff85")
-
-        if (USE_GUI):
-            hist_output_file = IO_DIRECTORY / 'current_hist.png'
-            fig.savefig(hist_output_file, bbox_inches='tight')
-        else:
-            # the directory where we will put the histogram
-            histogram_path = IO_DIRECTORY / "histograms"
-            
-            # try to create the directory 
-            try:
-                os.mkdir(histogram_path)
-            # unless it already exists
-            except FileExistsError:
-                # if the directory already exists, check if this is the 
-                # beginning of a new run (Era # is 1)
-                if era_number == 1:
-                    # if so, remove the directory and all its contents
-                    shutil.rmtree(histogram_path)
-                    # wait for this os operation to finish
-                    while os.path.exists(histogram_path): # check if it exists
-                        pass
-                    # then create a new (empty) folder to put pie charts in 
-                    os.mkdir(histogram_path)
-            
-            # the filename for the histogram
-            hist_filename = "hist_era" + str(era_number) + ".png"
-            
-            # the path for the histogram
-            hist_output_file = histogram_path / hist_filename
-            
-            # save the histogram chart
-            fig.savefig(hist_output_file, bbox_inches='tight')
+        Move some subgroups of a DeltaEvaluator to new letters and re-apply
+        the fitness rules to the courses they are enrolled in, updating the
+        genome, counts and per-course terms of the evaluator in place
         
-        # close the plot so it doesn't continue to sit in memory
-        plt.close()
+        Returns the change of (weighted_fitness_score, penalty_count, 
+        good_score, other_score) from these courses
+        
+        Parameters
+        ----------
+        evaluator : DeltaEvaluator object
+            the evaluator of the current partition
+        changed_subgroups : numpy array
+            the indices of the subgroups whose letters change (each letter 
+            must be different from the subgroup's current letter)
+        new_letters : numpy array
+            the new letter index of each subgroup in changed_subgroups
+        """
+        compiled = self.compiled
+        old_letters = evaluator.genome[changed_subgroups]
+        
+        # every enrollment of every changed subgroup:
+        positions, lengths = compiled.gather_ranges(compiled.subgroup_offsets, changed_subgroups)
+        courses = compiled.subgroup_course[positions]
+        
+        # move each enrollment from its old letter to its new letter:
+        np.subtract.at(evaluator.counts, (courses, np.repeat(old_letters, lengths)), 1)
+        np.add.at(evaluator.counts, (courses, np.repeat(new_letters, lengths)), 1)
+        
+        evaluator.genome[changed_subgroups] = new_letters
+        
+        # re-apply the fitness rules to the affected courses only:
+        affected = np.unique(courses)
+        
+        weighted_terms, penalties, good, other = self.course_terms(evaluator.counts[affected], self.course_thresholds.take(affected))
+        new_weighted = weighted_terms.sum(axis=-1)
+        
+        deltas = (float(new_weighted.sum() - evaluator.course_weighted[affected].sum()), 
+                  int(penalties.sum() - evaluator.course_penalties[affected].sum()), 
+                  int(good.sum()) - int(evaluator.course_good[affected].sum()), 
+                  int(other.sum()) - int(evaluator.course_other[affected].sum()))
+        
+        evaluator.course_weighted[affected] = new_weighted
+        evaluator.course_penalties[affected] = penalties
+        evaluator.course_good[affected] = good
+        evaluator.course_other[affected] = other
+        
+        return deltas
+        
+    def preferred_terms(self, genome):
+        """
+        Return an array with the penalty applied for each preferred subgroup
+        whose members were assigned different letters (0 otherwise)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup
+            (or a 2-D array with one genome per row)
+        """
+        compiled = self.compiled
+        
+        if compiled.number_of_preferred_subgroups == 0:
+            return np.zeros(genome.shape[:-1] + (0,))
+        
+        split_flags = compiled.preferred_split_flags(genome)
+        
+        return np.where(split_flags, -(100/compiled.number_of_preferred_subgroups), 0.0)
+        
+    def score(self, genome):
+        """
+        Evaluate a partition, returning the same tuple as Schedule.fitness_score():
+        (weighted_fitness_score, penalty_count, good_score, other_score, number_of_courses)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup
+        """
+        genome = self.decode_genome(genome)
+        counts = self.course_counts(genome)
+        
+        weighted_terms, penalties, good, other = self.course_terms(counts)
+        
+        weighted_offset, penalty_offset, good_offset, other_offset = self.score_offset
+        
+        # add every term from left to right, in the same order as 
+        # Schedule.fitness_score() (after the score of any courses 
+        # removed by presolve, which is 0 otherwise):
+        all_terms = np.concatenate(([weighted_offset], weighted_terms.ravel(), self.preferred_terms(genome)))
+        weighted_fitness_score = float(np.cumsum(all_terms)[-1])
+        
+        return (weighted_fitness_score, 
+                int(penalties.sum()) + penalty_offset, 
+                int(good.sum()) + good_offset, 
+                int(other.sum()) + other_offset, 
+                self.number_of_courses)
     
-    @classmethod
-    def yaml_writer(cls, settings_dict):
+    def score_population(self, genomes):
         """
-        Write configuration to "settings.yaml" along with 
-        descriptive comments
+        Evaluate every partition in a population at once, returning a list
+        with one Schedule.fitness_score() tuple per row of genomes
         
-        Note: yaml.dump method from the yaml module does 
-        not preserve comments, which is why this method
-        is necessary
+        The letter counts of every (partition, course) pair are computed in
+        a single pass over the enrollment arrays, and the fitness rules are
+        applied to the whole (population x courses) array
         
         Parameters
         ----------
-        settings_dict : dictionary
-            a dictionary of program settings from 'settings.yaml' 
-        """  
+        genomes : numpy array
+            a 2-D array with the letter indices of one partition per row
+        """
+        number_of_genomes = genomes.shape[0]
         
-        # concatenate the .yaml document as a string
-        settings_string = "# SCHOOL-SPECIFIC SETTINGS: \n \n"
-
-        settings_string += "# Number of groups to partition students into (only 2 and 4 are implemented) \n"
-        settings_string += "number_of_partitions : "
-        settings_string += str(settings_dict["number_of_partitions"])
-        settings_string += "\n \n"
-
-        settings_string += "# Max size of a partition when dividing students into two cohorts (default = 15) \n"
-        settings_string += "half_class_maximum : "
-        settings_string += str(settings_dict["half_class_maximum"])
-        settings_string += "\n \n"
-
-        settings_string += "# Max size of a partition when dividing students into four cohorts (default = 9) \n"
-        settings_string += "quarter_class_maximum : "
-        settings_string += str(settings_dict["quarter_class_maximum"])
-        settings_string += "\n \n"
+        if number_of_genomes == 0:
+            return []
+        
+        genomes = self.decode_genome(genomes)
+        counts = self.course_counts(genomes)
+        
+        weighted_terms, penalties, good, other = self.course_terms(counts)
+        
+        weighted_offset, penalty_offset, good_offset, other_offset = self.score_offset
+        
+        # add every term from left to right for each partition (row):
+        all_terms = np.concatenate((np.full((number_of_genomes, 1), float(weighted_offset)), 
+                                    weighted_terms.reshape(number_of_genomes, -1), 
+                                    self.preferred_terms(genomes)), axis=1)
+        
+        weighted_scores = np.cumsum(all_terms, axis=1)[:, -1].tolist()
+        
+        penalty_counts = (penalties.sum(axis=1) + penalty_offset).tolist()
+        good_scores = (good.sum(axis=1) + good_offset).tolist()
+        other_scores = (other.sum(axis=1) + other_offset).tolist()
+        
+        return [(weighted_scores[i], penalty_counts[i], good_scores[i], other_scores[i], self.number_of_courses)
+                for i in range(number_of_genomes)]
+    
+    def max_deviation(self, genome):
+        """
+        Return the same list as Schedule.get_max_deviation(): the max deviation
+        of each course that is not in compliance from a 25-25-25-25% split (if
+        number_of_partitions = 4) or a 50-50% split (if number_of_partitions = 2)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup
+        """
+        counts = self.course_counts(self.decode_genome(genome))
+        
+        not_compliant = ~self.compliance(counts)
+        
+        deviation = counts.max(axis=-1)/self.course_totals - 1/self.number_of_partitions
+        
+        # one entry for each of the identical sections merged by presolve:
+        multiplicity = self.course_thresholds.course_multiplicity
+        
+        if multiplicity is not None:
+            return np.repeat(deviation[not_compliant], multiplicity[not_compliant]).tolist()
+        
+        return deviation[not_compliant].tolist()
+
+class CohortFitnessEngine(FitnessEngine):
+    """
+    A FitnessEngine that scores partitions with the cohort constraints 
+    declared in settings.yaml (see CohortRules), for any number of 
+    partitions (ex: a 3-day or 5-day rotation)
+    
+    The letter counts are computed with np.bincount (the same as 
+    FitnessEngine) and the rules are applied to every course at once 
+    with CohortRules.course_terms()
+    
+    Attributes
+    ----------
+    cohort_rules : CohortRules object
+        the compiled cohort constraints
+    (the other attributes are inherited from FitnessEngine)
+    
+    Methods
+    -------
+    supports(number_of_partitions)
+        True for any number of partitions
+    compliance(counts, thresholds)
+        flag the courses that are "In Compliance"
+    course_terms(counts, thresholds)
+        apply the cohort rules to an array of course counts
+    """
+    
+    def __init__(self, compiled, number_of_partitions, half_class_maximum, quarter_class_maximum, cohort_rules, 
+                 course_thresholds = None, presolve = None, student_classes = None):
+        """
+        The constructor for the CohortFitnessEngine class
+        
+        Parameters
+        ----------
+        (the same as FitnessEngine, plus)
+        cohort_rules : CohortRules object
+            the compiled cohort constraints
+        """
+        if course_thresholds is None:
+            course_thresholds = CourseThresholds(compiled.course_totals, compiled.course_rooms, 
+                                                 half_class_maximum, quarter_class_maximum, cohort_rules)
+        
+        self.cohort_rules = cohort_rules
+        
+        super().__init__(compiled, number_of_partitions, half_class_maximum, quarter_class_maximum, course_thresholds, presolve, 
+                         student_classes)
+        
+    @classmethod
+    def supports(cls, number_of_partitions):
+        """
+        Return True if partitions with number_of_partitions letters can be
+        scored (any number of letters, as long as the groupings are declared)
+        
+        Parameters
+        ----------
+        number_of_partitions : int
+            the number of partitions students are to be separated into 
+        """
+        return number_of_partitions >= 2
+        
+    def compliance(self, counts, thresholds = None):
+        """
+        Return a boolean array that is True for each course that is "In
+        Compliance" (see CohortRules.compliance())
+        
+        Parameters
+        ----------
+        counts : numpy array
+            letter counts with shape (..., number_of_courses, number_of_partitions)
+        thresholds : CourseThresholds object
+            (optional) the thresholds of the courses in counts 
+            (default = None, which uses self.course_thresholds)
+        """
+        if thresholds is None:
+            thresholds = self.course_thresholds
+        
+        return self.cohort_rules.compliance(counts, thresholds.grouping_maxima)
+        
+    def course_terms(self, counts, thresholds = None):
+        """
+        Apply the cohort rules to every course at once (see 
+        CohortRules.course_terms() and FitnessEngine.course_terms())
+        
+        Parameters
+        ----------
+        counts : numpy array
+            letter counts with shape (..., number_of_courses, number_of_partitions)
+        thresholds : CourseThresholds object
+            (optional) the thresholds of the courses in counts 
+            (default = None, which uses self.course_thresholds)
+        """
+        if thresholds is None:
+            thresholds = self.course_thresholds
+        
+        course_terms = self.cohort_rules.course_terms(counts, thresholds.course_totals, self.course_weight, 
+                                                      thresholds.grouping_maxima, thresholds.grouping_tolerance)
+        
+        return self.weigh_sections(course_terms, thresholds)
+
+class JitFitnessEngine(FitnessEngine):
+    """
+    A FitnessEngine that evaluates partitions with a fused, single-pass 
+    kernel compiled by Numba: for each course, the letters of its roster 
+    are counted and the rules of Schedule.fitness_score() are applied 
+    immediately, so no temporary (courses x letters) arrays are created
+    
+    The kernel walks the compiled CSR arrays (course_offsets and 
+    enrollment_subgroup) and adds the terms of each course from left to 
+    right in the same order as FitnessEngine.score(), so both engines 
+    return the same tuple
+    
+    If Numba is not installed the kernels are plain Python functions (which
+    are correct, but slow), so Schedule.build_fitness_engine() only uses 
+    this class when Numba is available
+    
+    Attributes
+    ----------
+    (the same as FitnessEngine)
+    
+    Methods
+    -------
+    fused_scores(genomes, ...)
+        the compiled kernel, which scores every row of a 2-D array of genomes
+    fused_counts(genome, ...)
+        the compiled kernel, which counts the letters of each course
+    fused_update(genome, counts, ...)
+        the compiled kernel, which moves subgroups of a DeltaEvaluator and
+        re-scores their courses
+    course_counts(genome)
+        count the students of each letter in each course (with fused_counts)
+    update_courses(evaluator, changed_subgroups, new_letters)
+        move subgroups of a DeltaEvaluator and re-score their courses 
+        (with fused_update)
+    score(genome)
+        evaluate a partition, returning the same tuple as Schedule.fitness_score()
+    score_population(genomes)
+        evaluate every partition in a population 
+    """
+    
+    def fused_scores(genomes, course_offsets, enrollment_subgroup, course_totals, 
+                     number_of_partitions, half_class_maximum, quarter_class_maximum, 
+                     pairwise_tolerances, individual_tolerances, course_multiplicity, 
+                     course_weight, score_offset, 
+                     pairwise_multiplier, individual_multiplier, 
+                     preferred_offsets, preferred_member_subgroup):
+        """
+        Score every row of genomes, returning four arrays with one entry 
+        per genome: (weighted_fitness_score, penalty_count, good_score, other_score)
+        
+        (see FitnessEngine.course_terms() for the rules applied to each 
+        course, and CourseThresholds for the per-course arrays 
+        half_class_maximum, quarter_class_maximum, pairwise_tolerances and
+        individual_tolerances). The terms of each course are multiplied by
+        its number of identical sections, and the totals start from the 
+        score of any courses removed by presolve (see Presolve)
+        """
+        number_of_genomes = genomes.shape[0]
+        number_of_courses = course_totals.shape[0]
+        number_of_preferred_subgroups = preferred_offsets.shape[0] - 1
+        
+        weighted_scores = np.zeros(number_of_genomes)
+        penalty_counts = np.zeros(number_of_genomes, dtype=np.int64)
+        good_scores = np.zeros(number_of_genomes, dtype=np.int64)
+        other_scores = np.zeros(number_of_genomes, dtype=np.int64)
+        
+        # the letter counts of the current course: [A count, B count, ...]
+        counts = np.zeros(number_of_partitions, dtype=np.int64)
+        
+        for g in range(number_of_genomes):
+            genome = genomes[g]
+            
+            weighted = score_offset[0]
+            penalties = np.int64(score_offset[1])
+            good = np.int64(score_offset[2])
+            other = np.int64(score_offset[3])
+            
+            for c in range(number_of_courses):
+                counts[:] = 0
+                
+                for e in range(course_offsets[c], course_offsets[c + 1]):
+                    counts[genome[enrollment_subgroup[e]]] += 1
+                
+                total = course_totals[c]
+                m = course_multiplicity[c]
+                hcm = half_class_maximum[c]
+                qcm = quarter_class_maximum[c]
+                pairwise_tolerance = pairwise_tolerances[c]
+                
+                if number_of_partitions == 2:
+                    a_count = counts[0]
+                    b_count = counts[1]
+                    a_percent = a_count/total
+                    b_percent = b_count/total
+                    
+                    if a_count <= hcm and b_count <= hcm:
+                        weighted += course_weight*m
+                        good += m
+                    elif a_count <= hcm or b_count <= hcm:
+                        # exactly one of the two groups is above hcm:
+                        weighted += -abs(a_percent - b_percent)*m
+                        penalties += m
+                    elif a_percent > pairwise_tolerance or b_percent > pairwise_tolerance:
+                        weighted += -abs(a_percent - b_percent)*m
+                        penalties += m
+                    else:
+                        other += m
+                    
+                    continue
+                
+                # fitness function for an A/B/C/D partition:
+                compliant = (counts[0] + counts[1] <= hcm 
+                             and counts[2] + counts[3] <= hcm)
+                
+                for letter in range(4):
+                    if counts[letter] > qcm:
+                        compliant = False
+                
+                if compliant:
+                    weighted += course_weight*m
+                    good += m
+                    continue
+                
+                ab_percent = counts[0]/total + counts[1]/total
+                cd_percent = counts[2]/total + counts[3]/total
+                
+                # penalize (A + B) if it exceeds pairwise_tolerance, otherwise (C + D):
+                if ab_percent > pairwise_tolerance:
+                    weighted += -(pairwise_multiplier*(ab_percent - 0.5))*m
+                    penalties += m
+                elif cd_percent > pairwise_tolerance:
+                    weighted += -(pairwise_multiplier*(cd_percent - 0.5))*m
+                    penalties += m
+                
+                individual_tolerance = individual_tolerances[c]
+                
+                balanced = ab_percent <= pairwise_tolerance and cd_percent <= pairwise_tolerance
+                
+                for letter in range(4):
+                    percent = counts[letter]/total
+                    
+                    if percent > individual_tolerance:
+                        weighted += -(individual_multiplier*(percent - 0.25))*m
+                        penalties += m
+                        balanced = False
+                
+                # courses too big to ever be "In Compliance" are counted as 
+                # good when they are evenly partitioned:
+                if balanced and total > 2*hcm:
+                    weighted += course_weight*m
+                    good += m
+                elif balanced:
+                    other += m
+            
+            # penalize each preferred subgroup whose members were assigned different letters
+            for p in range(number_of_preferred_subgroups):
+                start = preferred_offsets[p]
+                first_letter = genome[preferred_member_subgroup[start]]
+                
+                for m in range(start + 1, preferred_offsets[p + 1]):
+                    if genome[preferred_member_subgroup[m]] != first_letter:
+                        weighted += -(100/number_of_preferred_subgroups)
+                        break
+            
+            weighted_scores[g] = weighted
+            penalty_counts[g] = penalties
+            good_scores[g] = good
+            other_scores[g] = other
+        
+        return weighted_scores, penalty_counts, good_scores, other_scores
+    
+    def fused_counts(genome, course_offsets, enrollment_subgroup, number_of_partitions):
+        """
+        Count the students of each letter in each course, returned as an 
+        array of shape (number_of_courses, number_of_partitions)
+        """
+        number_of_courses = course_offsets.shape[0] - 1
+        
+        counts = np.zeros((number_of_courses, number_of_partitions), dtype=np.int64)
+        
+        for c in range(number_of_courses):
+            for e in range(course_offsets[c], course_offsets[c + 1]):
+                counts[c, genome[enrollment_subgroup[e]]] += 1
+        
+        return counts
+    
+    def fused_update(genome, counts, course_weighted, course_penalties, course_good, course_other, 
+                     changed_subgroups, new_letters, subgroup_offsets, subgroup_course, course_totals, 
+                     number_of_partitions, half_class_maximum, quarter_class_maximum, 
+                     pairwise_tolerances, individual_tolerances, course_multiplicity, 
+                     course_weight, pairwise_multiplier, individual_multiplier):
+        """
+        Move each changed subgroup to its new letter and re-apply the rules
+        to the courses it is enrolled in, updating genome, counts and the 
+        per-course arrays of a DeltaEvaluator in place (see 
+        FitnessEngine.update_courses())
+        
+        The terms of each course are added in the same order as 
+        FitnessEngine.course_terms(), so the per-course totals are the same
+        as weighted_terms.sum(axis=-1). Returns the change of 
+        (weighted_fitness_score, penalty_count, good_score, other_score)
+        """
+        number_of_courses = course_totals.shape[0]
+        
+        is_affected = np.zeros(number_of_courses, dtype=np.bool_)
+        affected = np.empty(number_of_courses, dtype=np.int64)
+        number_of_affected = 0
+        
+        for i in range(changed_subgroups.shape[0]):
+            subgroup = changed_subgroups[i]
+            old_letter = genome[subgroup]
+            new_letter = new_letters[i]
+            
+            for e in range(subgroup_offsets[subgroup], subgroup_offsets[subgroup + 1]):
+                c = subgroup_course[e]
+                counts[c, old_letter] -= 1
+                counts[c, new_letter] += 1
+                
+                if not is_affected[c]:
+                    is_affected[c] = True
+                    affected[number_of_affected] = c
+                    number_of_affected += 1
+            
+            genome[subgroup] = new_letter
+        
+        weighted_change = 0.0
+        penalty_change = 0
+        good_change = 0
+        other_change = 0
+        
+        for j in range(number_of_affected):
+            c = affected[j]
+            
+            total = course_totals[c]
+            m = course_multiplicity[c]
+            hcm = half_class_maximum[c]
+            qcm = quarter_class_maximum[c]
+            pairwise_tolerance = pairwise_tolerances[c]
+            
+            weighted = 0.0
+            penalties = 0
+            good = 0
+            other = 0
+            
+            if number_of_partitions == 2:
+                a_count = counts[c, 0]
+                b_count = counts[c, 1]
+                a_percent = a_count/total
+                b_percent = b_count/total
+                
+                if a_count <= hcm and b_count <= hcm:
+                    weighted += course_weight*m
+                    good = m
+                elif a_count <= hcm or b_count <= hcm:
+                    weighted += -abs(a_percent - b_percent)*m
+                    penalties = m
+                elif a_percent > pairwise_tolerance or b_percent > pairwise_tolerance:
+                    weighted += -abs(a_percent - b_percent)*m
+                    penalties = m
+                else:
+                    other = m
+            else:
+                # fitness function for an A/B/C/D partition:
+                compliant = (counts[c, 0] + counts[c, 1] <= hcm 
+                             and counts[c, 2] + counts[c, 3] <= hcm)
+                
+                for letter in range(4):
+                    if counts[c, letter] > qcm:
+                        compliant = False
+                
+                if compliant:
+                    weighted += course_weight*m
+                    good = m
+                else:
+                    ab_percent = counts[c, 0]/total + counts[c, 1]/total
+                    cd_percent = counts[c, 2]/total + counts[c, 3]/total
+                    
+                    # penalize (A + B) if it exceeds pairwise_tolerance, otherwise (C + D):
+                    if ab_percent > pairwise_tolerance:
+                        weighted += -(pairwise_multiplier*(ab_percent - 0.5))*m
+                        penalties += m
+                    elif cd_percent > pairwise_tolerance:
+                        weighted += -(pairwise_multiplier*(cd_percent - 0.5))*m
+                        penalties += m
+                    
+                    individual_tolerance = individual_tolerances[c]
+                    
+                    balanced = ab_percent <= pairwise_tolerance and cd_percent <= pairwise_tolerance
+                    
+                    for letter in range(4):
+                        percent = counts[c, letter]/total
+                        
+                        if percent > individual_tolerance:
+                            weighted += -(individual_multiplier*(percent - 0.25))*m
+                            penalties += m
+                            balanced = False
+                    
+                    # courses too big to ever be "In Compliance" are counted 
+                    # as good when they are evenly partitioned:
+                    if balanced and total > 2*hcm:
+                        weighted += course_weight*m
+                        good = m
+                    elif balanced:
+                        other = m
+            
+            weighted_change += weighted - course_weighted[c]
+            penalty_change += penalties - course_penalties[c]
+            good_change += good - course_good[c]
+            other_change += other - course_other[c]
+            
+            course_weighted[c] = weighted
+            course_penalties[c] = penalties
+            course_good[c] = good
+            course_other[c] = other
+        
+        return weighted_change, penalty_change, good_change, other_change
+    
+    # compile the kernels (the first call in each process compiles them,
+    # and cache = True saves the machine code for later runs)
+    if njit is not None:
+        fused_scores = njit(cache = True)(fused_scores)
+        fused_counts = njit(cache = True)(fused_counts)
+        fused_update = njit(cache = True)(fused_update)
+    
+    fused_scores = staticmethod(fused_scores)
+    fused_counts = staticmethod(fused_counts)
+    fused_update = staticmethod(fused_update)
+    
+    def course_counts(self, genome):
+        """
+        Count the students of each letter in each course, returned as an 
+        array of shape (number_of_courses, number_of_partitions) 
+        (or (number_of_genomes, number_of_courses, number_of_partitions) 
+        for a 2-D array of genomes)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup 
+            (see CompiledSchedule.encode_partition)
+        """
+        compiled = self.compiled
+        
+        if genome.ndim == 2:
+            return np.stack([self.course_counts(row) for row in genome])
+        
+        return self.fused_counts(genome, compiled.course_offsets, compiled.enrollment_subgroup, self.number_of_partitions)
+    
+    def update_courses(self, evaluator, changed_subgroups, new_letters):
+        """
+        Move some subgroups of a DeltaEvaluator to new letters and re-apply
+        the fitness rules to the courses they are enrolled in, with the 
+        fused_update kernel (see FitnessEngine.update_courses())
+        
+        Parameters
+        ----------
+        evaluator : DeltaEvaluator object
+            the evaluator of the current partition
+        changed_subgroups : numpy array
+            the indices of the subgroups whose letters change
+        new_letters : numpy array
+            the new letter index of each subgroup in changed_subgroups
+        """
+        compiled = self.compiled
+        thresholds = self.course_thresholds
+        
+        # each course is a single section unless presolve merged sections:
+        if thresholds.course_multiplicity is not None:
+            course_multiplicity = thresholds.course_multiplicity
+        else:
+            course_multiplicity = np.ones(compiled.number_of_courses, dtype=np.int64)
+        
+        weighted_change, penalty_change, good_change, other_change = self.fused_update(
+            evaluator.genome, 
+            evaluator.counts, 
+            evaluator.course_weighted, 
+            evaluator.course_penalties, 
+            evaluator.course_good, 
+            evaluator.course_other, 
+            changed_subgroups, 
+            new_letters, 
+            compiled.subgroup_offsets, 
+            compiled.subgroup_course, 
+            self.course_totals, 
+            self.number_of_partitions, 
+            thresholds.half_class_maximum, 
+            thresholds.quarter_class_maximum, 
+            thresholds.pairwise_tolerance, 
+            thresholds.individual_tolerance, 
+            course_multiplicity, 
+            self.course_weight, 
+            self.pairwise_multiplier, 
+            self.individual_multiplier)
+        
+        return float(weighted_change), int(penalty_change), int(good_change), int(other_change)
+    
+    def score(self, genome):
+        """
+        Evaluate a partition, returning the same tuple as Schedule.fitness_score():
+        (weighted_fitness_score, penalty_count, good_score, other_score, number_of_courses)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup
+        """
+        return self.score_population(genome[None, :])[0]
+    
+    def score_population(self, genomes):
+        """
+        Evaluate every partition in a population with the fused kernel, 
+        returning a list with one Schedule.fitness_score() tuple per row 
+        of genomes
+        
+        Parameters
+        ----------
+        genomes : numpy array
+            a 2-D array with the letter indices of one partition per row
+        """
+        compiled = self.compiled
+        thresholds = self.course_thresholds
+        genomes = self.decode_genome(genomes)
+        
+        # each course is a single section unless presolve merged sections:
+        if thresholds.course_multiplicity is not None:
+            course_multiplicity = thresholds.course_multiplicity
+        else:
+            course_multiplicity = np.ones(compiled.number_of_courses, dtype=np.int64)
+        
+        if compiled.number_of_preferred_subgroups > 0:
+            preferred_offsets = compiled.preferred_offsets
+            preferred_member_subgroup = compiled.preferred_member_subgroup
+        else:
+            preferred_offsets = np.zeros(1, dtype=np.int64)
+            preferred_member_subgroup = np.zeros(0, dtype=np.int64)
+        
+        weighted_scores, penalty_counts, good_scores, other_scores = self.fused_scores(
+            np.ascontiguousarray(genomes), 
+            compiled.course_offsets, 
+            compiled.enrollment_subgroup, 
+            self.course_totals, 
+            self.number_of_partitions, 
+            thresholds.half_class_maximum, 
+            thresholds.quarter_class_maximum, 
+            thresholds.pairwise_tolerance, 
+            thresholds.individual_tolerance, 
+            course_multiplicity, 
+            self.course_weight, 
+            np.array(self.score_offset, dtype=np.float64), 
+            self.pairwise_multiplier, 
+            self.individual_multiplier, 
+            preferred_offsets, 
+            preferred_member_subgroup)
+        
+        return list(zip(weighted_scores.tolist(), 
+                        penalty_counts.tolist(), 
+                        good_scores.tolist(), 
+                        other_scores.tolist(), 
+                        [self.number_of_courses]*len(genomes)))
+
+class BitsetFitnessEngine(FitnessEngine):
+    """
+    A FitnessEngine that counts the letters of each course with bitsets:
+    each course roster is stored as a packed bitset over the subgroup 
+    indices, and each genome as one bitset per letter, so the number of
+    students of a letter in a course is 
+
+    popcount(roster & letter_mask)
+    
+    summed over 64-bit machine words (ex: about 4 KB per course for 30,000
+    subgroups). The rules of Schedule.fitness_score() are then applied to 
+    the counts by FitnessEngine.course_terms(), so score() returns the same
+    tuple as FitnessEngine.score() (for the 2- and 4-partition rules)
+    
+    A subgroup with several members in the same course is counted once for
+    each member: the roster of such a course has extra "layers", where 
+    layer m holds the subgroups with more than m members in the course
+    
+    Attributes
+    ----------
+    number_of_words : int
+        the number of 64-bit words in each bitset
+    roster_bits : numpy array
+        the packed roster of each layer, shape (number_of_layers, number_of_words)
+    layer_course : numpy array
+        the course index of each layer (a course has one layer, plus one 
+        more for each extra member of its largest subgroup on the roster)
+    one_layer_per_course : bool
+        True if every course has a single layer (so the layer counts are 
+        the course counts)
+    (the other attributes are inherited from FitnessEngine)
+    
+    Methods
+    -------
+    popcount(words)
+        the number of bits set in each 64-bit word
+    letter_bitsets(genome)
+        pack a genome into one bitset per letter
+    course_counts(genome)
+        count the students of each letter in each course with bitsets
+    """
+    
+    # number of bits set in each possible byte (used if NumPy is older 
+    # than 2.0, which added np.bitwise_count)
+    popcount_table = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+    
+    # the largest number of 64-bit words in the temporary array of 
+    # course_counts() (2^21 words is 16 MB)
+    maximum_block_words = 2**21
+    
+    def __init__(self, compiled, number_of_partitions, half_class_maximum, quarter_class_maximum, course_thresholds = None, 
+                 presolve = None, student_classes = None):
+        """
+        The constructor for the BitsetFitnessEngine class, which packs the
+        roster of each course into bitsets
+        
+        Parameters
+        ----------
+        (the same as FitnessEngine)
+        """
+        super().__init__(compiled, number_of_partitions, half_class_maximum, quarter_class_maximum, course_thresholds, presolve, 
+                         student_classes)
+        
+        self.number_of_words = (compiled.number_of_subgroups + 63)//64
+        
+        enrollment_course = compiled.enrollment_course.astype(np.int64)
+        enrollment_subgroup = compiled.enrollment_subgroup.astype(np.int64)
+        
+        # sort the enrollments by (course, subgroup), so that the members 
+        # of a subgroup in the same course are next to each other
+        order = np.lexsort((enrollment_subgroup, enrollment_course))
+        sorted_course = enrollment_course[order]
+        sorted_subgroup = enrollment_subgroup[order]
+        
+        # the rank of each enrollment among the members of its subgroup in
+        # its course (0 for the first member, 1 for the second, ...)
+        number_of_enrollments = len(order)
+        is_first = np.ones(number_of_enrollments, dtype=bool)
+        is_first[1:] = (sorted_course[1:] != sorted_course[:-1]) | (sorted_subgroup[1:] != sorted_subgroup[:-1])
+        
+        run_starts = np.flatnonzero(is_first)
+        run_lengths = np.diff(np.append(run_starts, number_of_enrollments))
+        member_rank = np.arange(number_of_enrollments) - np.repeat(run_starts, run_lengths)
+        
+        # one layer per (course, rank) pair, in order of course:
+        number_of_ranks = int(member_rank.max()) + 1 if number_of_enrollments > 0 else 1
+        
+        layer_keys, enrollment_layer = np.unique(sorted_course*number_of_ranks + member_rank, return_inverse = True)
+        
+        self.layer_course = layer_keys//number_of_ranks
+        self.one_layer_per_course = (len(layer_keys) == compiled.number_of_courses)
+        
+        # set the bit of each subgroup in the roster of its layer
+        self.roster_bits = np.zeros((len(layer_keys), self.number_of_words), dtype="<u8")
+        
+        bit_values = np.left_shift(np.uint64(1), (sorted_subgroup & 63).astype(np.uint64))
+        np.bitwise_or.at(self.roster_bits, (enrollment_layer, sorted_subgroup >> 6), bit_values)
+        
+    @classmethod
+    def popcount(cls, words):
+        """
+        Return the number of bits set in each 64-bit word
+        
+        Parameters
+        ----------
+        words : numpy array
+            an array of 64-bit words
+        """
+        if hasattr(np, "bitwise_count"):
+            return np.bitwise_count(words)
+        
+        byte_counts = cls.popcount_table[np.ascontiguousarray(words).view(np.uint8)]
+        
+        # (as uint8, the same as np.bitwise_count)
+        return byte_counts.reshape(words.shape + (8,)).sum(axis = -1, dtype = np.uint8)
+        
+    def letter_bitsets(self, genome):
+        """
+        Pack a genome into one bitset per letter, returned as an array of 
+        shape (number_of_partitions, number_of_words), where bit s of 
+        letter l is set if subgroup s was assigned letter l (or with one
+        more leading axis for a 2-D array of genomes)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup (or a 2-D array 
+            with one genome per row)
+        """
+        letter_flags = genome[..., None, :] == np.arange(self.number_of_partitions, dtype=genome.dtype)[:, None]
+        
+        # pack 8 subgroups into each byte (subgroup 0 in the lowest bit):
+        packed = np.zeros(letter_flags.shape[:-1] + (self.number_of_words*8,), dtype=np.uint8)
+        packed_flags = np.packbits(letter_flags, axis = -1, bitorder = "little")
+        packed[..., :packed_flags.shape[-1]] = packed_flags
+        
+        # 8 bytes (little-endian) make one 64-bit word:
+        return packed.view("<u8")
+        
+    def course_counts(self, genome):
+        """
+        Count the students of each letter in each course, returned as an 
+        array of shape (number_of_courses, number_of_partitions) 
+        (or (number_of_genomes, number_of_courses, number_of_partitions) 
+        for a 2-D array of genomes)
+        
+        Every genome of a 2-D array is packed at once, and the bitsets are 
+        reduced one 64-bit word at a time (over every layer and every 
+        genome), with the genomes split into blocks so that the temporary 
+        array never holds more than maximum_block_words words (a single 
+        genome, or a population that fits, is reduced in one pass)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            the letter index of each required subgroup 
+            (see CompiledSchedule.encode_partition), or a 2-D array with
+            one genome per row
+        """
+        number_of_layers = len(self.roster_bits)
+        
+        # one row per (genome, letter) pair:
+        letter_masks = self.letter_bitsets(genome)
+        mask_rows = letter_masks.reshape(-1, self.number_of_words)
+        number_of_rows = len(mask_rows)
+        
+        # popcount(roster & letter_mask), summed over the words of each 
+        # bitset, for every (layer, genome, letter) triple:
+        if number_of_layers*number_of_rows*self.number_of_words <= self.maximum_block_words:
+            # a single genome (or a small population) in one pass:
+            layer_counts = self.popcount(self.roster_bits[:, None, :] & mask_rows[None, :, :]).sum(axis = -1, dtype = np.int64)
+        else:
+            # one word at a time, with the words of every bitset stored as
+            # contiguous rows (and the genomes in blocks of block_size rows):
+            roster_words = np.ascontiguousarray(self.roster_bits.T)
+            mask_words = np.ascontiguousarray(mask_rows.T)
+            
+            block_size = max(1, self.maximum_block_words//number_of_layers)
+            layer_counts = np.zeros((number_of_layers, number_of_rows), dtype=np.int64)
+            
+            for start in range(0, number_of_rows, block_size):
+                block_counts = layer_counts[:, start:start + block_size]
+                
+                for roster_word, mask_word in zip(roster_words, mask_words[:, start:start + block_size]):
+                    block_counts += self.popcount(roster_word[:, None] & mask_word[None, :])
+        
+        if self.one_layer_per_course:
+            counts = layer_counts
+        else:
+            # the layers are in order of course, so the layers of each 
+            # course are summed as one slice:
+            counts = np.zeros((self.compiled.number_of_courses, number_of_rows), dtype=np.int64)
+            
+            first_layer = np.flatnonzero(np.diff(self.layer_course, prepend = -1))
+            counts[self.layer_course[first_layer]] = np.add.reduceat(layer_counts, first_layer, axis = 0)
+        
+        # (courses, genomes, letters) -> (genomes, courses, letters):
+        counts = counts.reshape((len(counts),) + letter_masks.shape[:-1])
+        
+        return np.ascontiguousarray(np.moveaxis(counts, 0, -2))
+
+class DeltaEvaluator:
+    """
+    A class that keeps the per-course letter counts and fitness terms of a
+    single partition, so that the fitness of a slightly different partition
+    (ex: a move or swap tried by LocalSearch, SimulatedAnnealing, TabuSearch
+    or LargeNeighborhoodSearch) can be found by only updating the courses 
+    that the changed subgroups are enrolled in
+    
+    Updating k changed subgroups costs time proportional to the number of
+    enrollments of those subgroups, instead of a full pass over every course.
+    
+    Attributes
+    ----------
+    fitness_engine : FitnessEngine object
+        the fitness rules used to score each course
+    compiled : CompiledSchedule object
+        the compiled schedule of fitness_engine
+    genome : numpy array
+        the letter index of each required subgroup for the current partition
+    counts : numpy array
+        the letter counts of each course, shape (number_of_courses, number_of_partitions)
+    course_weighted : numpy array
+        the amount each course adds to weighted_fitness_score
+    course_penalties : numpy array
+        the number of penalties applied to each course
+    course_good : numpy array
+        1 for each course counted in good_score (or the number of 
+        sections counted, for sections merged by Presolve)
+    course_other : numpy array
+        1 for each course counted in other_score (or the number of 
+        sections counted)
+    preferred_split : numpy array
+        True for each preferred subgroup whose members have different letters
+    weighted_fitness_score, penalty_count, good_score, other_score : float, int, int, int
+        running totals of the fitness tuple (see Schedule.fitness_score())
+        
+    Methods
+    -------
+    fitness()
+        the fitness tuple of the current partition
+    apply(changed_subgroups, new_letters)
+        change the letters of some subgroups and update the fitness
+    move_deltas(subgroups, new_letters)
+        the change of weighted_fitness_score of many single-subgroup moves
+    """
+    
+    def __init__(self, fitness_engine, genome):
+        """
+        The constructor for the DeltaEvaluator class, which scores genome 
+        from scratch once
+        
+        Parameters
+        ----------
+        fitness_engine : FitnessEngine object
+            the fitness rules used to score each course
+        genome : numpy array
+            the letter index of each required subgroup (or a genome of 
+            StudentClasses, which is expanded)
+        """
+        self.fitness_engine = fitness_engine
+        self.compiled = fitness_engine.compiled
+        self.genome = np.array(fitness_engine.decode_genome(genome), dtype=np.uint8)
+        
+        self.counts = np.ascontiguousarray(fitness_engine.course_counts(self.genome), dtype=np.int64)
+        
+        weighted_terms, penalties, good, other = fitness_engine.course_terms(self.counts)
+        
+        # (counted as integers, so that the per-course arrays can be 
+        # updated in place by any fitness engine, see update_courses())
+        self.course_weighted = weighted_terms.sum(axis=-1)
+        self.course_penalties = np.asarray(penalties, dtype=np.int64)
+        self.course_good = np.asarray(good, dtype=np.int64)
+        self.course_other = np.asarray(other, dtype=np.int64)
+        
+        self.preferred_split = self.compiled.preferred_split_flags(self.genome)
+        
+        # the starting totals are identical to FitnessEngine.score():
+        (self.weighted_fitness_score, 
+         self.penalty_count, 
+         self.good_score, 
+         self.other_score, 
+         _) = fitness_engine.score(self.genome)
+        
+    def fitness(self):
+        """
+        Return the fitness tuple of the current partition:
+        (weighted_fitness_score, penalty_count, good_score, other_score, number_of_courses)
+        
+        Parameters
+        ----------
+        None
+        """
+        return (self.weighted_fitness_score, 
+                self.penalty_count, 
+                self.good_score, 
+                self.other_score, 
+                self.fitness_engine.number_of_courses)
+    
+    def apply(self, changed_subgroups, new_letters):
+        """
+        Change the letters of some subgroups, updating only the counts and 
+        fitness terms of the courses (and preferred subgroups) they belong to
+        
+        Parameters
+        ----------
+        changed_subgroups : numpy array
+            the indices of the subgroups whose letters change
+        new_letters : numpy array
+            the new letter index of each subgroup in changed_subgroups
+        """
+        compiled = self.compiled
+        fitness_engine = self.fitness_engine
+        
+        changed_subgroups = np.asarray(changed_subgroups, dtype=np.int64)
+        new_letters = np.asarray(new_letters, dtype=np.uint8)
+        old_letters = self.genome[changed_subgroups]
+        
+        # ignore subgroups whose letter does not actually change:
+        is_changed = old_letters != new_letters
+        changed_subgroups = changed_subgroups[is_changed]
+        new_letters = new_letters[is_changed]
+        
+        if len(changed_subgroups) == 0:
+            return self.fitness()
+        
+        # move the subgroups and re-apply the fitness rules to the courses 
+        # they are enrolled in:
+        weighted_change, penalty_change, good_change, other_change = fitness_engine.update_courses(self, changed_subgroups, new_letters)
+        
+        self.weighted_fitness_score += weighted_change
+        self.penalty_count += penalty_change
+        self.good_score += good_change
+        self.other_score += other_change
+        
+        # re-check the preferred subgroups that the changed subgroups belong to:
+        if compiled.number_of_preferred_subgroups > 0:
+            positions, _ = compiled.gather_ranges(compiled.subgroup_preferred_offsets, changed_subgroups)
+            groups = np.unique(compiled.subgroup_preferred[positions])
+            
+            if len(groups) > 0:
+                member_positions, member_lengths = compiled.gather_ranges(compiled.preferred_offsets, groups)
+                member_letter = self.genome[compiled.preferred_member_subgroup[member_positions]]
+                
+                group_starts = np.cumsum(member_lengths) - member_lengths
+                split = (np.minimum.reduceat(member_letter, group_starts) 
+                         != np.maximum.reduceat(member_letter, group_starts))
+                
+                newly_split = int(np.count_nonzero(split)) - int(np.count_nonzero(self.preferred_split[groups]))
+                self.weighted_fitness_score -= newly_split*(100/compiled.number_of_preferred_subgroups)
+                self.preferred_split[groups] = split
+        
+        return self.fitness()
+    
+    def move_deltas(self, subgroups, new_letters):
+        """
+        Return the change of weighted_fitness_score for each move of a single
+        subgroup (subgroups[i] to new_letters[i]), where each move is 
+        evaluated on its own against the current partition (the partition 
+        is not changed)
+        
+        Every move is evaluated at once: the counts of each (move, course) 
+        pair are updated in a single array, and the fitness rules are 
+        applied to all of them in one call to course_terms()
+        
+        Parameters
+        ----------
+        subgroups : numpy array
+            the subgroup of each move
+        new_letters : numpy array
+            the new letter index of each move
+        """
+        compiled = self.compiled
+        fitness_engine = self.fitness_engine
+        
+        subgroups = np.asarray(subgroups, dtype=np.int64)
+        new_letters = np.asarray(new_letters, dtype=np.int64)
+        old_letters = self.genome[subgroups].astype(np.int64)
+        number_of_moves = len(subgroups)
+        
+        # the unique (move, course) pairs, with the number of members of
+        # the subgroup in the course:
+        positions, lengths = compiled.gather_ranges(compiled.subgroup_offsets, subgroups)
+        pair_keys = (np.repeat(np.arange(number_of_moves, dtype=np.int64), lengths)*compiled.number_of_courses 
+                     + compiled.subgroup_course[positions])
+        pair_keys, pair_members = np.unique(pair_keys, return_counts = True)
+        
+        pair_move = pair_keys//compiled.number_of_courses
+        pair_course = pair_keys % compiled.number_of_courses
+        pair_index = np.arange(len(pair_keys))
+        
+        new_counts = self.counts[pair_course].astype(np.int64)
+        new_counts[pair_index, old_letters[pair_move]] -= pair_members
+        new_counts[pair_index, new_letters[pair_move]] += pair_members
+        
+        weighted_terms, _, _, _ = fitness_engine.course_terms(new_counts, fitness_engine.course_thresholds.take(pair_course))
+        
+        deltas = np.bincount(pair_move, weights = weighted_terms.sum(axis=-1) - self.course_weighted[pair_course], 
+                             minlength = number_of_moves)
+        
+        # the preferred subgroups that each move splits (or joins):
+        if compiled.number_of_preferred_subgroups > 0:
+            positions, lengths = compiled.gather_ranges(compiled.subgroup_preferred_offsets, subgroups)
+            group_move = np.repeat(np.arange(number_of_moves, dtype=np.int64), lengths)
+            groups = compiled.subgroup_preferred[positions]
+            
+            # the letter counts of the members of each (move, group) pair:
+            member_positions, member_lengths = compiled.gather_ranges(compiled.preferred_offsets, groups)
+            member_pair = np.repeat(np.arange(len(groups), dtype=np.int64), member_lengths)
+            member_subgroup = compiled.preferred_member_subgroup[member_positions]
+            
+            group_counts = np.zeros((len(groups), self.counts.shape[1]), dtype=np.int64)
+            np.add.at(group_counts, (member_pair, self.genome[member_subgroup]), 1)
+            
+            # the members of each group that belong to the moved subgroup:
+            moved_members = np.bincount(member_pair, weights = (member_subgroup == subgroups[group_move][member_pair]), 
+                                        minlength = len(groups)).astype(np.int64)
+            
+            new_group_counts = group_counts.copy()
+            group_index = np.arange(len(groups))
+            new_group_counts[group_index, old_letters[group_move]] -= moved_members
+            new_group_counts[group_index, new_letters[group_move]] += moved_members
+            
+            was_split = np.count_nonzero(group_counts, axis=1) > 1
+            is_split = np.count_nonzero(new_group_counts, axis=1) > 1
+            
+            split_change = is_split.astype(np.int64) - was_split.astype(np.int64)
+            
+            deltas -= np.bincount(group_move, weights = split_change, minlength = number_of_moves)*(100/compiled.number_of_preferred_subgroups)
+        
+        return deltas
+
+class FitnessCache:
+    """
+    A bounded least-recently-used (LRU) cache of fitness scores, keyed by
+    a 64-bit hash of the genome, so that a partition that has been scored 
+    before (ex: a child that is an exact copy of its parent, or an elite 
+    that was sent back by crossbreed_islands()) is not scored again
+    
+    Each island keeps its own cache. When the cache holds more entries 
+    than fit in memory_limit_megabytes, the least recently used scores 
+    are evicted first
+    
+    Note: genomes are not stored in the cache (only their hash), so two 
+    different genomes with the same 64-bit hash would share a score. 
+    This is astronomically unlikely for the number of genomes an island
+    scores
+    
+    Attributes
+    ----------
+    entry_bytes : int
+        the estimated memory used by one entry (the key, the fitness 
+        tuple and the OrderedDict bookkeeping)
+    memory_limit_megabytes : float
+        the memory cap of the cache
+    maximum_entries : int
+        the number of entries that fit under memory_limit_megabytes
+    score_dict : collections.OrderedDict
+        key: genome hash, value: fitness tuple 
+        (in order from least to most recently used)
+    hits : int
+        the number of lookups that found a score
+    misses : int
+        the number of lookups that did not find a score
+        
+    Methods
+    -------
+    genome_key(genome)
+        the 64-bit hash of a genome
+    get(genome)
+        the cached fitness of a genome (or None)
+    put(genome, fitness)
+        add the fitness of a genome to the cache
+    """
+    
+    entry_bytes = 400
+    
+    def __init__(self, memory_limit_megabytes = 64):
+        """
+        Parameters
+        ----------
+        memory_limit_megabytes : float
+            the memory cap of the cache (default = 64)
+        """
+        self.memory_limit_megabytes = memory_limit_megabytes
+        self.maximum_entries = int(memory_limit_megabytes*1024*1024) // self.entry_bytes
+        self.score_dict = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def __len__(self):
+        return len(self.score_dict)
+    
+    @classmethod
+    def genome_key(cls, genome):
+        """
+        Returns the 64-bit hash of a genome (xxh3 if the xxhash module is 
+        installed, otherwise blake2b), computed over the raw bytes of the 
+        uint8 array
+        
+        Parameters
+        ----------
+        genome : numpy array
+            a genome in the form [0, 0, 1, 3, 0, 2, 1, 2, ...]
+        """
+        genome_bytes = np.ascontiguousarray(genome).data
+        
+        if xxhash is not None:
+            return xxhash.xxh3_64_intdigest(genome_bytes)
+        
+        return int.from_bytes(hashlib.blake2b(genome_bytes, digest_size=8).digest(), "little")
+    
+    def get(self, genome):
+        """
+        Returns the cached fitness of a genome, or None if the genome 
+        has not been scored (or its score has been evicted)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            a genome in the form [0, 0, 1, 3, 0, 2, 1, 2, ...]
+        """
+        key = self.genome_key(genome)
+        
+        fitness = self.score_dict.get(key)
+        
+        if fitness is None:
+            self.misses += 1
+            return None
+        
+        # this entry is now the most recently used
+        self.score_dict.move_to_end(key)
+        self.hits += 1
+        
+        return fitness
+    
+    def put(self, genome, fitness):
+        """
+        Adds the fitness of a genome to the cache, evicting the least 
+        recently used entries if the cache is full
+        
+        Parameters
+        ----------
+        genome : numpy array
+            a genome in the form [0, 0, 1, 3, 0, 2, 1, 2, ...]
+        fitness : tuple
+            the fitness of the genome, see Schedule.fitness_score()
+        """
+        if self.maximum_entries <= 0:
+            return
+        
+        key = self.genome_key(genome)
+        
+        self.score_dict[key] = fitness
+        self.score_dict.move_to_end(key)
+        
+        while len(self.score_dict) > self.maximum_entries:
+            self.score_dict.popitem(last = False)
+
+class LocalSearch:
+    """
+    A class that improves a partition with a first-improvement local search
+    (a "memetic" step of the genetic algorithm), scored with a DeltaEvaluator
+    
+    Only the subgroups enrolled in a course that is not "In Compliance" are
+    considered. For each of them (in random order), the search tries:
+    
+    1. moving the subgroup to each of the other letters
+    2. swapping letters with a few other such subgroups that have a 
+       different letter (which keeps the size of every letter the same)
+    
+    and keeps the first change that increases weighted_fitness_score. This
+    is repeated until a full pass finds no improvement (a local optimum) 
+    or the time limit is reached
+    
+    Many courses that are close to "In Compliance" are only one or two 
+    such changes away from it, which random mutation is slow to find
+    
+    Attributes
+    ----------
+    fitness_engine : FitnessEngine object
+        the fitness rules used to score partitions
+    rng : numpy.random.Generator
+        the random number generator used to order the subgroups and to 
+        choose swap partners
+    number_of_swap_partners : int
+        the number of subgroups each subgroup tries to swap letters with
+        
+    Methods
+    -------
+    candidate_subgroups(evaluator)
+        the subgroups enrolled in a course that is not "In Compliance"
+    try_change(evaluator, subgroups, letters)
+        change the letters of some subgroups if this improves the score
+    polish(genome, time_limit)
+        improve a partition until it is a local optimum (or the time is up)
+    """
+    
+    def __init__(self, fitness_engine, rng = None, number_of_swap_partners = 8):
+        """
+        The constructor for the LocalSearch class
+        
+        Parameters
+        ----------
+        fitness_engine : FitnessEngine object
+            the fitness rules used to score partitions
+        rng : numpy.random.Generator
+            (optional) the random number generator to use 
+            (default = None, which creates a new generator)
+        number_of_swap_partners : int
+            (optional) the number of subgroups each subgroup tries to swap
+            letters with (default = 8)
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        self.fitness_engine = fitness_engine
+        self.rng = rng
+        self.number_of_swap_partners = number_of_swap_partners
+        
+    def candidate_subgroups(self, evaluator):
+        """
+        Return the subgroups enrolled in a course that is not "In Compliance"
+        for the current partition of evaluator
+        
+        Parameters
+        ----------
+        evaluator : DeltaEvaluator object
+            the evaluator of the current partition
+        """
+        compiled = evaluator.compiled
+        
+        not_compliant = np.flatnonzero(evaluator.course_good == 0)
+        positions, _ = compiled.gather_ranges(compiled.course_offsets, not_compliant)
+        
+        return np.unique(compiled.enrollment_subgroup[positions])
+    
+    def try_change(self, evaluator, subgroups, letters):
+        """
+        Change the letters of some subgroups, and return True if this 
+        increases weighted_fitness_score (otherwise the change is undone
+        and False is returned)
+        
+        Parameters
+        ----------
+        evaluator : DeltaEvaluator object
+            the evaluator of the current partition
+        subgroups : list
+            the subgroups to change
+        letters : list
+            the new letter index of each subgroup
+        """
+        old_score = evaluator.weighted_fitness_score
+        old_letters = evaluator.genome[subgroups]
+        
+        evaluator.apply(subgroups, letters)
+        
+        if evaluator.weighted_fitness_score > old_score + 1e-9:
+            return True
+        
+        evaluator.apply(subgroups, old_letters)
+        
+        # restore the running total exactly (undoing a change adds and 
+        # subtracts the same terms, which can leave a rounding error):
+        evaluator.weighted_fitness_score = old_score
+        
+        return False
+    
+    def polish(self, genome, time_limit):
+        """
+        Improve a partition with single-subgroup moves and pairwise swaps 
+        until it is a local optimum or time_limit seconds have passed, and
+        return the (fitness, genome) tuple of the improved partition
+        
+        A genome of StudentClasses is searched one subgroup at a time and
+        compressed again at the end
+        
+        Parameters
+        ----------
+        genome : numpy array
+            a genome of the fitness engine
+        time_limit : float
+            the maximum time to search, in seconds
+        """
+        fitness_engine = self.fitness_engine
+        number_of_partitions = fitness_engine.number_of_partitions
+        rng = self.rng
+        
+        deadline = time.perf_counter() + time_limit
+        
+        evaluator = DeltaEvaluator(fitness_engine, genome)
+        
+        improved = True
+        
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            
+            candidates = self.candidate_subgroups(evaluator)
+            rng.shuffle(candidates)
+            
+            for subgroup in candidates.tolist():
+                if time.perf_counter() >= deadline:
+                    break
+                
+                letter = int(evaluator.genome[subgroup])
+                
+                # 1. move the subgroup to each of the other letters:
+                moved = False
+                
+                for shift in range(1, number_of_partitions):
+                    if self.try_change(evaluator, [subgroup], [(letter + shift) % number_of_partitions]):
+                        moved = True
+                        break
+                        
+                if moved:
+                    improved = True
+                    continue
+                
+                # 2. swap letters with a few other candidates:
+                partners = rng.choice(candidates, size = min(self.number_of_swap_partners, len(candidates)), replace = False)
+                
+                for partner in partners.tolist():
+                    partner_letter = int(evaluator.genome[partner])
+                    
+                    if partner_letter == letter:
+                        continue
+                    
+                    if self.try_change(evaluator, [subgroup, partner], [partner_letter, letter]):
+                        improved = True
+                        break
+        
+        # score the result from scratch (the running totals of the 
+        # evaluator are only accurate up to rounding):
+        letters = evaluator.genome
+        
+        if fitness_engine.student_classes is not None:
+            genome = fitness_engine.student_classes.compress_genome(letters)
+        else:
+            genome = letters
+        
+        return fitness_engine.score(genome), genome
+
+class SimulatedAnnealing:
+    """
+    A class that runs one chain of simulated annealing over the letters of 
+    the subgroups, scored with a DeltaEvaluator
+    
+    Source: https://en.wikipedia.org/wiki/Simulated_annealing
+    
+    Each step picks a random subgroup and either moves it to a random other
+    letter or swaps letters with another random subgroup (with probability 
+    swap_probability). A change that does not lower weighted_fitness_score
+    is always kept, and a change that lowers it by delta is kept with 
+    probability exp(-delta/temperature), so the chain can climb out of 
+    local optima while the temperature is high. The temperature falls from 
+    initial_temperature to final_temperature as the run progresses (see 
+    temperature())
+    
+    Attributes
+    ----------
+    fitness_engine : FitnessEngine object
+        the fitness rules used to score partitions
+    rng : numpy.random.Generator
+        the random number generator of the chain
+    initial_temperature : float
+        the temperature at the start of the run
+    final_temperature : float
+        the temperature at the end of the run
+    cooling_schedule : str
+        "geometric" (the temperature falls by the same factor at every 
+        step) or "linear" (it falls by the same amount)
+    swap_probability : float
+        the share of the steps that swap the letters of two subgroups
+    evaluator : DeltaEvaluator object
+        the evaluator of the current partition of the chain
+    best_fitness : tuple
+        the fitness tuple of the best partition found so far
+    best_letters : numpy array
+        the letter index of each subgroup of the best partition found so far
+    number_of_steps : int
+        the number of steps run so far
+    number_of_accepted_steps : int
+        the number of steps whose change was kept
+        
+    Methods
+    -------
+    temperature(progress)
+        the temperature at a point of the run
+    start(genome)
+        start the chain from a partition
+    run(number_of_steps, start_progress, end_progress)
+        run the chain for a number of steps
+    best()
+        the (fitness, genome) tuple of the best partition found so far
+    """
+    
+    # the number of random numbers drawn at once
+    batch_size = 1024
+    
+    def __init__(self, fitness_engine, rng = None, initial_temperature = 0.5, final_temperature = 0.005, 
+                 cooling_schedule = "geometric", swap_probability = 0.5):
+        """
+        The constructor for the SimulatedAnnealing class
+        
+        Parameters
+        ----------
+        fitness_engine : FitnessEngine object
+            the fitness rules used to score partitions
+        rng : numpy.random.Generator
+            (optional) the random number generator to use 
+            (default = None, which creates a new generator)
+        initial_temperature : float
+            (optional) the temperature at the start of the run (default = 0.5)
+        final_temperature : float
+            (optional) the temperature at the end of the run (default = 0.005)
+        cooling_schedule : str
+            (optional) "geometric" or "linear" (default = "geometric")
+        swap_probability : float
+            (optional) the share of the steps that swap the letters of two
+            subgroups (default = 0.5)
+        """
+        if cooling_schedule not in ("geometric", "linear"):
+            raise ValueError("The cooling schedule must be 'geometric' or 'linear', not " + repr(cooling_schedule))
+        
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        self.fitness_engine = fitness_engine
+        self.rng = rng
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.cooling_schedule = cooling_schedule
+        self.swap_probability = swap_probability
+        
+        self.evaluator = None
+        self.best_fitness = None
+        self.best_letters = None
+        self.number_of_steps = 0
+        self.number_of_accepted_steps = 0
+        
+    def temperature(self, progress):
+        """
+        Return the temperature when a share progress (from 0 to 1) of the 
+        run has been completed
+        
+        Parameters
+        ----------
+        progress : float
+            the share of the run that has been completed
+        """
+        progress = min(max(progress, 0.0), 1.0)
+        
+        if self.cooling_schedule == "linear":
+            return self.initial_temperature + (self.final_temperature - self.initial_temperature)*progress
+        
+        return self.initial_temperature*(self.final_temperature/self.initial_temperature)**progress
+    
+    def start(self, genome):
+        """
+        Start the chain from a partition
+        
+        Parameters
+        ----------
+        genome : numpy array
+            a genome of the fitness engine
+        """
+        self.evaluator = DeltaEvaluator(self.fitness_engine, genome)
+        
+        self.best_fitness = self.evaluator.fitness()
+        self.best_letters = self.evaluator.genome.copy()
+        
+    def run(self, number_of_steps, start_progress = 0.0, end_progress = 1.0):
+        """
+        Run the chain for number_of_steps steps, while the temperature falls
+        from temperature(start_progress) to temperature(end_progress)
+        
+        Returns the fitness tuple of the best partition found so far
+        
+        Parameters
+        ----------
+        number_of_steps : int
+            the number of steps to run
+        start_progress : float
+            (optional) the share of the whole run completed before these 
+            steps (default = 0.0)
+        end_progress : float
+            (optional) the share of the whole run completed after these 
+            steps (default = 1.0)
+        """
+        evaluator = self.evaluator
+        number_of_partitions = self.fitness_engine.number_of_partitions
+        number_of_subgroups = len(evaluator.genome)
+        rng = self.rng
+        
+        best_score = self.best_fitness[0]
+        
+        for batch_start in range(0, number_of_steps, self.batch_size):
+            batch_length = min(self.batch_size, number_of_steps - batch_start)
+            
+            # draw the random numbers of a whole batch of steps at once:
+            subgroups = rng.integers(0, number_of_subgroups, size = batch_length).tolist()
+            partners = rng.integers(0, number_of_subgroups, size = batch_length).tolist()
+            shifts = rng.integers(1, number_of_partitions, size = batch_length).tolist()
+            is_swap = (rng.random(batch_length) < self.swap_probability).tolist()
+            
+            # exp(-delta/temperature) > uniform is the same as 
+            # delta < -temperature*log(uniform):
+            thresholds = (-np.log(1.0 - rng.random(batch_length))).tolist()
+            
+            for step in range(batch_length):
+                progress = start_progress + (end_progress - start_progress)*(batch_start + step)/number_of_steps
+                temperature = self.temperature(progress)
+                
+                subgroup = subgroups[step]
+                letter = int(evaluator.genome[subgroup])
+                
+                if is_swap[step]:
+                    partner = partners[step]
+                    partner_letter = int(evaluator.genome[partner])
+                    
+                    if partner_letter == letter:
+                        continue
+                    
+                    changed_subgroups = [subgroup, partner]
+                    new_letters = [partner_letter, letter]
+                    old_letters = [letter, partner_letter]
+                else:
+                    changed_subgroups = [subgroup]
+                    new_letters = [(letter + shifts[step]) % number_of_partitions]
+                    old_letters = [letter]
+                
+                old_score = evaluator.weighted_fitness_score
+                
+                evaluator.apply(changed_subgroups, new_letters)
+                
+                delta = old_score - evaluator.weighted_fitness_score
+                
+                if delta <= 0 or delta < temperature*thresholds[step]:
+                    self.number_of_accepted_steps += 1
+                    
+                    # remember the best partition found so far:
+                    if evaluator.weighted_fitness_score > best_score + 1e-9:
+                        best_score = evaluator.weighted_fitness_score
+                        self.best_fitness = evaluator.fitness()
+                        self.best_letters = evaluator.genome.copy()
+                else:
+                    # undo the change (and any rounding error it left):
+                    evaluator.apply(changed_subgroups, old_letters)
+                    evaluator.weighted_fitness_score = old_score
+        
+        self.number_of_steps += number_of_steps
+        
+        return self.best_fitness
+    
+    def best(self):
+        """
+        Return the (fitness, genome) tuple of the best partition found so 
+        far, scored from scratch (a genome of StudentClasses is compressed
+        again)
+        
+        Parameters
+        ----------
+        None
+        """
+        fitness_engine = self.fitness_engine
+        
+        if fitness_engine.student_classes is not None:
+            genome = fitness_engine.student_classes.compress_genome(self.best_letters)
+        else:
+            genome = self.best_letters.copy()
+        
+        return fitness_engine.score(genome), genome
+
+class TabuSearch:
+    """
+    A class that runs a tabu search over the letters of the subgroups
+    
+    Source: https://en.wikipedia.org/wiki/Tabu_search
+    
+    Each iteration considers moving each subgroup enrolled in a course that
+    is not "In Compliance" (see LocalSearch.candidate_subgroups()) to each 
+    of the other letters, scores every move at once with 
+    DeltaEvaluator.move_deltas(), and makes the best move that is not tabu,
+    even if it lowers the score (which lets the search walk off a local 
+    optimum). Two memories steer the search:
+    
+    1. recency: after a subgroup leaves a letter, moving it back to that 
+       letter is tabu for tabu_tenure iterations (unless this would give 
+       the best partition found so far, the "aspiration" rule)
+    2. frequency: subgroups that have been moved often are penalized by 
+       frequency_weight times the share of the iterations they were moved
+       in, so that the search does not keep moving the same subgroups
+    
+    Only moves of subgroups in courses that are not "In Compliance" are 
+    considered, so each iteration is cheap even for very large schedules. 
+    If there are more than neighborhood_size such moves, a random sample 
+    of them is considered
+    
+    Attributes
+    ----------
+    fitness_engine : FitnessEngine object
+        the fitness rules used to score partitions
+    rng : numpy.random.Generator
+        the random number generator used to sample large neighborhoods
+    tabu_tenure : int
+        the number of iterations a subgroup may not return to a letter
+    frequency_weight : float
+        the penalty for moving a subgroup that is moved in every iteration
+    neighborhood_size : int
+        the largest number of moves considered in an iteration
+    evaluator : DeltaEvaluator object
+        the evaluator of the current partition
+    tabu_until : numpy array
+        the iteration until which each (subgroup, letter) move is tabu
+    move_count : numpy array
+        the number of times each subgroup has been moved
+    number_of_steps : int
+        the number of iterations run so far
+    best_fitness : tuple
+        the fitness tuple of the best partition found so far
+    best_letters : numpy array
+        the letter index of each subgroup of the best partition found so far
+        
+    Methods
+    -------
+    start(genome)
+        start the search from a partition
+    candidate_moves()
+        the (subgroup, letter) moves considered in the next iteration
+    run(number_of_iterations)
+        run a number of iterations
+    best()
+        the (fitness, genome) tuple of the best partition found so far
+    """
+    
+    def __init__(self, fitness_engine, rng = None, tabu_tenure = 20, frequency_weight = 0.05, neighborhood_size = 5000):
+        """
+        The constructor for the TabuSearch class
+        
+        Parameters
+        ----------
+        fitness_engine : FitnessEngine object
+            the fitness rules used to score partitions
+        rng : numpy.random.Generator
+            (optional) the random number generator to use 
+            (default = None, which creates a new generator)
+        tabu_tenure : int
+            (optional) the number of iterations a subgroup may not return 
+            to a letter it left (default = 20)
+        frequency_weight : float
+            (optional) the penalty for moving a subgroup that is moved in 
+            every iteration (default = 0.05)
+        neighborhood_size : int
+            (optional) the largest number of moves considered in an 
+            iteration (default = 5000)
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        self.fitness_engine = fitness_engine
+        self.rng = rng
+        self.tabu_tenure = tabu_tenure
+        self.frequency_weight = frequency_weight
+        self.neighborhood_size = neighborhood_size
+        
+        self.evaluator = None
+        self.tabu_until = None
+        self.move_count = None
+        self.number_of_steps = 0
+        self.best_fitness = None
+        self.best_letters = None
+    
+    def start(self, genome):
+        """
+        Start the search from a partition (and clear both memories)
+        
+        Parameters
+        ----------
+        genome : numpy array
+            a genome of the fitness engine
+        """
+        self.evaluator = DeltaEvaluator(self.fitness_engine, genome)
+        
+        number_of_subgroups = len(self.evaluator.genome)
+        
+        self.tabu_until = np.zeros((number_of_subgroups, self.fitness_engine.number_of_partitions), dtype=np.int64)
+        self.move_count = np.zeros(number_of_subgroups, dtype=np.int64)
+        self.number_of_steps = 0
+        
+        self.best_fitness = self.evaluator.fitness()
+        self.best_letters = self.evaluator.genome.copy()
+        
+    def candidate_moves(self):
+        """
+        Return the moves considered in the next iteration as two arrays 
+        (subgroups, new_letters): every subgroup enrolled in a course that 
+        is not "In Compliance", with every letter other than its own (a 
+        random sample of neighborhood_size of them if there are more)
+        
+        Parameters
+        ----------
+        None
+        """
+        number_of_partitions = self.fitness_engine.number_of_partitions
+        evaluator = self.evaluator
+        compiled = evaluator.compiled
+        
+        not_compliant = np.flatnonzero(evaluator.course_good == 0)
+        positions, _ = compiled.gather_ranges(compiled.course_offsets, not_compliant)
+        candidates = np.unique(compiled.enrollment_subgroup[positions]).astype(np.int64)
+        
+        # every other letter of each candidate:
+        subgroups = np.repeat(candidates, number_of_partitions - 1)
+        shifts = np.tile(np.arange(1, number_of_partitions, dtype=np.int64), len(candidates))
+        new_letters = (evaluator.genome[subgroups].astype(np.int64) + shifts) % number_of_partitions
+        
+        if len(subgroups) > self.neighborhood_size:
+            sample = self.rng.choice(len(subgroups), size = self.neighborhood_size, replace = False)
+            subgroups, new_letters = subgroups[sample], new_letters[sample]
+        
+        return subgroups, new_letters
+    
+    def run(self, number_of_iterations, start_progress = 0.0, end_progress = 1.0):
+        """
+        Run number_of_iterations iterations of the search, and return the 
+        fitness tuple of the best partition found so far
+        
+        (start_progress and end_progress are accepted so that a TabuSearch 
+        can be run in the place of a SimulatedAnnealing chain, but they are
+        not used)
+        
+        Parameters
+        ----------
+        number_of_iterations : int
+            the number of iterations to run
+        """
+        evaluator = self.evaluator
+        
+        for _ in range(number_of_iterations):
+            self.number_of_steps += 1
+            iteration = self.number_of_steps
+            
+            subgroups, new_letters = self.candidate_moves()
+            
+            # every course is "In Compliance" 
+            if len(subgroups) == 0:
+                break
+            
+            deltas = evaluator.move_deltas(subgroups, new_letters)
+            
+            # a tabu move is allowed if it gives the best partition so far:
+            is_tabu = self.tabu_until[subgroups, new_letters] > iteration
+            is_aspirated = evaluator.weighted_fitness_score + deltas > self.best_fitness[0] + 1e-9
+            is_allowed = ~is_tabu | is_aspirated
+            
+            if not is_allowed.any():
+                continue
+            
+            # penalize the subgroups that have been moved most often:
+            move_value = deltas - self.frequency_weight*self.move_count[subgroups]/iteration
+            move_value[~is_allowed] = -np.inf
+            
+            best_move = int(np.argmax(move_value))
+            subgroup = int(subgroups[best_move])
+            old_letter = int(evaluator.genome[subgroup])
+            
+            evaluator.apply([subgroup], [new_letters[best_move]])
+            
+            # the subgroup may not return to its old letter for a while:
+            self.tabu_until[subgroup, old_letter] = iteration + self.tabu_tenure
+            self.move_count[subgroup] += 1
+            
+            if evaluator.weighted_fitness_score > self.best_fitness[0] + 1e-9:
+                self.best_fitness = evaluator.fitness()
+                self.best_letters = evaluator.genome.copy()
+        
+        return self.best_fitness
+    
+    def best(self):
+        """
+        Return the (fitness, genome) tuple of the best partition found so 
+        far, scored from scratch (a genome of StudentClasses is compressed
+        again)
+        
+        Parameters
+        ----------
+        None
+        """
+        fitness_engine = self.fitness_engine
+        
+        if fitness_engine.student_classes is not None:
+            genome = fitness_engine.student_classes.compress_genome(self.best_letters)
+        else:
+            genome = self.best_letters.copy()
+        
+        return fitness_engine.score(genome), genome
+
+class ExactSolver:
+    """
+    A class that formulates giving letters to subgroups as an integer 
+    program, solved with the CP-SAT solver of OR-Tools (optional), which 
+    maximizes the number of courses counted in good_score
+    
+    A course is counted in good_score if no grouping is above its maximum 
+    ("In Compliance"), or if it is too big to ever be "In Compliance" and
+    no grouping is above its penalty tolerance (see CohortRules). Either 
+    way, the letter counts of each grouping have a limit, so with
+    
+    x[s, l] = 1 if subgroup s is given letter l (exactly one l per s)
+    
+    each of these options of course c is the linear constraint 
+    
+    fixed count of g + sum of members[c, s]*x[s, l] over l in g <= limit[g]
+    
+    for every grouping g, enforced only if the option is chosen, and the
+    objective is the number of courses (times the number of identical 
+    sections) with a chosen option. Each required subgroup has a single 
+    letter, so the required subgroups are part of the formulation
+    
+    The objective is exactly good_score (of the courses of the model), so
+    the bound proven by the solver is an upper bound on good_score. The 
+    penalties of the fitness function and the preferred subgroups are not
+    modeled, so the solution that counts the most courses in good_score is
+    not always the one with the highest weighted_fitness_score
+    
+    Attributes
+    ----------
+    fitness_engine : FitnessEngine object
+        the fitness rules used to score partitions
+    cohort_rules : CohortRules object
+        the cohort groupings that define "In Compliance"
+    number_of_workers : int
+        the number of threads the solver searches with
+        
+    Methods
+    -------
+    course_limits(thresholds)
+        the limit of each grouping of each course for each option
+    upper_bound()
+        an upper bound on good_score from each course by itself
+    course_members(enrollment_course, enrollment_subgroup, number_of_courses, number_of_subgroups)
+        the subgroups of each course (with their member counts) as CSR arrays
+    sparse_incidence(incidence)
+        the same arrays for a dense (courses x subgroups) incidence array
+    solve(courses, fixed_counts, member_offsets, member_subgroup, member_count, hint_letters, time_limit)
+        the letters of some subgroups that count the most courses in good_score
+    solve_partition(genome, time_limit)
+        the same, for every subgroup of the schedule
+    """
+    
+    def __init__(self, fitness_engine, cohort_rules, number_of_workers = 1):
+        """
+        The constructor for the ExactSolver class
+        
+        Parameters
+        ----------
+        fitness_engine : FitnessEngine object
+            the fitness rules used to score partitions
+        cohort_rules : CohortRules object
+            the cohort groupings that define "In Compliance" (see 
+            Schedule.cohort_rules)
+        number_of_workers : int
+            (optional) the number of threads the solver searches with
+            (default = 1)
+        """
+        self.fitness_engine = fitness_engine
+        self.cohort_rules = cohort_rules
+        self.number_of_workers = number_of_workers
+    
+    def course_limits(self, thresholds):
+        """
+        Return the limits of each grouping of each course for each way the
+        course can be counted in good_score, with shape (number of options,
+        number_of_courses, number_of_groupings): the maxima of "In 
+        Compliance", and the penalty tolerances of a course that is too big
+        to ever be "In Compliance" (the tolerances of other courses are set
+        to -1, so that they can never be chosen)
+        
+        Parameters
+        ----------
+        thresholds : CourseThresholds object
+            the thresholds of the courses
+        """
+        totals = thresholds.course_totals
+        maxima = thresholds.grouping_maxima
+        
+        # the courses that are counted in good_score when no grouping is 
+        # above its tolerance (see course_terms() of the fitness engine):
+        if isinstance(self.fitness_engine, CohortFitnessEngine):
+            too_big = np.any(totals[:, None]*self.cohort_rules.even_shares > maxima, axis=1)
+        elif self.fitness_engine.number_of_partitions == 4:
+            too_big = totals > 2*thresholds.half_class_maximum
+        else:
+            # the built-in A/B rules count these courses in other_score:
+            too_big = np.zeros(len(totals), dtype=bool)
+        
+        # a grouping is above its tolerance if count/total > tolerance:
+        balance_limits = np.floor(thresholds.grouping_tolerance*totals[:, None] + 1e-9).astype(np.int64)
+        balance_limits[~too_big] = -1
+        
+        return np.stack((maxima, balance_limits))
+    
+    def upper_bound(self):
+        """
+        Return an upper bound on good_score (including the courses removed 
+        by presolve) that does not need the solver: the number of courses
+        that could be counted in good_score if they were the only course
+        of the schedule. This bound is never below the best partition, but 
+        it is only reached if every such course can be counted at once
+        
+        An option of a course (see course_limits()) can only be met if:
+        
+        1. no limit is negative
+        2. the students of the course fit in every set of groupings that 
+           covers every letter (see CohortRules.course_capacity())
+        3. the largest subgroup of the course (which is given one letter) 
+           fits in the groupings of some letter
+        
+        (with every student in a subgroup of their own, these are the 
+        conditions that the LP relaxation of solve() can also meet, so the
+        LP relaxation gives the same bound)
+        
+        Parameters
+        ----------
+        None
+        """
+        fitness_engine = self.fitness_engine
+        compiled = fitness_engine.compiled
+        thresholds = fitness_engine.course_thresholds
+        membership = self.cohort_rules.membership
+        
+        totals = thresholds.course_totals
+        limits = self.course_limits(thresholds)
+        
+        if thresholds.course_multiplicity is not None:
+            multiplicity = thresholds.course_multiplicity
+        else:
+            multiplicity = np.ones(len(totals), dtype=np.int64)
+        
+        # the number of members of the largest subgroup in each course:
+        pair_keys = compiled.enrollment_course.astype(np.int64)*compiled.number_of_subgroups + compiled.enrollment_subgroup
+        pairs, pair_sizes = np.unique(pair_keys, return_counts=True)
+        
+        largest_subgroup = np.zeros(len(totals), dtype=np.int64)
+        np.maximum.at(largest_subgroup, pairs // compiled.number_of_subgroups, pair_sizes)
+        
+        # the room of each letter is the smallest limit of its groupings 
+        # (a letter without a grouping has no limit):
+        letter_room = np.where(membership[None, None, :, :] > 0, limits[:, :, None, :], np.iinfo(np.int64).max).min(axis=-1)
+        
+        is_possible = (np.all(limits >= 0, axis=-1) 
+                       & (totals[None, :] <= np.stack([self.cohort_rules.course_capacity(option_limits) for option_limits in limits])) 
+                       & (largest_subgroup[None, :] <= letter_room.max(axis=-1)))
+        
+        # the courses removed by presolve are always counted:
+        return int(multiplicity[is_possible.any(axis=0)].sum()) + int(fitness_engine.score_offset[2])
+    
+    @classmethod
+    def course_members(cls, enrollment_course, enrollment_subgroup, number_of_courses, number_of_subgroups):
+        """
+        Return the subgroups enrolled in each course, with the number of
+        their members in the course, as a tuple of CSR arrays 
+        (member_offsets, member_subgroup, member_count), where the members
+        of course c are member_subgroup[member_offsets[c]:member_offsets[c + 1]]
+        
+        Parameters
+        ----------
+        enrollment_course : numpy array
+            the course of each enrollment
+        enrollment_subgroup : numpy array
+            the subgroup of each enrollment
+        number_of_courses : int
+            the number of courses
+        number_of_subgroups : int
+            the number of subgroups
+        """
+        # unique (course, subgroup) pairs, sorted by course:
+        pairs, member_count = np.unique(enrollment_course.astype(np.int64)*number_of_subgroups + enrollment_subgroup, 
+                                        return_counts = True)
+        
+        member_offsets = np.zeros(number_of_courses + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs // number_of_subgroups, minlength = number_of_courses), out=member_offsets[1:])
+        
+        return member_offsets, pairs % number_of_subgroups, member_count.astype(np.int64)
+    
+    @classmethod
+    def sparse_incidence(cls, incidence):
+        """
+        Return the CSR arrays of course_members() for a dense incidence 
+        array, where incidence[c, s] is the number of members of subgroup 
+        s enrolled in course c (ex: a sub-problem of LargeNeighborhoodSearch)
+        
+        Parameters
+        ----------
+        incidence : numpy array
+            the number of members of each subgroup (column) enrolled in 
+            each course (row)
+        """
+        course_index, member_subgroup = np.nonzero(incidence)
+        
+        member_offsets = np.zeros(incidence.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(course_index, minlength = incidence.shape[0]), out=member_offsets[1:])
+        
+        return member_offsets, member_subgroup, incidence[course_index, member_subgroup].astype(np.int64)
+    
+    def solve(self, courses, fixed_counts, member_offsets, member_subgroup, member_count, hint_letters, time_limit):
+        """
+        Give letters to some subgroups, with the letters of every other
+        subgroup fixed, so that the most courses are counted in good_score,
+        and return a tuple (letters, good, bound, is_optimal) where
+        
+        letters : the letter of each subgroup (None if the solver found no 
+            solution within time_limit)
+        good : the number of the courses counted in good_score (with 
+            hint_letters if letters is None)
+        bound : an upper bound on good proven by the solver (None if the
+            solver found no solution within time_limit)
+        is_optimal : True if good is proven to be the most possible
+        
+        Parameters
+        ----------
+        courses : numpy array
+            the courses that the subgroups are enrolled in
+        fixed_counts : numpy array
+            the letter counts of each course without the subgroups, shape 
+            (number of courses, number_of_partitions)
+        member_offsets : numpy array
+            CSR offsets into member_subgroup, one entry per course plus one
+            (see course_members())
+        member_subgroup : numpy array
+            the subgroups (0 to the number of subgroups - 1) enrolled in 
+            each course
+        member_count : numpy array
+            the number of members of each entry of member_subgroup
+        hint_letters : numpy array
+            the current letter of each subgroup, which the solver starts from
+        time_limit : float
+            the maximum time to solve for, in seconds
+        """
+        if cp_model is None:
+            raise ImportError("The exact solver requires the ortools module (pip install ortools)")
+        
+        membership = self.cohort_rules.membership
+        number_of_partitions = self.fitness_engine.number_of_partitions
+        number_of_subgroups = len(hint_letters)
+        
+        hint_letters = np.asarray(hint_letters, dtype=np.int64)
+        member_course = np.repeat(np.arange(len(courses)), np.diff(member_offsets))
+        
+        def course_letter_counts(letters):
+            # the letter counts of each course when the subgroups have letters:
+            counts = fixed_counts.astype(np.int64)
+            np.add.at(counts, (member_course, letters[member_subgroup]), member_count)
+            
+            return counts
+        
+        thresholds = self.fitness_engine.course_thresholds.take(courses)
+        
+        if thresholds.course_multiplicity is not None:
+            multiplicity = thresholds.course_multiplicity
+        else:
+            multiplicity = np.ones(len(courses), dtype=np.int64)
+        
+        # the room left in each grouping of each course by the fixed students
+        # (for each option, see course_limits()):
+        limits = self.course_limits(thresholds)
+        room_left = limits - (fixed_counts @ membership)[None, :, :]
+        
+        # an option with room for every one of the subgroups in each grouping
+        # is always met, and an option with a grouping that the fixed 
+        # students already put above its limit is never met:
+        course_members_total = np.bincount(member_course, weights = member_count, minlength = len(courses)).astype(np.int64)
+        
+        is_binding = room_left < course_members_total[None, :, None]
+        is_possible = np.all(room_left >= 0, axis=-1)
+        is_always_met = is_possible & ~is_binding.any(axis=-1)
+        
+        always_good = is_always_met.any(axis=0)
+        constant_good = int(multiplicity[always_good].sum())
+        
+        # the options of the courses that the subgroups decide:
+        is_modeled = is_possible & ~always_good[None, :]
+        
+        # the letter counts of each course with the current letters (the 
+        # hint must set every variable, or the solver may not use it):
+        current_counts = course_letter_counts(hint_letters)
+        is_current_met = np.all((current_counts @ membership)[None, :, :] <= limits, axis=-1)
+        
+        model = cp_model.CpModel()
+        
+        # is_letter[s][l] is 1 if subgroup s is given letter l:
+        is_letter = [[model.NewBoolVar("") for _ in range(number_of_partitions)] for _ in range(number_of_subgroups)]
+        
+        for s in range(number_of_subgroups):
+            model.AddExactlyOne(is_letter[s])
+            
+            for l in range(number_of_partitions):
+                model.AddHint(is_letter[s][l], int(hint_letters[s] == l))
+        
+        objective_terms = []
+        
+        for c in np.flatnonzero(is_modeled.any(axis=0)).tolist():
+            enrolled = member_subgroup[member_offsets[c]:member_offsets[c + 1]].tolist()
+            enrolled_count = member_count[member_offsets[c]:member_offsets[c + 1]].tolist()
+            options = []
+            
+            for o in np.flatnonzero(is_modeled[:, c]).tolist():
+                # the option can only be chosen if no grouping of course c 
+                # is above its limit:
+                option = model.NewBoolVar("")
+                model.AddHint(option, bool(is_current_met[o, c]))
+                
+                for g in np.flatnonzero(is_binding[o, c]).tolist():
+                    grouping_letters = np.flatnonzero(membership[:, g]).tolist()
+                    
+                    model.Add(sum(count*is_letter[s][l] for s, count in zip(enrolled, enrolled_count) for l in grouping_letters) 
+                              <= int(room_left[o, c, g])).OnlyEnforceIf(option)
+                
+                options.append(option)
+            
+            # the course is good if any of its options is chosen:
+            good = model.NewBoolVar("")
+            model.AddHint(good, bool(is_current_met[is_modeled[:, c], c].any()))
+            model.Add(good <= sum(options))
+            
+            objective_terms.append(int(multiplicity[c])*good)
+        
+        # no course can change, so the current letters are optimal:
+        if not objective_terms:
+            return np.asarray(hint_letters), constant_good, constant_good, True
+        
+        model.Maximize(sum(objective_terms))
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_search_workers = self.number_of_workers
+        
+        status = solver.Solve(model)
+        
+        # the courses counted in good_score with the current letters:
+        hint_good = int(multiplicity[is_current_met.any(axis=0)].sum())
+        
+        # without a solution, the solver has not proven a bound (it reports
+        # a bound of 0 when it stops before searching):
+        if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+            return None, hint_good, None, False
+        
+        # the current letters are a solution, so no bound is below hint_good:
+        bound = max(constant_good + int(np.floor(solver.BestObjectiveBound() + 1e-6)), hint_good)
+        
+        letters = np.array([[solver.BooleanValue(is_letter[s][l]) for l in range(number_of_partitions)] 
+                            for s in range(number_of_subgroups)]).argmax(axis=1)
+        
+        # count the good courses of the letters (the objective of a solution
+        # that is not optimal can leave out a course that is good):
+        counts = course_letter_counts(letters)
+        is_met = np.all((counts @ membership)[None, :, :] <= limits, axis=-1)
+        
+        good = int(multiplicity[is_met.any(axis=0)].sum())
+        
+        return letters, good, bound, status == cp_model.OPTIMAL
+    
+    def solve_partition(self, genome, time_limit):
+        """
+        Give letters to every subgroup of the schedule so that the most 
+        courses are counted in good_score (starting from genome), and return
+        a tuple (genome, good, bound, is_optimal) as solve() does, where 
+        good and bound include the courses removed by presolve
+        
+        Parameters
+        ----------
+        genome : numpy array
+            a genome of the fitness engine to start from
+        time_limit : float
+            the maximum time to solve for, in seconds
+        """
+        fitness_engine = self.fitness_engine
+        compiled = fitness_engine.compiled
+        number_of_partitions = fitness_engine.number_of_partitions
+        
+        letters = fitness_engine.decode_genome(genome)
+        
+        courses = np.arange(compiled.number_of_courses)
+        fixed_counts = np.zeros((compiled.number_of_courses, number_of_partitions), dtype=np.int64)
+        
+        # the subgroups of each course, built from the enrollments (a dense
+        # courses x subgroups array would not fit in memory for a district):
+        member_offsets, member_subgroup, member_count = self.course_members(compiled.enrollment_course, compiled.enrollment_subgroup, 
+                                                                            compiled.number_of_courses, compiled.number_of_subgroups)
+        
+        new_letters, good, bound, is_optimal = self.solve(courses, fixed_counts, member_offsets, member_subgroup, member_count, 
+                                                          letters, time_limit)
+        
+        # the courses removed by presolve are always counted:
+        good_offset = fitness_engine.score_offset[2]
+        
+        if new_letters is None:
+            return None, good + good_offset, None, False
+        
+        new_genome = new_letters.astype(np.uint8)
+        
+        if fitness_engine.student_classes is not None:
+            new_genome = fitness_engine.student_classes.compress_genome(new_genome)
+        
+        return new_genome, good + good_offset, bound + good_offset, is_optimal
+
+class LargeNeighborhoodSearch:
+    """
+    A class that runs a large neighborhood search: it repeatedly keeps most
+    of the current partition fixed, frees the subgroups of a few related 
+    courses that are not "In Compliance", solves the sub-problem of giving 
+    those subgroups letters exactly, and keeps the result if it raises 
+    weighted_fitness_score
+    
+    Source: https://en.wikipedia.org/wiki/Large_neighborhood_search
+    
+    A neighborhood starts from a random course that is not "In Compliance",
+    and adds the courses that are not "In Compliance" and share the most 
+    subgroups with the courses chosen so far (courses that share students 
+    can only be repaired together). Every course that a freed subgroup is 
+    enrolled in is part of the sub-problem, with the letters of its other
+    students fixed
+    
+    The sub-problem is solved in one of two ways:
+    
+    1. if OR-Tools is installed, with the CP-SAT solver, which finds the
+       letters of up to max_free_subgroups subgroups that count the most 
+       courses in good_score (within solver_seconds)
+    2. otherwise, by scoring every partition of the freed subgroups with 
+       the fitness engine, which is exact for weighted_fitness_score, but
+       only possible for a few subgroups (at most maximum_enumeration 
+       partitions, ex: 6 subgroups for an A/B/C/D partition)
+    
+    Attributes
+    ----------
+    fitness_engine : FitnessEngine object
+        the fitness rules used to score partitions
+    cohort_rules : CohortRules object
+        the cohort groupings that define "In Compliance"
+    rng : numpy.random.Generator
+        the random number generator used to choose neighborhoods
+    courses_per_neighborhood : int
+        the number of courses that are not "In Compliance" freed at once
+    max_free_subgroups : int
+        the largest number of subgroups freed at once (fewer are freed if
+        the sub-problems are solved by enumeration)
+    solver_seconds : float
+        the time limit of the CP-SAT solver for each sub-problem
+    maximum_enumeration : int
+        the largest number of partitions scored to solve a sub-problem
+        without OR-Tools
+    exact_solver : ExactSolver object
+        the CP-SAT formulation of the sub-problems (None without OR-Tools)
+    evaluator : DeltaEvaluator object
+        the evaluator of the current partition
+    number_of_steps : int
+        the number of neighborhoods searched so far
+    number_of_improvements : int
+        the number of neighborhoods that raised the score
+    best_fitness : tuple
+        the fitness tuple of the current (and best) partition
+        
+    Methods
+    -------
+    start(genome)
+        start the search from a partition
+    choose_neighborhood()
+        the subgroups freed in the next neighborhood
+    sub_problem(free_subgroups)
+        the courses, fixed counts and enrollments of a sub-problem
+    solve_by_enumeration(free_subgroups)
+        the best letters of the freed subgroups, by scoring every partition
+    solve_with_solver(free_subgroups)
+        the letters of the freed subgroups that count the most courses
+        in good_score, found with CP-SAT
+    run(number_of_steps)
+        search a number of neighborhoods
+    best()
+        the (fitness, genome) tuple of the best partition found so far
+    """
+    
+    maximum_enumeration = 4096
+    
+    def __init__(self, fitness_engine, cohort_rules, rng = None, courses_per_neighborhood = 4, max_free_subgroups = 150, 
+                 solver_seconds = 2.0):
+        """
+        The constructor for the LargeNeighborhoodSearch class
+        
+        Parameters
+        ----------
+        fitness_engine : FitnessEngine object
+            the fitness rules used to score partitions
+        cohort_rules : CohortRules object
+            the cohort groupings that define "In Compliance" (see 
+            Schedule.cohort_rules)
+        rng : numpy.random.Generator
+            (optional) the random number generator to use 
+            (default = None, which creates a new generator)
+        courses_per_neighborhood : int
+            (optional) the number of courses that are not "In Compliance"
+            freed at once (default = 4)
+        max_free_subgroups : int
+            (optional) the largest number of subgroups freed at once
+            (default = 150)
+        solver_seconds : float
+            (optional) the time limit of the CP-SAT solver for each 
+            sub-problem (default = 2.0)
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        
+        self.fitness_engine = fitness_engine
+        self.cohort_rules = cohort_rules
+        self.rng = rng
+        self.courses_per_neighborhood = courses_per_neighborhood
+        self.max_free_subgroups = max_free_subgroups
+        self.solver_seconds = solver_seconds
+        
+        if cp_model is not None:
+            self.exact_solver = ExactSolver(fitness_engine, cohort_rules)
+        else:
+            self.exact_solver = None
+        
+        self.evaluator = None
+        self.number_of_steps = 0
+        self.number_of_improvements = 0
+        self.best_fitness = None
+    
+    def start(self, genome):
+        """
+        Start the search from a partition
+        
+        Parameters
+        ----------
+        genome : numpy array
+            a genome of the fitness engine
+        """
+        self.evaluator = DeltaEvaluator(self.fitness_engine, genome)
+        self.best_fitness = self.evaluator.fitness()
+    
+    def choose_neighborhood(self):
+        """
+        Return the subgroups freed in the next neighborhood: the subgroups 
+        of a random course that is not "In Compliance" and of the courses 
+        that are not "In Compliance" that share the most subgroups with it
+        (an empty array if every course is "In Compliance")
+        
+        Parameters
+        ----------
+        None
+        """
+        evaluator = self.evaluator
+        compiled = evaluator.compiled
+        rng = self.rng
+        
+        is_open = evaluator.course_good == 0
+        
+        if not is_open.any():
+            return np.zeros(0, dtype=np.int64)
+        
+        # without a solver, only a few subgroups can be freed:
+        if cp_model is not None:
+            max_free_subgroups = self.max_free_subgroups
+        else:
+            max_free_subgroups = min(self.max_free_subgroups, 
+                                     int(np.log(self.maximum_enumeration)/np.log(self.fitness_engine.number_of_partitions) + 1e-9))
+        
+        course = int(rng.choice(np.flatnonzero(is_open)))
+        is_open[course] = False
+        
+        free_subgroups = np.unique(compiled.enrollment_subgroup[compiled.course_offsets[course]:compiled.course_offsets[course + 1]])
+        
+        for _ in range(self.courses_per_neighborhood - 1):
+            if len(free_subgroups) >= max_free_subgroups:
+                break
+            
+            # the number of freed subgroups in each other course:
+            positions, _ = compiled.gather_ranges(compiled.subgroup_offsets, free_subgroups)
+            shared = np.bincount(compiled.subgroup_course[positions], minlength = compiled.number_of_courses)
+            shared[~is_open] = 0
+            
+            if shared.max() == 0:
+                break
+            
+            course = int(np.argmax(shared))
+            is_open[course] = False
+            
+            roster = compiled.enrollment_subgroup[compiled.course_offsets[course]:compiled.course_offsets[course + 1]]
+            free_subgroups = np.union1d(free_subgroups, roster)
+        
+        if len(free_subgroups) > max_free_subgroups:
+            free_subgroups = rng.choice(free_subgroups, size = max_free_subgroups, replace = False)
+        
+        return free_subgroups.astype(np.int64)
+    
+    def sub_problem(self, free_subgroups):
+        """
+        Return a tuple (courses, fixed_counts, incidence) describing the 
+        sub-problem of giving letters to free_subgroups, where
+        
+        courses : the courses that the freed subgroups are enrolled in
+        fixed_counts : the letter counts of each of these courses without
+            the freed subgroups, shape (number of courses, number_of_partitions)
+        incidence : the number of members of each freed subgroup (column) 
+            enrolled in each course (row)
+        
+        Parameters
+        ----------
+        free_subgroups : numpy array
+            the subgroups freed in the neighborhood
+        """
+        evaluator = self.evaluator
+        compiled = evaluator.compiled
+        
+        positions, lengths = compiled.gather_ranges(compiled.subgroup_offsets, free_subgroups)
+        free_index = np.repeat(np.arange(len(free_subgroups)), lengths)
+        
+        courses, course_position = np.unique(compiled.subgroup_course[positions], return_inverse = True)
+        
+        incidence = np.zeros((len(courses), len(free_subgroups)), dtype=np.int64)
+        np.add.at(incidence, (course_position, free_index), 1)
+        
+        fixed_counts = evaluator.counts[courses].astype(np.int64)
+        np.subtract.at(fixed_counts, (course_position, evaluator.genome[free_subgroups][free_index]), 1)
+        
+        return courses, fixed_counts, incidence
+    
+    def solve_by_enumeration(self, free_subgroups):
+        """
+        Return the letters of free_subgroups that give the highest 
+        weighted_fitness_score, found by scoring every partition of the 
+        freed subgroups (in batches) with the fitness engine
+        
+        Parameters
+        ----------
+        free_subgroups : numpy array
+            the subgroups freed in the neighborhood
+        """
+        fitness_engine = self.fitness_engine
+        compiled = self.evaluator.compiled
+        genome = self.evaluator.genome
+        number_of_partitions = fitness_engine.number_of_partitions
+        number_of_free = len(free_subgroups)
+        
+        courses, fixed_counts, incidence = self.sub_problem(free_subgroups)
+        thresholds = fitness_engine.course_thresholds.take(courses)
+        letter_identity = np.eye(number_of_partitions, dtype=np.int64)
+        
+        # the preferred subgroups of the freed subgroups, with the letters 
+        # of their other members:
+        if compiled.number_of_preferred_subgroups > 0:
+            positions, _ = compiled.gather_ranges(compiled.subgroup_preferred_offsets, free_subgroups)
+            groups = np.unique(compiled.subgroup_preferred[positions])
+            
+            member_positions, member_lengths = compiled.gather_ranges(compiled.preferred_offsets, groups)
+            member_group = np.repeat(np.arange(len(groups)), member_lengths)
+            member_subgroup = compiled.preferred_member_subgroup[member_positions]
+            
+            is_free = np.isin(member_subgroup, free_subgroups)
+            
+            fixed_letters = np.zeros((len(groups), number_of_partitions), dtype=bool)
+            fixed_letters[member_group[~is_free], genome[member_subgroup[~is_free]]] = True
+            
+            # the position in free_subgroups of each freed member:
+            order = np.argsort(free_subgroups)
+            free_position = order[np.searchsorted(free_subgroups[order], member_subgroup[is_free])]
+            
+            group_members = np.zeros((len(groups), number_of_free), dtype=np.int64)
+            group_members[member_group[is_free], free_position] = 1
+            
+            split_penalty = 100/compiled.number_of_preferred_subgroups
+        else:
+            groups = None
+        
+        place_values = number_of_partitions**np.arange(number_of_free, dtype=np.int64)
+        number_of_assignments = number_of_partitions**number_of_free
+        batch_size = 4096
+        
+        best_value = -np.inf
+        best_letters = None
+        
+        for batch_start in range(0, number_of_assignments, batch_size):
+            assignment_index = np.arange(batch_start, min(batch_start + batch_size, number_of_assignments), dtype=np.int64)
+            letters = (assignment_index[:, None]//place_values) % number_of_partitions
+            
+            one_hot = letter_identity[letters]
+            counts = fixed_counts + np.einsum('cn,bnk->bck', incidence, one_hot)
+            
+            weighted_terms, _, _, _ = fitness_engine.course_terms(counts, thresholds)
+            values = weighted_terms.sum(axis=(-2, -1))
+            
+            if groups is not None:
+                present = fixed_letters | (np.einsum('gn,bnk->bgk', group_members, one_hot) > 0)
+                values -= split_penalty*np.count_nonzero(present.sum(axis=-1) > 1, axis=-1)
+            
+            batch_best = int(np.argmax(values))
+            
+            if values[batch_best] > best_value:
+                best_value = values[batch_best]
+                best_letters = letters[batch_best]
+        
+        return best_letters
+    
+    def solve_with_solver(self, free_subgroups):
+        """
+        Return the letters of free_subgroups that count the most courses (of
+        the sub-problem) in good_score, found with the CP-SAT solver of 
+        OR-Tools (see ExactSolver), starting from the current letters, or 
+        None if the solver found no solution within solver_seconds
+        
+        Parameters
+        ----------
+        free_subgroups : numpy array
+            the subgroups freed in the neighborhood
+        """
+        courses, fixed_counts, incidence = self.sub_problem(free_subgroups)
+        member_offsets, member_subgroup, member_count = self.exact_solver.sparse_incidence(incidence)
+        
+        letters, _, _, _ = self.exact_solver.solve(courses, fixed_counts, member_offsets, member_subgroup, member_count, 
+                                                   self.evaluator.genome[free_subgroups], self.solver_seconds)
+        
+        return letters
+    
+    def run(self, number_of_steps, start_progress = 0.0, end_progress = 1.0):
+        """
+        Search number_of_steps neighborhoods, and return the fitness tuple 
+        of the best partition found so far
+        
+        (start_progress and end_progress are accepted so that a 
+        LargeNeighborhoodSearch can be run in the place of a 
+        SimulatedAnnealing chain, but they are not used)
+        
+        Parameters
+        ----------
+        number_of_steps : int
+            the number of neighborhoods to search
+        """
+        evaluator = self.evaluator
+        
+        for _ in range(number_of_steps):
+            free_subgroups = self.choose_neighborhood()
+            
+            # every course is "In Compliance"
+            if len(free_subgroups) == 0:
+                break
+            
+            self.number_of_steps += 1
+            
+            if cp_model is not None:
+                letters = self.solve_with_solver(free_subgroups)
+            else:
+                letters = self.solve_by_enumeration(free_subgroups)
+            
+            if letters is None:
+                continue
+            
+            # splice the letters back in, and keep them if they raise the 
+            # score (the solver does not see the penalties of the fitness 
+            # function, so its solution can score lower):
+            old_score = evaluator.weighted_fitness_score
+            old_letters = evaluator.genome[free_subgroups]
+            
+            evaluator.apply(free_subgroups, letters)
+            
+            if evaluator.weighted_fitness_score > old_score + 1e-9:
+                self.number_of_improvements += 1
+                self.best_fitness = evaluator.fitness()
+            else:
+                evaluator.apply(free_subgroups, old_letters)
+                evaluator.weighted_fitness_score = old_score
+        
+        return self.best_fitness
+    
+    def best(self):
+        """
+        Return the (fitness, genome) tuple of the best partition found so 
+        far, scored from scratch (a genome of StudentClasses is compressed
+        again)
+        
+        Parameters
+        ----------
+        None
+        """
+        fitness_engine = self.fitness_engine
+        letters = self.evaluator.genome
+        
+        if fitness_engine.student_classes is not None:
+            genome = fitness_engine.student_classes.compress_genome(letters)
+        else:
+            genome = letters.copy()
+        
+        return fitness_engine.score(genome), genome
+
+class IndividualPartition(Schedule):
+    """
+    A class used to store an individual partition of student
+    subgroups as an ordered array of letter assignments (a genome),
+    where each letter is stored as its index in student_letter_list
+    (0 = "A", 1 = "B", ...) in a numpy array of type uint8
+    
+    Ex: ["A", "A", "C", "B", "D", "A", ...] is stored as [0, 0, 2, 1, 3, 0, ...]
+    
+    Genomes take one byte per subgroup (a list of letters takes 8 bytes per
+    subgroup for the pointers alone), so they are much cheaper to copy and to 
+    send between processes, and letters are only needed for the reports 
+    (see CompiledSchedule.decode_partition())
+    
+    Attributes
+    ----------
+    schedule_obj: Schedule object
+        inherited from the schedule class
+    
+    number_of_partitions: int
+        inherited from the schedule class
+        
+    partition : numpy array
+        an individual partition of student subgroups stored as an 
+        array of letter indices, ex: [0, 0, 2, 1, 3, 0, ...]
+        
+    fitness: tuple
+        a tuple representing the fitness of the partition in the form:
+        (weighted_fitness_score, penalty_count, good_score, other_score, number_of_courses)
+    
+    student_letter_list : list
+        ["A", "B"], ["A", "B", "C", "D"], ... (one letter per partition)
+    
+    rng : numpy.random.Generator
+        the random number generator used to generate and mutate partitions
+        (each island process creates its own, so islands draw different 
+        random numbers)
+    
+    Methods
+    -------
+    return_fitness(number_of_partitions)
+        applies the partition to the Schedule object, and then 
+        uses the Schedule.evaluate_fitness() method to get
+        the fitness of partition_list
+
+    generate_partition()
+        generate a random partition, ex: [0, 0, 2, 1, 3, 0, ...]
+    load_partition(partition)
+        load a copy of a partition (a genome or a list of letters)
+    """
+    
+    def __init__(self, schedule_obj, seed = None):
+        """
+        The constructor for the IndividualPartition class
+        
+        Parameters
+        ----------
+        schedule_obj: Schedule object
+            inherited from the schedule class
+        seed : int
+            (optional) a seed for the random number generator, for 
+            reproducible runs (default = None, which seeds the generator
+            from the operating system)
+        """
+        self.schedule_obj = schedule_obj
+        self.rng = np.random.default_rng(seed)
+        self.number_of_partitions = schedule_obj.number_of_partitions
+        
+        # ["A", "B"], ["A", "B", "C", "D"], or in general the first 
+        # number_of_partitions letters of the alphabet
+        self.student_letter_list = [chr(i + 65) for i in range(0, self.number_of_partitions)]
+                
+        self.partition = None
+        self.fitness = None
+        self.max_deviation = None
+
+    def generate_partition(self):
+        """
+        A method to generate a random partition, ex: [0, 0, 2, 1, 3, 0, ...]
+        
+        Parameters
+        ----------
+        None
+        
+        """        
+        
+        # a random letter for each free subgroup and random letter counts 
+        # for each class of students with identical schedules:
+        if self.schedule_obj.student_classes is not None:
+            self.partition = self.schedule_obj.student_classes.random_genome(self.rng)
+            
+            return self.partition
+        
+        # use number_of_subgroups to determine how many letters are needed
+        # (a schedule attached to shared memory has no required_subgroups_list,
+        # and the genome of a presolved schedule only has the kept subgroups)
+        if self.schedule_obj.fitness_engine is not None:
+            number_of_subgroups = self.schedule_obj.fitness_engine.compiled.number_of_subgroups
+        elif self.schedule_obj.compiled is not None:
+            number_of_subgroups = self.schedule_obj.compiled.number_of_subgroups
+        else:
+            number_of_subgroups = len(self.schedule_obj.required_subgroups_list)
+
+        # populate the genome, ex: [0, 0, 2, 1, 3, 0, ...] 
+        # (store the genome in the self.partition attribute)
+        self.partition = self.rng.integers(0, self.number_of_partitions, size = number_of_subgroups, dtype = np.uint8)
+        
+        return self.partition
+
+    
+    def load_partition(self, partition):
+        """
+        A method to load a copy of a partition into memory
+        
+        Parameters
+        ----------
+        partition:
+            a genome of the form [0, 2, 3, ...] or a list of letters
+            of the form ["A", "C", "D", ...]
+        
+        """     
+        if isinstance(partition, np.ndarray):
+            self.partition = partition.astype(np.uint8)
+        else:
+            # convert letters into letter indices, "A" -> 0, "B" -> 1, ...
+            self.partition = np.array([ord(letter) - 65 for letter in partition], dtype=np.uint8)
+            
+        return self.partition
+
+
+    def return_fitness(self):
+        """
+        A method that loads the current partition into the Schedule object
+        and returns the fitness score of that partition
+        
+        If the Schedule object has been compiled, the partition is scored by
+        the vectorized FitnessEngine instead (without loading letters into
+        every Student object)
+        
+        Parameters
+        ----------
+        None
+        
+        """
+        fitness_engine = self.schedule_obj.fitness_engine
+        
+        if fitness_engine is not None:
+            self.fitness = fitness_engine.score(self.partition)
+            return self.fitness
+        
+        self.schedule_obj.load_partition(self.partition)        
+        self.fitness = self.schedule_obj.fitness_score()
+        return self.fitness
+    
+    def return_max_deviation(self):
+        """
+        A method that loads the current partitions into the Schedule object
+        and returns a list of the maximum deviation of each Course from
+        25-25-25-25% (if number_of_partitions = 4) or 50-50% (if number_of_partitions = 2)
+        of the total class size
+
+        Parameters
+        ----------
+        None
+
+        """
+
+        self.schedule_obj.load_partition(self.partition)        
+        self.max_deviation = self.schedule_obj.get_max_deviation()
+        return self.max_deviation
+        
+class Population(IndividualPartition):
+    """
+    A class used to store a population of partitions (numerous IndividualPartition objects)
+    
+    Attributes
+    ----------
+    individual_partition_obj : IndividualPartition object
+        inherited from the IndividualPartition class
+    
+    population_size : int
+        the number of individuals in the population
+        
+    population : list
+        a list of genomes (numpy arrays of letter indices, see 
+        IndividualPartition) that represent the population 
+        (ex: [partition1, partition2, ...]
+    
+    sorted_scored_population : list
+        a list of tuples in the form [(score1, partition1), (score2, partition2), ...] 
+        that is sorted by fitness score in descending order (so score1 is highest)
+        (partitions with equal scores keep the order they were scored in)
+        
+    number_of_partitions: int
+        inherited from the IndividualSchedule class
+    
+    student_letter_list : list
+            ["A", "B"], ["A", "B", "C", "D"], ... (one letter per partition)
+    
+    rng : numpy.random.Generator
+        inherited from the IndividualPartition class
+    
+    fitness_cache : FitnessCache object
+        the scores of genomes that have already been scored (or None)
+    
+    Methods
+    -------
+    generate_individual()
+        generate a random partition, ex: [0, 0, 2, 1, 3, 0, ...]
+    load_population(population)
+        load a list of partitions into self.population
+    populate():
+        generate a population of N individuals (random partitions), where N is 
+        self.number_of_partitions and each individual is appended to the list 
+        at self.population
+    population_fitness(scored_individuals)
+        assess the fitness of each individual in the population, stored in 
+        the attribute self.sorted_scored_population as a list in the form
+        [(score1, population1), (score2, population2), ...] where the 
+        scores are listed in descending order 
+    """
+    
+    def __init__(self, individual_partition_obj, population_size, fitness_cache = None):
+        """
+        Parameters
+        ----------
+        individual_partition_obj : IndividualPartition object
+            inherited from the IndividualPartition class
+    
+        population_size : int
+            the number of individuals in the population            
+        
+        fitness_cache : FitnessCache object
+            (optional) a cache of scores, so that genomes that have already 
+            been scored are not scored again (default = None)
+        
+        """
+        self.individual_partition_obj = individual_partition_obj
+        self.population_size = population_size
+        self.population = []
+        self.sorted_scored_population = []
+        self.number_of_partitions = individual_partition_obj.number_of_partitions
+        self.student_letter_list = individual_partition_obj.student_letter_list
+        self.rng = individual_partition_obj.rng
+        self.fitness_cache = fitness_cache
+
+    def generate_individual(self):
+        """
+        A method to generate a random partition, ex: [0, 0, 2, 1, 3, 0, ...]
+        
+        Parameters
+        ----------
+        None
+        """
+        
+        return self.individual_partition_obj.generate_partition()
+
+
+    def load_population(self, population):
+        """
+        A method to load a population into memory
+        
+        Parameters
+        ----------
+        population:
+            a list of partitions, where each partition is a genome [0, 2, 3, ...]
+            (or a list of letters ["A", "C", "D", ...])
+            Example: [ [0, 2, 3], [1, 1, 0], [2, 0, 0] ]
+        
+        """        
+        
+        self.population = []
+        for partition in population:
+            individual = self.individual_partition_obj.load_partition(partition)
+            self.population.append(individual)
+
+
+    def populate(self):
+        """
+        A method to generate a population of N individuals (random partitions),
+        where N is self.number_of_partitions and each individual is appended
+        to the list at self.population
+        
+        Parameters
+        ----------
+        None
+        """
+        
+        for _ in range(self.population_size):
+            individual = self.individual_partition_obj.generate_partition()
+            self.population.append(individual)
+
+    def population_fitness(self, scored_individuals = None):
+        """
+        A method to assess the fitness of each individual in the population, 
+        stored in the attribute self.sorted_scored_population as a list in the form
+        [(score1, population1), (score2, population2), ...] where the 
+        scores are listed in descending order 
+        
+        If the Schedule object has been compiled, the whole population is 
+        scored in a single batch by FitnessEngine.score_population()
+        
+        If there is a fitness cache, genomes that are found in the cache 
+        are not scored again (and every new score is added to the cache)
+        
+        Parameters
+        ----------
+        scored_individuals : list
+            (optional) a list of (score, partition) tuples that have already 
+            been scored, ex: the elites, which keep their scores and are 
+            added to the sorted population without being scored again
+        """
+        self.sorted_scored_population = []
+
+        if scored_individuals is not None:
+            self.sorted_scored_population.extend(scored_individuals)
+
+        schedule_obj = self.individual_partition_obj.schedule_obj
+
+        # genomes are numpy arrays, which cannot be compared when two 
+        # scores are tied, so sort by the score alone:
+        def score_key(scored_individual):
+            return scored_individual[0]
+
+        fitness_cache = self.fitness_cache
+        
+        # the individuals that are not in the cache still need to be scored
+        if fitness_cache is None:
+            unscored_individuals = self.population
+        else:
+            unscored_individuals = []
+            
+            for individual in self.population:
+                fitness = fitness_cache.get(individual)
+                
+                if fitness is None:
+                    unscored_individuals.append(individual)
+                else:
+                    self.sorted_scored_population.append((fitness, individual))
+
+        if schedule_obj.fitness_engine is not None:
+            if len(unscored_individuals) > 0:
+                # a 2-D array with one partition per row:
+                genomes = np.stack(unscored_individuals)
+
+                fitness_list = schedule_obj.fitness_engine.score_population(genomes)
+
+                for fitness, individual in zip(fitness_list, unscored_individuals):
+                    self.sorted_scored_population.append((fitness, individual))
+                    
+                    if fitness_cache is not None:
+                        fitness_cache.put(individual, fitness)
+
+            self.sorted_scored_population.sort(key = score_key, reverse = True)
+
+            return self.sorted_scored_population
+
+        for individual in unscored_individuals:
+            self.individual_partition_obj.partition = individual
+            fitness = self.individual_partition_obj.return_fitness()
+            tuple = (fitness, individual)
+            self.sorted_scored_population.append(tuple)
+            
+            if fitness_cache is not None:
+                fitness_cache.put(individual, fitness)
+        
+        self.sorted_scored_population.sort(key = score_key, reverse = True)
+        
+        return self.sorted_scored_population
+
+class GeneticAlgorithm(Population):
+    """
+    A class that implements the methods of a genetic algorithm 
+    
+    Attributes
+    ----------
+    population_obj : Population object
+        inherited from the Population class
+    generation_number : int
+        the current generation the algorithm is on
+    mutation_rate : float
+        the rate of mutation for each child, with
+        a default value of 0.01 (1%)
+    current_generation: 
+        a deep copy of the sorted_scored_population attribute from population_obj,
+        this is a list in the form [(score1, population1), (score2, population2), ...]
+    next_generation:
+        the next generation of individuals as determined by the algorithm, 
+        this is a list in the form [(score1, population1), (score2, population2), ...]
+    number_of_partitions: int
+        inherited from the Population class
+    student_letter_list : list
+        ["A", "B"], ["A", "B", "C", "D"], ... (one letter per partition)
+    rng : numpy.random.Generator
+        inherited from the Population class (one per island)
+    student_classes : StudentClasses object
+        the classes of the schedule (or None), whose letter counts are 
+        mutated and crossed over as a whole
+        
+    Methods
+    -------
+    mutate(individual_partition)
+        a method to mutate children based on a specified mutation rate
+    crossover_block(parents1, parents2, rng, gene_blocks)
+        cross many pairs of parents at once with a boolean crossover mask
+    tournament_winner_indices(array_length, num_reps, number_of_winners, rng)
+        run many tournaments at once and return the index of each winner
+    generate_next_generation()
+        use self.current_generation to generate self.next_generation
+    """
+    
+    def __init__(self, population_obj, generation_number, mutation_rate = 0.01):
+        """
+        Parameters
+        ----------
+        population_obj : Population object
+            inherited from the Population class
+        generation_number : int
+            the current generation the algorithm is on
+        mutation_rate : float
+            the rate of mutation for each child, with
+            a default value of 0.01 (1%)
+        current_generation: 
+            a deep copy of the sorted_scored_population attribute from population_obj,
+            this is a list in the form [(score1, population1), (score2, population2), ...]
+        next generation:
+            the next generation of individuals as determined by the algorithm, 
+            this is a list in the form [(score1, population1), (score2, population2), ...]
+        number_of_partitions: int
+            inherited from the Population class
+        """
+        self.population_obj = population_obj
+        self.generation_number = generation_number
+        self.mutation_rate = mutation_rate
+        self.current_generation = [(population[0],population[1].copy()) for population in population_obj.sorted_scored_population]
+        self.next_generation = None
+        self.number_of_partitions = population_obj.number_of_partitions
+        self.student_letter_list = population_obj.student_letter_list
+        self.rng = population_obj.rng
+        self.student_classes = population_obj.individual_partition_obj.schedule_obj.student_classes
+        
+    def mutate(self, individual_partition):
+        """
+        A method to mutate children based on a specified mutation rate
+        
+        Source: https://en.wikipedia.org/wiki/Mutation_(genetic_algorithm)
+        
+        Every letter is mutated independently with probability 
+        self.mutation_rate, with all of the random numbers for the genome 
+        drawn from self.rng at once (rather than one call per letter)
+        
+        A 2-D array with one genome per row (ex: every child of a 
+        generation) is mutated in a single pass
+        
+        The letter counts of a genome of StudentClasses are mutated by 
+        moving members of a class between letters instead (see 
+        StudentClasses.mutate_counts())
+        
+        Parameters
+        ----------
+        individual_partition : numpy array
+            a genome in the form [0, 0, 1, 3, 0, 2, 1, 2, ...]
+            (or a 2-D array of genomes)
+        """        
+                
+        # the mutated partition starts as a copy of the original
+        new_partition = individual_partition.copy()
+        
+        number_of_partitions = self.number_of_partitions
+        
+        # roll the dice for every letter at once, and find the 
+        # letters that won their "dice roll":
+        mutation_mask = self.rng.random(new_partition.shape) < self.mutation_rate
+        
+        # only the letters of the free subgroups are letters:
+        if self.student_classes is not None:
+            mutation_mask[..., len(self.student_classes.free_subgroups):] = False
+        
+        # the mutated letter is a random selection from the 
+        # other letters, for example, if the letter is 0 ("A") 
+        # and there are 4 letters, then adding 1, 2 or 3 
+        # (mod 4) gives 1 ("B"), 2 ("C") or 3 ("D"):
+        shifts = self.rng.integers(1, number_of_partitions, size = int(mutation_mask.sum()))
+        
+        new_partition[mutation_mask] = (new_partition[mutation_mask] + shifts) % number_of_partitions
+        
+        if self.student_classes is not None:
+            self.student_classes.mutate_counts(new_partition, self.mutation_rate, self.rng)
+        
+        # return the mutated partition
+        return new_partition
+
+    @classmethod
+    def get_children_pair(cls, parent1, parent2, rng = None, gene_blocks = None):
+        """
+        a given pair of parents create 2 new children:
+            1. child1 starts off as a clone of parent1, just as child2 starts off as a clone of parent2.
+            2. these 2 clones then have an opportunity to swap some genes (individual student letter assignments).
+               this happens by selecting a random [relatively small] subset of itself (i.e. a set of indices), and 
+               having child1 and child2 swap their letters at these indices.
+
+               the idea is that each parent might have found a successful schedule of a small "chunk" of students
+               that the other parent did not find yet (or was not successful in that overall environment), and this
+               is a way to inject those small "local" changes (local in the sense that it is an improvement that can
+               be made to a small subset of students that doesn't really affect those outside of this subset).
+            3. so whenever we take a parent from island1 to cross it with a parent from island2, the original population
+               [of island1] gets 2 children: one that is a near-clone of parent1 (and island1 native), and another one
+               that is a near-clone of parent2 (a foreigner from island2)
+
+        ****
+        
+        (see crossover_block() for the version that crosses many pairs at once)
+        
+        Parameters
+        ----------
+        parent1:
+            genome representing parent1 (the partition)
+
+        parent2:
+            genome representing parent2 (the partition)
+            
+        rng : numpy.random.Generator
+            (optional) the random number generator to use 
+            (default = None, which creates a new generator)
+            
+        gene_blocks : numpy array
+            (optional) the blocks of positions that are swapped as a whole
+            (see crossover_block())
+
+        """    
+        if rng is None:
+            rng = np.random.default_rng()
+
+        children1, children2 = cls.crossover_block(parent1[None, :], parent2[None, :], rng, gene_blocks)
+
+        return children1[0], children2[0]
+
+    @classmethod
+    def crossover_block(cls, parents1, parents2, rng, gene_blocks = None):
+        """
+        Cross many pairs of parents at once (see get_children_pair()), where
+        row i of parents1 is crossed with row i of parents2 
+        
+        For each pair, injection_size (between 10 and 30) random positions 
+        are chosen, and the two children swap their letters at each of these
+        positions. A position that is chosen twice is swapped twice (so it 
+        ends up unswapped), exactly as if the swaps were made one at a time. 
+        The swaps of every pair are collected in a single boolean matrix 
+        (the crossover mask), and the children are built with np.where
+        
+        If gene_blocks is given, a chosen position swaps the whole block it
+        belongs to (ex: every letter count of a class, see StudentClasses),
+        so that the counts of each class still add up to its size
+        
+        Returns two 2-D arrays (children1, children2), where children1 is 
+        a near-clone of parents1 and children2 is a near-clone of parents2
+        
+        Parameters
+        ----------
+        parents1 : numpy array
+            a 2-D array of genomes, one per row
+        parents2 : numpy array
+            a 2-D array of genomes with the same shape as parents1
+        rng : numpy.random.Generator
+            the random number generator to use
+        gene_blocks : numpy array
+            (optional) the first position of the block of each position
+            (default = None, where every position is a block of its own)
+        """
+        number_of_pairs, genome_length = parents1.shape
+        
+        # size of cohort to inject, i.e. number of letters to replace in the partition
+        # this is purely based on [what seems right to me] based on some limited experimentation
+        # far from finalized, please feel free to play around with the parameters
+        # some small number (such as between 10 and 40) seems to work best
+        minimum_injection_size, maximum_injection_size = 10, 30
+        injection_size = rng.integers(minimum_injection_size, maximum_injection_size + 1, size = number_of_pairs)
+
+        # choose injection_size random indexes (for each pair) which will get the other parent's genes
+        injection_index = rng.integers(0, genome_length, size = (number_of_pairs, maximum_injection_size))
+        
+        if gene_blocks is not None:
+            injection_index = gene_blocks[injection_index]
+            
+        is_used = np.arange(maximum_injection_size) < injection_size[:, None]
+        
+        pair_index = np.broadcast_to(np.arange(number_of_pairs)[:, None], injection_index.shape)
+        
+        # count how many times each position was chosen, and swap the 
+        # positions that were chosen an odd number of times:
+        swap_count = np.zeros((number_of_pairs, genome_length), dtype=np.uint8)
+        np.add.at(swap_count, (pair_index[is_used], injection_index[is_used]), 1)
+        
+        crossover_mask = (swap_count & 1).astype(bool)
+        
+        # every position of a block follows the first position of the block:
+        if gene_blocks is not None:
+            crossover_mask = crossover_mask[:, gene_blocks]
+
+        children1 = np.where(crossover_mask, parents2, parents1)
+        children2 = np.where(crossover_mask, parents1, parents2)
+
+        return children1, children2
+    
+    @classmethod
+    def tournament_winner_indices(cls, array_length, num_reps, number_of_winners, rng):
+        """
+        Helper function. Uses tournament selection with num_reps representatives 
+        to select number_of_winners indices (one tournament per winner) for an 
+        array of length array_length, and returns an array with the index of 
+        each winner
+
+        Source (tournament selection): https://en.wikipedia.org/wiki/Tournament_selection
+        
+        Parameters
+        ----------
+        array_length: int
+            the length of the array for which we are using tournament selection
+
+        num_reps: int
+            number of representatives to use for tournament selection
+            (at least 1 representative is always used)
+            
+        number_of_winners: int
+            the number of tournaments to run
+            
+        rng : numpy.random.Generator
+            the random number generator to use
+        """
+        # one row of representatives per tournament, and since our population
+        # is stored in descending order, the winner is the smallest index:
+        representatives = rng.integers(0, array_length, size = (number_of_winners, max(num_reps, 1)))
+
+        return representatives.min(axis = 1)
+
+    def generate_next_generation(self):
+        """
+        The main method of the GeneticAlgorithm class: use self.current_generation
+        to generate self.next_generation
+        
+        Source: https://en.wikipedia.org/wiki/Genetic_algorithm
+        
+        Parameters
+        ----------
+        None
+        """ 
+        # the next_generation should be the same length as the current_generation
+        next_generation_length = len(self.current_generation)
+        
+        # Use elitist selection for 20% of self.next_generation
+        # Source: https://en.wikipedia.org/wiki/Selection_(genetic_algorithm)#e._Elitism_Selection
+        elites_length = 2*next_generation_length//10
+        
+        # Introduce completely new individuals for 10% of self.next_generation
+        new_blood_length = next_generation_length//10
+        
+        # Use crossover for the remaining 70% of self_next_generation
+        # Source: https://en.wikipedia.org/wiki/Crossover_(genetic_algorithm)
+        children_length = next_generation_length - elites_length - new_blood_length
+        
+        # A container for the list of individuals that will be added to self.next_generation
+        # This initial list starts out unscored: [partition1, partition2, partition3,...]
+        next_generation_individuals = []
+        
+        # A list of elites (the fittest 20% of the self.current_generation)
+        # The elites keep their scores, so they are not scored again:
+        # [(score1, partition1), (score2, partition2), ...]
+        scored_elites = [(item[0], item[1]) for item in self.current_generation[0:elites_length]]
+        
+        # Generate the "new blood" (the 10% completely random individuals)
+        # Note: these individuals are currently unscored
+        for i in range(new_blood_length):
+            ith_partition = self.population_obj.generate_individual()
+            next_generation_individuals.append(ith_partition)
+
+        # A list of all individuals from self.current_generation, 
+        # these are the potential parents for self.next_generation
+        # Note: this list is in the form [partition1, partition2, partition3,...]
+        # (children are copies, so the parents do not need to be copied)
+        ordered_individuals = [element[1] for element in self.current_generation]
+
+        # For the remaining 70% of individuals in self.next_generation, 
+        # do the following for the whole generation at once:
+        # 1) Select every pair of parents using tournament selection
+        # 2) Generate every pair of children using crossover & mutation
+        number_of_pairs = (children_length + 1)//2
+        
+        number_of_tournament_reps = len(ordered_individuals)//10
+        
+        parent_indices = self.tournament_winner_indices(len(ordered_individuals), number_of_tournament_reps, 2*number_of_pairs, self.rng)
+        
+        # a 2-D array with one genome per row
+        parent_genomes = np.stack(ordered_individuals)
+        
+        if self.student_classes is not None:
+            gene_blocks = self.student_classes.gene_blocks
+        else:
+            gene_blocks = None
+        
+        children1, children2 = self.crossover_block(parent_genomes[parent_indices[0::2]], parent_genomes[parent_indices[1::2]], self.rng, 
+                                                    gene_blocks)
+        
+        # interleave the children so that each child follows its own 
+        # parent in parent_indices: [child1, child2, child1, child2, ...]
+        offspring = np.empty((2*number_of_pairs, parent_genomes.shape[1]), dtype=parent_genomes.dtype)
+        offspring[0::2] = children1
+        offspring[1::2] = children2
+        
+        offspring = self.mutate(offspring)
+        
+        # We are generating children in pairs, if we 
+        # generated one child too many, take off the extra child 
+        offspring = offspring[0:children_length]
+        
+        next_generation_individuals.extend(offspring)
+        
+        # next_generation_individuals has not yet been scored, so we use the 
+        # Population class to assess the fitness of the next_generation (the 
+        # new blood and the children are scored in one batch, skipping any 
+        # child found in the fitness cache, ex: an exact copy of its parent)
+        self.population_obj.population = next_generation_individuals
+        scored_next_generation = self.population_obj.population_fitness(scored_elites)
+        
+        # after scoring, assign this to self.next_generation
+        # self.next_generation is in the form [(score1, partition1), (score2, partition2), ...]
+        self.next_generation = scored_next_generation
+        
+        return self.population_obj.sorted_scored_population
+
+class Reports:
+    """
+    A class for generating reports/visualizations of the algorithm's progress
+    
+    Attributes
+    ----------
+    None
+        
+    Methods
+    -------
+    return_progress(cls, pid_string, generation_number, population, time, step_name)
+        concatenate a string with genetic algorithm progress
+    write_progress(cls, path, progress_string, write_or_append)
+        write a progress_string to the output log
+    return_era_progress(cls, era_number, start_timer, end_timer, total_time, in_compliance, upper_bound)
+        concatenate a string with parallel genetic algorithm progress
+    create_pie_chart(cls, era_number, fitness_score, in_compliance, total_courses)
+        generates a pie chart visualizing the number of classrooms in/out of compliance
+        with social distancing
+    create_histogram(cls, era_number, num_partitions, best_partition_score, max_deviation, time_elapsed, time_limit)
+        generates a histogram of the max deviation from 25/25/25/25% split (if 4 partitions) or
+        50/50% split (if 2 partitions) for each "bad" course that is not in compliance
+    """
+
+    @classmethod
+    def return_progress(cls, pid_string, generation_number, population, time, step_name = "Generation"):
+        """
+        Concatenate a string to report progress of the algorithm
+        
+        Parameters
+        ----------
+        pid_string: string
+            process ID string
+
+        generation_number: int
+            the current generation number
+            
+        population : nested list
+            a sorted, scored population, from which we will be extracting
+            a fitness score
+            
+        time : time object
+            the time elapsed
+            
+        step_name : string
+            (optional) what generation_number counts, ex: "Annealing steps"
+            (default = "Generation")
+
+        """    
+        # Concatenate a string to report progress:
+        progress_string = "PID(" + pid_string + "):"
+        progress_string += step_name + " = "
+        progress_string += str(generation_number)
+        progress_string += ", Fitness = "
+        progress_string += str(population[0][0][0])
+        progress_string += ", In Compliance = "
+        progress_string += str(population[0][0][2])
+        progress_string += " out of "
+        progress_string += str(population[0][0][-1])   
+        progress_string += ", elapsed time so far this era (sec) = " + str(time)
+
+        return progress_string
+    
+    @classmethod
+    def write_progress(cls, path, progress_string, write_or_append):
+        """
+        Write to the progress log
+        
+        Parameters
+        ----------
+        path: path object
+            the directory to write to
+
+        progress_string: string
+            the string to write
+            
+        write_or_append : string
+            use 'w' or 'a' to write over current file contents or append 
+        """  
+
+        progress_file = path / 'progress_log.txt'    
+        with open(progress_file, write_or_append) as file:
+            file.write(progress_string)
+            file.write("\n")  
+
+    @classmethod
+    def return_era_progress(cls, era_number, start_timer, end_timer, total_time, in_compliance = None, upper_bound = None):
+        """
+        Concatenate a string to report progress of the algorithm
+        
+        Parameters
+        ----------
+        pid_string: string
+            process ID string
+
+        era_number: int
+            the current era number
+        
+        start_timer : float
+            the start time of the era
+            
+        end_timer : float
+            the end time of the era
+        
+        total_time : float
+            the total time elapsed
+            
+        in_compliance : int
+            (optional) the number of courses "In Compliance" (good_score) 
+            of the champion partition
+        
+        upper_bound : int
+            (optional) the most courses that can be "In Compliance", which 
+            is reported with the gap to in_compliance (default = None)
+        """    
+
+        progress_string = "Just completed era #" + str(era_number) + " in " + str(round(end_timer - start_timer, 3)) + "sec"
+        progress_string += "\n"
+        progress_string += "Total elapsed time: " + str(round(total_time/60, 2)) + " min"
+        
+        if upper_bound is not None:
+            gap = upper_bound - in_compliance
+            
+            progress_string += "\n"
+            progress_string += "Upper bound on In Compliance: " + str(upper_bound) + " (gap = " + str(gap) + " courses"
+            
+            if gap <= 0:
+                progress_string += ", proven optimal"
+            
+            progress_string += ")"
+        
+        return progress_string
+
+    @classmethod
+    def create_pie_chart(cls, era_number, fitness_score, in_compliance, total_courses):
+        """
+        Creates a pie chart visualizing the portion of classrooms in compliance (green) vs. out of compliance (red)
+        Parameters
+        ----------
+        era_number: int
+            the current era number
+        
+        fitness_score: int
+            fitness score of best partition
+
+        in_compliance: int
+            the number of classrooms that satisfy social distancing guidelines as defined
+        
+        total_courses: int
+            the total number of classrooms present
+        """
+
+        labels = ["In Compliance", "Out of Compliance"]
+        sizes = [in_compliance, total_courses - in_compliance]
+        colorslist = ["#b0ff85", "#ff5757"]
+
+        # generates a string as the label for each slice
+        def pie_label_string(pct):
+            num = int(np.round(pct/100 * sum(sizes)))
+            return str(np.round(pct)) + "% \n" + "(" + str(num) + " out of " + str(total_courses) + ")"
+
+        fig = plt.figure(linewidth = 2)
+        ax = fig.add_subplot(111)
+
+        title_string = "Era " + str(era_number) + ": Classrooms In/Out of Compliance with Social Distancing\n"
+        subtitle_string = "Fitness Score: " + str(round(fitness_score,3))
+
+        ax.set_title(title_string + subtitle_string)
+        ax.pie(sizes, labels = labels, autopct = pie_label_string,
+                colors = colorslist, startangle = 90, wedgeprops={"edgecolor":"k",'linewidth': 1, 'antialiased': True})
+        ax.axis('equal')
+
+        if (USE_GUI):
+            pie_output_file = IO_DIRECTORY / 'current_pie.png'
+            fig.savefig(pie_output_file, bbox_inches='tight')
+        else:
+            # the directory where we will put the pie charts
+            pie_path = IO_DIRECTORY / "piecharts"
+            
+            # try to create the directory 
+            try:
+                os.mkdir(pie_path)
+            # unless it already exists
+            except FileExistsError:
+                # if the directory already exists, check if this is the 
+                # beginning of a new run (Era # is 1)
+                if era_number == 1:
+                    # if so, remove the directory and all its contents
+                    shutil.rmtree(pie_path)
+                    # wait for this os operation to finish
+                    while os.path.exists(pie_path): # check if it exists
+                        pass
+                    # then create a new (empty) folder to put pie charts in 
+                    os.mkdir(pie_path)
+            
+            # the filename for the pie chart
+            pie_filename = "pie_era" + str(era_number) + ".png"
+            
+            # the path for the pie chart
+            pie_output_file = pie_path / pie_filename
+            
+            # save the pie chart
+            fig.savefig(pie_output_file, bbox_inches='tight')
+        
+        # close the plot so it doesn't continue to sit in memory
+        plt.close()
+        
+    @classmethod
+    def create_histogram(cls, era_number, num_partitions, best_partition_score, max_deviation, time_elapsed, time_limit):
+        """
+        Creates an histogram visualizing the max deviation from 25/25/25/25% or 50/50% split of the courses
+        that are not in compliance
+
+        Parameters
+        ----------
+        era_number: int
+            the current era number
+        
+        num_partitions: int
+            number of partitions (ex: 2 or 4)
+
+        best_partition_score: tuple
+            fitness score and other data (i.e. number in compliance, etc)
+            of best partition found
+        
+        max_deviation: list
+            list of the maximum deviation of each bad course
+        
+        time_elapsed: int
+            the time the program has run for so far
+        
+        time_limit: int
+            the total time limit allotted for the program to run
+        """
+
+        n_bins = 10
+        total_courses = best_partition_score[-1]
+        in_compliance = best_partition_score[2]
+        not_in_compliance = total_courses - in_compliance
+
+        x = max_deviation
+
+        fig = plt.figure(linewidth = 2)
+        ax = fig.add_subplot(111)
+
+        n, bins, patches = ax.hist(x, bins=n_bins, edgecolor = 'black')
+        ax.set_title("Era " + str(era_number) + ": Max Deviation of the " + str(not_in_compliance) + " Courses Not in Compliance")
+        # ex: 25%/25%/25%/25% for an A/B/C/D partition
+        even_split = "/".join(["{:g}%".format(round(100/num_partitions, 1))]*num_partitions)
+        ax.set_xlabel("Max Deviation Per Course from " + even_split + " Of Class Size")
+        ax.set_ylabel("Number of Courses")
+
+        for thispatch in patches:
+            if (time_elapsed/time_limit < 0.5): # early; red plot
+                thispatch.set_facecolor("#ff5757")
+            elif (time_elapsed/time_limit < 0.8): # middle; yellow plot
+                thispatch.set_facecolor("#ffe485")
+            else: # late; green plot
+                thispatch.set_facecolor("#b0ff85")
+
+        if (USE_GUI):
+            hist_output_file = IO_DIRECTORY / 'current_hist.png'
+            fig.savefig(hist_output_file, bbox_inches='tight')
+        else:
+            # the directory where we will put the histogram
+            histogram_path = IO_DIRECTORY / "histograms"
+            
+            # try to create the directory 
+            try:
+                os.mkdir(histogram_path)
+            # unless it already exists
+            except FileExistsError:
+                # if the directory already exists, check if this is the 
+                # beginning of a new run (Era # is 1)
+                if era_number == 1:
+                    # if so, remove the directory and all its contents
+                    shutil.rmtree(histogram_path)
+                    # wait for this os operation to finish
+                    while os.path.exists(histogram_path): # check if it exists
+                        pass
+                    # then create a new (empty) folder to put pie charts in 
+                    os.mkdir(histogram_path)
+            
+            # the filename for the histogram
+            hist_filename = "hist_era" + str(era_number) + ".png"
+            
+            # the path for the histogram
+            hist_output_file = histogram_path / hist_filename
+            
+            # save the histogram chart
+            fig.savefig(hist_output_file, bbox_inches='tight')
+        
+        # close the plot so it doesn't continue to sit in memory
+        plt.close()
+    
+    @classmethod
+    def yaml_writer(cls, settings_dict):
+        """
+        Write configuration to "settings.yaml" along with 
+        descriptive comments
+        
+        Note: yaml.dump method from the yaml module does 
+        not preserve comments, which is why this method
+        is necessary
+        
+        Parameters
+        ----------
+        settings_dict : dictionary
+            a dictionary of program settings from 'settings.yaml' 
+        """  
+        
+        # concatenate the .yaml document as a string
+        settings_string = "# SCHOOL-SPECIFIC SETTINGS: \n \n"
+
+        settings_string += "# Number of groups to partition students into (2 and 4 are built in, other values need cohort_groupings below) \n"
+        settings_string += "number_of_partitions : "
+        settings_string += str(settings_dict["number_of_partitions"])
+        settings_string += "\n \n"
+
+        settings_string += "# Max size of a partition when dividing students into two cohorts (default = 15) \n"
+        settings_string += "half_class_maximum : "
+        settings_string += str(settings_dict["half_class_maximum"])
+        settings_string += "\n \n"
+
+        settings_string += "# Max size of a partition when dividing students into four cohorts (default = 9) \n"
+        settings_string += "quarter_class_maximum : "
+        settings_string += str(settings_dict["quarter_class_maximum"])
+        settings_string += "\n \n"
+        
+        settings_string += "# The maximum number of students of each grouping of cohorts in a classroom, which replaces \n"
+        settings_string += "# the two settings above, ex: for a 3-day rotation with at most 10 students of each letter: \n"
+        settings_string += "#   cohort_groupings : \n"
+        settings_string += "#     A : 10 \n"
+        settings_string += "#     B : 10 \n"
+        settings_string += "#     C : 10 \n"
+        settings_string += "# a grouping can have several letters (ex: AB : 15 for the A and B cohorts together) \n"
+        settings_string += "# (default = {}, which uses the built-in A/B or A/B/C/D rules) \n"
+        settings_string += "cohort_groupings : "
+        if not settings_dict["cohort_groupings"]:
+            settings_string += "{}"
+        else:
+            for grouping, maximum in settings_dict["cohort_groupings"].items():
+                settings_string += "\n  " + str(grouping) + " : " + str(maximum)
+        settings_string += "\n \n"
 
         settings_string += "# Time measured in minutes (default = 480 min or 8 hr) \n"
         settings_string += "time_limit : "
         settings_string += str(settings_dict["time_limit"])
         settings_string += "\n \n"
 
-        settings_string += "# Filename of .csv file with student schedule data (default = 'example_student_data.csv') \n"
-        settings_string += "# Note: does not need to be an absolute path " 
-        settings_string += "as long as the .csv and .py are in the same folder \n"
-        settings_string += "input_csv_filename : "
+        settings_string += "# Filename of .csv file with student schedule data (default = 'example_student_data.csv') \n"
+        settings_string += "# Note: does not need to be an absolute path " 
+        settings_string += "as long as the .csv and .py are in the same folder \n"
+        settings_string += "input_csv_filename : "
+        if len(settings_dict["input_csv_filename"]) == 0:
+            settings_string += '""'
+        else:
+            settings_string += settings_dict["input_csv_filename"]
+        settings_string += "\n \n"
+
+        settings_string += "# Filename of .csv file with required student subgrouping data (default = 'example_subgroups.csv') \n"
+        settings_string += "# if no required subgroups are needed, set the value below to an empty string, REQUIRED_SUBGROUP_CSV_FILENAME = '' \n" 
+        settings_string += "required_subgroup_csv_filename : "
+        if len(settings_dict["required_subgroup_csv_filename"]) == 0:
+            settings_string += '""'
+        else:
+            settings_string += settings_dict["required_subgroup_csv_filename"]
+        settings_string += "\n \n"
+ 
+        settings_string += "# Filename of .csv file with preferred student subgrouping data (default = None) \n"
+        settings_string += "# if no required subgroups are needed, set the value below to an empty string, PREFERRED_SUBGROUP_CSV_FILENAME = '' \n" 
+        settings_string += "preferred_subgroup_csv_filename : "
+        if len(settings_dict["preferred_subgroup_csv_filename"]) == 0:
+            settings_string += '""'
+        else:
+            settings_string += settings_dict["preferred_subgroup_csv_filename"]
+        settings_string += "\n \n" 
+
+        settings_string += "# Filename of .csv file with the capacity of each room (default = None) \n"
+        settings_string += "# columns: ROOM NUMBER, HALF CLASS MAXIMUM, QUARTER CLASS MAXIMUM (or one column per cohort grouping, ex: AB) \n"
+        settings_string += "# rooms that are not listed use half_class_maximum and quarter_class_maximum, ROOM_CAPACITY_CSV_FILENAME = '' \n" 
+        settings_string += "room_capacity_csv_filename : "
+        if len(settings_dict["room_capacity_csv_filename"]) == 0:
+            settings_string += '""'
+        else:
+            settings_string += settings_dict["room_capacity_csv_filename"]
+        settings_string += "\n \n" 
+
+        settings_string += "# The header of each column of the student .csv file, so that the columns can be in any order \n"
+        settings_string += "# (a column can also be given by its position, starting from 0, ex: period : 8) \n"
+        settings_string += "# only student_id, room_number and period are required, other missing columns are left blank \n"
+        settings_string += "column_map : "
+        if not settings_dict["column_map"]:
+            settings_string += "{}"
+        else:
+            for field, column in settings_dict["column_map"].items():
+                settings_string += "\n  " + field + " : "
+                if isinstance(column, int):
+                    settings_string += str(column)
+                else:
+                    settings_string += "'" + str(column).replace("'", "''") + "'"
+        settings_string += "\n \n" 
+
+        settings_string += "# Folder where compiled schedules are cached, so that the .csv files above are only \n"
+        settings_string += "# parsed again when their contents (or the settings above) change (default = 'schedule_cache') \n"
+        settings_string += "# to turn off the cache, set the value below to an empty string, SCHEDULE_CACHE_DIRECTORY = '' \n"
+        settings_string += "schedule_cache_directory : "
+        if len(settings_dict["schedule_cache_directory"]) == 0:
+            settings_string += '""'
+        else:
+            settings_string += settings_dict["schedule_cache_directory"]
+        settings_string += "\n \n" 
+        
+        settings_string += "# File format of the student_assignments and course_analysis reports, either csv or parquet \n"
+        settings_string += "# (parquet requires the pyarrow module, default = 'csv') \n"
+        settings_string += "report_format : "
+        settings_string += str(settings_dict["report_format"])
+        settings_string += "\n \n"
+        
+        settings_string += "# GENETIC ALGORITHM SETTINGS \n \n"
+        settings_string += "# If you experiment with the following settings, you may happen upon a \n"
+        settings_string += "# combination of values that optimizes more efficiently than the default \n"
+        settings_string += "# settings in this program. If so, please share these values with me at \n"
+        settings_string += "# studentpartitionoptimizer@gmail.com so I can verify and make these the \n"
+        settings_string += "# new defaults. \n \n"   
+        
+        settings_string += "# recommended range: between 0.01 and 0.05, (default = 0.01) \n"
+        settings_string += "mutation_rate : "
+        settings_string += str(settings_dict["mutation_rate"])
+        settings_string += "\n \n"
+
+        settings_string += "# the optimal value here is going to depend a lot on number of cores,) \n"
+        settings_string += "# so you can play around with this to see what seems to work best \n"
+        settings_string += "# recommended range for a 16-core machine: 20 - 80 (default = 60) \n"
+        settings_string += "population_size : "
+        settings_string += str(settings_dict["population_size"])
+        settings_string += "\n \n"
+
+        settings_string += "# recommended range: run it for as long as you have time, or until the \n"
+        settings_string += "# [number of compliant sections] metric seems to plateau out \n"
+        settings_string += "# (default = 5000) \n"
+        settings_string += "number_of_eras : "
+        settings_string += str(settings_dict["number_of_eras"])
+        settings_string += "\n \n"
+
+        settings_string += "# with 16 cores, good results are obtained with a default value of 20 \n"
+        settings_string += "# but with fewer cores, you may want to increase this value \n"
+        settings_string += "# recommended range: 10 - 50 (default = 20) \n"
+        settings_string += "number_of_generations_per_era : "
+        settings_string += str(settings_dict["number_of_generations_per_era"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# memory cap (in megabytes) of the fitness cache of each island, which remembers \n"
+        settings_string += "# the scores of partitions so that they are not scored again \n"
+        settings_string += "# (0 turns off the cache, default = 64) \n"
+        settings_string += "fitness_cache_megabytes : "
+        settings_string += str(settings_dict["fitness_cache_megabytes"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# evaluate partitions with a compiled kernel (numba), with packed bitsets (bitset) or with NumPy (numpy) \n"
+        settings_string += "# (numba requires the numba module, and falls back to numpy if it is not installed) \n"
+        settings_string += "# (default = 'numba') \n"
+        settings_string += "fitness_kernel : "
+        settings_string += str(settings_dict["fitness_kernel"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# remove courses that are in compliance under any partition, merge sections with identical \n"
+        settings_string += "# rosters and drop the subgroups that no longer affect the score before optimizing \n"
+        settings_string += "# (default = True) \n"
+        settings_string += "presolve : "
+        settings_string += str(settings_dict["presolve"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# optimize how many students of each group with identical schedules get each letter, \n"
+        settings_string += "# instead of the letter of every student (shrinks the search space) \n"
+        settings_string += "# (default = False) \n"
+        settings_string += "student_classes : "
+        settings_string += str(settings_dict["student_classes"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# time (in seconds) each island spends improving its best partitions with a local search \n"
+        settings_string += "# at the end of each era (0 turns off the local search, default = 5) \n"
+        settings_string += "local_search_seconds : "
+        settings_string += str(settings_dict["local_search_seconds"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# the optimizer to run: the island genetic algorithm (genetic) or parallel chains \n"
+        settings_string += "# of simulated annealing (annealing), of tabu search (tabu) or of large neighborhood \n"
+        settings_string += "# search (lns), or the exact solver (exact) (default = 'genetic') \n"
+        settings_string += "engine : "
+        settings_string += str(settings_dict["engine"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# the temperature of each annealing chain at the start and at the end of the run \n"
+        settings_string += "# (default = 0.1 and 0.001) \n"
+        settings_string += "annealing_initial_temperature : "
+        settings_string += str(settings_dict["annealing_initial_temperature"])
+        settings_string += "\n"
+        settings_string += "annealing_final_temperature : "
+        settings_string += str(settings_dict["annealing_final_temperature"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# how the temperature falls: by the same factor (geometric) or by the same amount \n"
+        settings_string += "# (linear) at every step (default = 'geometric') \n"
+        settings_string += "annealing_cooling_schedule : "
+        settings_string += str(settings_dict["annealing_cooling_schedule"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# number of steps each annealing chain runs per era (default = 20000) \n"
+        settings_string += "annealing_steps_per_era : "
+        settings_string += str(settings_dict["annealing_steps_per_era"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# number of iterations a student may not return to a letter it left in a tabu \n"
+        settings_string += "# search chain (default = 20) \n"
+        settings_string += "tabu_tenure : "
+        settings_string += str(settings_dict["tabu_tenure"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# penalty for moving a student that a tabu search chain has moved in every \n"
+        settings_string += "# iteration so far (default = 0.05) \n"
+        settings_string += "tabu_frequency_weight : "
+        settings_string += str(settings_dict["tabu_frequency_weight"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# largest number of moves a tabu search chain considers per iteration (default = 5000) \n"
+        settings_string += "tabu_neighborhood_size : "
+        settings_string += str(settings_dict["tabu_neighborhood_size"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# number of iterations each tabu search chain runs per era (default = 500) \n"
+        settings_string += "tabu_iterations_per_era : "
+        settings_string += str(settings_dict["tabu_iterations_per_era"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# number of courses that are not in compliance (and that share students) that a \n"
+        settings_string += "# large neighborhood search chain repairs at once (default = 4) \n"
+        settings_string += "lns_courses_per_neighborhood : "
+        settings_string += str(settings_dict["lns_courses_per_neighborhood"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# largest number of students (or subgroups) freed in each neighborhood (default = 150) \n"
+        settings_string += "lns_max_free_subgroups : "
+        settings_string += str(settings_dict["lns_max_free_subgroups"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# time limit (in seconds) of the exact solver for each neighborhood (default = 2.0) \n"
+        settings_string += "lns_solver_seconds : "
+        settings_string += str(settings_dict["lns_solver_seconds"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# number of neighborhoods each large neighborhood search chain repairs per era (default = 20) \n"
+        settings_string += "lns_neighborhoods_per_era : "
+        settings_string += str(settings_dict["lns_neighborhoods_per_era"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# time (in seconds) the exact solver searches for in each era (default = 60) \n"
+        settings_string += "exact_seconds_per_era : "
+        settings_string += str(settings_dict["exact_seconds_per_era"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# start the exact solver from the student_assignments report of an earlier run, \n"
+        settings_string += "# if there is one (default = True) \n"
+        settings_string += "exact_warm_start : "
+        settings_string += str(settings_dict["exact_warm_start"])
+        settings_string += "\n \n" 
+        
+        settings_string += "# GUI SETTINGS \n \n"
+
+        settings_string += "# toggle the GUI on/off using True or False \n"
+        settings_string += "# (default = True) \n"
+        settings_string += "use_gui : "
+        settings_string += str(settings_dict["use_gui"]) 
+        settings_string += "\n \n"
+        
+        settings_string += "# default width of the GUI window \n"
+        settings_string += "# measured in pixels (default = 600) \n"
+        settings_string += "window_width : "
+        settings_string += str(settings_dict["window_width"]) 
+        settings_string += "\n \n"
+
+        # write settings_string to 'settings.yaml'
+        with open(IO_DIRECTORY / 'settings.yaml', 'w+') as outfile:
+            # write dictionary with original comments to .yaml
+            outfile.write(settings_string)
+
+class ParallelGeneticAlgorithm(GeneticAlgorithm):        
+    """
+    A class that implements the parallel genetic algorithm 
+    
+    Attributes
+    ----------
+    number_of_processes : int
+        number of processes to launch 
+        (default = multiprocessing.cpu_count())
+        (WARNING: must be >= 4)
+    io_directory : path object
+        gets the location of the .py file as a Path object
+        using IO_DIRECTORY = Path(os.path.dirname(__file__))  
+        (this is where .csv input files should be located)
+    student_csv_path : string 
+        filename of .csv file with student schedule data 
+        (default = "example_student_data.csv)
+    required_subgroups_csv_path : string
+        filename of .csv file with required student subgrouping data 
+        (default = "example_subgroups.csv")
+        (if not needed, use None)
+    preferred_subgroups_csv_path : string
+        filename of .csv file with preferred student subgrouping data 
+        (default = None) 
+    room_capacity_csv_path : string
+        filename of .csv file with the capacity of each room 
+        (default = None, see Schedule.room_capacities_from_csv())
+    schedule_cache_directory : path object
+        folder where compiled schedules are cached, so the .csv files are
+        only parsed again when they change (None turns off the cache)
+        (default = "schedule_cache")
+    column_map : dict
+        the header of each column of the student .csv 
+        (default = None, see Schedule.students_from_csv())
+    report_format : str
+        the file format of student_assignments and course_analysis, 
+        either "csv" or "parquet" 
+        (default = "csv")
+    number_of_partitions : int
+        number of groups to partition students into 
+        (2 and 4 are built in, other values need cohort_groupings)
+    half_class_maximum : int
+        max size of a partition when dividing students into two cohorts
+        (default = 15) 
+    quarter_class_maximum : int
+        max size of a partition when dividing students into four cohorts 
+        (default = 9)
+    cohort_groupings : dict
+        the maximum number of students of each grouping of cohorts in a 
+        course, ex: {"A" : 10, "B" : 10, "C" : 10} (see CohortRules)
+        (default = {}, which uses the built-in A/B or A/B/C/D rules)
+    pop_size : int
+        the size of the population of each "island"
+        (default = 60, with a recommended range of 20 - 80)
+    rate_of_mutation : float
+        recommended range: between 0.01 and 0.05
+        (default = 0.01)
+    max_era : int
+        how many eras to run, you may want to set this number 
+        arbitrarily high and use the time_limit to decide when
+        to halt the algorithm
+    max_gen : int
+        number of generations per era
+        (default = 20, recommended range 10 - 50)
+    fitness_cache_megabytes : float
+        memory cap of the fitness cache of each island 
+        (default = 64, 0 turns off the cache)
+    fitness_kernel : str
+        "numba" to evaluate partitions with a compiled kernel (falls back
+        to "numpy" if Numba is not installed), or "bitset" to count the 
+        letters of each course with packed bitsets
+        (default = "numba")
+    use_presolve : bool
+        True to optimize a presolved copy of the schedule (see Presolve)
+        (default = True)
+    use_student_classes : bool
+        True to optimize the letter counts of classes of students with 
+        identical schedules (see StudentClasses)
+        (default = False)
+    gene_blocks : numpy array
+        the blocks of genes that crossbreeding swaps as a whole (see 
+        StudentClasses.gene_blocks), None unless use_student_classes is True
+    local_search_seconds : float
+        the time each island spends polishing its elites with a LocalSearch
+        at the end of each era, in seconds (0 turns off the local search)
+        (default = 5)
+    time_limit : float
+        time measured in minutes 
+        (default = 480 min or 8 hr)
+    number_of_tournament_reps_per_island : int
+        for the tournament selection when crossbreeding across islands,
+        the number of representatives to use
+        (default = number_of_processes//4)
+
+        
+    Methods
+    -------
+    run_era(cls, out_queue, in_queue)
+        repeat the Genetic Algorithm based on a specified 
+        number of generations (or time limit)
+    polish_elites(cls, population, scored_population)
+        improve the elites of an island with a local search
+    read_settings(cls)
+        read settings.yaml again before a run starts
+    load_main_schedule(cls)
+        load the schedule used by main() to write the reports
+    load_island_schedule(cls, ...)
+        load the schedule of an island process
+    write_champion_reports(cls, load_schedule, champion_partition)
+        write the reports of the champion partition of an era
+    find_upper_bound(cls, load_schedule)
+        the most courses that can be "In Compliance", found at the start
+    report_era(cls, load_schedule, era_number, champion_partition_score, ...)
+        draw the charts of an era and write it to the progress log
+    get_crossed_children(cls, population1, population2, num_children, num_tournament_reps)
+        given two populations, this method uses tournament selection 
+        to choose a parent from each populatio
+    crossbreed_islands(cls, island_populations, number_of_islands, number_of_tournament_reps_per_island)
+        helper function for crossbreeding across different island populations
+    run_parallel(cls)
+        run multiple copies of the GA, each running on its own core (island), and 
+        then periodically crossbreed between islands
+    """
+
+    io_directory = IO_DIRECTORY
+
+    # get config from 'settings.yaml'
+    with open(IO_DIRECTORY / 'settings.yaml') as infile:
+        # convert .yaml to dictionary
+        settings_dict = yaml.load(infile, Loader=yaml.FullLoader)
+
+    # assign class attributes based on the values in settings_dict
+    number_of_partitions = settings_dict["number_of_partitions"]
+    half_class_maximum = settings_dict["half_class_maximum"]
+    quarter_class_maximum = settings_dict["quarter_class_maximum"]
+    cohort_groupings = settings_dict["cohort_groupings"]
+    time_limit = settings_dict["time_limit"]
+    rate_of_mutation = settings_dict["mutation_rate"]
+    pop_size = settings_dict["population_size"]
+    max_era = settings_dict["number_of_eras"]
+    max_gen = settings_dict["number_of_generations_per_era"]
+    fitness_cache_megabytes = settings_dict["fitness_cache_megabytes"]
+    fitness_kernel = settings_dict["fitness_kernel"]
+    use_presolve = settings_dict["presolve"]
+    use_student_classes = settings_dict["student_classes"]
+    local_search_seconds = settings_dict["local_search_seconds"]
+    gene_blocks = None
+    
+    if len(settings_dict["input_csv_filename"]) == 0:
+        student_csv_path = None
+    else: 
+        student_csv_path = io_directory / settings_dict["input_csv_filename"]
+
+    if len(settings_dict["required_subgroup_csv_filename"]) == 0:
+        required_subgroups_csv_path = None
+    else: 
+        required_subgroups_csv_path = io_directory / settings_dict["required_subgroup_csv_filename"]
+        
+    if len(settings_dict["preferred_subgroup_csv_filename"]) == 0:
+        preferred_subgroups_csv_path = None
+    else: 
+        preferred_subgroups_csv_path = io_directory / settings_dict["preferred_subgroup_csv_filename"]
+
+    if len(settings_dict["room_capacity_csv_filename"]) == 0:
+        room_capacity_csv_path = None
+    else: 
+        room_capacity_csv_path = io_directory / settings_dict["room_capacity_csv_filename"]
+
+    if len(settings_dict["schedule_cache_directory"]) == 0:
+        schedule_cache_directory = None
+    else:
+        schedule_cache_directory = io_directory / settings_dict["schedule_cache_directory"]
+
+    column_map = settings_dict["column_map"]
+    report_format = settings_dict["report_format"]
+
+    # global variables set at the top of page 
+    number_of_processes = NUMBER_OF_PROCESSES 
+    number_of_tournament_reps_per_island = NUMBER_OF_TOURNAMENT_REPS_PER_ISLAND
+
+    @classmethod
+    def run_era(cls, 
+                number_of_partitions, 
+                half_class_maximum,
+                quarter_class_maximum,
+                student_csv_path,
+                required_subgroups_csv_path,
+                preferred_subgroups_csv_path,
+                out_queue, 
+                in_queue,
+                schedule_cache_directory = None,
+                shared_schedule = None,
+                column_map = None):
+        
+        """
+        Repeat the Genetic Algorithm based on a specified number of generations (or time limit)
+                    
+        Parameters
+        ----------
+        number_of_partitions : int
+            the number of partitions to separate students into
+            2 for an A/B partition
+            4 for an A/B/C/D partition
+            Note: Other values are not implemented
+        half_class_maximum : int
+            the maximum desired size when dividing a classroom in half_class_maximum
+        quarter_class_maximum : int 
+            the maximum desired size when dividing a class into quarters
+        student_csv_path : str
+            the location of the input.csv with student schedule data
+        required_subgroups_csv_path : str
+            the location of the input.csv with required subgrouping data
+        preferred_subgroups_csv_path : str
+            the location of the input.csv with preferred subgrouping data
+        out_queue: multiprocessing.Queue()
+            threadsafe outbound queue, used to report final population to main()
+        in_queue: multiprocessing.Queue()
+            threadsafe inbound queue, used to receive crossbred population from main()
+        schedule_cache_directory : str
+            the folder where compiled schedules are cached (or None)
+        shared_schedule : dict
+            the descriptor of the compiled schedule published to shared 
+            memory by run_parallel(), see CompiledSchedule.publish()
+            (if None, the schedule is loaded from the .csv files/cache)
+        column_map : dict
+            the header of each column of the student .csv (or None)
+        """     
+        
+        # this function is run by child processes that main() launches, so grab the process ID for logging purposes
+        process_ID_as_string = str(os.getpid())
+
+        # initializer the timer to 0
+        timer_total = 0
+        
+        # start the timer
+        start_timer = time.perf_counter()
+        
+        # load the schedule of this island
+        load_schedule = cls.load_island_schedule(number_of_partitions, 
+                                                 half_class_maximum, 
+                                                 quarter_class_maximum, 
+                                                 student_csv_path, 
+                                                 required_subgroups_csv_path, 
+                                                 preferred_subgroups_csv_path, 
+                                                 schedule_cache_directory, 
+                                                 shared_schedule, 
+                                                 column_map)
+        
+        # instantiate the IndividualPartition object
+        first_partition = IndividualPartition(load_schedule)
+        
+        # a cache of the scores of this island, so that partitions that 
+        # have already been scored (ex: elites, or children that are exact
+        # copies of their parents) are not scored again
+        if cls.fitness_cache_megabytes > 0:
+            fitness_cache = FitnessCache(cls.fitness_cache_megabytes)
+        else:
+            fitness_cache = None
+        
+        # instantiate the Population object
+        population = Population(first_partition, cls.pop_size, fitness_cache)
+        
+        # populate with random individuals for the first generation
+        population.populate()
+        
+        # score this initial population
+        population.population_fitness()
+
+        # instantiate the GeneticAlgorithm object
+        generation_number = 1
+        first_generation = GeneticAlgorithm(population, generation_number, cls.rate_of_mutation)
+        
+        # generate Generation #2
+        first_generation.generate_next_generation()
+        previous_population = first_generation.next_generation
+        
+        # track the time this process took:
+        end_timer = time.perf_counter()
+        timer_total += end_timer - start_timer
+        
+        # get algorithm progress
+        progress = Reports.return_progress(process_ID_as_string, generation_number, previous_population, timer_total)
+        
+        # print algorithm progress
+        print(progress)
+        
+        # write algorithm progress to file   
+        Reports.write_progress(cls.io_directory, progress, 'a')
+
+        # keep repeating this process until the maximum number
+        # of generations or the time limit has been reached
+        while generation_number < cls.max_gen:
+            
+            # same process as above
+            start_timer = time.perf_counter()
+            
+            generation_number += 1
+            
+            population.sorted_scored_population = previous_population
+            current_generation = GeneticAlgorithm(population, generation_number, cls.rate_of_mutation)
+            current_generation.generate_next_generation()
+            previous_population = current_generation.next_generation
+            
+            end_timer = time.perf_counter()
+            timer_total += end_timer - start_timer
+
+            # Uncomment below to track how long this took:
+            # (This is the general case WITHOUT initial CSV load)
+            # print("Benchmark result = " + str(end_timer - start_timer))
+
+            # get algorithm progress
+            progress = Reports.return_progress(process_ID_as_string, generation_number, previous_population, timer_total)
+
+            # print algorithm progress
+            print(progress)
+            
+            # write algorithm progress to file
+            Reports.write_progress(cls.io_directory, progress, 'a')
+
+
+        # polish the elites with a local search before reporting back
+        # (see polish_elites()):
+        if cls.local_search_seconds > 0:
+            start_timer = time.perf_counter()
+            previous_population = cls.polish_elites(population, previous_population)
+            timer_total += time.perf_counter() - start_timer
+            
+            progress = Reports.return_progress(process_ID_as_string, str(generation_number) + " (local search)", previous_population, timer_total)
+            print(progress)
+            Reports.write_progress(cls.io_directory, progress, 'a')
+
+        """
+        with the generations done, this island process must send its findings back to main(). We can
+        represent our findings as a sorted list, where each item is a list composed of a partition
+        and its corresponding fitness score. So the first item is [score1, partition1];
+        the second item is [score2, partition2]; and so on, where partition1 is better
+        than partition2, partition2 is better than partition3, etc.
+        """
+
+        result_population = []
+
+        for item in previous_population:
+            result_population.append(item)
+
+        out_queue.put(result_population)
+
+
+        """
+        This island process just finished its first era, after having read in the CSV file
+        and seeding itself with a random partition.
+
+        Now, we enter a second phase: we simply wait for main() to send us a new crossbred
+        population via in_queue, then load that population into our genetic algorithm,
+        and compute another era. And so on.
+        """
+        while True:
+            # This is a blocking call until we receive a crossbred population from main()
+            crossbred_population = in_queue.get()
+
+            # Now that we've received a crossbred population, we start a new era
+            generation_number = 1
+
+            # Start timers for logging
+            timer_total = 0
+            start_timer = time.perf_counter()
+
+            # Load the received population into our in-memory population object
+            # (the elites keep the scores they were sent with, so only the
+            #  new children are loaded to be scored)
+            scored_individuals = [(score, partition) for score, partition in crossbred_population if score is not None]
+            population.load_population([partition for score, partition in crossbred_population if score is None])
+
+            # score this initial population
+            population.population_fitness(scored_individuals)
+            
+            # instantiate the GeneticAlgorithm object
+            first_generation = GeneticAlgorithm(population, generation_number, cls.rate_of_mutation)
+            
+            # generate Generation #2
+            first_generation.generate_next_generation()
+            previous_population = first_generation.next_generation
+            
+
+            # track the time this process took
+            end_timer = time.perf_counter()
+            timer_total += end_timer - start_timer
+
+            # get algorithm progress
+            progress = Reports.return_progress(process_ID_as_string, generation_number, previous_population, timer_total)
+            
+            # print algorithm progress
+            print(progress)
+            
+            # write algorithm progress to file   
+            Reports.write_progress(cls.io_directory, progress, 'a')
+           
+            # keep repeating this process until the maximum number
+            # of generations or the time limit has been reached
+            while generation_number < cls.max_gen:
+                
+                # same process as above
+                start_timer = time.perf_counter()
+
+                generation_number += 1
+                
+                population.sorted_scored_population = previous_population
+                current_generation = GeneticAlgorithm(population, generation_number, cls.rate_of_mutation)
+                current_generation.generate_next_generation()
+                previous_population = current_generation.next_generation
+                
+                end_timer = time.perf_counter()
+                timer_total += end_timer - start_timer
+                
+                # get algorithm progress
+                progress = Reports.return_progress(process_ID_as_string, generation_number, previous_population, timer_total)
+                
+                # print algorithm progress
+                print(progress)
+                
+                # write algorithm progress to file   
+                Reports.write_progress(cls.io_directory, progress, 'a')                        
+            
+            # polish the elites with a local search, same as above
+            if cls.local_search_seconds > 0:
+                start_timer = time.perf_counter()
+                previous_population = cls.polish_elites(population, previous_population)
+                timer_total += time.perf_counter() - start_timer
+                
+                progress = Reports.return_progress(process_ID_as_string, str(generation_number) + " (local search)", previous_population, timer_total)
+                print(progress)
+                Reports.write_progress(cls.io_directory, progress, 'a')
+                
+            # Send population back to main()
+            result_population = []
+
+            for item in previous_population:
+                result_population.append(item)
+
+            out_queue.put(result_population)
+
+            # we've completed one more era, now we go back to the start of "while True" loop,
+            # where we wait for main() to send the crossbred population back to us
+
+
+    @classmethod
+    def polish_elites(cls, population, scored_population):
+        """
+        Improve the elites of an island (the fittest 20%, the same share that
+        GeneticAlgorithm keeps) with a LocalSearch, where the elites share 
+        a time budget of local_search_seconds
+        
+        Returns scored_population with the polished elites, sorted again in
+        descending order of fitness
+        
+        Parameters
+        ----------
+        population : Population object
+            the population of the island (for its schedule and random
+            number generator)
+        scored_population : list
+            a list in the form [(score1, partition1), (score2, partition2), ...]
+            sorted in descending order of fitness
+        """
+        fitness_engine = population.individual_partition_obj.schedule_obj.fitness_engine
+        
+        # the local search is built on delta evaluation, which needs a 
+        # compiled schedule:
+        if fitness_engine is None or len(scored_population) == 0:
+            return scored_population
+        
+        number_of_elites = max(2*len(scored_population)//10, 1)
+        time_limit = cls.local_search_seconds/number_of_elites
+        
+        local_search = LocalSearch(fitness_engine, population.rng)
+        
+        polished_population = [local_search.polish(partition, time_limit) for _, partition in scored_population[0:number_of_elites]]
+        polished_population.extend(scored_population[number_of_elites:])
+        
+        # (sorted by the score alone, since genomes cannot be compared)
+        polished_population.sort(key = lambda scored_individual: scored_individual[0], reverse = True)
+        
+        return polished_population
+
+    @classmethod
+    def get_crossed_children(cls, population1, population2, num_children, num_tournament_reps, rng = None):
+        """
+        Helper function used by crossbreed_islands. Given two populations, this method
+        uses tournament selection to choose a parent from each population. These two
+        parents then create a pair of children. This process is repeated until num_children
+        children are produced.
+
+        Returns a list of children, where each child is a partition
+        (so it's returning a list of genomes)
+
+        Parameters
+        ----------
+        population1:
+            represents the population of an island, includes scores: [ [score1, [0, 1, ...]], [score2, [1, 2, ...]], ... ]
+            parent1 will be selected from this
+        population2:
+            represents the population of an island, includes scores: [ [score1, [0, 1, ...]], [score2, [1, 2, ...]], ... ]
+            parent2 will be selected from this
+        num_children: int
+            number of children to generate and return
+        num_tournament_reps: int
+            for the tournament selection to select parents, the number of representatives to use
+        rng : numpy.random.Generator
+            (optional) the random number generator to use 
+            (default = None, which creates a new generator)
+        """  
+        if rng is None:
+            rng = np.random.default_rng()
+
+        # size of each population
+        population_size = len(population1)
+
+        number_of_pairs = (num_children + 1)//2
+        
+        # select every pair of parents at once using tournament selection
+        parent1_indices = GeneticAlgorithm.tournament_winner_indices(population_size, num_tournament_reps, number_of_pairs, rng)
+        parent2_indices = GeneticAlgorithm.tournament_winner_indices(population_size, num_tournament_reps, number_of_pairs, rng)
+        
+        # [1] is because we just want the partition part, not the score part
+        parents1 = np.stack([population1[index][1] for index in parent1_indices])
+        parents2 = np.stack([population2[index][1] for index in parent2_indices])
+        
+        # each pair of parents generates a pair of children
+        # (the letter counts of each class of students are swapped as a whole)
+        children1, children2 = GeneticAlgorithm.crossover_block(parents1, parents2, rng, cls.gene_blocks)
+
+        # list to store the children: [child1, child2, child1, child2, ...]
+        crossed_children_list = [child for pair in zip(children1, children2) for child in pair]
+
+        # We are generating children in pairs, if we 
+        # generated one child too many, take off the extra child 
+        return crossed_children_list[0:num_children]
+
+    @classmethod
+    def crossbreed_islands(cls, island_populations, number_of_islands, number_of_tournament_reps_per_island):
+        """
+        Helper function for crossbreeding across different island populations.
+        Returns the list containing the crossbred populations.
+
+        Parameters
+        ----------
+        island_populations:
+            a list of island populations of the form [population1, population2, ...], where
+            each population is of the form [ [score1, partition1], [score2, partition2], ... ], where
+            each partition is a genome of the form [0, 2, ...] (see IndividualPartition)
+
+            putting all this together, island_populations is of the form:
+            [ [ [score11, [0, 1, ...]], [score12, [1, 2, ...]], ...],      <-- population1
+              [ [score21, [2, 1, ...]], [score22, [0, 0, ...]], ...],      <-- population2
+              [ [score31, [1, 1, ...]], [score32, [2, 0, ...]], ...],      <-- population3
+              ...
+            ]  
+
+        output value:  
+            similar to the input value island_populations, EXCEPT only the elites keep 
+            their scores (the score of each new child is None, since it has not been scored yet).
+            so it ends up looking like:
+            [ [ (score11, [1, 0, ...]), ..., (None, [2, 1, ...]), ...],      <-- population1
+              [ (score21, [2, 2, ...]), ..., (None, [2, 0, ...]), ...],      <-- population2
+              ...
+            ]
+        """    
+        
+        # each population keeps the top 25% elites
+        num_elites = len(island_populations[0])//4
+
+        # an empty list for each of the crossed populations 
+        crossed_populations = [[] for _ in range(number_of_islands)]
+        
+        # populate the 25% elites onto each island:
+        for i in range(number_of_islands):
+            crossed_pop = crossed_populations[i]
+            orig_pop = island_populations[i]
+            crossed_pop.extend([(item[0], item[1]) for item in orig_pop[0:num_elites]])    # the elites keep their scores
+        
+
+        # for each island population, the remaining 75% is composed of 
+        # [crossing with each of the other (number_of_islands - 1) islands].
+
+        # divide the remaining number of partitions as evenly as possible into
+        # (1/((number_of_islands - 1)))ths
+        
+        # most groups will be of this size:
+        num_children = (len(island_populations[0]) - num_elites)//(number_of_islands - 1)
+        
+        # the last group will be composed of whatever space is left over:
+        remainder = len(island_populations[0]) - num_elites - (num_children)*(number_of_islands - 2)
+
+        # one random number generator for all of the crossings
+        rng = np.random.default_rng()
+
+        # for each island:
+        for i in range(number_of_islands):
+            # the crossed population (that currently only has elites)
+            crossed_pop = crossed_populations[i]
+            
+            # the first population to cross with: 
+            first_pop = island_populations[i]
+            
+            # the indices of the remaining populations to cross with:
+            other_indices = [n for n in range(number_of_islands)]
+            other_indices.remove(i)
+            
+            # for each index (except the last):
+            for index in other_indices[:-1]:
+                # get the second population for crossing
+                second_pop = island_populations[index]
+                
+                # cross the two islands and add the children to cross_pop 
+                # (the number of children added will = num_children)
+                crossed_pop.extend([(None, child) for child in cls.get_crossed_children(first_pop, second_pop, num_children, number_of_tournament_reps_per_island, rng)])
+            
+            # cross with the last island and add the children to cross_pop
+            # (this time, the number of children added will = remainder)
+            crossed_pop.extend([(None, child) for child in cls.get_crossed_children(first_pop, island_populations[-1], remainder, number_of_tournament_reps_per_island, rng)])
+
+        # return the list of crossed populations
+        return crossed_populations
+
+    @classmethod
+    def read_settings(cls):
+        """
+        Read settings.yaml again and update the class attributes that can be
+        changed in the GUI before a run starts (ex: the input .csv files)
+        
+        Returns the settings as a dictionary
+        
+        Parameters
+        ----------
+        None
+        """
+        with open(IO_DIRECTORY / 'settings.yaml') as infile:
+            # convert .yaml to dictionary
+            settings_dict = yaml.load(infile, Loader=yaml.FullLoader)
+
+        cls.number_of_partitions = settings_dict["number_of_partitions"]
+                    
+        cls.half_class_maximum = settings_dict["half_class_maximum"]
+                    
+        cls.quarter_class_maximum = settings_dict["quarter_class_maximum"]
+        cls.cohort_groupings = settings_dict["cohort_groupings"]
+            
+        cls.time_limit = settings_dict["time_limit"]
+        
         if len(settings_dict["input_csv_filename"]) == 0:
-            settings_string += '""'
-        else:
-            settings_string += settings_dict["input_csv_filename"]
-        settings_string += "\n \n"
+            cls.student_csv_path = None
+        else: 
+            cls.student_csv_path = cls.io_directory / settings_dict["input_csv_filename"]
 
-        settings_string += "# Filename of .csv file with required student subgrouping data (default = 'example_subgroups.csv') \n"
-        settings_string += "# if no required subgroups are needed, set the value below to an empty string, REQUIRED_SUBGROUP_CSV_FILENAME = '' \n" 
-        settings_string += "required_subgroup_csv_filename : "
         if len(settings_dict["required_subgroup_csv_filename"]) == 0:
-            settings_string += '""'
-        else:
-            settings_string += settings_dict["required_subgroup_csv_filename"]
-        settings_string += "\n \n"
- 
-        settings_string += "# Filename of .csv file with preferred student subgrouping data (default = None) \n"
-        settings_string += "# if no required subgroups are needed, set the value below to an empty string, PREFERRED_SUBGROUP_CSV_FILENAME = '' \n" 
-        settings_string += "preferred_subgroup_csv_filename : "
+            cls.required_subgroups_csv_path = None
+        else: 
+            cls.required_subgroups_csv_path = cls.io_directory / settings_dict["required_subgroup_csv_filename"]
+            
         if len(settings_dict["preferred_subgroup_csv_filename"]) == 0:
-            settings_string += '""'
+            cls.preferred_subgroups_csv_path = None
+        else: 
+            cls.preferred_subgroups_csv_path = cls.io_directory / settings_dict["preferred_subgroup_csv_filename"]
+
+        if len(settings_dict["room_capacity_csv_filename"]) == 0:
+            cls.room_capacity_csv_path = None
+        else: 
+            cls.room_capacity_csv_path = cls.io_directory / settings_dict["room_capacity_csv_filename"]
+
+        if len(settings_dict["schedule_cache_directory"]) == 0:
+            cls.schedule_cache_directory = None
         else:
-            settings_string += settings_dict["preferred_subgroup_csv_filename"]
-        settings_string += "\n \n" 
+            cls.schedule_cache_directory = cls.io_directory / settings_dict["schedule_cache_directory"]
+
+        cls.column_map = settings_dict["column_map"]
+
+        cls.report_format = settings_dict["report_format"]
         
-        settings_string += "# GENETIC ALGORITHM SETTINGS \n \n"
-        settings_string += "# If you experiment with the following settings, you may happen upon a \n"
-        settings_string += "# combination of values that optimizes more efficiently than the default \n"
-        settings_string += "# settings in this program. If so, please share these values with me at \n"
-        settings_string += "# studentpartitionoptimizer@gmail.com so I can verify and make these the \n"
-        settings_string += "# new defaults. \n \n"   
+        return settings_dict
+
+    @classmethod
+    def load_main_schedule(cls):
+        """
+        Load and compile the schedule in the main process (the copy that is 
+        used to write the reports of each era), print the presolve and 
+        student class summaries to the progress log, and return the schedule
         
-        settings_string += "# recommended range: between 0.01 and 0.05, (default = 0.01) \n"
-        settings_string += "mutation_rate : "
-        settings_string += str(settings_dict["mutation_rate"])
-        settings_string += "\n \n"
+        This also writes the compiled schedule to the cache (if the .csv files 
+        have changed since the last run), which the island processes then read
+        
+        Parameters
+        ----------
+        None
+        """
+        load_schedule = Schedule(cls.number_of_partitions, cls.half_class_maximum, cls.quarter_class_maximum, cls.fitness_kernel, cls.cohort_groupings, 
+                                 cls.use_presolve, cls.use_student_classes)
+        load_schedule.load_csv_files(cls.student_csv_path, 
+                                     cls.required_subgroups_csv_path, 
+                                     cls.preferred_subgroups_csv_path, 
+                                     cls.schedule_cache_directory,
+                                     cls.column_map)
+        
+        if cls.room_capacity_csv_path is not None:
+            load_schedule.room_capacities_from_csv(cls.room_capacity_csv_path)
+        
+        # report how much of the problem presolve removed:
+        if load_schedule.presolve is not None:
+            presolve_summary = load_schedule.presolve.summary()
+            print(presolve_summary)
+            Reports.write_progress(cls.io_directory, presolve_summary, 'a')
+        
+        # report how much grouping students with identical schedules 
+        # shrank the genome:
+        if load_schedule.student_classes is not None:
+            student_classes_summary = load_schedule.student_classes.summary()
+            print(student_classes_summary)
+            Reports.write_progress(cls.io_directory, student_classes_summary, 'a')
+            
+            cls.gene_blocks = load_schedule.student_classes.gene_blocks
+        else:
+            cls.gene_blocks = None
 
-        settings_string += "# the optimal value here is going to depend a lot on number of cores,) \n"
-        settings_string += "# so you can play around with this to see what seems to work best \n"
-        settings_string += "# recommended range for a 16-core machine: 20 - 80 (default = 60) \n"
-        settings_string += "population_size : "
-        settings_string += str(settings_dict["population_size"])
-        settings_string += "\n \n"
+        return load_schedule
+
+    @classmethod
+    def load_island_schedule(cls, 
+                             number_of_partitions, 
+                             half_class_maximum, 
+                             quarter_class_maximum, 
+                             student_csv_path, 
+                             required_subgroups_csv_path, 
+                             preferred_subgroups_csv_path, 
+                             schedule_cache_directory = None, 
+                             shared_schedule = None, 
+                             column_map = None):
+        """
+        Load the schedule of an island process (or of any other process that 
+        evaluates partitions), attaching to the compiled schedule in shared 
+        memory when there is one
+        
+        Parameters
+        ----------
+        (the same as run_era())
+        """
+        # instantiate the Schedule object
+        load_schedule = Schedule(number_of_partitions, half_class_maximum, quarter_class_maximum, cls.fitness_kernel, cls.cohort_groupings, 
+                                 cls.use_presolve, cls.use_student_classes)
+        
+        # attach to the compiled schedule that run_parallel() published to
+        # shared memory, so that every island shares a single read-only copy
+        # of the schedule (and no Student/Course objects are built)
+        if shared_schedule is not None:
+            load_schedule.load_shared(shared_schedule)
+            
+        # otherwise, load school data and required/preferred subgroups into the 
+        # Schedule object and build the array-backed copy used for evaluation 
+        # (run_parallel() has already written the compiled schedule to the 
+        # cache, so this does not parse the .csv files again)
+        else:
+            load_schedule.load_csv_files(student_csv_path, 
+                                         required_subgroups_csv_path, 
+                                         preferred_subgroups_csv_path, 
+                                         schedule_cache_directory,
+                                         column_map)
+        
+        # check each course against the capacity of its room:
+        if cls.room_capacity_csv_path is not None:
+            load_schedule.room_capacities_from_csv(cls.room_capacity_csv_path)
+        
+        return load_schedule
 
-        settings_string += "# recommended range: run it for as long as you have time, or until the \n"
-        settings_string += "# [number of compliant sections] metric seems to plateau out \n"
-        settings_string += "# (default = 5000) \n"
-        settings_string += "number_of_eras : "
-        settings_string += str(settings_dict["number_of_eras"])
-        settings_string += "\n \n"
+    @classmethod
+    def write_champion_reports(cls, load_schedule, champion_partition):
+        """
+        Load the champion partition of an era into load_schedule and write 
+        the student assignment and course analysis reports (as .csv or 
+        Parquet files, see report_format)
+        
+        Parameters
+        ----------
+        load_schedule : Schedule object
+            the schedule of the main process
+        champion_partition : numpy array
+            the genome of the best partition of the era
+        """
+        load_schedule.load_partition(champion_partition)
+        
+        if cls.report_format == "parquet":
+            load_schedule.write_student_assignments_parquet()
+            load_schedule.write_course_analysis_parquet()
+        else:
+            load_schedule.write_student_assignments()
+            load_schedule.write_course_analysis()
 
-        settings_string += "# with 16 cores, good results are obtained with a default value of 20 \n"
-        settings_string += "# but with fewer cores, you may want to increase this value \n"
-        settings_string += "# recommended range: 10 - 50 (default = 20) \n"
-        settings_string += "number_of_generations_per_era : "
-        settings_string += str(settings_dict["number_of_generations_per_era"])
-        settings_string += "\n \n" 
+    @classmethod
+    def find_upper_bound(cls, load_schedule):
+        """
+        Return an upper bound on the number of courses "In Compliance" 
+        (good_score) of any partition, from the courses that can each be 
+        counted by themselves (see ExactSolver.upper_bound()), and write 
+        it to the progress log
         
-        settings_string += "# GUI SETTINGS \n \n"
+        A run stops as soon as its champion reaches this bound, since no
+        partition can count more courses
+        
+        Parameters
+        ----------
+        load_schedule : Schedule object
+            the schedule of the main process
+        """
+        fitness_engine = load_schedule.fitness_engine
+        
+        upper_bound = ExactSolver(fitness_engine, load_schedule.cohort_rules).upper_bound()
+        
+        progress = ("Upper bound on In Compliance: " + str(upper_bound) + " of " + str(fitness_engine.number_of_courses) 
+                    + " courses (" + str(fitness_engine.number_of_courses - upper_bound) + " can never be counted)")
+        print(progress)
+        Reports.write_progress(cls.io_directory, progress, 'a')
+        
+        return upper_bound
 
-        settings_string += "# toggle the GUI on/off using True or False \n"
-        settings_string += "# (default = True) \n"
-        settings_string += "use_gui : "
-        settings_string += str(settings_dict["use_gui"]) 
-        settings_string += "\n \n"
+    @classmethod
+    def report_era(cls, load_schedule, era_number, champion_partition_score, start_timer, end_timer, total_time, message_queue = None, 
+                   upper_bound = None):
+        """
+        Report the progress of an era: draw the pie chart and histogram of 
+        the champion partition (which must already be loaded into 
+        load_schedule, see write_champion_reports()), send them to the GUI 
+        and write the era to the progress log
         
-        settings_string += "# default width of the GUI window \n"
-        settings_string += "# measured in pixels (default = 600) \n"
-        settings_string += "window_width : "
-        settings_string += str(settings_dict["window_width"]) 
-        settings_string += "\n \n"
+        Parameters
+        ----------
+        load_schedule : Schedule object
+            the schedule of the main process
+        era_number : int
+            the number of eras completed
+        champion_partition_score : tuple
+            the fitness tuple of the champion partition
+        start_timer : float
+            the time the era started
+        end_timer : float
+            the time the era ended
+        total_time : float
+            the total time elapsed (in seconds)
+        message_queue : queue.Queue
+            the queue of messages to the GUI (only used if USE_GUI is True)
+        upper_bound : int
+            (optional) the most courses that can be "In Compliance", see
+            Reports.return_era_progress() (default = None); the run stops 
+            once the champion reaches it
+        """
+        # fetch info for creating a pie chart for the champion partition this era
+        champion_fitness_score = champion_partition_score[0]
+        champion_in_compliance = champion_partition_score[2]
+        total_courses = champion_partition_score[-1]
 
-        # write settings_string to 'settings.yaml'
-        with open(IO_DIRECTORY / 'settings.yaml', 'w+') as outfile:
-            # write dictionary with original comments to .yaml
-            outfile.write(settings_string)
+        max_deviation = load_schedule.get_max_deviation()
+        time_limit_seconds = 60 * cls.time_limit
+        
+        # the run stops before the time limit once the champion reaches the
+        # upper bound, so the GUI is told that the time is up:
+        if upper_bound is not None and champion_in_compliance >= upper_bound:
+            time_limit_seconds = total_time
 
-class ParallelGeneticAlgorithm(GeneticAlgorithm):        
-    """
-    A class that implements the parallel genetic algorithm 
-    
-    Attributes
-    ----------
-    number_of_processes : int
-        number of processes to launch 
-        (default = multiprocessing.cpu_count())
-        (WARNING: must be >= 4)
-    io_directory : path object
-        gets the location of the .py file as a Path object
-        using IO_DIRECTORY = Path(os.path.dirname(__file__))  
-        (this is where .csv input files should be located)
-    student_csv_path : string 
-        filename of .csv file with student schedule data 
-        (default = "example_student_data.csv)
-    required_subgroups_csv_path : string
-        filename of .csv file with required student subgrouping data 
-        (default = "example_subgroups.csv")
-        (if not needed, use None)
-    preferred_subgroups_csv_path : string
-        filename of .csv file with preferred student subgrouping data 
-        (default = None) 
-    number_of_partitions : int
-        number of groups to partition students into 
-        (only 2 and 4 are implemented)
-    half_class_maximum : int
-        max size of a partition when dividing students into two cohorts
-        (default = 15) 
-    quarter_class_maximum : int
-        max size of a partition when dividing students into four cohorts 
-        (default = 9)
-    pop_size : int
-        the size of the population of each "island"
-        (default = 60, with a recommended range of 20 - 80)
-    rate_of_mutation : float
-        recommended range: between 0.01 and 0.05
-        (default = 0.01)
-    max_era : int
-        how many eras to run, you may want to set this number 
-        arbitrarily high and use the time_limit to decide when
-        to halt the algorithm
-    max_gen : int
-        number of generations per era
-        (default = 20, recommended range 10 - 50)
-    time_limit : float
-        time measured in minutes 
-        (default = 480 min or 8 hr)
-    number_of_tournament_reps_per_island : int
-        for the tournament selection when crossbreeding across islands,
-        the number of representatives to use
-        (default = number_of_processes//4)
+        # create a pie chart
+        Reports.create_pie_chart(era_number, champion_fitness_score, champion_in_compliance, total_courses)
 
-        
-    Methods
-    -------
-    run_era(cls, out_queue, in_queue)
-        repeat the Genetic Algorithm based on a specified 
-        number of generations (or time limit)
-    get_crossed_children(cls, population1, population2, num_children, num_tournament_reps)
-        given two populations, this method uses tournament selection 
-        to choose a parent from each populatio
-    crossbreed_islands(cls, island_populations, number_of_islands, number_of_tournament_reps_per_island)
-        helper function for crossbreeding across different island populations
-    run_parallel(cls)
-        run multiple copies of the GA, each running on its own core (island), and 
-        then periodically crossbreed between islands
-    """
+        # create a histogram
+        Reports.create_histogram(era_number, cls.number_of_partitions, champion_partition_score, max_deviation, total_time, time_limit_seconds)
 
-    io_directory = IO_DIRECTORY
+        if (USE_GUI):
+            queue_tuple = (era_number, cls.number_of_partitions, champion_partition_score, max_deviation, total_time, time_limit_seconds)
+            message_queue.put(queue_tuple)
 
-    # get config from 'settings.yaml'
-    with open(IO_DIRECTORY / 'settings.yaml') as infile:
-        # convert .yaml to dictionary
-        settings_dict = yaml.load(infile, Loader=yaml.FullLoader)
+        progress = Reports.return_era_progress(era_number, start_timer, end_timer, total_time, champion_in_compliance, upper_bound)
+        print(progress)
+        Reports.write_progress(cls.io_directory, progress, 'a')
 
-    # assign class attributes based on the values in settings_dict
-    number_of_partitions = settings_dict["number_of_partitions"]
-    half_class_maximum = settings_dict["half_class_maximum"]
-    quarter_class_maximum = settings_dict["quarter_class_maximum"]
-    time_limit = settings_dict["time_limit"]
-    rate_of_mutation = settings_dict["mutation_rate"]
-    pop_size = settings_dict["population_size"]
-    max_era = settings_dict["number_of_eras"]
-    max_gen = settings_dict["number_of_generations_per_era"]
-    
-    if len(settings_dict["input_csv_filename"]) == 0:
-        student_csv_path = None
-    else: 
-        student_csv_path = io_directory / settings_dict["input_csv_filename"]
+    @classmethod
+    def run_parallel(cls, message_queue = None):
+        """
+        In order to take advantage of multiple cores, main() works as follows:
+            1. Launch NUMBER_OF_PROCESSES processes, each of which runs an instance of the self.run_era() function.
+               You can think of this as the genetic algorithm working on N separate islands.
+            2. After running the genetic algorithm for NUMBER_OF_GENERATIONS_PER_ERA generations, these processes
+               each report their population back to main().
+            3. We have just completed an "era". We now start the next era by crossbreeding these populations
+               and then feeding the crossbred population back to each island (process), so that each island can
+               go off and run the genetic algorithm for another era in isolation before reporting back, etc.
+        """
+        # if you open a .csv report in Microsoft Excel and leave it open,
+        # this program will throw a PermissionError when it tries to write
+        # the new .csv report
+        #
+        # this warning is to remind you to close these .csv files before this
+        # happens
+        #
+        warnings.warn("To avoid permission errors, close any output files you may have left open from previous runs.")
 
-    if len(settings_dict["required_subgroup_csv_filename"]) == 0:
-        required_subgroups_csv_path = None
-    else: 
-        required_subgroups_csv_path = io_directory / settings_dict["required_subgroup_csv_filename"]
+        # start progress log
+        Reports.write_progress(cls.io_directory, 'Progress Log', 'w')
         
-    if len(settings_dict["preferred_subgroup_csv_filename"]) == 0:
-        preferred_subgroups_csv_path = None
-    else: 
-        preferred_subgroups_csv_path = io_directory / settings_dict["preferred_subgroup_csv_filename"]
+        # The "island" processes report back to main() by putting their population into this threadsafe queue
+        island_population_queue = multiprocessing.Queue()
 
-    # global variables set at the top of page 
-    number_of_processes = NUMBER_OF_PROCESSES 
-    number_of_tournament_reps_per_island = NUMBER_OF_TOURNAMENT_REPS_PER_ISLAND
+        # main() can then send the crossbred populations back to the "island" processes via this threadsafe queue
+        crossbred_population_queue = multiprocessing.Queue()
+
+        # store the processes that we launch in a list
+        island_processes = []
 
-    @classmethod
-    def run_era(cls, 
-                number_of_partitions, 
-                half_class_maximum,
-                quarter_class_maximum,
-                student_csv_path,
-                required_subgroups_csv_path,
-                preferred_subgroups_csv_path,
-                out_queue, 
-                in_queue):
-        
         """
-        Repeat the Genetic Algorithm based on a specified number of generations (or time limit)
-                    
-        Parameters
-        ----------
-        number_of_partitions : int
-            the number of partitions to separate students into
-            2 for an A/B partition
-            4 for an A/B/C/D partition
-            Note: Other values are not implemented
-        half_class_maximum : int
-            the maximum desired size when dividing a classroom in half_class_maximum
-        quarter_class_maximum : int 
-            the maximum desired size when dividing a class into quarters
-        student_csv_path : str
-            the location of the input.csv with student schedule data
-        required_subgroups_csv_path : str
-            the location of the input.csv with required subgrouping data
-        preferred_subgroups_csv_path : str
-            the location of the input.csv with preferred subgrouping data
-        out_queue: multiprocessing.Queue()
-            threadsafe outbound queue, used to report final population to main()
-        in_queue: multiprocessing.Queue()
-            threadsafe inbound queue, used to receive crossbred population from main()
-        """     
+        try:
+            cls.number_of_partitions = cls.number_of_partitions.value
+        except TypeError:
+            pass
+
+        try:
+            cls.half_class_maximum = cls.half_class_maximum.value
+        except TypeError:
+            pass
+            
+        try:
+            cls.quarter_class_maximum = cls.quarter_class_maximum.value
+        except TypeError:
+            pass
+
+        try:
+            cls.time_limit = cls.time_limit.value
+        except TypeError:
+            pass
+        """
         
-        # this function is run by child processes that main() launches, so grab the process ID for logging purposes
-        process_ID_as_string = str(os.getpid())
+        # read the settings again (they may have been changed in the GUI)
+        cls.read_settings()
+
+        # prepare load_schedule to be used later for writing out student assignments and
+        # course analysis at the end of each era
+        load_schedule = cls.load_main_schedule()
+
+        # no partition can have more courses "In Compliance" than this
+        upper_bound = cls.find_upper_bound(load_schedule)
+
+        # publish the arrays of the compiled schedule to shared memory, so the
+        # island processes can attach to them instead of loading the schedule 
+        # themselves (this requires Python 3.8+)
+        if shared_memory is not None:
+            shared_memory_block, shared_schedule = load_schedule.compiled.publish()
+        else:
+            shared_memory_block, shared_schedule = None, None
+
+        try:
+            # instantiate NUMBER_OF_PROCESSES island processes, each of which will execute self.run_era()
+            for _ in range(0, cls.number_of_processes):
+                p = multiprocessing.Process(target=cls.run_era, args=(cls.number_of_partitions, 
+                                                                      cls.half_class_maximum, 
+                                                                      cls.quarter_class_maximum, 
+                                                                      cls.student_csv_path, 
+                                                                      cls.required_subgroups_csv_path, 
+                                                                      cls.preferred_subgroups_csv_path, 
+                                                                      island_population_queue, 
+                                                                      crossbred_population_queue,
+                                                                      cls.schedule_cache_directory,
+                                                                      shared_schedule,
+                                                                      cls.column_map))
+                island_processes.append(p)
+
+            # start the processes
+            for p in island_processes:
+                p.start()
+
+            # timers for logging
+            start_timer = end_timer = total_time = 0
+        
+            # number of eras we've completed
+            era_number = 0
+
+            # one iteration through this loop represents one era
+            while total_time < 60*cls.time_limit and era_number < cls.max_era:
+                # we will time how long this era takes us
+                start_timer = time.perf_counter()
+
+                # each island will send us their population - store all of them in this list
+                island_populations = []
+
+                # get() is blocking, so the main() process will spend most of its
+                # time waiting here for all of the islands to report back
+                for i in range(cls.number_of_processes):
+                    island_populations.append(island_population_queue.get())
+
+                # before we start crossbreeding, we first log the current chamption partition out of all the islands
+                # (sorted by the score of the best partition of each island, since genomes cannot be compared)
+                island_populations.sort(key = lambda island_population: island_population[0][0], reverse = True)
+                champion_partition = island_populations[0][0][1]
+                cls.write_champion_reports(load_schedule, champion_partition)
 
-        # initializer the timer to 0
-        timer_total = 0
-        
-        # start the timer
-        start_timer = time.perf_counter()
+                # the score of the champion partition this era
+                champion_partition_score = island_populations[0][0][0]
+
+                # uncomment the below line to output info about the champion partition
+                # print("CURRENT HIGH FITNESS SCORE: " + str(island_populations[0][0]))
+
+                # now that we've saved all info about the current champion, we can crossbreed
+                crossed_populations = cls.crossbreed_islands(island_populations, cls.number_of_processes, cls.number_of_tournament_reps_per_island)
+
+                # send this crossed population back to the island process via crossbred_population_queue
+                # (each island process is constantly checking this queue for a crossbred population,
+                #  and once it is able to pop one off, starts computing the new era using that initial population)
+                for item in crossed_populations:
+                    crossbred_population_queue.put(item)
+
+                # log time elapsed
+                end_timer = time.perf_counter()
+                total_time += (end_timer - start_timer)
+
+                # we've completed one more era, log progress and we're done
+                era_number += 1
+
+                cls.report_era(load_schedule, era_number, champion_partition_score, start_timer, end_timer, total_time, message_queue, 
+                               upper_bound)
+
+                # the champion is optimal, so there is nothing left to find:
+                if champion_partition_score[2] >= upper_bound:
+                    break
+
+        finally:
+            # stop the islands and free the shared memory, even if the era 
+            # loop raised (ex: a PermissionError from a report left open in 
+            # Excel, or a KeyboardInterrupt)
+            for p in island_processes:
+                if p.is_alive():
+                    p.terminate()
+                    p.join()
+            
+            # free the shared memory once every island has exited
+            if shared_memory_block is not None:
+                shared_memory_block.close()
+                shared_memory_block.unlink()
+
+
+class ParallelAnnealing(ParallelGeneticAlgorithm):
+    """
+    A class that runs independent chains of simulated annealing in parallel,
+    one per core, as an alternative to the island genetic algorithm 
+    (selected with engine : 'annealing' in settings.yaml)
+    
+    The chains are started from random partitions and never exchange 
+    partitions. After each era (annealing_steps_per_era steps of every 
+    chain), each chain sends the best partition it has found to main(), 
+    which writes the reports of the best one, exactly as run_parallel() 
+    of ParallelGeneticAlgorithm does
+    
+    The temperature of every chain falls over the whole run, which ends 
+    after number_of_eras eras or time_limit minutes (whichever comes first),
+    or as soon as the best partition reaches the upper bound on courses 
+    "In Compliance" (see find_upper_bound())
+    
+    Attributes
+    ----------
+    (the same as ParallelGeneticAlgorithm, plus)
+    initial_temperature : float
+        the temperature of each chain at the start of the run
+        (default = 0.1)
+    final_temperature : float
+        the temperature of each chain at the end of the run
+        (default = 0.001)
+    cooling_schedule : str
+        "geometric" or "linear", see SimulatedAnnealing
+        (default = "geometric")
+    steps_per_era : int
+        the number of steps each chain runs per era
+        (default = 20000)
+    step_name : str
+        the name of a step in the progress log
+    restart_from_champion : bool
+        if True, every chain continues from the best partition of all the
+        chains after each era (False for simulated annealing)
         
-        # instantiate the Schedule object
-        load_schedule = Schedule(number_of_partitions, half_class_maximum, quarter_class_maximum)
+    Methods
+    -------
+    initial_genome(cls, load_schedule)
+        the genome that each chain starts from
+    create_chain(cls, load_schedule)
+        create the search run by each chain
+    run_chain(cls, ...)
+        run one chain of simulated annealing (in its own process)
+    run_parallel(cls)
+        run one chain per core, and write the reports of the best 
+        partition after each era
+    """
+    
+    # assign class attributes based on the values in settings_dict
+    initial_temperature = ParallelGeneticAlgorithm.settings_dict["annealing_initial_temperature"]
+    final_temperature = ParallelGeneticAlgorithm.settings_dict["annealing_final_temperature"]
+    cooling_schedule = ParallelGeneticAlgorithm.settings_dict["annealing_cooling_schedule"]
+    steps_per_era = ParallelGeneticAlgorithm.settings_dict["annealing_steps_per_era"]
+    step_name = "Annealing steps"
+    restart_from_champion = False
+    
+    @classmethod
+    def read_settings(cls):
+        """
+        Read settings.yaml again (see ParallelGeneticAlgorithm.read_settings()),
+        including the annealing settings
         
-        # load school data into the Schedule object
-        load_schedule.students_from_csv(student_csv_path)
+        Parameters
+        ----------
+        None
+        """
+        settings_dict = super().read_settings()
         
-        # load required subgroups into the Schedule object
-        load_schedule.subgroups_from_csv(required_subgroups_csv_path, "required")    
+        cls.initial_temperature = settings_dict["annealing_initial_temperature"]
+        cls.final_temperature = settings_dict["annealing_final_temperature"]
+        cls.cooling_schedule = settings_dict["annealing_cooling_schedule"]
+        cls.steps_per_era = settings_dict["annealing_steps_per_era"]
         
-        # load preferred subgroups into the Schedule object
-        load_schedule.subgroups_from_csv(preferred_subgroups_csv_path, "preferred")
+        return settings_dict
+    
+    @classmethod
+    def initial_genome(cls, load_schedule):
+        """
+        Return the genome that each chain starts from (a random partition)
         
-        # instantiate the IndividualPartition object
-        first_partition = IndividualPartition(load_schedule)
+        Parameters
+        ----------
+        load_schedule : Schedule object
+            the chain's schedule
+        """
+        return IndividualPartition(load_schedule).generate_partition()
+    
+    @classmethod
+    def create_chain(cls, load_schedule):
+        """
+        Create the search run by each chain (a SimulatedAnnealing object;
+        subclasses may return any object with the same start(), run() 
+        and best() methods and number_of_steps attribute)
         
-        # instantiate the Population object
-        population = Population(first_partition, cls.pop_size)
+        Parameters
+        ----------
+        load_schedule : Schedule object
+            the chain's schedule
+        """
+        return SimulatedAnnealing(load_schedule.fitness_engine, 
+                                  np.random.default_rng(), 
+                                  cls.initial_temperature, 
+                                  cls.final_temperature, 
+                                  cls.cooling_schedule)
+    
+    @classmethod
+    def run_chain(cls, 
+                  number_of_partitions, 
+                  half_class_maximum,
+                  quarter_class_maximum,
+                  student_csv_path,
+                  required_subgroups_csv_path,
+                  preferred_subgroups_csv_path,
+                  out_queue, 
+                  in_queue, 
+                  schedule_cache_directory = None, 
+                  shared_schedule = None, 
+                  column_map = None):
+        """
+        Run one chain of simulated annealing: after each era, send the best
+        (fitness, genome) tuple found so far to main() through out_queue, 
+        and wait for main() to start the next era through in_queue (with 
+        the best genome of all the chains, which the chain continues from 
+        if restart_from_champion is True)
         
-        # populate with random individuals for the first generation
-        population.populate()
+        The share of the run that each era completes (which sets the 
+        temperature, see SimulatedAnnealing.temperature()) is the larger 
+        of its share of number_of_eras and its share of time_limit, where
+        each era is assumed to take as long as the one before
         
-        # score this initial population
-        population.population_fitness()
-
-        # instantiate the GeneticAlgorithm object
-        generation_number = 1
-        first_generation = GeneticAlgorithm(population, generation_number, cls.rate_of_mutation)
+        Parameters
+        ----------
+        (the same as ParallelGeneticAlgorithm.run_era())
+        """
+        process_ID_as_string = str(os.getpid())
         
-        # generate Generation #2
-        first_generation.generate_next_generation()
-        previous_population = first_generation.next_generation
+        load_schedule = cls.load_island_schedule(number_of_partitions, 
+                                                 half_class_maximum, 
+                                                 quarter_class_maximum, 
+                                                 student_csv_path, 
+                                                 required_subgroups_csv_path, 
+                                                 preferred_subgroups_csv_path, 
+                                                 schedule_cache_directory, 
+                                                 shared_schedule, 
+                                                 column_map)
         
-        # track the time this process took:
-        end_timer = time.perf_counter()
-        timer_total += end_timer - start_timer
+        chain = cls.create_chain(load_schedule)
         
-        # get algorithm progress
-        progress = Reports.return_progress(process_ID_as_string, generation_number, previous_population, timer_total)
+        chain.start(cls.initial_genome(load_schedule))
         
-        # print algorithm progress
-        print(progress)
+        time_limit_seconds = 60*cls.time_limit
+        total_time = 0
+        era_time = 0
+        era_number = 0
         
-        # write algorithm progress to file   
-        Reports.write_progress(cls.io_directory, progress, 'a')
-
-        # keep repeating this process until the maximum number
-        # of generations or the time limit has been reached
-        while generation_number < cls.max_gen:
-            
-            # same process as above
+        while True:
             start_timer = time.perf_counter()
             
-            generation_number += 1
+            start_progress = max(era_number/cls.max_era, total_time/time_limit_seconds)
+            end_progress = max((era_number + 1)/cls.max_era, (total_time + era_time)/time_limit_seconds)
             
-            population.sorted_scored_population = previous_population
-            current_generation = GeneticAlgorithm(population, generation_number, cls.rate_of_mutation)
-            current_generation.generate_next_generation()
-            previous_population = current_generation.next_generation
+            chain.run(cls.steps_per_era, start_progress, end_progress)
+            
+            era_number += 1
+            
+            champion = chain.best()
             
             end_timer = time.perf_counter()
-            timer_total += end_timer - start_timer
-
-            # Uncomment below to track how long this took:
-            # (This is the general case WITHOUT initial CSV load)
-            # print("Benchmark result = " + str(end_timer - start_timer))
-
-            # get algorithm progress
-            progress = Reports.return_progress(process_ID_as_string, generation_number, previous_population, timer_total)
-
-            # print algorithm progress
-            print(progress)
+            era_time = end_timer - start_timer
+            total_time += era_time
             
-            # write algorithm progress to file
+            # report the best partition of this chain
+            progress = Reports.return_progress(process_ID_as_string, chain.number_of_steps, [champion], era_time, cls.step_name)
+            print(progress)
             Reports.write_progress(cls.io_directory, progress, 'a')
-
-
-        """
-        with the generations done, this island process must send its findings back to main(). We can
-        represent our findings as a sorted list, where each item is a list composed of a partition
-        and its corresponding fitness score. So the first item is [score1, partition1];
-        the second item is [score2, partition2]; and so on, where partition1 is better
-        than partition2, partition2 is better than partition3, etc.
-        """
-
-        result_population = []
-
-        for item in previous_population:
-            result_population.append(item)
-
-        out_queue.put(result_population)
-
-
+            
+            out_queue.put(champion)
+            
+            # wait for main() to start the next era (the time spent
+            # waiting counts towards the time limit), which sends the 
+            # best genome of all the chains:
+            champion_genome = in_queue.get()
+            total_time += time.perf_counter() - end_timer
+            
+            if cls.restart_from_champion:
+                chain.start(champion_genome)
+    
+    @classmethod
+    def run_parallel(cls, message_queue = None):
         """
-        This island process just finished its first era, after having read in the CSV file
-        and seeding itself with a random partition.
-
-        Now, we enter a second phase: we simply wait for main() to send us a new crossbred
-        population via in_queue, then load that population into our genetic algorithm,
-        and compute another era. And so on.
+        Run NUMBER_OF_PROCESSES chains of simulated annealing, each in its 
+        own process (see run_chain()). After every era, main() writes the
+        reports of the best partition found by any chain, and then lets 
+        every chain run another era
+        
+        Parameters
+        ----------
+        message_queue : queue.Queue
+            (optional) the queue of messages to the GUI
         """
-        while True:
-            # This is a blocking call until we receive a crossbred population from main()
-            crossbred_population = in_queue.get()
-
-            # Now that we've received a crossbred population, we start a new era
-            generation_number = 1
-
-            # Start timers for logging
-            timer_total = 0
-            start_timer = time.perf_counter()
-
-            # Load the received population into our in-memory population object
-            population.load_population(crossbred_population)
+        warnings.warn("To avoid permission errors, close any output files you may have left open from previous runs.")
 
-            # score this initial population
-            population.population_fitness()
+        # start progress log
+        Reports.write_progress(cls.io_directory, 'Progress Log', 'w')
+        
+        # read the settings again (they may have been changed in the GUI)
+        cls.read_settings()
+        
+        # the schedule used to write the reports of each era
+        load_schedule = cls.load_main_schedule()
+        
+        # no partition can have more courses "In Compliance" than this
+        upper_bound = cls.find_upper_bound(load_schedule)
+        
+        # publish the compiled schedule to shared memory (see 
+        # ParallelGeneticAlgorithm.run_parallel())
+        if shared_memory is not None:
+            shared_memory_block, shared_schedule = load_schedule.compiled.publish()
+        else:
+            shared_memory_block, shared_schedule = None, None
+        
+        # the chains report back to main() through this queue
+        champion_queue = multiprocessing.Queue()
+        
+        # and main() starts the next era of each chain through its own queue
+        next_era_queues = [multiprocessing.Queue() for _ in range(cls.number_of_processes)]
+        
+        chain_processes = []
+        
+        try:
+            for next_era_queue in next_era_queues:
+                p = multiprocessing.Process(target=cls.run_chain, args=(cls.number_of_partitions, 
+                                                                        cls.half_class_maximum, 
+                                                                        cls.quarter_class_maximum, 
+                                                                        cls.student_csv_path, 
+                                                                        cls.required_subgroups_csv_path, 
+                                                                        cls.preferred_subgroups_csv_path, 
+                                                                        champion_queue, 
+                                                                        next_era_queue,
+                                                                        cls.schedule_cache_directory,
+                                                                        shared_schedule,
+                                                                        cls.column_map))
+                chain_processes.append(p)
+        
+            for p in chain_processes:
+                p.start()
+        
+            # timers for logging
+            start_timer = end_timer = total_time = 0
+        
+            # number of eras we've completed
+            era_number = 0
+        
+            while total_time < 60*cls.time_limit and era_number < cls.max_era:
+                start_timer = time.perf_counter()
             
-            # instantiate the GeneticAlgorithm object
-            first_generation = GeneticAlgorithm(population, generation_number, cls.rate_of_mutation)
+                # the best (fitness, genome) tuple of each chain
+                champions = [champion_queue.get() for _ in range(cls.number_of_processes)]
             
-            # generate Generation #2
-            first_generation.generate_next_generation()
-            previous_population = first_generation.next_generation
+                # (sorted by the score alone, since genomes cannot be compared)
+                champions.sort(key = lambda champion: champion[0], reverse = True)
+                champion_partition_score, champion_partition = champions[0]
             
-
-            # track the time this process took
-            end_timer = time.perf_counter()
-            timer_total += end_timer - start_timer
-
-            # get algorithm progress
-            progress = Reports.return_progress(process_ID_as_string, generation_number, previous_population, timer_total)
+                cls.write_champion_reports(load_schedule, champion_partition)
             
-            # print algorithm progress
-            print(progress)
+                # start the next era of every chain
+                for next_era_queue in next_era_queues:
+                    next_era_queue.put(champion_partition)
             
-            # write algorithm progress to file   
-            Reports.write_progress(cls.io_directory, progress, 'a')
-           
-            # keep repeating this process until the maximum number
-            # of generations or the time limit has been reached
-            while generation_number < cls.max_gen:
-                
-                # same process as above
-                start_timer = time.perf_counter()
-
-                generation_number += 1
-                
-                population.sorted_scored_population = previous_population
-                current_generation = GeneticAlgorithm(population, generation_number, cls.rate_of_mutation)
-                current_generation.generate_next_generation()
-                previous_population = current_generation.next_generation
-                
                 end_timer = time.perf_counter()
-                timer_total += end_timer - start_timer
-                
-                # get algorithm progress
-                progress = Reports.return_progress(process_ID_as_string, generation_number, previous_population, timer_total)
-                
-                # print algorithm progress
-                print(progress)
-                
-                # write algorithm progress to file   
-                Reports.write_progress(cls.io_directory, progress, 'a')                        
-                
-            # Send population back to main()
-            result_population = []
-
-            for item in previous_population:
-                result_population.append(item)
-
-            out_queue.put(result_population)
-
-            # we've completed one more era, now we go back to the start of "while True" loop,
-            # where we wait for main() to send the crossbred population back to us
+                total_time += (end_timer - start_timer)
+            
+                era_number += 1
+            
+                cls.report_era(load_schedule, era_number, champion_partition_score, start_timer, end_timer, total_time, message_queue, 
+                               upper_bound)
+            
+                # the champion is optimal, so there is nothing left to find:
+                if champion_partition_score[2] >= upper_bound:
+                    break
+        
+        finally:
+            # stop the chains and free the shared memory, even if the era 
+            # loop raised (see ParallelGeneticAlgorithm.run_parallel())
+            for p in chain_processes:
+                if p.is_alive():
+                    p.terminate()
+                    p.join()
+            
+            # free the shared memory once every chain has exited
+            if shared_memory_block is not None:
+                shared_memory_block.close()
+                shared_memory_block.unlink()
 
 
+class ParallelTabuSearch(ParallelAnnealing):
+    """
+    A class that runs independent chains of tabu search in parallel, one 
+    per core (selected with engine : 'tabu' in settings.yaml)
+    
+    The chains are run exactly as the chains of ParallelAnnealing, but 
+    each chain runs a TabuSearch instead of a SimulatedAnnealing
+    
+    Attributes
+    ----------
+    (the same as ParallelAnnealing, plus)
+    tabu_tenure : int
+        the number of iterations a student may not return to a letter
+        (default = 20)
+    frequency_weight : float
+        the penalty for moving a student that is moved in every iteration
+        (default = 0.05)
+    neighborhood_size : int
+        the largest number of moves considered in an iteration
+        (default = 5000)
+    steps_per_era : int
+        the number of iterations each chain runs per era
+        (default = 500)
+        
+    Methods
+    -------
+    create_chain(cls, load_schedule)
+        create the TabuSearch run by each chain
+    """
+    
+    # assign class attributes based on the values in settings_dict
+    tabu_tenure = ParallelGeneticAlgorithm.settings_dict["tabu_tenure"]
+    frequency_weight = ParallelGeneticAlgorithm.settings_dict["tabu_frequency_weight"]
+    neighborhood_size = ParallelGeneticAlgorithm.settings_dict["tabu_neighborhood_size"]
+    steps_per_era = ParallelGeneticAlgorithm.settings_dict["tabu_iterations_per_era"]
+    step_name = "Tabu iterations"
+    
     @classmethod
-    def get_crossed_children(cls, population1, population2, num_children, num_tournament_reps):
+    def read_settings(cls):
         """
-        Helper function used by crossbreed_islands. Given two populations, this method
-        uses tournament selection to choose a parent from each population. These two
-        parents then create a pair of children. This process is repeated until num_children
-        children are produced.
-
-        Returns a list of children, where each child is a partition
-        (so it's returning a list of list of strings)
-
+        Read settings.yaml again (see ParallelGeneticAlgorithm.read_settings()),
+        including the tabu search settings
+        
+        Parameters
+        ----------
+        None
+        """
+        settings_dict = super().read_settings()
+        
+        cls.tabu_tenure = settings_dict["tabu_tenure"]
+        cls.frequency_weight = settings_dict["tabu_frequency_weight"]
+        cls.neighborhood_size = settings_dict["tabu_neighborhood_size"]
+        cls.steps_per_era = settings_dict["tabu_iterations_per_era"]
+        
+        return settings_dict
+    
+    @classmethod
+    def create_chain(cls, load_schedule):
+        """
+        Create the TabuSearch run by each chain
+        
         Parameters
         ----------
-        population1:
-            represents the population of an island, includes scores: [ [score1, ["A", "B", ...]], [score2, ["B", "C", ...]], ... ]
-            parent1 will be selected from this
-        population2:
-            represents the population of an island, includes scores: [ [score1, ["A", "B", ...]], [score2, ["B", "C", ...]], ... ]
-            parent2 will be selected from this
-        num_children: int
-            number of children to generate and return
-        num_tournament_reps: int
-            for the tournament selection to select parents, the number of representatives to use
-        """  
+        load_schedule : Schedule object
+            the chain's schedule
+        """
+        return TabuSearch(load_schedule.fitness_engine, 
+                          np.random.default_rng(), 
+                          cls.tabu_tenure, 
+                          cls.frequency_weight, 
+                          cls.neighborhood_size)
 
-        # size of each population
-        population_size = len(population1)
 
-        # list to store the children
-        crossed_children_list = []
+class ParallelLargeNeighborhoodSearch(ParallelAnnealing):
+    """
+    A class that runs independent chains of large neighborhood search in 
+    parallel, one per core (selected with engine : 'lns' in settings.yaml)
+    
+    The chains are run exactly as the chains of ParallelAnnealing, but each
+    chain starts from a partition improved by LocalSearch and runs a 
+    LargeNeighborhoodSearch, and after each era every chain continues from
+    the best partition of all the chains, so the chains repair different 
+    neighborhoods of the same champion
+    
+    Attributes
+    ----------
+    (the same as ParallelAnnealing, plus)
+    courses_per_neighborhood : int
+        the number of courses that are not "In Compliance" freed at once
+        (default = 4)
+    max_free_subgroups : int
+        the largest number of subgroups freed at once (default = 150)
+    solver_seconds : float
+        the time limit of the CP-SAT solver for each neighborhood
+        (default = 2.0)
+    steps_per_era : int
+        the number of neighborhoods each chain searches per era
+        (default = 20)
         
-        for _ in range( (num_children+1) // 2 ):
-            # select the two parents using tournament selection
-            # the number 4 is somewhat arbitrary, but seems to work well in practice
-            parent1_index = GeneticAlgorithm.tournament_winner_index(population_size, num_tournament_reps)
-            parent1 = population1[parent1_index][1]     # [1] is because we just want the partition part, not the score part
-            
-            parent2_index = GeneticAlgorithm.tournament_winner_index(population_size, num_tournament_reps)
-            parent2 = population2[parent2_index][1]
-            
-            # length of a partition
-            genome_length = len(parent1)
-     
-            # a pair of parents generates a pair of children
-            child1, child2 = GeneticAlgorithm.get_children_pair(parent1, parent2)
-
-            # add the pair of children to the output list
-            crossed_children_list.append(child1)
-            crossed_children_list.append(child2)
-
-            # We are generating children in pairs, if we accidentally
-            # add one child too many to self.next_generation, take off 
-            # the extra child 
-            if len(crossed_children_list) > num_children: 
-                crossed_children_list = crossed_children_list[0:-1]
-
-        return crossed_children_list
-
+    Methods
+    -------
+    initial_genome(cls, load_schedule)
+        a random partition improved by LocalSearch
+    create_chain(cls, load_schedule)
+        create the LargeNeighborhoodSearch run by each chain
+    """
+    
+    # assign class attributes based on the values in settings_dict
+    courses_per_neighborhood = ParallelGeneticAlgorithm.settings_dict["lns_courses_per_neighborhood"]
+    max_free_subgroups = ParallelGeneticAlgorithm.settings_dict["lns_max_free_subgroups"]
+    solver_seconds = ParallelGeneticAlgorithm.settings_dict["lns_solver_seconds"]
+    steps_per_era = ParallelGeneticAlgorithm.settings_dict["lns_neighborhoods_per_era"]
+    step_name = "Neighborhoods"
+    restart_from_champion = True
+    
     @classmethod
-    def crossbreed_islands(cls, island_populations, number_of_islands, number_of_tournament_reps_per_island):
+    def read_settings(cls):
         """
-        Helper function for crossbreeding across different island populations.
-        Returns the list containing the crossbred populations.
-
+        Read settings.yaml again (see ParallelGeneticAlgorithm.read_settings()),
+        including the large neighborhood search settings
+        
         Parameters
         ----------
-        island_populations:
-            a list of island populations of the form [population1, population2, ...], where
-            each population is of the form [ [score1, partition1], [score2, partition2], ... ], where
-            each partition is of the form ["A", "C", ...]
-
-            putting all this together, island_populations is of the form:
-            [ [ [score11, ["A", "B", ...]], [score12, ["B", "C", ...]], ...],      <-- population1
-              [ [score21, ["C", "B", ...]], [score22, ["A", "A", ...]], ...],      <-- population2
-              [ [score31, ["B", "B", ...]], [score32, ["C", "A", ...]], ...],      <-- population3
-              ...
-            ]  
-
-        output value:  
-            similar to the input value island_populations, EXCEPT we do NOT include the scores.
-            so it ends up looking like:
-            [ [ ["B", "A", ...], ["C", "B", ...], ...],      <-- population1
-              [ ["C", "C", ...], ["C", "A", ...], ...],      <-- population2
-              ...
-            ]
-        """    
+        None
+        """
+        settings_dict = super().read_settings()
         
-        # each population keeps the top 25% elites
-        num_elites = len(island_populations[0])//4
-
-        # an empty list for each of the crossed populations 
-        crossed_populations = [[] for _ in range(number_of_islands)]
+        cls.courses_per_neighborhood = settings_dict["lns_courses_per_neighborhood"]
+        cls.max_free_subgroups = settings_dict["lns_max_free_subgroups"]
+        cls.solver_seconds = settings_dict["lns_solver_seconds"]
+        cls.steps_per_era = settings_dict["lns_neighborhoods_per_era"]
         
-        # populate the 25% elites onto each island:
-        for i in range(number_of_islands):
-            crossed_pop = crossed_populations[i]
-            orig_pop = island_populations[i]
-            crossed_pop.extend([item[1] for item in orig_pop[0:num_elites]])    # item[1] b/c we only want the partition
+        return settings_dict
+    
+    @classmethod
+    def initial_genome(cls, load_schedule):
+        """
+        Return the genome that each chain starts from: a random partition
+        improved by LocalSearch for local_search_seconds (an exact solver 
+        is slow to repair a random partition, where most courses are not
+        "In Compliance")
+        
+        Parameters
+        ----------
+        load_schedule : Schedule object
+            the chain's schedule
+        """
+        genome = super().initial_genome(load_schedule)
+        
+        if cls.local_search_seconds > 0:
+            _, genome = LocalSearch(load_schedule.fitness_engine).polish(genome, cls.local_search_seconds)
+        
+        return genome
+    
+    @classmethod
+    def create_chain(cls, load_schedule):
+        """
+        Create the LargeNeighborhoodSearch run by each chain
+        
+        Parameters
+        ----------
+        load_schedule : Schedule object
+            the chain's schedule
+        """
+        if cp_model is None:
+            warnings.warn("The ortools module is not installed, so each neighborhood is solved by scoring every partition of a few students")
         
+        return LargeNeighborhoodSearch(load_schedule.fitness_engine, 
+                                       load_schedule.cohort_rules, 
+                                       np.random.default_rng(), 
+                                       cls.courses_per_neighborhood, 
+                                       cls.max_free_subgroups, 
+                                       cls.solver_seconds)
 
-        # for each island population, the remaining 75% is composed of 
-        # [crossing with each of the other (number_of_islands - 1) islands].
 
-        # divide the remaining number of partitions as evenly as possible into
-        # (1/((number_of_islands - 1)))ths
+class ExactOptimizer(ParallelGeneticAlgorithm):
+    """
+    A class that solves the whole schedule with the exact solver (see 
+    ExactSolver, which requires OR-Tools), as an alternative to the island 
+    genetic algorithm for small schools or single grade levels (selected 
+    with engine : 'exact' in settings.yaml)
+    
+    The solver starts from the student assignment report of an earlier run
+    (ex: the champion of the genetic algorithm) if there is one, and from a
+    random partition otherwise. Each era, it searches for seconds_per_era 
+    seconds (with one thread per core) starting from the champion, which is
+    replaced if the solver finds a partition with more courses "In 
+    Compliance". The reports are written after each era, along with the 
+    smallest upper bound the solver has proven on the number of courses 
+    "In Compliance", and the run stops as soon as the champion reaches it
+    (or after number_of_eras eras or time_limit minutes)
+    
+    Attributes
+    ----------
+    (the same as ParallelGeneticAlgorithm, plus)
+    seconds_per_era : float
+        the time the solver searches for in each era (default = 60)
+    warm_start : bool
+        if True, start from the student assignment report of an earlier run
+        (if there is one) (default = True)
         
-        # most groups will be of this size:
-        num_children = (len(island_populations[0]) - num_elites)//(number_of_islands - 1)
+    Methods
+    -------
+    initial_genome(cls, load_schedule)
+        the genome that the solver starts from
+    run_parallel(cls)
+        solve the schedule, and write the reports of the champion after 
+        each era
+    """
+    
+    # assign class attributes based on the values in settings_dict
+    seconds_per_era = ParallelGeneticAlgorithm.settings_dict["exact_seconds_per_era"]
+    warm_start = ParallelGeneticAlgorithm.settings_dict["exact_warm_start"]
+    
+    @classmethod
+    def read_settings(cls):
+        """
+        Read settings.yaml again (see ParallelGeneticAlgorithm.read_settings()),
+        including the exact solver settings
         
-        # the last group will be composed of whatever space is left over:
-        remainder = len(island_populations[0]) - num_elites - (num_children)*(number_of_islands - 2)
-
-        # for each island:
-        for i in range(number_of_islands):
-            # the crossed population (that currently only has elites)
-            crossed_pop = crossed_populations[i]
+        Parameters
+        ----------
+        None
+        """
+        settings_dict = super().read_settings()
+        
+        cls.seconds_per_era = settings_dict["exact_seconds_per_era"]
+        cls.warm_start = settings_dict["exact_warm_start"]
+        
+        return settings_dict
+    
+    @classmethod
+    def initial_genome(cls, load_schedule):
+        """
+        Return the genome that the solver starts from: the partition of the
+        student assignment report in the output folder (if warm_start is 
+        True and there is one, see Schedule.partition_from_assignments()),
+        or a random partition
+        
+        Parameters
+        ----------
+        load_schedule : Schedule object
+            the schedule of the main process
+        """
+        if cls.report_format == "parquet":
+            report_path = cls.io_directory / 'student_assignments.parquet'
+        else:
+            report_path = cls.io_directory / 'student_assignments.csv'
+        
+        if cls.warm_start and report_path.exists():
+            genome, number_of_missing_subgroups = load_schedule.partition_from_assignments(report_path)
             
-            # the first population to cross with: 
-            first_pop = island_populations[i]
+            message = "Warm start from " + report_path.name
             
-            # the indices of the remaining populations to cross with:
-            other_indices = [n for n in range(number_of_islands)]
-            other_indices.remove(i)
+            if number_of_missing_subgroups > 0:
+                message += " (" + str(number_of_missing_subgroups) + " subgroups without a letter in the report were given random letters)"
             
-            # for each index (except the last):
-            for index in other_indices[:-1]:
-                # get the second population for crossing
-                second_pop = island_populations[index]
-                
-                # cross the two islands and add the children to cross_pop 
-                # (the number of children added will = num_children)
-                crossed_pop.extend(cls.get_crossed_children(first_pop, second_pop, num_children, number_of_tournament_reps_per_island))
+            print(message)
+            Reports.write_progress(cls.io_directory, message, 'a')
             
-            # cross with the last island and add the children to cross_pop
-            # (this time, the number of children added will = remainder)
-            crossed_pop.extend(cls.get_crossed_children(first_pop, island_populations[-1], remainder, number_of_tournament_reps_per_island))
-
-        # return the list of crossed populations
-        return crossed_populations
-
+            return genome
+        
+        return IndividualPartition(load_schedule).generate_partition()
+    
     @classmethod
     def run_parallel(cls, message_queue = None):
         """
-        In order to take advantage of multiple cores, main() works as follows:
-            1. Launch NUMBER_OF_PROCESSES processes, each of which runs an instance of the self.run_era() function.
-               You can think of this as the genetic algorithm working on N separate islands.
-            2. After running the genetic algorithm for NUMBER_OF_GENERATIONS_PER_ERA generations, these processes
-               each report their population back to main().
-            3. We have just completed an "era". We now start the next era by crossbreeding these populations
-               and then feeding the crossbred population back to each island (process), so that each island can
-               go off and run the genetic algorithm for another era in isolation before reporting back, etc.
+        Solve the schedule with ExactSolver (which searches with 
+        NUMBER_OF_PROCESSES threads), one era of seconds_per_era seconds at
+        a time, and write the reports of the champion after each era
+        
+        Parameters
+        ----------
+        message_queue : queue.Queue
+            (optional) the queue of messages to the GUI
         """
-        # if you open a .csv report in Microsoft Excel and leave it open,
-        # this program will throw a PermissionError when it tries to write
-        # the new .csv report
-        #
-        # this warning is to remind you to close these .csv files before this
-        # happens
-        #
+        # fail before loading the schedule:
+        if cp_model is None:
+            raise ImportError("The exact solver requires the ortools module (pip install ortools)")
+        
         warnings.warn("To avoid permission errors, close any output files you may have left open from previous runs.")
 
         # start progress log
         Reports.write_progress(cls.io_directory, 'Progress Log', 'w')
         
-        # The "island" processes report back to main() by putting their population into this threadsafe queue
-        island_population_queue = multiprocessing.Queue()
-
-        # main() can then send the crossbred populations back to the "island" processes via this threadsafe queue
-        crossbred_population_queue = multiprocessing.Queue()
-
-        # store the processes that we launch in a list
-        island_processes = []
-
-        """
-        try:
-            cls.number_of_partitions = cls.number_of_partitions.value
-        except TypeError:
-            pass
-
-        try:
-            cls.half_class_maximum = cls.half_class_maximum.value
-        except TypeError:
-            pass
-            
-        try:
-            cls.quarter_class_maximum = cls.quarter_class_maximum.value
-        except TypeError:
-            pass
-
-        try:
-            cls.time_limit = cls.time_limit.value
-        except TypeError:
-            pass
-        """
+        # read the settings again (they may have been changed in the GUI)
+        cls.read_settings()
         
-        with open(IO_DIRECTORY / 'settings.yaml') as infile:
-            # convert .yaml to dictionary
-            settings_dict = yaml.load(infile, Loader=yaml.FullLoader)
-
-        cls.number_of_partitions = settings_dict["number_of_partitions"]
-                    
-        cls.half_class_maximum = settings_dict["half_class_maximum"]
-                    
-        cls.quarter_class_maximum = settings_dict["quarter_class_maximum"]
-            
-        cls.time_limit = settings_dict["time_limit"]
+        load_schedule = cls.load_main_schedule()
+        fitness_engine = load_schedule.fitness_engine
+        
+        exact_solver = ExactSolver(fitness_engine, load_schedule.cohort_rules, cls.number_of_processes)
+        
+        champion_partition = cls.initial_genome(load_schedule)
+        champion_partition_score = fitness_engine.score(champion_partition)
+        
+        # the bound before solving (each era proves its own bound)
+        upper_bound = cls.find_upper_bound(load_schedule)
         
-        if len(settings_dict["input_csv_filename"]) == 0:
-            cls.student_csv_path = None
-        else: 
-            cls.student_csv_path = cls.io_directory / settings_dict["input_csv_filename"]
-
-        if len(settings_dict["required_subgroup_csv_filename"]) == 0:
-            cls.required_subgroups_csv_path = None
-        else: 
-            cls.required_subgroups_csv_path = cls.io_directory / settings_dict["required_subgroup_csv_filename"]
-            
-        if len(settings_dict["preferred_subgroup_csv_filename"]) == 0:
-            cls.preferred_subgroups_csv_path = None
-        else: 
-            cls.preferred_subgroups_csv_path = cls.io_directory / settings_dict["preferred_subgroup_csv_filename"]
-       
-
-        # prepare load_schedule to be used later for writing out student assignments and
-        # course analysis at the end of each era
-        load_schedule = Schedule(cls.number_of_partitions, cls.half_class_maximum, cls.quarter_class_maximum)
-        load_schedule.students_from_csv(cls.student_csv_path)        
-        load_schedule.subgroups_from_csv(cls.required_subgroups_csv_path, "required")    
-        load_schedule.subgroups_from_csv(cls.preferred_subgroups_csv_path, "preferred")
-
-        # instantiate NUMBER_OF_PROCESSES island processes, each of which will execute self.run_era()
-        for _ in range(0, cls.number_of_processes):
-            p = multiprocessing.Process(target=cls.run_era, args=(cls.number_of_partitions, 
-                                                                  cls.half_class_maximum, 
-                                                                  cls.quarter_class_maximum, 
-                                                                  cls.student_csv_path, 
-                                                                  cls.required_subgroups_csv_path, 
-                                                                  cls.preferred_subgroups_csv_path, 
-                                                                  island_population_queue, 
-                                                                  crossbred_population_queue))
-            island_processes.append(p)
-
-        # start the processes
-        for p in island_processes:
-            p.start()
-
         # timers for logging
         start_timer = end_timer = total_time = 0
         
         # number of eras we've completed
         era_number = 0
-
-        # one iteration through this loop represents one era
+        
         while total_time < 60*cls.time_limit and era_number < cls.max_era:
-            # we will time how long this era takes us
             start_timer = time.perf_counter()
-
-            # each island will send us their population - store all of them in this list
-            island_populations = []
-
-            # get() is blocking, so the main() process will spend most of its
-            # time waiting here for all of the islands to report back
-            for i in range(cls.number_of_processes):
-                island_populations.append(island_population_queue.get())
-
-            # before we start crossbreeding, we first log the current chamption partition out of all the islands
-            island_populations.sort(reverse = True)
-            champion_partition = island_populations[0][0][1]
-            load_schedule.load_partition(champion_partition)
-            load_schedule.write_student_assignments()
-            load_schedule.write_course_analysis()
-
-            # fetch info for creating a pie chart for the champion partition this era
-            champion_partition_score = island_populations[0][0][0]
-            champion_fitness_score = champion_partition_score[0]
-            champion_in_compliance = champion_partition_score[2]
-            total_courses = champion_partition_score[-1]
-
-            # uncomment the below line to output info about the champion partition
-            # print("CURRENT HIGH FITNESS SCORE: " + str(island_populations[0][0]))
-
-            # now that we've saved all info about the current champion, we can crossbreed
-            crossed_populations = cls.crossbreed_islands(island_populations, cls.number_of_processes, cls.number_of_tournament_reps_per_island)
-
-            # send this crossed population back to the island process via crossbred_population_queue
-            # (each island process is constantly checking this queue for a crossbred population,
-            #  and once it is able to pop one off, starts computing the new era using that initial population)
-            for item in crossed_populations:
-                crossbred_population_queue.put(item)
-
-            # log time elapsed
+            
+            time_limit = min(cls.seconds_per_era, 60*cls.time_limit - total_time)
+            
+            genome, _, bound, _ = exact_solver.solve_partition(champion_partition, time_limit)
+            
+            # every era that finds a solution proves its own bound, so keep
+            # the smallest:
+            if bound is not None:
+                upper_bound = min(upper_bound, bound)
+            
+            if genome is not None:
+                score = fitness_engine.score(genome)
+                
+                # more courses "In Compliance" (or as many, with a higher score):
+                if (score[2], score[0]) > (champion_partition_score[2], champion_partition_score[0]):
+                    champion_partition, champion_partition_score = genome, score
+            
+            cls.write_champion_reports(load_schedule, champion_partition)
+            
             end_timer = time.perf_counter()
             total_time += (end_timer - start_timer)
-
-            # we've completed one more era, log progress and we're done
+            
             era_number += 1
+            
+            cls.report_era(load_schedule, era_number, champion_partition_score, start_timer, end_timer, total_time, message_queue, 
+                           upper_bound)
+            
+            # the champion is optimal, so there is nothing left to find:
+            if champion_partition_score[2] >= upper_bound:
+                break
 
-            max_deviation = load_schedule.get_max_deviation()
-            time_limit_seconds = 60 * cls.time_limit
-
-            # create a pie chart
-            Reports.create_pie_chart(era_number, champion_fitness_score, champion_in_compliance, total_courses)
-
-            # create a histogram
-            Reports.create_histogram(era_number, cls.number_of_partitions, champion_partition_score, max_deviation, total_time, time_limit_seconds)
-
-            if (USE_GUI):
-                queue_tuple = (era_number, cls.number_of_partitions, champion_partition_score, max_deviation, total_time, time_limit_seconds)
-                message_queue.put(queue_tuple)
-
-            progress = Reports.return_era_progress(era_number, start_timer, end_timer, total_time)
-            print(progress)
-            Reports.write_progress(cls.io_directory, progress, 'a')
 
-        # we're done, exit
-        for p in island_processes:
-            p.terminate()
-            p.join()
+def run_optimizer(message_queue = None):
+    """
+    Run the optimizer selected by the engine setting in settings.yaml: 
+    'genetic' for the island genetic algorithm (ParallelGeneticAlgorithm),
+    'annealing' for parallel chains of simulated annealing 
+    (ParallelAnnealing), 'tabu' for parallel chains of tabu search 
+    (ParallelTabuSearch), 'lns' for parallel chains of large neighborhood
+    search (ParallelLargeNeighborhoodSearch) or 'exact' for the exact 
+    solver (ExactOptimizer)
+    
+    Parameters
+    ----------
+    message_queue : queue.Queue
+        (optional) the queue of messages to the GUI
+    """
+    with open(IO_DIRECTORY / 'settings.yaml') as infile:
+        # convert .yaml to dictionary
+        settings_dict = yaml.load(infile, Loader=yaml.FullLoader)
+    
+    if settings_dict["engine"] == "annealing":
+        ParallelAnnealing.run_parallel(message_queue)
+    elif settings_dict["engine"] == "tabu":
+        ParallelTabuSearch.run_parallel(message_queue)
+    elif settings_dict["engine"] == "lns":
+        ParallelLargeNeighborhoodSearch.run_parallel(message_queue)
+    elif settings_dict["engine"] == "exact":
+        ExactOptimizer.run_parallel(message_queue)
+    elif settings_dict["engine"] == "genetic":
+        ParallelGeneticAlgorithm.run_parallel(message_queue)
+    else:
+        raise ValueError("The engine in settings.yaml must be 'genetic', 'annealing', 'tabu', 'lns' or 'exact', not " + repr(settings_dict["engine"]))
 
 
 if __name__ == "__main__":
@@ -3363,4 +10547,4 @@ if __name__ == "__main__":
         root.after(1000, root.update)
         root.mainloop()
     else:
-        ParallelGeneticAlgorithm.run_parallel()
+        run_optimizer()
@@ -0,0 +1,51 @@
+"""
+Fixtures shared by the tests of SPOTS.py
+"""
+
+import csv
+
+import pytest
+
+from pathlib import Path
+
+IO_DIRECTORY = Path(__file__).parent
+
+STUDENT_CSV_PATH = IO_DIRECTORY / "example_student_data.csv"
+
+# the students of example_student_data.csv copied into the replicated
+# student .csv, and the number of copies of each (no two students of
+# example_student_data.csv share a schedule, so StudentClasses only has
+# classes to merge when students are copied)
+NUMBER_OF_REPLICATED_STUDENTS = 150
+NUMBER_OF_COPIES = 6
+
+# added to the student ID of each copy
+COPY_ID_OFFSET = 100000
+
+
+@pytest.fixture(scope="session")
+def replicated_student_csv_path(tmp_path_factory):
+    """
+    Write a student .csv with NUMBER_OF_COPIES copies of the first 
+    NUMBER_OF_REPLICATED_STUDENTS students of example_student_data.csv (with
+    new student IDs), and return its path
+    """
+    with open(STUDENT_CSV_PATH, newline = "") as student_csv:
+        reader = csv.DictReader(student_csv)
+        field_names = reader.fieldnames
+        rows = list(reader)
+
+    student_ids = list(dict.fromkeys(row["STUDENT ID"] for row in rows))[:NUMBER_OF_REPLICATED_STUDENTS]
+    rows = [row for row in rows if row["STUDENT ID"] in set(student_ids)]
+
+    replicated_student_csv_path = tmp_path_factory.mktemp("csv") / "replicated_student_data.csv"
+
+    with open(replicated_student_csv_path, "w", newline = "") as student_csv:
+        writer = csv.DictWriter(student_csv, fieldnames = field_names)
+        writer.writeheader()
+
+        for copy in range(NUMBER_OF_COPIES):
+            for row in rows:
+                writer.writerow(dict(row, **{"STUDENT ID" : str(int(row["STUDENT ID"]) + copy*COPY_ID_OFFSET)}))
+
+    return replicated_student_csv_path
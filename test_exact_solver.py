@@ -0,0 +1,71 @@
+"""
+Check the bound that ExactSolver returns, when the solver finishes and when
+it stops before finding a solution
+
+Run with: python -m pytest test_exact_solver.py
+"""
+
+import pytest
+
+import SPOTS
+
+pytestmark = pytest.mark.skipif(SPOTS.cp_model is None, reason = "the exact solver requires ortools")
+
+
+class TimedOutSolver(SPOTS.cp_model.CpSolver if SPOTS.cp_model is not None else object):
+    """
+    A CP-SAT solver that stops before finding a solution, as CpSolver does
+    when max_time_in_seconds runs out first (status UNKNOWN, with a bound of 0)
+    """
+
+    def Solve(self, model, *args, **kwargs):
+        return SPOTS.cp_model.UNKNOWN
+
+    def BestObjectiveBound(self):
+        return 0.0
+
+
+def load_schedule(replicated_student_csv_path, number_of_partitions):
+    """
+    Return a compiled Schedule of the replicated student .csv, without 
+    presolve
+    """
+    schedule = SPOTS.Schedule(number_of_partitions, 15, 9, "numpy", None, False, False)
+    schedule.load_csv_files(replicated_student_csv_path, None, None)
+
+    return schedule
+
+
+@pytest.mark.parametrize("number_of_partitions", (2, 4))
+def test_bound_is_not_below_start(replicated_student_csv_path, number_of_partitions):
+    schedule = load_schedule(replicated_student_csv_path, number_of_partitions)
+    fitness_engine = schedule.fitness_engine
+    genome = SPOTS.IndividualPartition(schedule, seed = 0).generate_partition()
+
+    exact_solver = SPOTS.ExactSolver(fitness_engine, schedule.cohort_rules)
+    new_genome, good, bound, is_optimal = exact_solver.solve_partition(genome, 2)
+
+    assert new_genome is not None
+    assert good == fitness_engine.score(new_genome)[2]
+    assert fitness_engine.score(genome)[2] <= good <= bound
+    assert bound <= fitness_engine.number_of_courses
+
+    if is_optimal:
+        assert good == bound
+
+
+def test_timeout_has_no_bound(replicated_student_csv_path, monkeypatch):
+    schedule = load_schedule(replicated_student_csv_path, 2)
+    fitness_engine = schedule.fitness_engine
+    genome = SPOTS.IndividualPartition(schedule, seed = 0).generate_partition()
+
+    monkeypatch.setattr(SPOTS.cp_model, "CpSolver", TimedOutSolver)
+
+    exact_solver = SPOTS.ExactSolver(fitness_engine, schedule.cohort_rules)
+    new_genome, good, bound, is_optimal = exact_solver.solve_partition(genome, 2)
+
+    # the solver proved nothing, so the run must not stop at its bound:
+    assert new_genome is None
+    assert bound is None
+    assert not is_optimal
+    assert good == fitness_engine.score(genome)[2]
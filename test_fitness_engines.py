@@ -0,0 +1,178 @@
+"""
+Check that every way of scoring a partition returns the same fitness tuple
+as Schedule.fitness_score() on example_student_data.csv:
+
+FitnessEngine, JitFitnessEngine, BitsetFitnessEngine and CohortFitnessEngine
+(score() and score_population()), and DeltaEvaluator (from scratch and after
+a series of moves), with and without Presolve, StudentClasses, room
+capacities and preferred subgroups
+
+No two students of example_student_data.csv share a schedule, so the tests
+with StudentClasses score a copy of it with replicated students instead
+(see replicated_student_csv_path in conftest.py)
+
+Run with: python -m pytest test_fitness_engines.py
+"""
+
+import itertools
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import SPOTS
+
+IO_DIRECTORY = Path(__file__).parent
+
+STUDENT_CSV_PATH = IO_DIRECTORY / "example_student_data.csv"
+REQUIRED_SUBGROUPS_CSV_PATH = IO_DIRECTORY / "example_subgroups.csv"
+
+# the number of random partitions scored for each schedule
+NUMBER_OF_GENOMES = 2
+
+# the number of moves applied to each DeltaEvaluator
+NUMBER_OF_MOVES = 100
+
+
+@pytest.fixture(scope="module")
+def extra_csv_paths(tmp_path_factory):
+    """
+    Write a room capacity .csv and a preferred subgroup .csv, and return
+    their paths as a tuple (room_capacity_csv_path, preferred_subgroups_csv_path)
+    """
+    csv_directory = tmp_path_factory.mktemp("csv")
+
+    room_capacity_csv_path = csv_directory / "room_capacities.csv"
+    room_capacity_csv_path.write_text("ROOM NUMBER,HALF CLASS MAXIMUM,QUARTER CLASS MAXIMUM\n"
+                                      "RoomNumber3,12,7\n"
+                                      "RoomNumber5,18,11\n")
+
+    preferred_subgroups_csv_path = csv_directory / "preferred_subgroups.csv"
+    preferred_subgroups_csv_path.write_text("Student1 ID,Student2 ID\n"
+                                            "1,2\n"
+                                            "10,20\n"
+                                            "30,31\n"
+                                            "100,200\n")
+
+    return room_capacity_csv_path, preferred_subgroups_csv_path
+
+
+def load_schedule(number_of_partitions, fitness_kernel, use_presolve, use_student_classes, use_rooms, use_preferred,
+                  extra_csv_paths, replicated_student_csv_path, cohort_groupings = None):
+    """
+    Return a compiled Schedule with the given settings: of the replicated 
+    student .csv if use_student_classes is True (checking that it has 
+    student classes), and of example_student_data.csv otherwise
+    """
+    room_capacity_csv_path, preferred_subgroups_csv_path = extra_csv_paths
+
+    if use_student_classes:
+        student_csv_path = replicated_student_csv_path
+    else:
+        student_csv_path = STUDENT_CSV_PATH
+
+    schedule = SPOTS.Schedule(number_of_partitions, 15, 9, fitness_kernel, cohort_groupings, use_presolve, use_student_classes)
+    schedule.load_csv_files(student_csv_path,
+                            REQUIRED_SUBGROUPS_CSV_PATH,
+                            preferred_subgroups_csv_path if use_preferred else None)
+
+    if use_rooms:
+        schedule.room_capacities_from_csv(room_capacity_csv_path)
+
+    # the genomes must be genomes of StudentClasses, or the test repeats
+    # the one without student classes:
+    assert (schedule.student_classes is not None) == use_student_classes
+
+    if use_student_classes:
+        assert schedule.fitness_engine.student_classes is schedule.student_classes
+
+    return schedule
+
+
+def assert_same_fitness(fitness, expected_fitness, exact):
+    """
+    Assert that two fitness tuples are the same, where weighted_fitness_score
+    may differ by floating point rounding unless exact is True (the terms
+    are added in a different order by Presolve and DeltaEvaluator)
+    """
+    if exact:
+        assert fitness == expected_fitness
+    else:
+        assert fitness[0] == pytest.approx(expected_fitness[0], abs = 1e-9)
+        assert fitness[1:] == expected_fitness[1:]
+
+
+def check_schedule(schedule, exact):
+    """
+    Score random partitions of schedule with its fitness engine and with
+    DeltaEvaluator, and compare them with Schedule.fitness_score()
+    """
+    fitness_engine = schedule.fitness_engine
+    individual_partition = SPOTS.IndividualPartition(schedule, seed = 0)
+    rng = np.random.default_rng(0)
+
+    genomes = [individual_partition.generate_partition() for _ in range(NUMBER_OF_GENOMES)]
+    population_fitness = fitness_engine.score_population(np.stack(genomes))
+
+    for genome, fitness in zip(genomes, population_fitness):
+        schedule.load_partition(genome)
+        expected_fitness = schedule.fitness_score()
+
+        assert_same_fitness(fitness_engine.score(genome), expected_fitness, exact)
+        assert_same_fitness(fitness, expected_fitness, exact)
+
+        evaluator = SPOTS.DeltaEvaluator(fitness_engine, genome)
+        assert_same_fitness(evaluator.fitness(), expected_fitness, exact)
+
+        # move two different subgroups at a time, then compare the running
+        # totals with the partition scored from scratch:
+        for _ in range(NUMBER_OF_MOVES):
+            subgroups = rng.choice(len(evaluator.genome), size = 2, replace = False)
+            evaluator.apply(subgroups, rng.integers(0, schedule.number_of_partitions, size = 2))
+
+        schedule.load_partition(evaluator.genome)
+
+        assert_same_fitness(evaluator.fitness(), schedule.fitness_score(), exact = False)
+        assert_same_fitness(evaluator.fitness(), fitness_engine.score(evaluator.genome), exact = False)
+
+
+@pytest.mark.parametrize("number_of_partitions, fitness_kernel, use_presolve, use_student_classes, use_rooms, use_preferred",
+                         list(itertools.product((2, 4), ("numpy", "numba", "bitset"),
+                                                (False, True), (False, True), (False, True), (False, True))))
+def test_built_in_rules(number_of_partitions, fitness_kernel, use_presolve, use_student_classes, use_rooms, use_preferred,
+                        extra_csv_paths, replicated_student_csv_path):
+    schedule = load_schedule(number_of_partitions, fitness_kernel, use_presolve, use_student_classes, use_rooms, use_preferred,
+                             extra_csv_paths, replicated_student_csv_path)
+
+    # presolve adds the terms of each course in a different order
+    check_schedule(schedule, exact = not use_presolve)
+
+
+@pytest.mark.parametrize("number_of_partitions, maximum_block_words", list(itertools.product((2, 4), (1, 5000, 2**21))))
+def test_bitset_blocks(number_of_partitions, maximum_block_words, extra_csv_paths, monkeypatch):
+    schedule = load_schedule(number_of_partitions, "bitset", False, False, False, False, extra_csv_paths, None)
+    fitness_engine = schedule.fitness_engine
+
+    # count a population in blocks of genomes (or in one pass), and compare
+    # the counts with the bincount of FitnessEngine:
+    monkeypatch.setattr(SPOTS.BitsetFitnessEngine, "maximum_block_words", maximum_block_words)
+
+    individual_partition = SPOTS.IndividualPartition(schedule, seed = 0)
+    genomes = np.stack([individual_partition.generate_partition() for _ in range(5)])
+
+    expected_counts = np.stack([SPOTS.FitnessEngine.course_counts(fitness_engine, genome) for genome in genomes])
+
+    assert np.array_equal(fitness_engine.course_counts(genomes), expected_counts)
+    assert np.array_equal(fitness_engine.course_counts(genomes[0]), expected_counts[0])
+
+
+@pytest.mark.parametrize("use_presolve, use_student_classes, use_rooms, use_preferred",
+                         list(itertools.product((False, True), (False, True), (False, True), (False, True))))
+def test_cohort_groupings(use_presolve, use_student_classes, use_rooms, use_preferred, extra_csv_paths,
+                          replicated_student_csv_path):
+    schedule = load_schedule(3, "numpy", use_presolve, use_student_classes, use_rooms, use_preferred, extra_csv_paths,
+                             replicated_student_csv_path, cohort_groupings = {"A" : 10, "B" : 10, "C" : 10})
+
+    assert isinstance(schedule.fitness_engine, SPOTS.CohortFitnessEngine)
+
+    check_schedule(schedule, exact = not use_presolve)
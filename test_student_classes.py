@@ -0,0 +1,221 @@
+"""
+Check StudentClasses on a copy of example_student_data.csv with replicated
+students (see replicated_student_csv_path in conftest.py): that mutation, 
+crossover and every search engine keep the size of each class, and that 
+the partition of a genome expanded by Schedule.load_partition() scores the
+same as the genome
+
+Run with: python -m pytest test_student_classes.py
+"""
+
+import numpy as np
+import pytest
+
+import SPOTS
+
+# the size of the populations of the genetic algorithm
+POPULATION_SIZE = 20
+
+
+@pytest.fixture(scope="module", params=(2, 4))
+def schedule(request, replicated_student_csv_path):
+    """
+    Return a compiled Schedule of the replicated student .csv with student
+    classes (for 2 and 4 partitions)
+    """
+    schedule = SPOTS.Schedule(request.param, 15, 9, "numpy", None, False, True)
+    schedule.load_csv_files(replicated_student_csv_path, None, None)
+
+    assert schedule.student_classes is not None
+    assert schedule.student_classes.number_of_classes > 0
+
+    return schedule
+
+
+def random_genomes(schedule, number_of_genomes, seed = 0):
+    """
+    Return a 2-D array of random genomes of the student classes of schedule
+    """
+    individual_partition = SPOTS.IndividualPartition(schedule, seed = seed)
+
+    return np.stack([individual_partition.generate_partition() for _ in range(number_of_genomes)])
+
+
+def check_genome(schedule, genome, fitness = None):
+    """
+    Check that the counts of every class of a genome add up to the size of 
+    the class, that Schedule.load_partition() gives each class exactly these
+    counts, and that the genome (and fitness, if given) score the same as 
+    Schedule.fitness_score()
+    """
+    student_classes = schedule.student_classes
+    number_of_partitions = schedule.number_of_partitions
+
+    assert genome.shape == (student_classes.genome_length,)
+    assert genome.dtype == np.uint8
+
+    counts = student_classes.class_counts(genome).astype(np.int64)
+
+    assert np.array_equal(counts.sum(axis = 1), student_classes.class_sizes)
+
+    # one letter per subgroup after loading, with the counts of the genome:
+    schedule.load_partition(genome)
+    letters = schedule.compiled_partition
+
+    loaded_counts = np.zeros_like(counts)
+    np.add.at(loaded_counts, (student_classes.member_class, letters[student_classes.class_members]), 1)
+
+    assert np.array_equal(loaded_counts, counts)
+    assert np.array_equal(letters[student_classes.free_subgroups], genome[:len(student_classes.free_subgroups)])
+
+    for subgroup, letter in zip(schedule.required_subgroups_list, letters.tolist()):
+        for student in subgroup:
+            assert student.letter == chr(letter + 65)
+
+    assert letters.max() < number_of_partitions
+
+    expected_fitness = schedule.fitness_score()
+
+    assert schedule.fitness_engine.score(genome) == expected_fitness
+
+    if fitness is not None:
+        assert fitness == expected_fitness
+
+
+def test_compress_genome(schedule):
+    student_classes = schedule.student_classes
+    genomes = random_genomes(schedule, 5)
+
+    expanded_genomes = student_classes.expand_genome(genomes)
+
+    assert expanded_genomes.shape == (5, student_classes.number_of_subgroups)
+    assert np.array_equal(student_classes.compress_genome(expanded_genomes), genomes)
+
+    for genome, fitness in zip(genomes, schedule.fitness_engine.score_population(genomes)):
+        check_genome(schedule, genome, fitness)
+
+        # any partition that gives each class the same counts scores the same:
+        expanded_genome = student_classes.expand_genome(genome)
+        shuffled_genome = expanded_genome.copy()
+
+        for start, end in zip(student_classes.class_offsets[:-1], student_classes.class_offsets[1:]):
+            members = student_classes.class_members[start:end]
+            shuffled_genome[members] = np.random.default_rng(start).permutation(expanded_genome[members])
+
+        assert np.array_equal(student_classes.compress_genome(shuffled_genome), genome)
+        assert schedule.fitness_engine.score(shuffled_genome) == fitness
+
+
+def test_mutate_counts(schedule):
+    student_classes = schedule.student_classes
+    genomes = random_genomes(schedule, 10)
+    number_of_free = len(student_classes.free_subgroups)
+
+    mutated_genomes = student_classes.mutate_counts(genomes.copy(), 0.5, np.random.default_rng(1))
+
+    # the counts changed, but the letters of the free subgroups did not:
+    assert not np.array_equal(mutated_genomes, genomes)
+    assert np.array_equal(mutated_genomes[:, :number_of_free], genomes[:, :number_of_free])
+
+    # every mutation moves one member of a class to another letter:
+    moved = np.abs(student_classes.class_counts(mutated_genomes).astype(np.int64) 
+                   - student_classes.class_counts(genomes).astype(np.int64)).sum(axis = -1)
+
+    assert set(np.unique(moved).tolist()) <= {0, 2}
+
+    for genome in mutated_genomes:
+        check_genome(schedule, genome)
+
+
+def test_crossover_block(schedule):
+    student_classes = schedule.student_classes
+    parents1 = random_genomes(schedule, 20, seed = 1)
+    parents2 = random_genomes(schedule, 20, seed = 2)
+
+    children1, children2 = SPOTS.GeneticAlgorithm.crossover_block(parents1, parents2, np.random.default_rng(0), 
+                                                                  student_classes.gene_blocks)
+
+    # each gene comes from one of the parents, and the counts of each
+    # class come from the same parent:
+    assert np.array_equal(np.sort(np.stack((children1, children2)), axis = 0), np.sort(np.stack((parents1, parents2)), axis = 0))
+
+    is_swapped = children1 != parents1
+    block_is_swapped = np.logical_or.reduceat(is_swapped, np.unique(student_classes.gene_blocks), axis = 1)
+
+    assert block_is_swapped.any()
+
+    for child in np.concatenate((children1, children2)):
+        check_genome(schedule, child)
+
+    # and for a single pair:
+    child1, child2 = SPOTS.GeneticAlgorithm.get_children_pair(parents1[0], parents2[0], np.random.default_rng(0), 
+                                                              student_classes.gene_blocks)
+
+    check_genome(schedule, child1)
+    check_genome(schedule, child2)
+
+
+def test_generate_next_generation(schedule):
+    individual_partition = SPOTS.IndividualPartition(schedule, seed = 0)
+    population = SPOTS.Population(individual_partition, POPULATION_SIZE)
+    population.populate()
+    population.population_fitness()
+
+    genetic_algorithm = SPOTS.GeneticAlgorithm(population, 0, mutation_rate = 0.05)
+    genetic_algorithm.generate_next_generation()
+
+    assert len(genetic_algorithm.next_generation) == POPULATION_SIZE
+
+    for fitness, genome in genetic_algorithm.next_generation:
+        check_genome(schedule, genome, fitness)
+
+
+def test_get_crossed_children(schedule, monkeypatch):
+    fitness_engine = schedule.fitness_engine
+    genomes1 = random_genomes(schedule, POPULATION_SIZE, seed = 1)
+    genomes2 = random_genomes(schedule, POPULATION_SIZE, seed = 2)
+
+    population1 = sorted(zip(fitness_engine.score_population(genomes1), genomes1), key = lambda item: item[0], reverse = True)
+    population2 = sorted(zip(fitness_engine.score_population(genomes2), genomes2), key = lambda item: item[0], reverse = True)
+
+    # the gene blocks are set when the main schedule is loaded:
+    monkeypatch.setattr(SPOTS.ParallelGeneticAlgorithm, "gene_blocks", schedule.student_classes.gene_blocks)
+
+    children = SPOTS.ParallelGeneticAlgorithm.get_crossed_children(population1, population2, 7, 2, np.random.default_rng(0))
+
+    assert len(children) == 7
+
+    for child in children:
+        check_genome(schedule, child)
+
+
+def search_results(schedule, genome):
+    """
+    Return the (fitness, genome) tuple of each search engine started from
+    genome: LocalSearch, SimulatedAnnealing, TabuSearch and 
+    LargeNeighborhoodSearch
+    """
+    fitness_engine = schedule.fitness_engine
+    results = [SPOTS.LocalSearch(fitness_engine, np.random.default_rng(0)).polish(genome, 1.0)]
+
+    searches = [(SPOTS.SimulatedAnnealing(fitness_engine, np.random.default_rng(0)), 2000), 
+                (SPOTS.TabuSearch(fitness_engine, np.random.default_rng(0), neighborhood_size = 200), 20), 
+                (SPOTS.LargeNeighborhoodSearch(fitness_engine, schedule.cohort_rules, np.random.default_rng(0), 
+                                               solver_seconds = 0.5), 5)]
+
+    for search, number_of_steps in searches:
+        search.start(genome)
+        search.run(number_of_steps)
+        results.append(search.best())
+
+    return results
+
+
+def test_search_engines(schedule):
+    genome = random_genomes(schedule, 1)[0]
+    start_fitness = schedule.fitness_engine.score(genome)
+
+    for fitness, best_genome in search_results(schedule, genome):
+        check_genome(schedule, best_genome, fitness)
+
+        assert fitness[0] >= start_fitness[0] - 1e-9